@@ -1,4 +1,6 @@
+import functools
 from pathlib import Path
+from typing import Iterator
 
 from bioptim_gui_api.acrobatics_ocp.code_generation.common import AcrobaticsGenerationCommon
 from bioptim_gui_api.acrobatics_ocp.code_generation.common_non_collision import (
@@ -12,10 +14,31 @@ from bioptim_gui_api.acrobatics_ocp.code_generation.gen_prepare_ocp_non_collisio
 from bioptim_gui_api.acrobatics_ocp.endpoints.acrobatics_responses import NewGeneratedBioMod
 from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
 from bioptim_gui_api.generic_ocp.code_generation.imports import ImportGeneration
+from bioptim_gui_api.model_converter.biomod_ast import parse_biomod
+from bioptim_gui_api.model_converter.converted_model_cache import converted_models
 from bioptim_gui_api.model_converter.converter_utils import get_converter
+from bioptim_gui_api.model_registry.misc.model_registry import read_model_content
 
 
-def generated_code(data: dict, new_model_path: str, coneless_model_path: str = None) -> str:
+def generated_code_chunks(data: dict, new_model_path: str, coneless_model_path: str = None) -> Iterator[str]:
+    """
+    Generate the script of the acrobatics section by section, the sections whose inputs did not change since a
+    previous generation are not generated again (see cached_section)
+
+    Parameters
+    ----------
+    data: dict
+        The data of the acrobatics
+    new_model_path: str
+        The path of the converted model
+    coneless_model_path: str
+        The path of the converted model without the vision cone, if any
+
+    Returns
+    -------
+    Iterator[str]
+        The sections of the script, in order
+    """
     non_collision = data["collision_constraint"]
     prepare_ocp_printer = AcrobaticsGenerationPrepareOCP
     common_printer = AcrobaticsGenerationCommon
@@ -24,46 +47,50 @@ def generated_code(data: dict, new_model_path: str, coneless_model_path: str = N
         prepare_ocp_printer = AcrobaticsGenerationPrepareOCPNonCollision
         common_printer = AcrobaticsGenerationCommonNonCollision
 
-    ret = ImportGeneration.generate_imports()
-    ret += f'BIOMODEL_PATH = "{new_model_path}"\n'
+    yield ImportGeneration.generate_imports(common_printer.limit_threads())
+    yield f'BIOMODEL_PATH = "{new_model_path}"\n'
     if coneless_model_path:
-        ret += f'CONELESS_MODEL = "{coneless_model_path}"\n'
+        yield f'CONELESS_MODEL = "{coneless_model_path}"\n'
     else:
-        ret += f"CONELESS_MODEL = None\n"
-    ret += AcrobaticsGenerationCustomPenalties.all_customs_function(data)
-    ret += prepare_ocp_printer.prepare_ocp(data, new_model_path)
-    ret += common_printer.generate_common(data)
-    return ret
+        yield f"CONELESS_MODEL = None\n"
+    yield from AcrobaticsGenerationCustomPenalties.all_customs_function_chunks(data)
+    yield from prepare_ocp_printer.prepare_ocp_chunks(data, new_model_path)
+    yield from common_printer.generate_common_chunks(data)
+
+
+def generated_code(data: dict, new_model_path: str, coneless_model_path: str = None) -> str:
+    return "".join(generated_code_chunks(data, new_model_path, coneless_model_path))
 
 
 def converted_model(data: dict) -> list[NewGeneratedBioMod]:
     model_path = data["model_path"]
     position = data["position"]
+    model_content = read_model_content(data)
 
     save_folder = Path("models/")
     original_filename = Path(model_path).name.split(".")[0]
     new_model_path = save_folder / f"{original_filename}-{position}.bioMod"
 
+    # parsed at most once for both converters, only if a conversion is not cached
+    document = functools.cache(lambda: parse_biomod(model_content))
+
+    def convert(additional_criteria: AdditionalCriteria) -> str:
+        converter = get_converter(position, additional_criteria)
+        return converted_models().get(
+            model_content, position, additional_criteria, lambda: converter.convert_document(document())
+        )
+
     additional_criteria = AdditionalCriteria(
         with_visual_criteria=data["with_visual_criteria"],
         collision_constraint=data["collision_constraint"],
         with_spine=data["with_spine"],
     )
-
-    converter = get_converter(data["position"], additional_criteria)
-    new_bio_model = converter.convert(data["model_content"])
+    new_bio_model = convert(additional_criteria)
 
     ret = [NewGeneratedBioMod(new_bio_model, str(new_model_path))]
 
     if data["with_visual_criteria"]:
-        additional_criteria = AdditionalCriteria(
-            with_visual_criteria=data["with_visual_criteria"],
-            collision_constraint=data["collision_constraint"],
-            with_spine=data["with_spine"],
-            without_cone=True,
-        )
-        converter = get_converter(data["position"], additional_criteria)
-        without_cone_model = converter.convert(data["model_content"])
+        without_cone_model = convert(additional_criteria._replace(without_cone=True))
         without_cone_model_path = save_folder / f"{original_filename}-{position}-without_cone.bioMod"
         ret.append(NewGeneratedBioMod(without_cone_model, str(without_cone_model_path)))
 
@@ -1,6 +1,7 @@
+from typing import Iterator
+
 from bioptim_gui_api.acrobatics_ocp.variables.utils import BioptimVariable, var_bounds_list, var_initial_guess_list
 from bioptim_gui_api.generic_ocp.code_generation.bounds import BoundsGeneration
-from bioptim_gui_api.utils.format_utils import format_2d_array
 
 
 class AcrobaticsGenerationBounds(BoundsGeneration):
@@ -18,15 +19,7 @@ class AcrobaticsGenerationBounds(BoundsGeneration):
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_bounds.add(
-        "q",
-        min_bound={format_2d_array(q_bounds[i]["min"])},
-        max_bound={format_2d_array(q_bounds[i]["max"])},
-        interpolation=InterpolationType.{q_bounds[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+            ret += cls.add_bounds("x_bounds", "q", i, q_bounds[i])
         return ret
 
     @classmethod
@@ -39,15 +32,7 @@ class AcrobaticsGenerationBounds(BoundsGeneration):
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_bounds.add(
-        "qdot",
-        min_bound={format_2d_array(qdot_bounds[i]["min"])},
-        max_bound={format_2d_array(qdot_bounds[i]["max"])},
-        interpolation=InterpolationType.{qdot_bounds[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+            ret += cls.add_bounds("x_bounds", "qdot", i, qdot_bounds[i])
         return ret
 
     @classmethod
@@ -60,14 +45,7 @@ class AcrobaticsGenerationBounds(BoundsGeneration):
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_initial_guesses.add(
-        "q",
-        initial_guess={format_2d_array(q_init[i]["initial_guess"])},
-        interpolation=InterpolationType.{q_init[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+            ret += cls.add_initial_guess("x_initial_guesses", "q", i, q_init[i])
         return ret
 
     @classmethod
@@ -77,14 +55,7 @@ class AcrobaticsGenerationBounds(BoundsGeneration):
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_initial_guesses.add(
-        "qdot",
-        initial_guess={format_2d_array(q_init[i]["initial_guess"])},
-        interpolation=InterpolationType.{q_init[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+            ret += cls.add_initial_guess("x_initial_guesses", "qdot", i, q_init[i])
         return ret
 
     @classmethod
@@ -95,15 +66,7 @@ class AcrobaticsGenerationBounds(BoundsGeneration):
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    u_bounds.add(
-        "{control_name}",
-        min_bound={format_2d_array(control_bounds[i]["min"])},
-        max_bound={format_2d_array(control_bounds[i]["max"])},
-        interpolation=InterpolationType.{control_bounds[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+            ret += cls.add_bounds("u_bounds", control_name, i, control_bounds[i])
         return ret
 
     @classmethod
@@ -114,23 +77,15 @@ class AcrobaticsGenerationBounds(BoundsGeneration):
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    u_initial_guesses.add(
-        "{control_name}",
-        initial_guess={format_2d_array(control_init[i]["initial_guess"])},
-        interpolation=InterpolationType.{control_init[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+            ret += cls.add_initial_guess("u_initial_guesses", control_name, i, control_init[i])
         return ret
 
     @classmethod
-    def bounds(cls, data: dict) -> str:
-        ret = cls.declare_bounds()
-        ret += cls.add_q_bounds(data)
-        ret += cls.add_qdot_bounds(data)
-        ret += cls.add_tau_bounds(data)
-        ret += cls.add_q_init(data)
-        ret += cls.add_qdot_init(data)
-        ret += cls.add_tau_init(data)
-        return ret
+    def bounds_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.declare_bounds()
+        yield cls.add_q_bounds(data)
+        yield cls.add_qdot_bounds(data)
+        yield cls.add_tau_bounds(data)
+        yield cls.add_q_init(data)
+        yield cls.add_qdot_init(data)
+        yield cls.add_tau_init(data)
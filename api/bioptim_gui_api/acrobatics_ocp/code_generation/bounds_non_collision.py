@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from bioptim_gui_api.acrobatics_ocp.code_generation.bounds import AcrobaticsGenerationBounds
 from bioptim_gui_api.utils.format_utils import indent_lines
 from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
@@ -30,12 +32,11 @@ class AcrobaticsGenerationBoundsNonCollision(AcrobaticsGenerationBounds):
         return f"""
     if not warming_up:
         # use the solution of the warm up as initial guess
-        with open(pkl_path, "rb") as file:
-            sol = pkl.load(file)["solution"]
+        with np.load(pkl_path) as sol:
             for phase in range(nb_phases):
-                q_init = sol.states[phase]["q"]
-                qdot_init = sol.states[phase]["qdot"]
-                tau_init = sol.controls[phase]["{control}"][:, :-1]
+                q_init = sol[f"solution/states/{{phase}}/q"]
+                qdot_init = sol[f"solution/states/{{phase}}/qdot"]
+                tau_init = sol[f"solution/controls/{{phase}}/{control}"][:, :-1]
 
                 x_initial_guesses.add(
                     "q",
@@ -60,7 +61,6 @@ class AcrobaticsGenerationBoundsNonCollision(AcrobaticsGenerationBounds):
 """
 
     @classmethod
-    def bounds(cls, data: dict) -> str:
-        ret = super().bounds(data)
-        ret += cls.use_solution_as_initial_guess(data)
-        return ret
+    def bounds_chunks(cls, data: dict) -> Iterator[str]:
+        yield from super().bounds_chunks(data)
+        yield cls.use_solution_as_initial_guess(data)
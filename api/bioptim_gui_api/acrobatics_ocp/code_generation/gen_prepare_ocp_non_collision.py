@@ -1,5 +1,3 @@
-from multiprocessing import cpu_count
-
 from bioptim_gui_api.acrobatics_ocp.code_generation.bounds_non_collision import (
     AcrobaticsGenerationBoundsNonCollision,
 )
@@ -24,6 +22,7 @@ def prepare_ocp(
     seed: int = 0,
     warming_up: bool = False,
     pkl_path: str = None,
+    n_threads: int = 1,
 )-> OptimalControlProgram:
     \"""
     This function build an optimal control program and instantiate it.
@@ -39,6 +38,41 @@ def prepare_ocp(
     \"""
 """
 
+    @classmethod
+    def warm_start_functions(cls, data: dict) -> str:
+        # the warm up already provides the initial guesses (see use_solution_as_initial_guess)
+        return ""
+
+    @classmethod
+    def warm_start_initial_guesses(cls, data: dict) -> str:
+        return ""
+
+    @classmethod
+    def bounds_function_header(cls) -> str:
+        return """
+def prepare_bounds_and_initial_guesses(
+    seed: int = 0,
+    warming_up: bool = False,
+    pkl_path: str = None,
+) -> tuple[BoundsList, BoundsList, InitialGuessList, InitialGuessList]:
+    \"""
+    The bounds and the initial guesses of the optimal control program, without building it. The initial guesses are
+    seeded when warming up, and the solution of the warm up (pkl_path) otherwise
+
+    Returns
+    -------
+    The x_bounds, u_bounds, x_initial_guesses and u_initial_guesses
+    \"""
+"""
+
+    @classmethod
+    def bounds_function_call(cls) -> str:
+        return """
+    x_bounds, u_bounds, x_initial_guesses, u_initial_guesses = prepare_bounds_and_initial_guesses(
+        seed, warming_up, pkl_path
+    )
+"""
+
     @classmethod
     def penalties(cls, data: dict) -> str:
         phases = data["phases_info"]
@@ -114,8 +148,7 @@ def prepare_ocp(
 
     @classmethod
     def return_ocp(cls, torque_driven: bool) -> str:
-        n_threads = cpu_count() - 2
-        ret = f"""
+        ret = """
     # Construct and return the optimal control program (OCP)
     return OptimalControlProgram(
         bio_model=bio_model,
@@ -131,10 +164,10 @@ def prepare_ocp(
         if torque_driven:
             ret += "        variable_mappings=mapping,\n"
 
-        ret += f"""        use_sx=False,
+        ret += """        use_sx=False,
         constraints=constraints,
         multinode_constraints=multinode_constraints,
-        n_threads={int(n_threads / 2)},
+        n_threads=n_threads,
     )
 """
         return ret
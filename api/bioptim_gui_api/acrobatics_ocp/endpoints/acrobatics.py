@@ -37,6 +37,7 @@ from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_phases_variables import (
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_requests import DynamicsRequest
 from bioptim_gui_api.penalty.endpoints.penalty import penalties_get_available_values
 from bioptim_gui_api.utils.format_utils import get_spaced_capitalized
+from bioptim_gui_api.utils.static_response import add_static_route
 from bioptim_gui_api.variables.endpoints.variables import variables_get_available_values
 from bioptim_gui_api.variables.misc.enums import Dynamics
 
@@ -60,7 +61,6 @@ class AcrobaticsOCPBaseFieldRegistrar(GenericOCPBaseFieldRegistrar):
         self.register_put_dynamics()
 
     def register_get_available_values(self) -> None:
-        @self.router.get("/available_values", response_model=dict)
         def get_available_values():
             penalties_available_values = penalties_get_available_values()
             variables_available_values = variables_get_available_values()
@@ -71,6 +71,8 @@ class AcrobaticsOCPBaseFieldRegistrar(GenericOCPBaseFieldRegistrar):
             }
             return penalties_available_values | variables_available_values | acrobatics_specific_available_values
 
+        add_static_route(self.router, "/available_values", get_available_values, response_model=dict)
+
     def register_update_nb_phases(self) -> None:
         # disable the endpoint
         pass
@@ -110,15 +112,17 @@ class AcrobaticsOCPBaseFieldRegistrar(GenericOCPBaseFieldRegistrar):
             return FinalTimeMarginResponse(final_time_margin=new_value)
 
     def register_get_positions(self):
-        @self.router.get("/position", response_model=list[str])
         def get_position():
             return get_spaced_capitalized(Position)
 
+        add_static_route(self.router, "/position", get_position, response_model=list[str])
+
     def register_get_sport_types(self):
-        @self.router.get("/sport_type", response_model=list[str])
         def get_sport_type():
             return get_spaced_capitalized(SportType)
 
+        add_static_route(self.router, "/sport_type", get_sport_type, response_model=list[str])
+
     def register_put_sport_type(self):
         @self.router.put("/sport_type", response_model=SportTypeResponse)
         def put_sport_type(sport_type: SportTypeRequest):
@@ -135,10 +139,11 @@ class AcrobaticsOCPBaseFieldRegistrar(GenericOCPBaseFieldRegistrar):
             return SportTypeResponse(sport_type=new_value)
 
     def register_get_preferred_twist_side(self):
-        @self.router.get("/preferred_twist_side", response_model=list[str])
         def get_preferred_twist_side():
             return get_spaced_capitalized(PreferredTwistSide)
 
+        add_static_route(self.router, "/preferred_twist_side", get_preferred_twist_side, response_model=list[str])
+
     def register_put_preferred_twist_side(self):
         @self.router.put("/preferred_twist_side", response_model=PreferredTwistSideResponse)
         def put_preferred_twist_side(preferred_twist_side: PreferredTwistSideRequest):
@@ -154,10 +159,11 @@ class AcrobaticsOCPBaseFieldRegistrar(GenericOCPBaseFieldRegistrar):
             return PreferredTwistSideResponse(preferred_twist_side=new_value)
 
     def register_get_dynamics(self):
-        @self.router.get("/dynamics", response_model=list[str])
         def get_dynamics():
             return get_spaced_capitalized(Dynamics)
 
+        add_static_route(self.router, "/dynamics", get_dynamics, response_model=list[str])
+
     def register_put_dynamics(self):
         @self.router.put("/dynamics", response_model=AcrobaticsDynamicResponse)
         def put_dynamics(dynamics: DynamicsRequest):
@@ -1,14 +1,30 @@
-from fastapi import APIRouter, HTTPException
+import json
 
-from bioptim_gui_api.acrobatics_ocp.code_generation.acrobatics_generation_utils import generated_code, converted_model
+from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from bioptim_gui_api.acrobatics_ocp.code_generation.acrobatics_generation_utils import (
+    converted_model,
+    generated_code,
+    generated_code_chunks,
+)
 from bioptim_gui_api.acrobatics_ocp.endpoints.acrobatics_responses import CodeGenerationResponse
 from bioptim_gui_api.acrobatics_ocp.misc.acrobatics_data import AcrobaticsOCPData
+from bioptim_gui_api.acrobatics_ocp.penalties.non_collision_cylinders.cylinder_culling import cull_collision_pairs
+from bioptim_gui_api.utils.json_stream import json_string_chunks
 
 router = APIRouter()
 
 
 @router.post("/generate_code", response_model=CodeGenerationResponse)
-def get_acrobatics_generated_code():
+def get_acrobatics_generated_code(stream: bool = False, cull_collisions: bool = False):
+    """
+    Generate the script of the acrobatics and the converted models.
+    With stream=true, the same response is streamed while the script is generated.
+    With cull_collisions=true, the cylinder pairs of the non-collision penalties which can not come close given the
+    bounds of each phase are left out of the script (see cull_collision_pairs).
+    """
     data = AcrobaticsOCPData.read_data()
 
     model_path = data["model_path"]
@@ -16,13 +32,26 @@ def get_acrobatics_generated_code():
     if not model_path:
         raise HTTPException(status_code=400, detail="No model path provided")
 
-    new_models = converted_model(data)
+    try:
+        new_models = converted_model(data)
+    except KeyError:
+        raise HTTPException(status_code=400, detail="The model is not in the registry anymore, upload it again")
+    new_model_path = new_models[0].new_model_path
+    coneless_model_path = new_models[1].new_model_path if len(new_models) > 1 else None
 
-    generated = generated_code(
-        data,
-        new_models[0].new_model_path,
-        new_models[1].new_model_path if len(new_models) > 1 else None,
-    )
+    if cull_collisions and data["collision_constraint"]:
+        data = cull_collision_pairs(data, new_models[0].new_model)
+
+    if stream:
+
+        def content():
+            yield '{"generated_code":'
+            yield from json_string_chunks(generated_code_chunks(data, new_model_path, coneless_model_path))
+            yield ',"new_models":' + json.dumps(jsonable_encoder(new_models), ensure_ascii=False) + "}"
+
+        return StreamingResponse(content(), media_type="application/json")
+
+    generated = generated_code(data, new_model_path, coneless_model_path)
 
     return CodeGenerationResponse(
         generated_code=generated,
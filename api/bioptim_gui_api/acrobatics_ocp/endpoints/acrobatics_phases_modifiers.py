@@ -15,7 +15,7 @@ from bioptim_gui_api.acrobatics_ocp.endpoints.acrobatics_responses import (
     CollisionConstraintResponse,
     WithSpineResponse,
 )
-from bioptim_gui_api.acrobatics_ocp.misc.phase_updating import update_phase_info
+from bioptim_gui_api.acrobatics_ocp.misc.phase_updating import update_phase_info, update_phase_info_incrementally
 
 
 class AcrobaticsPhaseModifiers:
@@ -78,17 +78,22 @@ class AcrobaticsPhaseModifiers:
     def register_put_nb_half_twists(self):
         @self.router.put("/nb_half_twists/{somersault_index}", response_model=list)
         def put_nb_half_twist(somersault_index: int, half_twists_request: NbHalfTwistsRequest):
+            """
+            Update the number of half twists of a somersault
+            Only the phases affected by the twist are regenerated, the modifications of the other phases are kept
+            Returns the new phases_info (see the X-OCP-Patch-From header to get a json patch instead)
+            """
             # error handling
             if half_twists_request.nb_half_twists < 0:
                 raise HTTPException(status_code=400, detail="nb_half_twists must be positive or zero")
 
             # updating data
-            half_twists = self.data.read_data("nb_half_twists")
+            old_data = self.data.read_data()
+            half_twists = list(old_data["nb_half_twists"])
             half_twists[somersault_index] = half_twists_request.nb_half_twists
             self.data.update_data("nb_half_twists", half_twists)
 
-            phases = update_phase_info()
-            return phases
+            return update_phase_info_incrementally(old_data)
 
     def register_put_position(self):
         @self.router.put("/position", response_model=PositionResponse)
@@ -23,6 +23,7 @@ class AcrobaticsOCPData(GenericOCPData):
         "nb_somersaults": 1,
         "nb_half_twists": [0],
         "model_path": "",
+        "model_hash": "",
         "final_time": 1.0,
         "final_time_margin": 0.1,
         "position": "straight",
@@ -38,3 +39,11 @@ class AcrobaticsOCPData(GenericOCPData):
             copy.deepcopy(default_phases_info),
         ],
     }
+
+    @classmethod
+    def init_data(cls) -> None:
+        # imported here as phase_updating depends on this module
+        from bioptim_gui_api.acrobatics_ocp.misc.phase_updating import update_phase_info
+
+        cls.reset_data()
+        update_phase_info()
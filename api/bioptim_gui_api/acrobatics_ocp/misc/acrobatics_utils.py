@@ -1,5 +1,4 @@
 import copy
-import json
 
 import numpy as np
 
@@ -68,7 +67,7 @@ def acrobatics_phase_names(nb_somersaults: int, position: str, half_twists: list
 
 
 def phase_name_to_info(
-    position, phase_names: list[str], phase_index: int, additional_criteria: AdditionalCriteria
+    position, phase_names: list[str], phase_index: int, additional_criteria: AdditionalCriteria, dynamics: str
 ) -> dict:
     """
     Returns the phase info for the given phase name, position and additional criteria
@@ -84,6 +83,8 @@ def phase_name_to_info(
         Some objectives depends on the index of the phase (First, last, ...)
     additional_criteria: AdditionalCriteria
         The additional criteria (e.g. with_visual_criteria, collision_constraint, without_cone)
+    dynamics: str
+        The dynamics of the acrobatics (e.g. "TORQUE_DRIVEN")
 
     Returns
     -------
@@ -100,9 +101,6 @@ def phase_name_to_info(
     res["objectives"] = get_phase_objectives(phase_names, phase_index, position, additional_criteria)
     res["constraints"] = get_phase_constraints(phase_name, position, additional_criteria)
 
-    with open(AcrobaticsOCPData.datafile, "r") as f:
-        dynamics = json.load(f)["dynamics"]
-
     adapt_dynamics(res, dynamics)
 
     return res
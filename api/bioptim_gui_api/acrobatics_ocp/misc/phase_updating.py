@@ -1,3 +1,7 @@
+import json
+from difflib import SequenceMatcher
+from functools import lru_cache
+
 import numpy as np
 
 from bioptim_gui_api.acrobatics_ocp.misc.acrobatics_data import AcrobaticsOCPData
@@ -7,11 +11,12 @@ from bioptim_gui_api.acrobatics_ocp.misc.acrobatics_utils import (
 )
 from bioptim_gui_api.acrobatics_ocp.misc.dynamics_updating import adapt_dynamics
 from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
+from bioptim_gui_api.acrobatics_ocp.variables.bounds_table import get_q_bounds
 from bioptim_gui_api.acrobatics_ocp.variables.variable_compute import get_variable_computer
 from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
 
 
-def update_state_control_variables(phases: list[dict], data: dict) -> None:
+def update_state_control_variables(phases: list[dict], data: dict) -> list[str]:
     """
     Updates the state and control variables of the phases according to given data.
     Updates the dimension of the state and control variables.
@@ -24,6 +29,11 @@ def update_state_control_variables(phases: list[dict], data: dict) -> None:
         The list of phases to update
     data: dict
         The data of the acrobatics
+
+    Returns
+    -------
+    list[str]
+        The names of the degrees of freedom of the model
     """
     nb_somersaults = data["nb_somersaults"]
     half_twists = data["nb_half_twists"]
@@ -40,13 +50,12 @@ def update_state_control_variables(phases: list[dict], data: dict) -> None:
 
     model = get_variable_computer(position, additional_criteria)
 
-    AcrobaticsOCPData.update_data("dof_names", model.dofs)
-
     nb_q = model.nb_q
     nb_qdot = model.nb_qdot
     nb_tau = model.nb_tau
 
-    q_bounds = model.get_q_bounds(half_twists, prefer_left)
+    # read from the precomputed bounds table when there is one
+    q_bounds = get_q_bounds(model, half_twists, prefer_left)
     nb_phases = len(q_bounds)
     qdot_bounds = model.get_qdot_bounds(nb_phases, final_time, is_forward)
     tau_bounds = model.get_tau_bounds(nb_phases)
@@ -94,6 +103,85 @@ def update_state_control_variables(phases: list[dict], data: dict) -> None:
             },
         ]
 
+    return model.dofs
+
+
+@lru_cache(maxsize=256)
+def _phases_info_template(
+    nb_somersaults: int,
+    position: str,
+    half_twists: tuple[int, ...],
+    final_time: float,
+    preferred_twist_side: str,
+    additional_criteria: AdditionalCriteria,
+    dynamics: str,
+) -> str:
+    """
+    Compute the phases_info and the dof names of an acrobatics, json encoded so that the cached value can't be modified
+    """
+    phase_names = acrobatics_phase_names(nb_somersaults, position, list(half_twists))
+    n_phases = len(phase_names)
+    new_phases = [
+        phase_name_to_info(position, phase_names, i, additional_criteria, dynamics) for i, _ in enumerate(phase_names)
+    ]
+
+    for i in range(n_phases):
+        new_phases[i]["phase_name"] = phase_names[i]
+        # rounding is necessary to avoid buffer overflow in the frontend
+        new_phases[i]["duration"] = round(final_time / n_phases, 2)
+
+    data = {
+        "nb_somersaults": nb_somersaults,
+        "nb_half_twists": list(half_twists),
+        "preferred_twist_side": preferred_twist_side,
+        "position": position,
+        "with_visual_criteria": additional_criteria.with_visual_criteria,
+        "collision_constraint": additional_criteria.collision_constraint,
+        "with_spine": additional_criteria.with_spine,
+        "dynamics": dynamics,
+    }
+    dof_names = update_state_control_variables(new_phases, data)
+
+    for phase in new_phases:
+        adapt_dynamics(phase, dynamics)
+
+    return json.dumps({"phases_info": new_phases, "dof_names": dof_names})
+
+
+def phases_info_template(data: dict) -> tuple[list[dict], list[str]]:
+    """
+    The phases_info and dof names of an acrobatics, as generated from scratch for the given data.
+    The templates are cached by the fields they depend on (position, nb_somersaults, nb_half_twists, final_time,
+    preferred_twist_side, additional criteria and dynamics), toggling back to a previous configuration does not
+    recompute the objectives, constraints, bounds and initial guesses.
+
+    Parameters
+    ----------
+    data: dict
+        The data of the acrobatics
+
+    Returns
+    -------
+    tuple[list[dict], list[str]]
+        A new copy of the phases_info, and the dof names
+    """
+    additional_criteria = AdditionalCriteria(
+        with_visual_criteria=data["with_visual_criteria"],
+        collision_constraint=data["collision_constraint"],
+        with_spine=data["with_spine"],
+    )
+    template = _phases_info_template(
+        data["nb_somersaults"],
+        data["position"],
+        tuple(data["nb_half_twists"]),
+        data["final_time"],
+        data["preferred_twist_side"],
+        additional_criteria,
+        data["dynamics"],
+    )
+    template = json.loads(template)
+    return template["phases_info"], template["dof_names"]
+
 
 def update_phase_info() -> list[dict]:
     """
@@ -107,6 +195,7 @@ def update_phase_info() -> list[dict]:
     - The phase's objectives and constraints are updated according to the new phase name, existing position, and
     additional criteria (with_visual_criteria and collision_constraint)
 
+    The phases are computed once per configuration, see phases_info_template.
 
     Returns
     -------
@@ -115,32 +204,95 @@ def update_phase_info() -> list[dict]:
     """
     data = AcrobaticsOCPData.read_data()
 
-    nb_somersaults = data["nb_somersaults"]
-    position = data["position"]
-    half_twists = data["nb_half_twists"]
-    final_time = data["final_time"]
-    additional_criteria = AdditionalCriteria(
-        with_visual_criteria=data["with_visual_criteria"],
-        collision_constraint=data["collision_constraint"],
-        with_spine=data["with_spine"],
-    )
-    dynamics = data["dynamics"]
+    new_phases, dof_names = phases_info_template(data)
 
-    phase_names = acrobatics_phase_names(nb_somersaults, position, half_twists)
-    n_phases = len(phase_names)
-    new_phases = [phase_name_to_info(position, phase_names, i, additional_criteria) for i, _ in enumerate(phase_names)]
+    AcrobaticsOCPData.update_data("dof_names", dof_names)
+    AcrobaticsOCPData.update_data("nb_phases", len(new_phases))
+    AcrobaticsOCPData.update_data("phases_info", new_phases)
 
-    for i in range(n_phases):
-        new_phases[i]["phase_name"] = phase_names[i]
-        # rounding is necessary to avoid buffer overflow in the frontend
-        new_phases[i]["duration"] = round(final_time / n_phases, 2)
+    return new_phases
 
-    update_state_control_variables(new_phases, data)
 
-    for phase in new_phases:
-        adapt_dynamics(phase, dynamics)
+def keep_user_modifications(old_generated, current, new_generated):
+    """
+    Three-way merge of a generated value: the parts of the value that are generated the same way before and after
+    the modification keep their current value (i.e. the modifications of the user), the other ones take their newly
+    generated value.
+
+    Parameters
+    ----------
+    old_generated: Any
+        The value generated before the modification
+    current: Any
+        The current value, old_generated possibly modified by the user
+    new_generated: Any
+        The value generated after the modification
+
+    Returns
+    -------
+    Any
+        The merged value
+    """
+    if old_generated == new_generated:
+        return current
+    if current == old_generated:
+        return new_generated
+
+    if isinstance(new_generated, dict) and isinstance(old_generated, dict) and isinstance(current, dict):
+        if new_generated.keys() == old_generated.keys() == current.keys():
+            return {
+                key: keep_user_modifications(old_generated[key], current[key], new_generated[key])
+                for key in new_generated
+            }
+
+    if isinstance(new_generated, list) and isinstance(old_generated, list) and isinstance(current, list):
+        if len(new_generated) == len(old_generated) == len(current):
+            return [keep_user_modifications(o, c, n) for o, c, n in zip(old_generated, current, new_generated)]
+
+    return new_generated
+
+
+def update_phase_info_incrementally(old_data: dict) -> list[dict]:
+    """
+    Update the phases_info of the acrobatics after a modification that only changes some of its phases, e.g. the
+    number of half twists of one somersault.
+
+    The old and new phases are matched by their names, the unmatched phases are generated from scratch. The fields of
+    the matched phases that are generated the same way (e.g. the bounds that do not depend on the modified twist) keep
+    their current value, so that the modifications of the user on the untouched phases are kept. The other fields,
+    such as the boundary bounds of the neighbours of the modified phases, are regenerated.
+
+    Parameters
+    ----------
+    old_data: dict
+        The data of the acrobatics before the modification
+
+    Returns
+    -------
+    list[dict]
+        The updated phases_info
+    """
+    data = AcrobaticsOCPData.read_data()
+
+    old_generated, _ = phases_info_template(old_data)
+    new_phases, dof_names = phases_info_template(data)
+    current_phases = old_data["phases_info"]
+
+    if len(current_phases) == len(old_generated):
+        matcher = SequenceMatcher(
+            None,
+            [phase["phase_name"] for phase in old_generated],
+            [phase["phase_name"] for phase in new_phases],
+            autojunk=False,
+        )
+        for old_index, new_index, size in matcher.get_matching_blocks():
+            for k in range(size):
+                new_phases[new_index + k] = keep_user_modifications(
+                    old_generated[old_index + k], current_phases[old_index + k], new_phases[new_index + k]
+                )
 
-    AcrobaticsOCPData.update_data("nb_phases", n_phases)
+    AcrobaticsOCPData.update_data("dof_names", dof_names)
+    AcrobaticsOCPData.update_data("nb_phases", len(new_phases))
     AcrobaticsOCPData.update_data("phases_info", new_phases)
 
     return new_phases
@@ -57,18 +57,19 @@ class CollisionComputer:
         list
             [(Marker 1, Marker 2, Marker 3, Marker 4), ...]
         """
-        cylinders = {Cylinder(m1, m2) for m1, m2 in cls.cylinders.values()}
+        # in the order of the cylinders, so that the generated code is the same for the same acrobatics
+        cylinders = [Cylinder(m1, m2) for m1, m2 in cls.cylinders.values()]
         exceptions = {
             CylinderCollision(Cylinder(*cls.cylinders[c1]), Cylinder(*cls.cylinders[c2])) for c1, c2 in cls.exceptions
         }
 
-        all_cylinder_combinations = combinations(cylinders, 2)
-        all_collision_combinations = {CylinderCollision(c1, c2) for c1, c2 in all_cylinder_combinations}
+        non_collision_markers = [
+            CylinderCollision(c1, c2)
+            for c1, c2 in combinations(cylinders, 2)
+            if CylinderCollision(c1, c2) not in exceptions
+        ]
 
-        non_collision_markers = all_collision_combinations - set(exceptions)
-
-        tuple_form = [tuple(c) for c in non_collision_markers]
-        return tuple_form
+        return [tuple(c) for c in non_collision_markers]
 
 
 class StraightCylinderCollision(CollisionComputer):
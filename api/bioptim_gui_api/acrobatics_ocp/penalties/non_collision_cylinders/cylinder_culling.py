@@ -0,0 +1,388 @@
+import ast
+import copy
+import operator
+from typing import NamedTuple
+
+import numpy as np
+
+from bioptim_gui_api.model_converter.biomod_ast import BioModDocument, Marker, Segment, parse_biomod
+
+# the custom functions of the non-collision penalties and the arguments holding their markers
+BATCH_FUNCTIONS = ("custom_noncrossing_batch_const", "custom_noncrossing_batch_obj")
+PAIR_FUNCTIONS = ("custom_noncrossing_const", "custom_noncrossing_obj")
+PAIR_MARKERS = ("marker_1", "marker_2", "marker_3", "marker_4")
+
+_operators = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _number(token: str) -> float:
+    """
+    Evaluate a number of a bioMod, which can be an arithmetic expression of pi (e.g. "-pi/2")
+    """
+
+    def evaluate(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        if isinstance(node, ast.Name) and node.id.lower() == "pi":
+            return np.pi
+        if isinstance(node, ast.BinOp) and type(node.op) in _operators:
+            return _operators[type(node.op)](evaluate(node.left), evaluate(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _operators:
+            return _operators[type(node.op)](evaluate(node.operand))
+        raise ValueError(f"Unsupported number in the bioMod: {token}")
+
+    return evaluate(ast.parse(token, mode="eval").body)
+
+
+def _rotation(axis: str, angle: float) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    if axis == "x":
+        return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+    if axis == "y":
+        return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+    if axis == "z":
+        return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+    raise ValueError(f"Unknown axis {axis}")
+
+
+def _euler(angles: list[float], sequence: str) -> np.ndarray:
+    rotation = np.eye(3)
+    for axis, angle in zip(sequence, angles):
+        rotation = rotation @ _rotation(axis, angle)
+    return rotation
+
+
+class SkeletonSegment(NamedTuple):
+    """
+    The kinematics of a segment: its frame in the frame of its parent is
+    (rotation, translation) @ translations dofs @ rotations dofs
+    """
+
+    name: str
+    parent: str | None
+    rotation: np.ndarray
+    translation: np.ndarray
+    translations: str  # the axes of the translation dofs, e.g. "xyz"
+    rotations: str  # the axes of the rotation dofs, e.g. "zy"
+    first_dof: int  # the index in q of the first dof of the segment
+
+
+class Skeleton:
+    """
+    The forward kinematics of the markers of a bioMod, computed without biorbd. It follows the bioMod conventions:
+    the dofs are ordered by segment, translations before rotations, the angles of rt and of the rotations are applied
+    in the order of their sequence.
+
+    Attributes
+    ----------
+    segments: dict[str, SkeletonSegment]
+        The segments, in the order of the model
+    markers: dict[str, tuple[str, np.ndarray]]
+        The segment and the position in the segment of each marker
+    nb_q: int
+        The number of dofs of the model
+    """
+
+    def __init__(self, document: BioModDocument):
+        self.segments = {}
+        self.markers = {}
+        nb_q = 0
+        for node in document.nodes:
+            if isinstance(node, Segment):
+                segment = self._segment(node, nb_q)
+                self.segments[segment.name] = segment
+                nb_q += len(segment.translations) + len(segment.rotations)
+                for child in node.body:
+                    if isinstance(child, Marker):
+                        self._add_marker(child, node.name)
+            elif isinstance(node, Marker):
+                self._add_marker(node, None)
+        self.nb_q = nb_q
+
+    @classmethod
+    def from_biomod(cls, model_content: str) -> "Skeleton":
+        return cls(parse_biomod(model_content))
+
+    @staticmethod
+    def _segment(node: Segment, first_dof: int) -> SkeletonSegment:
+        parent = None
+        rotation, translation = np.eye(3), np.zeros(3)
+        translations = rotations = ""
+        rt_in_matrix = False
+        matrix_rows = None
+
+        for child in node.body:
+            if hasattr(child, "kind"):
+                if child.kind == "translations":
+                    translations = child.axes.lower()
+                else:
+                    rotations = child.axes.lower()
+                continue
+            if not hasattr(child, "keyword"):
+                continue
+
+            values = child.line.split()
+            keyword = child.keyword.lower()
+            if matrix_rows is not None and values and keyword not in ("rt", "rtinmatrix"):
+                try:
+                    matrix_rows.append([_number(value) for value in values[:4]])
+                except (ValueError, SyntaxError):
+                    matrix_rows = None
+                    continue
+                if len(matrix_rows) == 4:
+                    matrix = np.array(matrix_rows)
+                    rotation, translation = matrix[:3, :3], matrix[:3, 3]
+                    matrix_rows = None
+            elif keyword == "parent":
+                parent = values[1]
+            elif keyword == "rtinmatrix":
+                rt_in_matrix = bool(int(_number(values[1])))
+            elif keyword == "rt":
+                if rt_in_matrix:
+                    matrix_rows = [[_number(value) for value in values[1:5]]] if len(values) > 1 else []
+                else:
+                    angles = [_number(value) for value in values[1:4]]
+                    rotation = _euler(angles, values[4].lower())
+                    translation = np.array([_number(value) for value in values[5:8]])
+
+        return SkeletonSegment(node.name, parent, rotation, translation, translations, rotations, first_dof)
+
+    def _add_marker(self, marker: Marker, segment: str | None) -> None:
+        position = np.zeros(3)
+        for line in marker.lines[1:]:
+            values = line.split()
+            if not values:
+                continue
+            if values[0].lower() == "parent":
+                segment = values[1]
+            elif values[0].lower() == "position":
+                position = np.array([_number(value) for value in values[1:4]])
+        if segment is not None:
+            self.markers[marker.name] = (segment, position)
+
+    def chain(self, segment: str) -> list[str]:
+        """
+        The segments from the root to the segment (included)
+        """
+        chain = []
+        while segment is not None:
+            chain.append(segment)
+            segment = self.segments[segment].parent
+        return chain[::-1]
+
+    def global_frames(self, q: np.ndarray) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        The rotation and the origin of the frame of each segment in the global frame, for the generalized coordinates q
+        """
+        frames = {}
+        for segment in self.segments.values():
+            rotation, origin = (np.eye(3), np.zeros(3)) if segment.parent is None else frames[segment.parent]
+            origin = origin + rotation @ segment.translation
+            rotation = rotation @ segment.rotation
+
+            dof = segment.first_dof
+            for axis in segment.translations:
+                origin = origin + rotation @ (np.eye(3)["xyz".index(axis)] * q[dof])
+                dof += 1
+            for axis in segment.rotations:
+                rotation = rotation @ _rotation(axis, q[dof])
+                dof += 1
+            frames[segment.name] = (rotation, origin)
+        return frames
+
+    def marker_positions(self, q: np.ndarray, markers: list[str] = None) -> dict[str, np.ndarray]:
+        """
+        The positions of the markers in the global frame, for the generalized coordinates q
+        """
+        frames = self.global_frames(q)
+        positions = {}
+        for marker in markers if markers is not None else self.markers:
+            segment, position = self.markers[marker]
+            rotation, origin = frames[segment]
+            positions[marker] = origin + rotation @ position
+        return positions
+
+    def _reach(self, segment: str, marker: str) -> float:
+        """
+        The maximum distance between the origin of a segment and a marker of a descendant segment, whatever the dofs
+        """
+        marker_segment, position = self.markers[marker]
+        chain = self.chain(marker_segment)
+        reach = float(np.linalg.norm(position))
+        for name in chain[chain.index(segment) + 1 :]:
+            reach += float(np.linalg.norm(self.segments[name].translation))
+        return reach
+
+    def marker_displacement(
+        self, marker: str, q_min: np.ndarray, q_max: np.ndarray, fixed_segments: set[str] = frozenset()
+    ) -> float:
+        """
+        An upper bound of the displacement of a marker from its position at the middle of the bounds, relative to
+        the fixed segments (their dofs are ignored). Each dof moves the marker by at most its lever times its half
+        range, for rotations the lever is the reach of the marker from the segment.
+
+        Parameters
+        ----------
+        marker: str
+            The marker
+        q_min: np.ndarray
+            The minimal bounds of q
+        q_max: np.ndarray
+            The maximal bounds of q
+        fixed_segments: set[str]
+            The segments whose dofs are ignored
+
+        Returns
+        -------
+        float
+            The bound of the displacement, inf if a bound of the dofs is infinite
+        """
+        half_range = (np.asarray(q_max, dtype=float) - np.asarray(q_min, dtype=float)) / 2
+        displacement = 0.0
+        for name in self.chain(self.markers[marker][0]):
+            if name in fixed_segments:
+                continue
+            segment = self.segments[name]
+            dof = segment.first_dof
+            for _ in segment.translations:
+                displacement += half_range[dof]
+                dof += 1
+            reach = self._reach(name, marker)
+            for _ in segment.rotations:
+                # a rotation of angle a moves a point at a distance r by 2 r sin(a / 2)
+                displacement += reach * min(half_range[dof], 2.0)
+                dof += 1
+        return displacement
+
+
+def segment_distance(a0: np.ndarray, a1: np.ndarray, b0: np.ndarray, b1: np.ndarray) -> float:
+    """
+    The distance between the segments [a0, a1] and [b0, b1]
+    """
+    u, v, w = a1 - a0, b1 - b0, a0 - b0
+    a, b, c, d, e = u @ u, u @ v, v @ v, u @ w, v @ w
+    denominator = a * c - b * b
+
+    # the closest points of the lines, clamped to the segments, then each one projected again on the other segment
+    s = np.clip((b * e - c * d) / denominator, 0, 1) if denominator > 1e-12 else 0.0
+    t = np.clip((b * s + e) / c, 0, 1) if c > 1e-12 else 0.0
+    s = np.clip((b * t - d) / a, 0, 1) if a > 1e-12 else 0.0
+    return float(np.linalg.norm(w + s * u - t * v))
+
+
+def can_collide(
+    skeleton: Skeleton,
+    markers: tuple[str, str, str, str],
+    radii: float,
+    q_min: np.ndarray,
+    q_max: np.ndarray,
+    margin: float = 0.05,
+) -> bool:
+    """
+    If the cylinders (markers[0], markers[1]) and (markers[2], markers[3]) can come closer than the sum of their radii
+    plus a margin, with q within its bounds. Conservative: True unless they are sure to stay apart.
+
+    Parameters
+    ----------
+    skeleton: Skeleton
+        The kinematics of the model
+    markers: tuple[str, str, str, str]
+        The markers of the two cylinders
+    radii: float
+        The sum of the radii of the cylinders
+    q_min: np.ndarray
+        The minimal bounds of q
+    q_max: np.ndarray
+        The maximal bounds of q
+    margin: float
+        The additional distance under which the cylinders are considered able to collide
+
+    Returns
+    -------
+    bool
+        False if the cylinders can not come close
+    """
+    if any(marker not in skeleton.markers for marker in markers):
+        return True
+    q_min, q_max = np.asarray(q_min, dtype=float), np.asarray(q_max, dtype=float)
+    if not (np.all(np.isfinite(q_min)) and np.all(np.isfinite(q_max))):
+        return True
+
+    # the dofs of the segments common to the four chains move the cylinders together, without changing their distance
+    chains = [set(skeleton.chain(skeleton.markers[marker][0])) for marker in markers]
+    common = set.intersection(*chains)
+
+    positions = skeleton.marker_positions((q_min + q_max) / 2, list(markers))
+    displacements = [skeleton.marker_displacement(marker, q_min, q_max, common) for marker in markers]
+
+    # every point of a cylinder axis moves less than the farthest moving of its ends
+    distance = segment_distance(*(positions[marker] for marker in markers))
+    return distance - max(displacements[:2]) - max(displacements[2:]) <= radii + margin
+
+
+def _argument(penalty: dict, name: str):
+    for argument in penalty["arguments"]:
+        if argument["name"] == name:
+            return argument
+    return None
+
+
+def cull_collision_pairs(data: dict, model_content: str, margin: float = 0.05) -> dict:
+    """
+    Remove, from each phase, the cylinder pairs of the non-collision penalties that can not come close given the
+    bounds of q of the phase (see can_collide), e.g. the arms of a straight position whose bounds keep them apart.
+
+    Parameters
+    ----------
+    data: dict
+        The data of the acrobatics
+    model_content: str
+        The content of the model of the generated code, with the markers of the cylinders
+    margin: float
+        The additional distance under which the cylinders are kept
+
+    Returns
+    -------
+    dict
+        A copy of the data without the culled pairs, the penalties without pairs left are removed. The data is
+        returned unchanged if the model does not match the bounds.
+    """
+    skeleton = Skeleton.from_biomod(model_content)
+    culled = copy.deepcopy(data)
+
+    for phase in culled["phases_info"]:
+        q = next((variable for variable in phase["state_variables"] if variable["name"] == "q"), None)
+        if q is None or q["dimension"] != skeleton.nb_q:
+            continue
+        q_min = np.min(np.array(q["bounds"]["min_bounds"], dtype=float), axis=1)
+        q_max = np.max(np.array(q["bounds"]["max_bounds"], dtype=float), axis=1)
+
+        def keep(markers: tuple, penalty: dict) -> bool:
+            radii = sum(_argument(penalty, name)["value"] for name in ("radius_1", "radius_2"))
+            return can_collide(skeleton, tuple(markers), radii, q_min, q_max, margin)
+
+        for key in ("objectives", "constraints"):
+            penalties = []
+            for penalty in phase[key]:
+                function = _argument(penalty, "function")
+                function = function["value"] if function is not None else None
+                if function in BATCH_FUNCTIONS:
+                    pairs = _argument(penalty, "cylinder_pairs")
+                    pairs["value"] = [pair for pair in pairs["value"] if keep(pair, penalty)]
+                    if not pairs["value"]:
+                        continue
+                elif function in PAIR_FUNCTIONS:
+                    if not keep([_argument(penalty, name)["value"] for name in PAIR_MARKERS], penalty):
+                        continue
+                penalties.append(penalty)
+            phase[key] = penalties
+
+    return culled
@@ -4,12 +4,12 @@ from bioptim_gui_api.penalty.misc.penalty_utils import create_constraint
 
 def collision_constraint_constraints(phase_name, position):
     """
-    CUSTOM custom_noncrossing_const all_shooting, weight=1.0
-    """
-    constraints = []
+    CUSTOM custom_noncrossing_batch_const all_shooting, weight=1.0
 
+    A single constraint for all the cylinder pairs of the position, their distances are evaluated in one call per node
+    """
     if phase_name == "Somersault":
-        return constraints
+        return []
 
     collision_computer = get_collision_computer(position)
     non_collisions_markers = collision_computer.non_collision_markers_combinations()
@@ -20,22 +20,20 @@ def collision_constraint_constraints(phase_name, position):
         "Kick out": "all[:-3]",
     }
 
-    for m1_1, m1_2, m2_1, m2_2 in non_collisions_markers:
-        constraints.append(
-            create_constraint(
-                penalty_type="CUSTOM",
-                nodes=position_node.get(phase_name, "all_shooting"),
-                weight=1.0,
-                arguments=[
-                    {"name": "function", "value": "custom_noncrossing_const", "type": "function"},
-                    {"name": "marker_1", "value": m1_1, "type": "str"},
-                    {"name": "marker_2", "value": m1_2, "type": "str"},
-                    {"name": "radius_1", "value": 0.05, "type": "float"},
-                    {"name": "marker_3", "value": m2_1, "type": "str"},
-                    {"name": "marker_4", "value": m2_2, "type": "str"},
-                    {"name": "radius_2", "value": 0.05, "type": "float"},
-                ],
-            )
+    return [
+        create_constraint(
+            penalty_type="CUSTOM",
+            nodes=position_node.get(phase_name, "all_shooting"),
+            weight=1.0,
+            arguments=[
+                {"name": "function", "value": "custom_noncrossing_batch_const", "type": "function"},
+                {
+                    "name": "cylinder_pairs",
+                    "value": [list(markers) for markers in non_collisions_markers],
+                    "type": "list",
+                },
+                {"name": "radius_1", "value": 0.05, "type": "float"},
+                {"name": "radius_2", "value": 0.05, "type": "float"},
+            ],
         )
-
-    return constraints
+    ]
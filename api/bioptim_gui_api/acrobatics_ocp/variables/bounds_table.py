@@ -0,0 +1,234 @@
+import argparse
+import itertools
+import json
+from pathlib import Path
+from typing import Type
+
+import numpy as np
+
+from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
+from bioptim_gui_api.acrobatics_ocp.variables.variable_compute import get_variable_computer
+from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.straight_acrobatics_variables import (
+    StraightAcrobaticsVariables,
+)
+from bioptim_gui_api.utils.cache_utils import EnvConfigured, source_fingerprint
+from bioptim_gui_api.utils.format_utils import invert_min_max_array
+
+BOUNDS_TABLE_ENV = "BIOPTIM_GUI_BOUNDS_TABLE"
+INDEX_FILE = "index.json"
+
+_api_directory = Path(__file__).parents[2]
+# the bounds depend on the code of these files, a table built with another version of them is not used
+_source_files = (
+    *(_api_directory / "acrobatics_ocp" / "variables" / "variable_computers").glob("*.py"),
+    _api_directory / "acrobatics_ocp" / "variables" / "utils.py",
+    _api_directory / "variables" / "misc" / "variables_utils.py",
+    _api_directory / "utils" / "format_utils.py",
+)
+
+
+def all_variable_computers() -> list[Type[StraightAcrobaticsVariables]]:
+    return [
+        get_variable_computer(position, AdditionalCriteria(with_visual_criteria=visual, with_spine=spine))
+        for position in ("straight", "tuck", "pike")
+        for visual in (False, True)
+        for spine in (False, True)
+    ]
+
+
+def _key(half_twists: list) -> str:
+    return ",".join(str(half_twist) for half_twist in half_twists)
+
+
+class QBoundsTable:
+    """
+    The q bounds of every variable computer precomputed for all the twist sequences up to a number of somersaults and
+    of half twists per somersault, read from memory-mapped arrays.
+
+    The twist sequences share most of their phases (e.g. the landing), so each distinct phase is stored once. The table
+    is a directory with, for each variable computer, a .npy file of its distinct phases (shape (nb_phases, 2, nb_q, 3),
+    min then max, in float64 so that the bounds are exactly the computed ones) and a .rows.npy file giving the phases
+    of all the twist sequences one after the other, and an index.json file giving the first row and the number of
+    phases of each twist sequence. Only the bounds twisting to the left are stored, the bounds twisting to the right
+    are their inversion on Zrot.
+
+    The qdot and tau bounds and the initial guesses are not stored: they depend on the duration of the phases or are
+    derived from the q bounds, and are computed with a few array operations.
+
+    Attributes
+    ----------
+    directory: Path
+        The directory of the table
+    index: dict
+        The content of index.json
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        with open(self.directory / INDEX_FILE, "r") as f:
+            self.index = json.load(f)
+        self._arrays = {}
+
+    @property
+    def is_up_to_date(self) -> bool:
+        return self.index["fingerprint"] == source_fingerprint(_source_files)
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.directory / f"{name}.npy", mmap_mode="r")
+        return self._arrays[name]
+
+    def get_q_bounds_array(
+        self, model: Type[StraightAcrobaticsVariables], half_twists: list, prefer_left: bool
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Read the bounds of q of all the phases, same as model.get_q_bounds_array
+
+        Parameters
+        ----------
+        model: Type[StraightAcrobaticsVariables]
+            The variable computer
+        half_twists: list
+            The number of half twists of each somersault
+        prefer_left: bool
+            If the twists are done to the left
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray] | None
+            The min and max bounds, of shape (nb_phases, nb_q, 3), None if they are not in the table
+        """
+        location = self.index["computers"].get(model.__name__, {}).get(_key(half_twists))
+        if location is None:
+            return None
+
+        start, nb_phases = location
+        rows = self._array(f"{model.__name__}.rows")[start : start + nb_phases]
+        # fancy indexing copies the phases out of the memory-mapped file
+        bounds = self._array(model.__name__)[rows]
+        min_bounds, max_bounds = bounds[:, 0], bounds[:, 1]
+        if not prefer_left:
+            invert_min_max_array(min_bounds, max_bounds, model.Zrot)
+        return min_bounds, max_bounds
+
+    @classmethod
+    def build(cls, directory: str | Path, max_somersaults: int = 5, max_half_twists: int = 3) -> "QBoundsTable":
+        """
+        Compute the bounds of every variable computer and write the table
+
+        Parameters
+        ----------
+        directory: str | Path
+            The directory to write the table to, created if needed
+        max_somersaults: int
+            The maximum number of somersaults
+        max_half_twists: int
+            The maximum number of half twists of each somersault
+
+        Returns
+        -------
+        QBoundsTable
+            The table
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        computers = {}
+        for model in all_variable_computers():
+            locations = {}
+            phases = [np.zeros((0, 2, model.nb_q, 3))]
+            # the row of each distinct phase, by the bytes of its bounds
+            phase_rows = {}
+            rows = []
+            for nb_somersaults in range(1, max_somersaults + 1):
+                for half_twists in itertools.product(range(max_half_twists + 1), repeat=nb_somersaults):
+                    try:
+                        min_bounds, max_bounds = model.get_q_bounds_array(list(half_twists), True)
+                    except IndexError:
+                        # not a valid acrobatics for this position (e.g. 1 somersault in pike)
+                        continue
+                    locations[_key(half_twists)] = [len(rows), len(min_bounds)]
+                    for phase in np.stack([min_bounds, max_bounds], axis=1):
+                        phase_key = phase.tobytes()
+                        if phase_key not in phase_rows:
+                            phase_rows[phase_key] = len(phase_rows)
+                            phases.append(phase[np.newaxis])
+                        rows.append(phase_rows[phase_key])
+
+            np.save(directory / f"{model.__name__}.npy", np.concatenate(phases))
+            np.save(directory / f"{model.__name__}.rows.npy", np.array(rows, dtype=np.int32))
+            computers[model.__name__] = locations
+
+        index = {
+            "fingerprint": source_fingerprint(_source_files),
+            "max_somersaults": max_somersaults,
+            "max_half_twists": max_half_twists,
+            "computers": computers,
+        }
+        with open(directory / INDEX_FILE, "w") as f:
+            json.dump(index, f)
+
+        return cls(directory)
+
+
+def _open_table(directory: str | None) -> QBoundsTable | None:
+    if not directory or not (Path(directory) / INDEX_FILE).is_file():
+        return None
+    table = QBoundsTable(directory)
+    return table if table.is_up_to_date else None
+
+
+_table = EnvConfigured(BOUNDS_TABLE_ENV, _open_table)
+
+
+def bounds_table() -> QBoundsTable | None:
+    """
+    The table of the directory given by the BIOPTIM_GUI_BOUNDS_TABLE environment variable.
+
+    Returns
+    -------
+    QBoundsTable | None
+        The table, None if there is no table or if it is outdated
+    """
+    return _table.get()
+
+
+def get_q_bounds(
+    model: Type[StraightAcrobaticsVariables], half_twists: list, prefer_left: bool
+) -> list[dict[str, np.ndarray]]:
+    """
+    The bounds of q, read from the bounds table if possible, computed by the variable computer otherwise
+
+    Parameters
+    ----------
+    model: Type[StraightAcrobaticsVariables]
+        The variable computer
+    half_twists: list
+        The number of half twists of each somersault
+    prefer_left: bool
+        If the twists are done to the left
+
+    Returns
+    -------
+    list[dict[str, np.ndarray]]
+        The min and max bounds of each phase, same as model.get_q_bounds
+    """
+    table = bounds_table()
+    bounds = table.get_q_bounds_array(model, half_twists, prefer_left) if table is not None else None
+    if bounds is None:
+        return model.get_q_bounds(half_twists, prefer_left)
+
+    min_bounds, max_bounds = bounds
+    return [{"min": min_bounds[i], "max": max_bounds[i]} for i in range(len(min_bounds))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the q bounds of the acrobatics")
+    parser.add_argument("directory", help=f"The directory of the table, to be given in {BOUNDS_TABLE_ENV}")
+    parser.add_argument("--max-somersaults", type=int, default=5)
+    parser.add_argument(
+        "--max-half-twists", type=int, default=3, help="The maximum number of half twists per somersault"
+    )
+    args = parser.parse_args()
+
+    QBoundsTable.build(args.directory, args.max_somersaults, args.max_half_twists)
@@ -1,9 +1,11 @@
+from functools import partial
+from typing import Callable
+
 import numpy as np
 
 from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.straight_acrobatics_variables import (
     StraightAcrobaticsVariables,
 )
-from bioptim_gui_api.utils.format_utils import invert_min_max
 from bioptim_gui_api.variables.misc.variables_utils import define_loose_bounds, LooseValue
 
 
@@ -353,23 +355,13 @@ class PikeAcrobaticsVariables(StraightAcrobaticsVariables):
         define_loose_bounds(x_bounds[-1], cls.YrotUpperLegs, 2, LooseValue(0.0, 0.1))
 
     @classmethod
-    def get_q_bounds(cls, half_twists: list, prefer_left: bool) -> dict:
+    def _q_bounds_phases(cls, half_twists: list) -> list[Callable[[list], None]]:
         nb_somersaults = len(half_twists)
-        is_forward = sum(half_twists) % 2 != 0
-        x_bounds = []
-
-        def add_phase_bounds():
-            x_bounds.append(
-                {
-                    "min": cls.q_min_bounds.copy(),
-                    "max": cls.q_max_bounds.copy(),
-                }
-            )
+        phases = []
 
         # twist start
         if half_twists[0] > 0:
-            add_phase_bounds()
-            cls._fill_init_phase(x_bounds, half_twists)
+            phases.append(partial(cls._fill_init_phase, half_twists=half_twists))
 
         last_have_twist = True
         next_have_twist = half_twists[1] > 0
@@ -377,38 +369,29 @@ class PikeAcrobaticsVariables(StraightAcrobaticsVariables):
             is_last_somersault = i == nb_somersaults - 1
             # piking
             if last_have_twist:
-                add_phase_bounds()
-                cls._fill_position_phase(x_bounds, i, half_twists)
+                phases.append(partial(cls._fill_position_phase, i=i, half_twists=half_twists))
 
             if is_last_somersault or next_have_twist:
                 # somersaulting in pike
-                add_phase_bounds()
-                cls._fill_somersault_phase(x_bounds, i, half_twists)
+                phases.append(partial(cls._fill_somersault_phase, phase=i, half_twists=half_twists))
 
                 # kick out
-                add_phase_bounds()
-                cls._fill_kickout_phase(x_bounds, i, half_twists)
+                phases.append(partial(cls._fill_kickout_phase, i=i, half_twists=half_twists))
 
             # twisting
             if next_have_twist:
-                add_phase_bounds()
-                cls._fill_twist_phase(x_bounds, i, half_twists, is_last_somersault)
+                phases.append(
+                    partial(cls._fill_twist_phase, i=i, half_twists=half_twists, is_last_somersault=is_last_somersault)
+                )
 
             last_have_twist = next_have_twist
             next_have_twist = is_last_somersault or half_twists[i + 1] > 0
 
         # waiting phase
         if half_twists[-1] == 0:
-            add_phase_bounds()
-            cls._fill_waiting_phase(x_bounds, nb_somersaults)
+            phases.append(partial(cls._fill_waiting_phase, nb_somersaults=nb_somersaults))
 
         # landing
-        add_phase_bounds()
-        cls._fill_landing_phase(x_bounds, half_twists)
-
-        if not is_forward:
-            invert_min_max(x_bounds, cls.Xrot)
-        if not prefer_left:
-            invert_min_max(x_bounds, cls.Zrot)
+        phases.append(partial(cls._fill_landing_phase, half_twists=half_twists))
 
-        return x_bounds
+        return phases
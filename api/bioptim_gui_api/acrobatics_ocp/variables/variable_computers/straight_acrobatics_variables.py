@@ -1,7 +1,10 @@
+from functools import partial
+from typing import Callable
+
 import numpy as np
 
 from bioptim_gui_api.acrobatics_ocp.variables.utils import maximum_fig_arms_angle
-from bioptim_gui_api.utils.format_utils import invert_min_max
+from bioptim_gui_api.utils.format_utils import invert_min_max_array
 from bioptim_gui_api.variables.misc.variables_utils import define_loose_bounds, LooseValue
 
 
@@ -81,6 +84,11 @@ class StraightAcrobaticsVariables:
         ]
     )
 
+    # bounds of the start of the first phase and of the end of the landing phase that only depend on the dofs of the
+    # model (e.g. the head and eyes of the visual criteria), {dof attribute name: value +- looseness}
+    first_node_q_bounds: dict[str, LooseValue] = {}
+    last_node_q_bounds: dict[str, LooseValue] = {}
+
     @classmethod
     def _fill_init_phase(cls, x_bounds: np.ndarray) -> None:
         x_bounds[0]["min"][:, 0] = [0] * cls.nb_q
@@ -171,62 +179,118 @@ class StraightAcrobaticsVariables:
         define_loose_bounds(x_bounds[-1], cls.ZrotLeftUpperArm, 2, LooseValue(0.0, 0.1))
 
     @classmethod
-    def get_q_bounds(cls, half_twists: list, prefer_left: bool) -> dict:
+    def _q_bounds_phases(cls, half_twists: list) -> list[Callable[[list], None]]:
+        """
+        The functions filling the bounds of each phase, in order. Each function is called with the bounds of the
+        phases up to the one it fills (included), the bounds of the following phases are not filled yet.
+
+        Parameters
+        ----------
+        half_twists: list
+            The number of half twists of each somersault
+
+        Returns
+        -------
+        list[Callable[[list], None]]
+            One function per phase
+        """
         nb_somersaults = len(half_twists)
-        is_forward = sum(half_twists) % 2 != 0
-        x_bounds = [
-            {
-                "min": cls.q_min_bounds.copy(),
-                "max": cls.q_max_bounds.copy(),
-            }
-            for _ in range(nb_somersaults + 1)  # + 1 for landing
-        ]
 
-        cls._fill_init_phase(x_bounds)
+        def fill_first_phase(x_bounds: list) -> None:
+            cls._fill_init_phase(x_bounds)
+            cls._fill_somersault_phase(x_bounds, 0, half_twists)
+
+        return (
+            [fill_first_phase]
+            + [
+                partial(cls._fill_somersault_phase, phase=phase, half_twists=half_twists)
+                for phase in range(1, nb_somersaults)
+            ]
+            + [partial(cls._fill_landing_phase, half_twists=half_twists)]
+        )
 
-        for phase in range(nb_somersaults):
-            cls._fill_somersault_phase(x_bounds, phase, half_twists)
+    @classmethod
+    def _fill_node_q_bounds(
+        cls, min_bounds: np.ndarray, max_bounds: np.ndarray, phase: int, node: int, loose_values: dict[str, LooseValue]
+    ) -> None:
+        if not loose_values:
+            return
+        dofs = [getattr(cls, name) for name in loose_values]
+        values = np.array([loose_value.value for loose_value in loose_values.values()])
+        looseness = np.array([loose_value.looseness for loose_value in loose_values.values()])
+        min_bounds[phase, dofs, node] = values - looseness
+        max_bounds[phase, dofs, node] = values + looseness
 
-        cls._fill_landing_phase(x_bounds, half_twists)
+    @classmethod
+    def get_q_bounds_array(cls, half_twists: list, prefer_left: bool) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the bounds of q of all the phases at once
+
+        Parameters
+        ----------
+        half_twists: list
+            The number of half twists of each somersault
+        prefer_left: bool
+            If the twists are done to the left
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The min and max bounds, of shape (nb_phases, nb_q, 3)
+        """
+        is_forward = sum(half_twists) % 2 != 0
+        phases = cls._q_bounds_phases(half_twists)
+        nb_phases = len(phases)
+
+        min_bounds = np.tile(cls.q_min_bounds.astype(float), (nb_phases, 1, 1))
+        max_bounds = np.tile(cls.q_max_bounds.astype(float), (nb_phases, 1, 1))
+        # the bounds of each phase are views on the arrays, filled by the functions of the phases
+        x_bounds = [{"min": min_bounds[i], "max": max_bounds[i]} for i in range(nb_phases)]
+        for i, fill_phase in enumerate(phases):
+            fill_phase(x_bounds[: i + 1])
+
+        cls._fill_node_q_bounds(min_bounds, max_bounds, 0, 0, cls.first_node_q_bounds)
+        cls._fill_node_q_bounds(min_bounds, max_bounds, -1, 2, cls.last_node_q_bounds)
 
         if not is_forward:
-            invert_min_max(x_bounds, cls.Xrot)
+            invert_min_max_array(min_bounds, max_bounds, cls.Xrot)
         if not prefer_left:
-            invert_min_max(x_bounds, cls.Zrot)
+            invert_min_max_array(min_bounds, max_bounds, cls.Zrot)
+
+        return min_bounds, max_bounds
 
-        return x_bounds
+    @classmethod
+    def get_q_bounds(cls, half_twists: list, prefer_left: bool) -> list[dict[str, np.ndarray]]:
+        min_bounds, max_bounds = cls.get_q_bounds_array(half_twists, prefer_left)
+        return [{"min": min_bounds[i], "max": max_bounds[i]} for i in range(len(min_bounds))]
 
     @classmethod
     def get_q_init(cls, half_twists: list = [], prefer_left: bool = True, q_bounds: np.ndarray = None) -> list:
         x_bounds = q_bounds or cls.get_q_bounds(half_twists, prefer_left)
-        nb_phases = len(x_bounds)
-
-        x_inits = np.zeros((nb_phases, 2, cls.nb_q))
+        min_bounds = np.array([bounds["min"] for bounds in x_bounds])
+        max_bounds = np.array([bounds["max"] for bounds in x_bounds])
 
-        for phase in range(nb_phases):
-            x_inits[phase, 0] = (x_bounds[phase]["min"][:, 0] + x_bounds[phase]["max"][:, 0]) / 2
-            x_inits[phase, 1] = (x_bounds[phase]["min"][:, 2] + x_bounds[phase]["max"][:, 2]) / 2
-
-        return x_inits
+        # mean of the start and end bounds, shape (nb_phases, 2, nb_q)
+        return ((min_bounds[:, :, [0, 2]] + max_bounds[:, :, [0, 2]]) / 2).transpose(0, 2, 1)
 
     @classmethod
-    def _fill_qdot_initial(cls, x_bounds: np.ndarray, final_time: float) -> None:
+    def _fill_qdot_initial(cls, min_bounds: np.ndarray, max_bounds: np.ndarray, final_time: float) -> None:
         vzinit = 9.81 / 2 * final_time  # initial Z velocity to land at final_time
 
-        x_bounds[0]["min"][:, 0] = [0] * cls.nb_qdot
-        x_bounds[0]["max"][:, 0] = [0] * cls.nb_qdot
+        min_bounds[0, :, 0] = 0
+        max_bounds[0, :, 0] = 0
 
-        x_bounds[0]["min"][: cls.Z, 0] = -0.5
-        x_bounds[0]["max"][: cls.Z, 0] = 0.5
+        min_bounds[0, : cls.Z, 0] = -0.5
+        max_bounds[0, : cls.Z, 0] = 0.5
 
-        x_bounds[0]["min"][cls.Z, 0] = vzinit - 5
-        x_bounds[0]["max"][cls.Z, 0] = vzinit + 5
+        min_bounds[0, cls.Z, 0] = vzinit - 5
+        max_bounds[0, cls.Z, 0] = vzinit + 5
 
-        x_bounds[0]["min"][cls.Xrot, 0] = 0.5
-        x_bounds[0]["max"][cls.Xrot, 0] = 50.0
+        min_bounds[0, cls.Xrot, 0] = 0.5
+        max_bounds[0, cls.Xrot, 0] = 50.0
 
     @classmethod
-    def _fill_qdot_intermediary(cls, x_bounds: np.ndarray, final_time: float) -> None:
+    def _fill_qdot_intermediary(cls, min_bounds: np.ndarray, max_bounds: np.ndarray, final_time: float) -> None:
         """
         vzinit = -g / 2 * final_time
         vz(t) = -gt + vzinit
@@ -238,44 +302,36 @@ class StraightAcrobaticsVariables:
         """
         vzinit = 9.81 / 2 * final_time
 
-        nb_phases = len(x_bounds)
-        for phase in range(nb_phases):
-            if phase != 0:
-                # initial bounds, same as final bounds of previous phase
-                x_bounds[phase]["min"][:, 0] = x_bounds[phase - 1]["min"][:, 2]
-                x_bounds[phase]["max"][:, 0] = x_bounds[phase - 1]["max"][:, 2]
+        min_bounds[:, :, 1:] = -100
+        max_bounds[:, :, 1:] = 100
 
-            x_bounds[phase]["min"][:, 1:] = -100
-            x_bounds[phase]["max"][:, 1:] = 100
+        min_bounds[:, : cls.Z, 1:] = -10
+        max_bounds[:, : cls.Z, 1:] = 10
 
-            x_bounds[phase]["min"][: cls.Z, 1:] = -10
-            x_bounds[phase]["max"][: cls.Z, 1:] = 10
+        min_bounds[:, cls.Z, 1:] = -vzinit - 10
+        max_bounds[:, cls.Z, 1:] = vzinit + 10
 
-            x_bounds[phase]["min"][cls.Z, 1:] = -vzinit - 10
-            x_bounds[phase]["max"][cls.Z, 1:] = vzinit + 10
+        min_bounds[:, cls.Xrot, 1:] = 0.5
+        max_bounds[:, cls.Xrot, 1:] = 50.0
 
-            x_bounds[phase]["min"][cls.Xrot, 1:] = 0.5
-            x_bounds[phase]["max"][cls.Xrot, 1:] = 50.0
+        # initial bounds, same as final bounds of previous phase
+        min_bounds[1:, :, 0] = min_bounds[:-1, :, 2]
+        max_bounds[1:, :, 0] = max_bounds[:-1, :, 2]
 
     @classmethod
-    def get_qdot_bounds(cls, nb_phases: int, final_time: float, is_forward: bool) -> dict:
-        x_bounds = [
-            {
-                "min": np.zeros((cls.nb_qdot, 3)) + cls.qdot_min,
-                "max": np.zeros((cls.nb_qdot, 3)) + cls.qdot_max,
-            }
-            for _ in range(nb_phases)
-        ]
+    def get_qdot_bounds(cls, nb_phases: int, final_time: float, is_forward: bool) -> list[dict[str, np.ndarray]]:
+        min_bounds = np.full((nb_phases, cls.nb_qdot, 3), cls.qdot_min)
+        max_bounds = np.full((nb_phases, cls.nb_qdot, 3), cls.qdot_max)
 
         # Initial bounds
-        cls._fill_qdot_initial(x_bounds, final_time)
+        cls._fill_qdot_initial(min_bounds, max_bounds, final_time)
 
-        cls._fill_qdot_intermediary(x_bounds, final_time)
+        cls._fill_qdot_intermediary(min_bounds, max_bounds, final_time)
 
         if not is_forward:
-            invert_min_max(x_bounds, cls.Xrot)
+            invert_min_max_array(min_bounds, max_bounds, cls.Xrot)
 
-        return x_bounds
+        return [{"min": min_bounds[i], "max": max_bounds[i]} for i in range(nb_phases)]
 
     @classmethod
     def get_qdot_init(
@@ -309,22 +365,16 @@ class StraightAcrobaticsVariables:
         qdot_init = np.zeros((nb_phases, cls.nb_qdot, 1))
 
         qdot_init[:, cls.Xrot] = 2.5 * np.pi * nb_somersaults * forward_factor
-
-        for phase in range(nb_phases):
-            qdot_init[phase][cls.Z] = vzinit
+        qdot_init[:, cls.Z] = vzinit
 
         return qdot_init
 
     @classmethod
     def get_tau_bounds(cls, nb_phases: int) -> list[dict[str, np.ndarray]]:
-        return [
-            {
-                "min": np.zeros((cls.nb_tau, 1)) + cls.tau_min,
-                "max": np.zeros((cls.nb_tau, 1)) + cls.tau_max,
-            }
-            for _ in range(nb_phases)
-        ]
+        min_bounds = np.full((nb_phases, cls.nb_tau, 1), cls.tau_min)
+        max_bounds = np.full((nb_phases, cls.nb_tau, 1), cls.tau_max)
+        return [{"min": min_bounds[i], "max": max_bounds[i]} for i in range(nb_phases)]
 
     @classmethod
     def get_tau_init(cls, nb_phases: int) -> np.ndarray:
-        return np.zeros((nb_phases, cls.nb_tau, 1)) + cls.tau_init
+        return np.full((nb_phases, cls.nb_tau, 1), cls.tau_init)
@@ -116,9 +116,8 @@ class TuckAcrobaticsVariables(PikeAcrobaticsVariables):
     )
 
     @classmethod
-    def get_q_bounds(cls, half_twists: list, prefer_left: bool) -> dict:
-        x_bounds = super().get_q_bounds(half_twists, prefer_left)
-        nb_phases = len(x_bounds)
+    def get_q_bounds_array(cls, half_twists: list, prefer_left: bool) -> tuple[np.ndarray, np.ndarray]:
+        min_bounds, max_bounds = super().get_q_bounds_array(half_twists, prefer_left)
 
         # the number of tuck is at least 1, every twists that are not the
         # first phase or last phase before landing have a tuck phase
@@ -132,27 +131,25 @@ class TuckAcrobaticsVariables(PikeAcrobaticsVariables):
         if half_twists[0] > 0:
             tuck_phase_idx += 1
 
-        for i in range(nb_phases):
-            x_bounds[i]["min"][cls.XrotLowerLegs, :] = -0.15
-            x_bounds[i]["max"][cls.XrotLowerLegs, :] = 0.15
-
-        for idx in tuck_phase_idx:
-            # tucking
-            x_bounds[idx]["min"][cls.XrotLowerLegs, 0] = -0.2
-            x_bounds[idx]["max"][cls.XrotLowerLegs, 0] = 0.2
-            x_bounds[idx]["min"][cls.XrotLowerLegs, 1] = -0.2
-            x_bounds[idx]["max"][cls.XrotLowerLegs, 1] = 2.4 + 0.2
-            x_bounds[idx]["min"][cls.XrotLowerLegs, 2] = 2.4 - 0.2
-            x_bounds[idx]["max"][cls.XrotLowerLegs, 2] = 2.4 + 0.2
-
-            # somersaulting in tuck
-            x_bounds[idx + 1]["min"][cls.XrotLowerLegs, :] = 2.4 - 0.2
-            x_bounds[idx + 1]["max"][cls.XrotLowerLegs, :] = 2.4 + 0.2
-
-            # kick out
-            x_bounds[idx + 2]["min"][cls.XrotLowerLegs, 0] = 2.4 - 0.21
-            x_bounds[idx + 2]["max"][cls.XrotLowerLegs, 0] = 2.4 + 0.21
-            x_bounds[idx + 2]["min"][cls.XrotLowerLegs, 1] = -0.21
-            x_bounds[idx + 2]["max"][cls.XrotLowerLegs, 1] = 2.4 + 0.21
-
-        return x_bounds
+        min_bounds[:, cls.XrotLowerLegs, :] = -0.15
+        max_bounds[:, cls.XrotLowerLegs, :] = 0.15
+
+        # tucking
+        min_bounds[tuck_phase_idx, cls.XrotLowerLegs, 0] = -0.2
+        max_bounds[tuck_phase_idx, cls.XrotLowerLegs, 0] = 0.2
+        min_bounds[tuck_phase_idx, cls.XrotLowerLegs, 1] = -0.2
+        max_bounds[tuck_phase_idx, cls.XrotLowerLegs, 1] = 2.4 + 0.2
+        min_bounds[tuck_phase_idx, cls.XrotLowerLegs, 2] = 2.4 - 0.2
+        max_bounds[tuck_phase_idx, cls.XrotLowerLegs, 2] = 2.4 + 0.2
+
+        # somersaulting in tuck
+        min_bounds[tuck_phase_idx + 1, cls.XrotLowerLegs, :] = 2.4 - 0.2
+        max_bounds[tuck_phase_idx + 1, cls.XrotLowerLegs, :] = 2.4 + 0.2
+
+        # kick out
+        min_bounds[tuck_phase_idx + 2, cls.XrotLowerLegs, 0] = 2.4 - 0.21
+        max_bounds[tuck_phase_idx + 2, cls.XrotLowerLegs, 0] = 2.4 + 0.21
+        min_bounds[tuck_phase_idx + 2, cls.XrotLowerLegs, 1] = -0.21
+        max_bounds[tuck_phase_idx + 2, cls.XrotLowerLegs, 1] = 2.4 + 0.21
+
+        return min_bounds, max_bounds
@@ -3,6 +3,7 @@ import numpy as np
 from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.tuck_acrobatics_variables import (
     TuckAcrobaticsVariables,
 )
+from bioptim_gui_api.variables.misc.variables_utils import LooseValue
 
 
 class TuckAcrobaticsVariablesWithSpine(TuckAcrobaticsVariables):
@@ -163,9 +164,20 @@ class TuckAcrobaticsVariablesWithSpine(TuckAcrobaticsVariables):
         ]
     )
 
-    @classmethod
-    def _fill_landing_phase(cls, x_bounds, half_twists: list) -> dict:
-        super()._fill_landing_phase(x_bounds, half_twists)
-
-        x_bounds[-1]["min"][cls.XrotStomach : cls.ZrotShoulder, 2] = -0.01
-        x_bounds[-1]["max"][cls.XrotStomach : cls.ZrotShoulder, 2] = 0.01
+    # spine straight at landing
+    last_node_q_bounds = {
+        dof: LooseValue(0.0, 0.01)
+        for dof in (
+            "XrotStomach",
+            "YrotStomach",
+            "ZrotStomach",
+            "XrotRib",
+            "YrotRib",
+            "ZrotRib",
+            "XrotNipple",
+            "YrotNipple",
+            "ZrotNipple",
+            "XrotShoulder",
+            "YrotShoulder",
+        )
+    }
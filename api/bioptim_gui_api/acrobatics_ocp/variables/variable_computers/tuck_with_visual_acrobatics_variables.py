@@ -3,6 +3,7 @@ import numpy as np
 from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.tuck_acrobatics_variables import (
     TuckAcrobaticsVariables,
 )
+from bioptim_gui_api.variables.misc.variables_utils import LooseValue
 
 
 class TuckAcrobaticsWithVisualVariables(TuckAcrobaticsVariables):
@@ -131,15 +132,10 @@ class TuckAcrobaticsWithVisualVariables(TuckAcrobaticsVariables):
         ]
     )
 
-    @classmethod
-    def get_q_bounds(cls, half_twists: list, prefer_left: bool) -> dict:
-        bounds = super().get_q_bounds(half_twists, prefer_left)
-        bounds[0]["min"][cls.ZrotHead, 0] = -0.1
-        bounds[0]["max"][cls.ZrotHead, 0] = 0.1
-        bounds[0]["min"][cls.XrotHead, 0] = -0.1
-        bounds[0]["max"][cls.XrotHead, 0] = 0.1
-        bounds[0]["min"][cls.ZrotEyes, 0] = -0.1
-        bounds[0]["max"][cls.ZrotEyes, 0] = 0.1
-        bounds[0]["min"][cls.XrotEyes, 0] = np.pi / 8 - 0.1
-        bounds[0]["max"][cls.XrotEyes, 0] = np.pi / 8 + 0.1
-        return bounds
+    # head straight and eyes looking slightly down at the start
+    first_node_q_bounds = {
+        "ZrotHead": LooseValue(0.0, 0.1),
+        "XrotHead": LooseValue(0.0, 0.1),
+        "ZrotEyes": LooseValue(0.0, 0.1),
+        "XrotEyes": LooseValue(np.pi / 8, 0.1),
+    }
@@ -1,5 +1,8 @@
+from typing import Iterator
+
 from bioptim_gui_api.acrobatics_ocp.variables.utils import BioptimVariable, var_bounds_list, var_initial_guess_list
 from bioptim_gui_api.utils.format_utils import format_2d_array
+from bioptim_gui_api.utils.section_cache import cached_section
 
 
 class BoundsGeneration:
@@ -19,6 +22,71 @@ class BoundsGeneration:
     u_initial_guesses = InitialGuessList()
 """
 
+    @classmethod
+    @cached_section
+    def add_bounds(cls, bounds_list: str, variable: str, phase: int, bounds: dict) -> str:
+        """
+        The addition of the bounds of a variable of a phase, cached as formatting the bounds is the longest part of
+        the generation
+
+        Parameters
+        ----------
+        bounds_list: str
+            The name of the BoundsList in the generated code ("x_bounds" or "u_bounds")
+        variable: str
+            The name of the variable (e.g. "q")
+        phase: int
+            The index of the phase
+        bounds: dict
+            The bounds of the phase, as returned by var_bounds_list
+
+        Returns
+        -------
+        str
+            The generated code
+        """
+        return f"""
+    {bounds_list}.add(
+        "{variable}",
+        min_bound={format_2d_array(bounds["min"])},
+        max_bound={format_2d_array(bounds["max"])},
+        interpolation=InterpolationType.{bounds["interpolation_type"]},
+        phase={phase},
+    )
+"""
+
+    @classmethod
+    @cached_section
+    def add_initial_guess(cls, initial_guesses_list: str, variable: str, phase: int, initial_guess: dict) -> str:
+        """
+        The addition of the initial guess of a variable of a phase, cached as formatting the initial guess is the
+        longest part of the generation
+
+        Parameters
+        ----------
+        initial_guesses_list: str
+            The name of the InitialGuessList in the generated code ("x_initial_guesses" or "u_initial_guesses")
+        variable: str
+            The name of the variable (e.g. "q")
+        phase: int
+            The index of the phase
+        initial_guess: dict
+            The initial guess of the phase, as returned by var_initial_guess_list
+
+        Returns
+        -------
+        str
+            The generated code
+        """
+        return f"""
+    {initial_guesses_list}.add(
+        "{variable}",
+        initial_guess={format_2d_array(initial_guess["initial_guess"])},
+        interpolation=InterpolationType.{initial_guess["interpolation_type"]},
+        phase={phase},
+    )
+"""
+
     @classmethod
     def state_bounds(cls, data: dict) -> str:
         phases = data["phases_info"]
@@ -30,15 +98,7 @@ class BoundsGeneration:
             bounds = var_bounds_list(data, state_variable, BioptimVariable.STATE_VARIABLE)
             nb_phases = len(phases)
             for i in range(nb_phases):
-                ret += f"""
-    x_bounds.add(
-        "{state_variable}",
-        min_bound={format_2d_array(bounds[i]["min"])},
-        max_bound={format_2d_array(bounds[i]["max"])},
-        interpolation=InterpolationType.{bounds[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+                ret += cls.add_bounds("x_bounds", state_variable, i, bounds[i])
         return ret
 
     @classmethod
@@ -52,15 +112,7 @@ class BoundsGeneration:
             bounds = var_bounds_list(data, control_variable, BioptimVariable.CONTROL_VARIABLE)
             nb_phases = len(phases)
             for i in range(nb_phases):
-                ret += f"""
-    u_bounds.add(
-        "{control_variable}",
-        min_bound={format_2d_array(bounds[i]["min"])},
-        max_bound={format_2d_array(bounds[i]["max"])},
-        interpolation=InterpolationType.{bounds[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+                ret += cls.add_bounds("u_bounds", control_variable, i, bounds[i])
         return ret
 
     @classmethod
@@ -74,14 +126,7 @@ class BoundsGeneration:
             init_guess = var_initial_guess_list(data, state_variable, BioptimVariable.STATE_VARIABLE)
             nb_phases = len(phases)
             for i in range(nb_phases):
-                ret += f"""
-    x_initial_guesses.add(
-        "{state_variable}",
-        initial_guess={format_2d_array(init_guess[i]["initial_guess"])},
-        interpolation=InterpolationType.{init_guess[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+                ret += cls.add_initial_guess("x_initial_guesses", state_variable, i, init_guess[i])
         return ret
 
     @classmethod
@@ -95,21 +140,17 @@ class BoundsGeneration:
             init_guess = var_initial_guess_list(data, control_variable, BioptimVariable.CONTROL_VARIABLE)
             nb_phases = len(phases)
             for i in range(nb_phases):
-                ret += f"""
-    u_initial_guesses.add(
-        "{control_variable}",
-        initial_guess={format_2d_array(init_guess[i]["initial_guess"])},
-        interpolation=InterpolationType.{init_guess[i]["interpolation_type"]},
-        phase={i},
-    )
-"""
+                ret += cls.add_initial_guess("u_initial_guesses", control_variable, i, init_guess[i])
         return ret
 
+    @classmethod
+    def bounds_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.declare_bounds()
+        yield cls.state_bounds(data)
+        yield cls.control_bounds(data)
+        yield cls.state_init_guess(data)
+        yield cls.control_init_guess(data)
+
     @classmethod
     def bounds(cls, data: dict) -> str:
-        ret = cls.declare_bounds()
-        ret += cls.state_bounds(data)
-        ret += cls.control_bounds(data)
-        ret += cls.state_init_guess(data)
-        ret += cls.control_init_guess(data)
-        return ret
+        return "".join(cls.bounds_chunks(data))
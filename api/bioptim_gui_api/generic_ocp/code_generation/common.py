@@ -1,3 +1,6 @@
+from typing import Iterator
+
+
 class CommonGeneration:
     """
     This class contains the common code for the generation, including multistart, save, main, ...
@@ -6,28 +9,67 @@ class CommonGeneration:
     @classmethod
     def main_function(cls, data: dict) -> str:
         return f"""
-def main():
+def main(n_threads: int = 1):
     \"""
     If this file is run, then it will perform the optimization
     \"""
 
     # --- Prepare the ocp --- #
-    ocp = prepare_ocp()
+    ocp = prepare_ocp(n_threads=n_threads)
 
     # --- Solve the ocp --- #
     sol = ocp.solve(solver=Solver.IPOPT())
     sol.animate()
+"""
+
+    @classmethod
+    def limit_threads(cls) -> str:
+        return """
+
+def limit_threads() -> None:
+    \"""
+    Cap the threads of the numerical libraries (OpenMP, BLAS, used e.g. by the linear solver of IPOPT) to the --threads
+    argument, if given. The libraries read the caps when they are loaded, so this is run before importing them.
+    The caps already set in the environment are kept.
+    \"""
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-t', '--threads', type=int)
+    n_threads = parser.parse_known_args()[0].threads
+    if n_threads:
+        for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ.setdefault(variable, str(n_threads))
+
+
+if __name__ == "__main__":
+    limit_threads()
+
 """
 
     @classmethod
     def name_eq_main(cls) -> str:
         return """
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        '-t',
+        '--threads',
+        type=int,
+        default=1,
+        help='Number of threads of the ocp (1 by default), also the cap of the numerical libraries (none by default)',
+    )
+
+    args = parser.parse_args()
+
+    main(args.threads)
 """
 
+    @classmethod
+    def generate_common_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.main_function(data)
+        yield cls.name_eq_main()
+
     @classmethod
     def generate_common(cls, data: dict) -> str:
-        ret = cls.main_function(data)
-        ret += cls.name_eq_main()
-        return ret
+        return "".join(cls.generate_common_chunks(data))
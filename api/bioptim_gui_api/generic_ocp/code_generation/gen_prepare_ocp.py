@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from bioptim_gui_api.generic_ocp.code_generation.bounds import BoundsGeneration
 from bioptim_gui_api.penalty.misc.constraint_printer import ConstraintPrinter
 from bioptim_gui_api.penalty.misc.objective_printer import ObjectivePrinter
@@ -13,7 +15,7 @@ class PrepareOCPGeneration:
     @classmethod
     def prepare_ocp_header(cls) -> str:
         return """
-def prepare_ocp()-> OptimalControlProgram:
+def prepare_ocp(n_threads: int = 1)-> OptimalControlProgram:
     \"""
     This function build an optimal control program and instantiate it.
     It can be seen as a factory for the OptimalControlProgram class.
@@ -98,16 +100,20 @@ def prepare_ocp()-> OptimalControlProgram:
         constraints=constraints,
         objective_functions=objective_functions,
         use_sx=True,
+        n_threads=n_threads,
     )
 """
         return ret
 
+    @classmethod
+    def prepare_ocp_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.prepare_ocp_header()
+        yield cls.generic_elements(data)
+        yield cls.penalties(data)
+        yield cls.dynamics_str(data)
+        yield from cls.bounds_generation.bounds_chunks(data)
+        yield cls.return_ocp()
+
     @classmethod
     def prepare_ocp(cls, data: dict) -> str:
-        ret = cls.prepare_ocp_header()
-        ret += cls.generic_elements(data)
-        ret += cls.penalties(data)
-        ret += cls.dynamics_str(data)
-        ret += cls.bounds_generation.bounds(data)
-        ret += cls.return_ocp()
-        return ret
+        return "".join(cls.prepare_ocp_chunks(data))
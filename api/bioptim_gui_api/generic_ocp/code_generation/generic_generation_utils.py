@@ -1,15 +1,33 @@
+from typing import Iterator
+
 from bioptim_gui_api.generic_ocp.code_generation.common import CommonGeneration
 from bioptim_gui_api.generic_ocp.code_generation.gen_prepare_ocp import PrepareOCPGeneration
 from bioptim_gui_api.generic_ocp.code_generation.imports import ImportGeneration
 
 
-def generic_generated_code(data: dict) -> str:
+def generic_generated_code_chunks(data: dict) -> Iterator[str]:
+    """
+    Generate the script of the generic ocp section by section (see generated_code_chunks of the acrobatics)
+
+    Parameters
+    ----------
+    data: dict
+        The data of the generic ocp
+
+    Returns
+    -------
+    Iterator[str]
+        The sections of the script, in order
+    """
     prepare_ocp_printer = PrepareOCPGeneration
     common_printer = CommonGeneration
     model_path = data["model_path"]
 
-    ret = ImportGeneration.generate_imports()
-    ret += f'BIOMODEL_PATH = "{model_path}"\n'
-    ret += prepare_ocp_printer.prepare_ocp(data)
-    ret += common_printer.generate_common(data)
-    return ret
+    yield ImportGeneration.generate_imports(common_printer.limit_threads())
+    yield f'BIOMODEL_PATH = "{model_path}"\n'
+    yield from prepare_ocp_printer.prepare_ocp_chunks(data)
+    yield from common_printer.generate_common_chunks(data)
+
+
+def generic_generated_code(data: dict) -> str:
+    return "".join(generic_generated_code_chunks(data))
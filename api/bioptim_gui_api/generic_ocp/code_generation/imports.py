@@ -4,18 +4,34 @@ class ImportGeneration:
     """
 
     @classmethod
-    def generate_imports(cls) -> str:
-        return """\"""This file was automatically generated using BioptimGUI version 0.0.1\"""
+    def generate_imports(cls, limit_threads: str = "") -> str:
+        """
+        The imports of the generated script
+
+        Parameters
+        ----------
+        limit_threads: str
+            The code capping the threads of the numerical libraries (see CommonGeneration.limit_threads), run before
+            importing them
+
+        Returns
+        -------
+        str
+            The code of the imports
+        """
+        return f"""\"""This file was automatically generated using BioptimGUI version 0.0.1\"""
 
 import argparse
-import biorbd
-import casadi as cas
+import hashlib
+import json
 import os
 from pathlib import Path
-import pickle as pkl
+import sqlite3
 import time
 import sys
-
+{limit_threads}
+import biorbd
+import casadi as cas
 import numpy as np
 from bioptim import (
     Axis,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_code_generation import (
     router as code_generation_router,
@@ -13,14 +14,23 @@ from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_phases_variables import (
     GenericStateVariableRouter,
 )
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_requests import (
+    BatchRequest,
+    ModelReferenceRequest,
     NbPhasesRequest,
 )
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_responses import (
+    BatchOperationResponse,
+    BatchResponse,
     ModelPathResponse,
+    ModelReferenceResponse,
+    SnapshotResponse,
 )
+from bioptim_gui_api.generic_ocp.misc.batch import dispatch_operation
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_utils import add_phase_info, remove_phase_info
+from bioptim_gui_api.model_registry.misc.model_registry import model_registry
 from bioptim_gui_api.penalty.endpoints.penalty import penalties_get_available_values
+from bioptim_gui_api.utils.static_response import add_static_route
 from bioptim_gui_api.variables.endpoints.variables import variables_get_available_values
 
 
@@ -34,9 +44,12 @@ class GenericOCPBaseFieldRegistrar:
 
         # register all endpoints
         self.register_get_ocp_data()
+        self.register_get_snapshot()
         self.register_get_available_values()
         self.register_update_nb_phases()
         self.register_put_model_path()
+        self.register_put_model()
+        self.register_post_batch()
 
     def register_get_ocp_data(self) -> None:
         @self.router.get("/", response_model=dict)
@@ -44,13 +57,24 @@ class GenericOCPBaseFieldRegistrar:
             data = self.data.read_data()
             return data
 
+    def register_get_snapshot(self) -> None:
+        @self.router.get("/snapshot", response_model=SnapshotResponse)
+        def get_snapshot():
+            """
+            The data with its revision, to which the json patches of the modifications can be applied
+            (see the X-OCP-Patch-From header)
+            """
+            revision, data = self.data.snapshot()
+            return SnapshotResponse(revision=revision, data=data)
+
     def register_get_available_values(self) -> None:
-        @self.router.get("/available_values", response_model=dict)
         def get_available_values():
             penalties_available_values = penalties_get_available_values()
             variables_available_values = variables_get_available_values()
             return penalties_available_values | variables_available_values
 
+        add_static_route(self.router, "/available_values", get_available_values, response_model=dict)
+
     def register_update_nb_phases(self) -> None:
         @self.router.put("/nb_phases", response_model=dict)
         def put_nb_phases(nb_phases: NbPhasesRequest):
@@ -69,15 +93,66 @@ class GenericOCPBaseFieldRegistrar:
             data = self.data.read_data()
             return data
 
+    def _set_model(self, model_path: str, reference: str) -> None:
+        data = self.data.read_data()
+        # data saved before the model registry existed contain the whole model
+        data.pop("model_content", None)
+        data["model_path"] = model_path
+        data["model_hash"] = reference
+        self.data.update_data(None, data)
+
     def register_put_model_path(self) -> None:
         @self.router.put("/model_path", response_model=ModelPathResponse)
         async def put_model_path(file: UploadFile):
             model_content = await file.read()
             model_content_str = model_content.decode("utf-8")
-            self.data.update_data("model_path", file.filename)
-            self.data.update_data("model_content", model_content_str)
+            reference = await run_in_threadpool(model_registry().put, model_content_str)
+            await run_in_threadpool(self._set_model, file.filename, reference)
             return ModelPathResponse(model_path=file.filename)
 
+    def register_put_model(self) -> None:
+        @self.router.put("/model", response_model=ModelReferenceResponse)
+        def put_model(model: ModelReferenceRequest):
+            """
+            Use a model already uploaded to the registry (POST /models), only its reference is kept in the data
+            """
+            if model.model_hash not in model_registry():
+                raise HTTPException(status_code=404, detail=f"No model {model.model_hash}, upload it to /models")
+
+            self._set_model(model.model_path, model.model_hash)
+            return ModelReferenceResponse(model_path=model.model_path, model_hash=model.model_hash)
+
+    def register_post_batch(self) -> None:
+        @self.router.post("/batch", response_model=BatchResponse)
+        async def post_batch(batch: BatchRequest):
+            """
+            Apply an ordered list of operations, each one being a request to another endpoint of this router
+            (e.g. {"method": "PUT", "path": "/phases_info/0/state_variables/0/max_bounds", "body": {...}})
+            The operations are all applied or none of them: if one fails, the data is restored and its error is
+            returned along with its index
+            """
+            batch_path = "/batch"
+            old_data = await run_in_threadpool(self.data.read_data)
+
+            results = []
+            try:
+                for index, operation in enumerate(batch.operations):
+                    if operation.path.rstrip("/") == batch_path:
+                        status_code, body = 400, "batch operations cannot be nested"
+                    else:
+                        status_code, body = await dispatch_operation(
+                            self.router, operation.method, operation.path, operation.body, operation.query
+                        )
+
+                    if status_code >= 400:
+                        raise HTTPException(status_code=status_code, detail={"operation_index": index, "detail": body})
+                    results.append(BatchOperationResponse(status_code=status_code, body=body))
+            except Exception:
+                await run_in_threadpool(self.data.update_data, None, old_data)
+                raise
+
+            return BatchResponse(results=results)
+
 
 router = APIRouter(
     prefix="/generic_ocp",
@@ -1,7 +1,12 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
-from bioptim_gui_api.generic_ocp.code_generation.generic_generation_utils import generic_generated_code
+from bioptim_gui_api.generic_ocp.code_generation.generic_generation_utils import (
+    generic_generated_code,
+    generic_generated_code_chunks,
+)
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
+from bioptim_gui_api.utils.json_stream import json_string_chunks
 
 router = APIRouter(
     responses={404: {"description": "Not found"}},
@@ -9,9 +14,16 @@ router = APIRouter(
 
 
 @router.get("/generate_code", response_model=str)
-def get_generic_ocp_generated_code():
+def get_generic_ocp_generated_code(stream: bool = False):
+    """
+    Generate the script of the ocp.
+    With stream=true, the same response is streamed while the script is generated.
+    """
     data = GenericOCPData.read_data()
 
+    if stream:
+        return StreamingResponse(json_string_chunks(generic_generated_code_chunks(data)), media_type="application/json")
+
     generated_code = generic_generated_code(data)
 
     return generated_code
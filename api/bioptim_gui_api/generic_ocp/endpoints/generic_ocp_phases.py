@@ -11,6 +11,7 @@ from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_responses import (
     DynamicsResponse,
 )
 from bioptim_gui_api.utils.format_utils import get_spaced_capitalized
+from bioptim_gui_api.utils.static_response import add_static_route
 from bioptim_gui_api.variables.misc.enums import Dynamics
 from bioptim_gui_api.variables.misc.variables_config import get_dynamics_decision_variables
 
@@ -79,10 +80,11 @@ class GenericPhaseRouter:
             return PhaseDurationResponse(duration=duration.duration)
 
     def register_get_phase_index_dynamics(self):
-        @self.router.get("/{phase_index}/dynamics", response_model=list)
         def get_dynamics_list():
             return get_spaced_capitalized(Dynamics)
 
+        add_static_route(self.router, "/{phase_index}/dynamics", get_dynamics_list, response_model=list)
+
     def register_put_phase_index_dynamics(self):
         @self.router.put("/{phase_index}/dynamics", response_model=DynamicsResponse)
         def put_dynamics_list(phase_index: int, dynamic_req: DynamicsRequest):
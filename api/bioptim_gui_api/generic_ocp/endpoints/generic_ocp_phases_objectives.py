@@ -1,4 +1,3 @@
-from bioptim import ObjectiveFcn
 from fastapi import APIRouter, HTTPException
 
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_penalties import GenericOCPPenaltyRouter
@@ -11,6 +10,7 @@ from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_responses import (
     WeightResponse,
 )
 from bioptim_gui_api.penalty.misc.penalty_config import DefaultPenaltyConfig
+from bioptim_gui_api.penalty.misc.penalty_signatures import penalty_signatures
 from bioptim_gui_api.penalty.misc.penalty_utils import obj_arguments
 
 
@@ -30,10 +30,6 @@ class GenericOCPObjectiveRouter(GenericOCPPenaltyRouter):
     def register_put_penalty_type(self):
         @self.router.put("/{phase_index}/objectives/{objective_index}/penalty_type", response_model=dict)
         def put_objective_penalty_type(phase_index: int, objective_index: int, penalty_type: ObjectiveFcnRequest):
-            objective_fcn = {
-                "mayer": ObjectiveFcn.Mayer,
-                "lagrange": ObjectiveFcn.Lagrange,
-            }
             complementary = {
                 "mayer": "lagrange",
                 "lagrange": "mayer",
@@ -52,9 +48,7 @@ class GenericOCPObjectiveRouter(GenericOCPPenaltyRouter):
             else:
                 penalty_type_value = DefaultPenaltyConfig.max_to_original_dict[penalty_type_value]
 
-            try:
-                getattr(objective_fcn[objective_type], penalty_type_value)
-            except AttributeError:
+            if penalty_type_value not in penalty_signatures()[objective_type]:
                 objective["objective_type"] = complementary[objective["objective_type"]]
                 objective_type = objective["objective_type"]
 
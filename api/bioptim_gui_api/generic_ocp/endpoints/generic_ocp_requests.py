@@ -1,8 +1,8 @@
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
-from bioptim import QuadratureRule, Node
 from pydantic import BaseModel
 
+from bioptim_gui_api.penalty.misc.bioptim_enums import QuadratureRule, Node
 from bioptim_gui_api.penalty.misc.enums import ObjectiveType
 from bioptim_gui_api.variables.misc.enums import Dynamics, InterpolationType
 
@@ -11,6 +11,11 @@ class NbPhasesRequest(BaseModel):
     nb_phases: int
 
 
+class ModelReferenceRequest(BaseModel):
+    model_path: str
+    model_hash: str
+
+
 class NbShootingPointsRequest(BaseModel):
     nb_shooting_points: int
 
@@ -92,3 +97,14 @@ class DimensionRequest(BaseModel):
 class ArgumentRequest(BaseModel):
     type: str
     value: Union[float | int | str | list | None]
+
+
+class BatchOperationRequest(BaseModel):
+    method: str
+    path: str
+    body: Any = None
+    query: dict = {}
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperationRequest]
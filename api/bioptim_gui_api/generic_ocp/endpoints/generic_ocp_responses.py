@@ -1,11 +1,11 @@
-from typing import Union
+from typing import Any, Union
 
-from bioptim import Axis
 from pydantic import BaseModel
 
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_requests import (
     ConstraintFcnRequest,
     ExpandRequest,
+    ModelReferenceRequest,
     DerivativeRequest,
     IntegrationRuleRequest,
     MultiThreadRequest,
@@ -21,6 +21,7 @@ from bioptim_gui_api.generic_ocp.endpoints.generic_ocp_requests import (
     WeightRequest,
     DynamicsRequest,
 )
+from bioptim_gui_api.penalty.misc.bioptim_enums import Axis
 
 
 class NbPhasesResponse(NbPhasesRequest):
@@ -31,6 +32,24 @@ class ModelPathResponse(BaseModel):
     model_path: str
 
 
+class ModelReferenceResponse(ModelReferenceRequest):
+    pass
+
+
+class SnapshotResponse(BaseModel):
+    revision: int
+    data: dict
+
+
+class BatchOperationResponse(BaseModel):
+    status_code: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    results: list[BatchOperationResponse]
+
+
 class NbShootingPointsResponse(NbShootingPointsRequest):
     pass
 
@@ -0,0 +1,77 @@
+import json
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+
+
+async def dispatch_operation(
+    router: APIRouter, method: str, path: str, body=None, query: dict = None
+) -> tuple[int, object]:
+    """
+    Call an endpoint of the router in-process, as if it was requested by the client
+
+    Parameters
+    ----------
+    router: APIRouter
+        The router containing the endpoint
+    method: str
+        The http method of the endpoint (e.g. "PUT")
+    path: str
+        The path of the endpoint relative to the prefix of the router (e.g. "/phases_info/0/duration")
+    body: Any
+        The json body of the request, no body if None
+    query: dict
+        The query parameters of the request
+
+    Returns
+    -------
+    tuple[int, Any]
+        The status code and the (json decoded) body of the response
+    """
+    path = router.prefix + path
+    content = b"" if body is None else json.dumps(body).encode("utf-8")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": "",
+        "query_string": urlencode(query or {}, doseq=True).encode("latin-1"),
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(content)).encode("latin-1")),
+        ],
+        "client": None,
+        "server": None,
+    }
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": content, "more_body": False}
+
+    status_code = 500
+    response_body = b""
+
+    async def send(message) -> None:
+        nonlocal status_code, response_body
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            response_body += message.get("body", b"")
+
+    # the endpoints exceptions are not converted to responses by the router, only by the app
+    try:
+        await router(scope, receive, send)
+    except HTTPException as e:
+        return e.status_code, e.detail
+    except RequestValidationError as e:
+        return 422, jsonable_encoder(e.errors())
+
+    try:
+        return status_code, json.loads(response_body) if response_body else None
+    except ValueError:
+        return status_code, response_body.decode("utf-8")
@@ -1,11 +1,18 @@
 import copy
-import json
 
+from bioptim_gui_api.generic_ocp.misc.ocp_store import InMemoryStore, JsonFileStore
+from bioptim_gui_api.generic_ocp.misc.workspaces import workspace_document
 from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
 
 
 class GenericOCPData:
+    """
+    The data of the ocp being edited, one document per workspace (see workspaces.py).
+    The document of a workspace is created from the base data the first time the workspace is used.
+    """
+
     datafile = "generic_ocp_data.json"
+    store = InMemoryStore(persistence=JsonFileStore(), max_documents=64, idle_timeout=15 * 60, history_size=32)
 
     default_phase_info = {
         "nb_shooting_points": 24,
@@ -20,13 +27,14 @@ class GenericOCPData:
     base_data = {
         "nb_phases": 1,
         "model_path": "",
+        "model_hash": "",
         "phases_info": [copy.deepcopy(default_phase_info)],
     }
 
     @classmethod
     def read_data(cls, key: str = None):
         """
-        Read the data of the ocp store in a json file
+        Read the data of the ocp from the store
 
         Parameters
         ----------
@@ -37,14 +45,16 @@ class GenericOCPData:
         -------
         The data or the value of the key, the whole data if key is None
         """
-        with open(cls.datafile, "r") as f:
-            data = json.load(f)
-        return data if key is None else data[key]
+        try:
+            return cls.store.read(cls.document(), key)
+        except FileNotFoundError:
+            cls.init_data()
+            return cls.store.read(cls.document(), key)
 
     @classmethod
     def update_data(cls, key: str | None, value) -> None:
         """
-        Update the data of the ocp store in a json file
+        Update the data of the ocp in the store
 
         Parameters
         ----------
@@ -57,12 +67,65 @@ class GenericOCPData:
         -------
         None
         """
-        if key is not None:
-            with open(cls.datafile, "r") as f:
-                data = json.load(f)
-            data[key] = value
-        else:
-            data = value
+        try:
+            cls.store.update(cls.document(), key, value)
+        except FileNotFoundError:
+            cls.init_data()
+            cls.store.update(cls.document(), key, value)
+
+    @classmethod
+    def document(cls) -> str:
+        """
+        The name of the document of the current workspace in the store
+        """
+        return workspace_document(cls.datafile)
+
+    @classmethod
+    def revision(cls) -> int:
+        """
+        The revision of the data of the current workspace, incremented by each update
+        """
+        return cls.store.revision(cls.document())
+
+    @classmethod
+    def snapshot(cls, revision: int = None) -> tuple[int, dict]:
+        """
+        The data of the current workspace as it was at a given revision, raises a KeyError if it is not available
+        anymore
+
+        Parameters
+        ----------
+        revision: int
+            The revision to read, the current one if None
+
+        Returns
+        -------
+        tuple[int, dict]
+            The revision and the data
+        """
+        try:
+            return cls.store.snapshot(cls.document(), revision)
+        except FileNotFoundError:
+            cls.init_data()
+            return cls.store.snapshot(cls.document(), revision)
+
+    @classmethod
+    def reset_data(cls) -> None:
+        """
+        Replace the data of the ocp by the base data
+        """
+        cls.update_data(None, cls.base_data)
 
-        with open(cls.datafile, "w") as f:
-            json.dump(data, f)
+    @classmethod
+    def init_data(cls) -> None:
+        """
+        Create the data of the ocp of a new workspace
+        """
+        cls.reset_data()
+
+    @classmethod
+    def delete_data(cls) -> None:
+        """
+        Delete the data of the ocp from the store
+        """
+        cls.store.delete(cls.document())
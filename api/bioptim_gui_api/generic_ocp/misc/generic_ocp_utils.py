@@ -1,5 +1,3 @@
-import json
-
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
 
 
@@ -14,9 +12,7 @@ def add_phase_info(n: int = 1) -> None:
     for _ in range(before, before + n):
         phases_info.append(GenericOCPData.default_phase_info)
 
-    data["phases_info"] = phases_info
-    with open(GenericOCPData.datafile, "w") as f:
-        json.dump(data, f)
+    GenericOCPData.update_data("phases_info", phases_info)
 
 
 def remove_phase_info(n: int = 0) -> None:
@@ -27,6 +23,4 @@ def remove_phase_info(n: int = 0) -> None:
 
     for _ in range(n):
         phases_info.pop()
-    data["phases_info"] = phases_info
-    with open(GenericOCPData.datafile, "w") as f:
-        json.dump(data, f)
+    GenericOCPData.update_data("phases_info", phases_info)
@@ -0,0 +1,425 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+
+class OCPStore(ABC):
+    """
+    Base class for the storage backends of the ocp data (see GenericOCPData), SHOULD NOT be used directly
+
+    A store contains documents identified by a name (e.g. "acrobatics_data.json"), each document being a json-like
+    dict. Values read from a store are always copies, modifying them has no effect until they are updated in the store.
+
+    Each update of a document increments its revision, which lets the clients detect concurrent modifications.
+    """
+
+    def __init__(self):
+        self._revisions = {}
+
+    def revision(self, name: str) -> int:
+        """
+        The revision of a document, 0 if it has never been updated through this store
+
+        Parameters
+        ----------
+        name: str
+            The name of the document
+
+        Returns
+        -------
+        int
+            The revision of the document
+        """
+        return self._revisions.get(name, 0)
+
+    def _increment_revision(self, name: str) -> None:
+        self._revisions[name] = self.revision(name) + 1
+
+    def snapshot(self, name: str, revision: int = None) -> tuple[int, dict]:
+        """
+        Read a whole document as it was at a given revision
+
+        Parameters
+        ----------
+        name: str
+            The name of the document
+        revision: int
+            The revision to read, the current one if None
+
+        Returns
+        -------
+        tuple[int, dict]
+            The revision and the document
+        """
+        current = self.revision(name)
+        if revision is not None and revision != current:
+            raise KeyError(f"Revision {revision} of {name} is not available")
+        return current, self.read(name)
+
+    @abstractmethod
+    def read(self, name: str, key: str = None):
+        """
+        Read a document or one of its keys
+
+        Parameters
+        ----------
+        name: str
+            The name of the document
+        key: str
+            The key to read
+
+        Returns
+        -------
+        The document or the value of the key, the whole document if key is None
+        """
+
+    @abstractmethod
+    def update(self, name: str, key: str | None, value) -> None:
+        """
+        Update a document or one of its keys
+
+        Parameters
+        ----------
+        name: str
+            The name of the document
+        key: str
+            The key to update, the whole document is replaced by value if key is None
+        value: Any
+            The value to put in the key
+        """
+
+    @abstractmethod
+    def delete(self, name: str) -> None:
+        """
+        Delete a document, do nothing if it does not exist
+
+        Parameters
+        ----------
+        name: str
+            The name of the document
+        """
+
+    def flush(self) -> None:
+        """
+        Write the pending modifications to the persistent storage, if the backend has any
+        """
+
+    def close(self) -> None:
+        """
+        Flush the pending modifications and release the resources of the store
+        """
+        self.flush()
+
+
+class JsonFileStore(OCPStore):
+    """
+    Store each document in its own json file, every read parses the file and every update rewrites it.
+
+    Attributes
+    ----------
+    directory: str
+        The directory in which the json files are written
+    """
+
+    def __init__(self, directory: str = "."):
+        super().__init__()
+        self.directory = directory
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def read(self, name: str, key: str = None):
+        with open(self.path(name), "r") as f:
+            data = json.load(f)
+        return data if key is None else data[key]
+
+    def update(self, name: str, key: str | None, value) -> None:
+        if key is not None:
+            data = self.read(name)
+            data[key] = value
+        else:
+            data = value
+
+        self.write_text(name, json.dumps(data))
+        self._increment_revision(name)
+
+    def write_text(self, name: str, text: str) -> None:
+        """
+        Write an already json encoded document.
+        The text is written to a temporary file which then replaces the document, so that the document is never
+        partially written, even if the process is stopped while writing.
+
+        Parameters
+        ----------
+        name: str
+            The name of the document
+        text: str
+            The json encoded document
+        """
+        path = self.path(name)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def delete(self, name: str) -> None:
+        if os.path.exists(self.path(name)):
+            os.remove(self.path(name))
+        self._revisions.pop(name, None)
+
+        # remove the directory of the document (e.g. of its workspace) if it is now empty
+        directory = os.path.dirname(name)
+        if directory and os.path.isdir(self.path(directory)) and not os.listdir(self.path(directory)):
+            os.rmdir(self.path(directory))
+
+
+class InMemoryStore(OCPStore):
+    """
+    Keep the documents in memory, protected by a lock.
+
+    Each key of a document is kept json encoded: reading a key only decodes this key (and returns a fresh copy of it)
+    and updating a key only encodes the new value, regardless of the size of the rest of the document.
+
+    The modified (dirty) documents are written to the persistence store in the background every flush_interval seconds
+    (write-behind), and when the store is flushed or closed. A document that is not in memory is loaded from the
+    persistence store the first time it is accessed.
+
+    The last history_size revisions of each document are kept, to be read with snapshot.
+
+    When there is a persistence store, at most max_documents documents are kept in memory: the least recently used
+    ones are written and dropped from memory, as well as the documents that have not been accessed for idle_timeout
+    seconds. They are restored from the persistence store on their next access, their revision and history are
+    dropped with them.
+
+    Attributes
+    ----------
+    persistence: JsonFileStore | None
+        The store the documents are written to, the documents only live in memory if None
+    flush_interval: float
+        The number of seconds between two background flushes
+    max_documents: int | None
+        The maximum number of documents kept in memory, no limit if None
+    idle_timeout: float | None
+        The number of seconds after which a document that is not accessed is dropped from memory, never if None
+    history_size: int
+        The number of revisions of each document that can be read with snapshot
+    """
+
+    def __init__(
+        self,
+        persistence: JsonFileStore | None = None,
+        flush_interval: float = 1.0,
+        max_documents: int | None = None,
+        idle_timeout: float | None = None,
+        history_size: int = 16,
+    ):
+        super().__init__()
+        self.persistence = persistence
+        self.flush_interval = flush_interval
+        self.max_documents = max_documents
+        self.idle_timeout = idle_timeout
+        self.history_size = history_size
+
+        # documents are ordered from the least to the most recently used
+        self._documents = OrderedDict()
+        self._last_access = {}
+        self._history = {}
+        self._dirty = set()
+        # _lock protects the in memory documents, _flush_lock serializes the writes to the persistence store
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._stop_flusher = threading.Event()
+
+    def _document(self, name: str) -> dict:
+        """
+        Return the encoded document, loading it from the persistence store if needed. Must be called with _lock held.
+        """
+        if name not in self._documents:
+            if self.persistence is None:
+                raise FileNotFoundError(f"{name} does not exist")
+            data = self.persistence.read(name)
+            self._documents[name] = {k: json.dumps(v) for k, v in data.items()}
+        self._touch(name)
+        return self._documents[name]
+
+    def _touch(self, name: str) -> None:
+        """
+        Mark the document as the most recently used one. Must be called with _lock held.
+        """
+        self._documents.move_to_end(name)
+        self._last_access[name] = time.monotonic()
+
+    def revision(self, name: str) -> int:
+        with self._lock:
+            return super().revision(name)
+
+    def read(self, name: str, key: str = None):
+        with self._lock:
+            document = self._document(name)
+            if key is not None:
+                encoded = document[key]
+            else:
+                encoded = document.copy()
+
+        self._evict_least_recently_used()
+
+        if key is not None:
+            return json.loads(encoded)
+        return {k: json.loads(v) for k, v in encoded.items()}
+
+    def update(self, name: str, key: str | None, value) -> None:
+        if key is not None:
+            encoded = json.dumps(value)
+            with self._lock:
+                self._document(name)[key] = encoded
+                self._dirty.add(name)
+                self._increment_revision(name)
+                self._record_history(name)
+        else:
+            encoded = {k: json.dumps(v) for k, v in value.items()}
+            with self._lock:
+                self._documents[name] = encoded
+                self._touch(name)
+                self._dirty.add(name)
+                self._increment_revision(name)
+                self._record_history(name)
+
+        self._evict_least_recently_used()
+        self._start_flusher()
+
+    def _record_history(self, name: str) -> None:
+        """
+        Keep the current revision of the document. Must be called with _lock held.
+        """
+        if name not in self._history:
+            self._history[name] = deque(maxlen=self.history_size)
+        # the encoded values are immutable strings, a shallow copy is enough
+        self._history[name].append((self._revisions[name], self._documents[name].copy()))
+
+    def snapshot(self, name: str, revision: int = None) -> tuple[int, dict]:
+        with self._lock:
+            document = self._document(name)
+            current = super().revision(name)
+            if revision is None or revision == current:
+                revision, encoded = current, document.copy()
+            else:
+                encoded = dict(self._history.get(name, ())).get(revision)
+                if encoded is None:
+                    raise KeyError(f"Revision {revision} of {name} is not available")
+
+        return revision, {k: json.loads(v) for k, v in encoded.items()}
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._documents.pop(name, None)
+            self._last_access.pop(name, None)
+            self._history.pop(name, None)
+            self._revisions.pop(name, None)
+            self._dirty.discard(name)
+
+        if self.persistence is not None:
+            with self._flush_lock:
+                self.persistence.delete(name)
+
+    def flush(self) -> None:
+        if self.persistence is None:
+            return
+
+        with self._flush_lock:
+            with self._lock:
+                to_write = {name: self._documents[name].copy() for name in self._dirty}
+                self._dirty.clear()
+
+            for name, document in to_write.items():
+                self._write(name, document)
+
+    def _write(self, name: str, document: dict) -> None:
+        text = "{" + ", ".join(f"{json.dumps(k)}: {v}" for k, v in document.items()) + "}"
+        self.persistence.write_text(name, text)
+
+    def _evict(self, names_to_evict) -> None:
+        """
+        Write and drop from memory the documents selected by names_to_evict.
+
+        Parameters
+        ----------
+        names_to_evict: Callable[[], list[str]]
+            Called with the locks held, returns the names of the documents to evict
+        """
+        if self.persistence is None:
+            return
+
+        # both locks are held while writing, so that a concurrent access cannot restore an outdated document
+        with self._flush_lock:
+            with self._lock:
+                for name in names_to_evict():
+                    document = self._documents.pop(name)
+                    self._last_access.pop(name, None)
+                    self._history.pop(name, None)
+                    self._revisions.pop(name, None)
+                    if name in self._dirty:
+                        self._dirty.discard(name)
+                        self._write(name, document)
+
+    def _evict_least_recently_used(self) -> None:
+        if self.max_documents is None:
+            return
+        with self._lock:
+            if len(self._documents) <= self.max_documents:
+                return
+
+        def least_recently_used() -> list[str]:
+            nb_to_evict = max(len(self._documents) - self.max_documents, 0)
+            return list(self._documents)[:nb_to_evict]
+
+        self._evict(least_recently_used)
+
+    def _evict_idle(self) -> None:
+        if self.idle_timeout is None:
+            return
+
+        def idle() -> list[str]:
+            now = time.monotonic()
+            return [name for name in self._documents if now - self._last_access[name] > self.idle_timeout]
+
+        self._evict(idle)
+
+    def close(self) -> None:
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+
+        if flusher is not None:
+            self._stop_flusher.set()
+            flusher.join()
+            self._stop_flusher.clear()
+
+        self.flush()
+
+    def _start_flusher(self) -> None:
+        if self.persistence is None:
+            return
+
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flusher.wait(self.flush_interval):
+            self.flush()
+            self._evict_idle()
@@ -0,0 +1,213 @@
+import asyncio
+import re
+import weakref
+from contextvars import ContextVar
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from bioptim_gui_api.utils.json_patch import make_patch
+
+WORKSPACE_HEADER = "X-Workspace-Id"
+REVISION_HEADER = "X-OCP-Revision"
+PATCH_FROM_HEADER = "X-OCP-Patch-From"
+DEFAULT_WORKSPACE = "default"
+WORKSPACES_DIRECTORY = "workspaces"
+
+_workspace_id_pattern = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+current_workspace: ContextVar[str] = ContextVar("current_workspace", default=DEFAULT_WORKSPACE)
+
+
+def validate_workspace_id(workspace_id: str) -> str:
+    """
+    Check that the workspace id can safely be used as a directory name
+
+    Parameters
+    ----------
+    workspace_id: str
+        The id of the workspace
+
+    Returns
+    -------
+    str
+        The id of the workspace
+    """
+    if not _workspace_id_pattern.fullmatch(workspace_id):
+        raise ValueError(
+            f"Invalid workspace id {workspace_id!r}, it must be 1 to 64 letters, digits, underscores or dashes"
+        )
+    return workspace_id
+
+
+def workspace_document(datafile: str, workspace_id: str = None) -> str:
+    """
+    The name of the document of the given workspace in the store.
+    The default workspace keeps the historical location of the datafile (the working directory).
+
+    Parameters
+    ----------
+    datafile: str
+        The name of the datafile (e.g. "acrobatics_data.json")
+    workspace_id: str
+        The id of the workspace, the workspace of the current request if None
+
+    Returns
+    -------
+    str
+        The name of the document
+    """
+    if workspace_id is None:
+        workspace_id = current_workspace.get()
+
+    if workspace_id == DEFAULT_WORKSPACE:
+        return datafile
+    return f"{WORKSPACES_DIRECTORY}/{workspace_id}/{datafile}"
+
+
+class WorkspaceMiddleware:
+    """
+    Select the workspace of each request from the X-Workspace-Id header.
+    Requests without the header use the default workspace, requests with an invalid id are rejected (400).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = WORKSPACE_HEADER.lower().encode("latin-1")
+        workspace_id = DEFAULT_WORKSPACE
+        for name, value in scope["headers"]:
+            if name == header:
+                workspace_id = value.decode("latin-1")
+                break
+
+        try:
+            validate_workspace_id(workspace_id)
+        except ValueError as e:
+            response = JSONResponse({"detail": str(e)}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        token = current_workspace.set(workspace_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_workspace.reset(token)
+
+
+class WorkspaceLockMiddleware:
+    """
+    Serialize the modifications of the ocp data of each workspace and version them.
+
+    The requests that modify the data (POST, PUT, PATCH, DELETE) of a workspace are handled one at a time, so that
+    the read-modify-write of an endpoint cannot be interleaved with the one of another request. The waiting requests
+    do not hold a worker thread.
+
+    Every response carries the revision of the data in the X-OCP-Revision header. A modification sent with an
+    If-Match header is rejected (412) if the data has been modified since the given revision.
+
+    A modification sent with an X-OCP-Patch-From header returns {"revision": ..., "patch": [...]} instead of the
+    response of the endpoint, the patch being the json patch (RFC 6902) from the data at the given revision to the
+    modified data. If the given revision is too old, the modification is rejected (409) and the client should get a
+    new snapshot of the data (GET .../snapshot).
+
+    Must be added before (i.e. inside) the WorkspaceMiddleware.
+
+    Attributes
+    ----------
+    data_by_prefix: dict[str, type[GenericOCPData]]
+        The data modified by the routes starting with each prefix, e.g. {"/acrobatics": AcrobaticsOCPData}
+    """
+
+    modifying_methods = ("POST", "PUT", "PATCH", "DELETE")
+
+    def __init__(self, app: ASGIApp, data_by_prefix: dict):
+        self.app = app
+        self.data_by_prefix = data_by_prefix
+        self._locks = weakref.WeakValueDictionary()
+
+    def _lock(self, workspace_id: str) -> asyncio.Lock:
+        lock = self._locks.get(workspace_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[workspace_id] = lock
+        return lock
+
+    def _data(self, path: str):
+        for prefix, data in self.data_by_prefix.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return data
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        data = self._data(scope["path"]) if scope["type"] == "http" else None
+        if data is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_revision(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REVISION_HEADER.lower().encode("latin-1"), str(data.revision()).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        if scope["method"] not in self.modifying_methods:
+            await self.app(scope, receive, send_with_revision)
+            return
+
+        async with self._lock(current_workspace.get()):
+            headers = dict(scope["headers"])
+
+            expected_revision = headers.get(b"if-match")
+            if expected_revision is not None:
+                expected_revision = expected_revision.decode("latin-1").strip().strip('"')
+                if expected_revision != str(data.revision()):
+                    response = JSONResponse(
+                        {"detail": f"The data has been modified, its revision is now {data.revision()}"},
+                        status_code=412,
+                    )
+                    await response(scope, receive, send_with_revision)
+                    return
+
+            patch_from = headers.get(PATCH_FROM_HEADER.lower().encode("latin-1"))
+            if patch_from is None:
+                await self.app(scope, receive, send_with_revision)
+                return
+
+            try:
+                _, old_data = await run_in_threadpool(data.snapshot, int(patch_from.decode("latin-1")))
+            except ValueError:
+                response = JSONResponse({"detail": f"{PATCH_FROM_HEADER} must be a revision"}, status_code=400)
+                await response(scope, receive, send_with_revision)
+                return
+            except KeyError:
+                response = JSONResponse(
+                    {"detail": f"Revision {patch_from.decode('latin-1')} is not available anymore, get a snapshot"},
+                    status_code=409,
+                )
+                await response(scope, receive, send_with_revision)
+                return
+
+            messages = []
+
+            async def buffer(message) -> None:
+                messages.append(message)
+
+            await self.app(scope, receive, buffer)
+
+            if not 200 <= messages[0]["status"] < 300:
+                for message in messages:
+                    await send_with_revision(message)
+                return
+
+            revision, new_data = await run_in_threadpool(data.snapshot)
+            patch = await run_in_threadpool(make_patch, old_data, new_data)
+            response = JSONResponse({"revision": revision, "patch": patch})
+            await response(scope, receive, send_with_revision)
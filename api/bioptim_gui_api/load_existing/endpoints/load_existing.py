@@ -1,11 +1,16 @@
-import pickle as pkl
-from enum import Enum, auto
+import io
 from typing import List
 
-import numpy as np
 from fastapi import UploadFile, APIRouter, HTTPException
-
-from bioptim_gui_api.load_existing.endpoints.load_existing_responses import LoadExistingResponse
+from fastapi.responses import StreamingResponse
+
+from bioptim_gui_api.load_existing.endpoints.load_existing_responses import LoadExistingResponse, PickleVerdictResponse
+from bioptim_gui_api.load_existing.misc.pickle_analysis import (
+    DiscardState,
+    analyze_pickles,
+    solution_stem,
+    summary_solution_stem,
+)
 
 router = APIRouter(
     prefix="/load_existing",
@@ -14,91 +19,125 @@ router = APIRouter(
 )
 
 
-class DiscardState(str, Enum):
-    """
-    Enum used to describe the state of a pickle file
+def check_pickle_file(file: UploadFile) -> None:
     """
-
-    HARD_DISCARD = auto()  # the pickle is not even a solution
-    KEEP = auto()  # the pickle is a solution and can be kept
-    SOFT_DISCARD = auto()  # the solution diverges too much from the integrated states
-
-
-async def handle_pkl(file: UploadFile) -> (bool, float):
-    """
-    Handle a pickle file to check if it has to be discarded by user and return discard choice and the cost of the
-    solution
-
-    A pickle file has to be discarded if the integrated states and the solution states diverge by more than 1 degree.
+    Check that the uploaded file is a pickle file
 
     Parameters
     ----------
     file: UploadFile
-        The pickle file to handle
-
-    Returns
-    -------
-    bool
-        True if the pickle file has to be discarded, False otherwise
-    float
-        The cost of the solution
+        The file to check
 
     Raises
     ------
     HTTPException
         If the file is not a pickle file
-    HTTPException
-        If the pickle file doesn't contain the right data (integrated_states and solution)
     """
     if file.content_type != "application/octet-stream":
         raise HTTPException(400, "File must be a pickle file")
 
-    pickle_data = await file.read()
-    loaded_data = pkl.loads(pickle_data)
-
-    try:
-        integrated_state = loaded_data["integrated_states"][-1]["q"][:, -1]
-        sol_states = loaded_data["solution"].states[-1]["q"][:, -1]
-    except KeyError:
-        return DiscardState.HARD_DISCARD, -1
-
-    to_discard = DiscardState.KEEP
-    cost = float(loaded_data["solution"].cost)
-
-    if np.any(abs(integrated_state - sol_states) > np.deg2rad(1)):
-        to_discard = DiscardState.SOFT_DISCARD
-
-    return to_discard, cost
 
-
-@router.post("/load", response_model=LoadExistingResponse)
-async def load_pickle(files: List[UploadFile] = None):
+def detach(file: UploadFile) -> UploadFile:
     """
-    Load a pickles file and return the best one to use and the one to discard
-    The pickles are received as a list of UploadFile, instead of a list of filepath, to allow the api to be hosted on a
-    remote server.
+    The upload, still open once the endpoint has returned (the uploads of a request are closed when its endpoint
+    returns, before a streaming response is sent). The content is not read, large uploads stay spooled on disk.
 
     Parameters
     ----------
-    files: List[UploadFile]
-        The pickle files to load
+    file: UploadFile
+        The upload to detach, left empty
 
     Returns
     -------
-    LoadExistingResponse
-        The best (lowest) cost pickle file to use and the one to discard
+    UploadFile
+        The upload, to be closed by the caller
+    """
+    detached = UploadFile(file.file, size=file.size, filename=file.filename, headers=file.headers)
+    file.file = io.BytesIO()
+    return detached
+
+
+def summarize(filenames: list[str], verdicts: list[tuple[DiscardState, float]]) -> LoadExistingResponse:
+    """
+    The best (lowest) cost pickle file to use and the ones to discard, in the order of the files
     """
     min_cost = float("inf")
     to_discard_list = []
     best = None
 
-    for file in files:
-        discard, cost = await handle_pkl(file)
+    for filename, (discard, cost) in zip(filenames, verdicts):
         if discard != DiscardState.KEEP:
-            to_discard_list.append(file.filename)
+            to_discard_list.append(filename)
 
         if discard != DiscardState.HARD_DISCARD and cost < min_cost:
             min_cost = cost
-            best = file.filename
+            best = filename
 
     return LoadExistingResponse(to_discard=to_discard_list, best=best)
+
+
+@router.post("/load", response_model=LoadExistingResponse)
+async def load_pickle(files: List[UploadFile] = None, stream: bool = False):
+    """
+    Load the saved solutions and return the best one to use and the ones to discard
+    The solutions (solution files .npz, or pickles .pkl saved by older generated code) are received as a list of
+    UploadFile, instead of a list of filepath, to allow the api to be hosted on a remote server.
+
+    A solution uploaded with its summary sidecar (e.g. sol_0.npz and sol_0.summary.json, written by the generated code)
+    is analyzed from the summary only, a summary can also be uploaded without its solution. The verdicts are given for
+    the names of the solutions (sol_0.npz for a summary uploaded alone). Pickles are only unpickled when the
+    BIOPTIM_GUI_ALLOW_PICKLE environment variable is "1".
+
+    The solutions are analyzed in parallel in a process pool. With stream=true, the verdict of each solution is streamed
+    as soon as it is analyzed, one json object per line ({"filename": ..., "verdict": "KEEP", "cost": ...}), the last line
+    being the usual response.
+
+    Parameters
+    ----------
+    files: List[UploadFile]
+        The solutions and summary sidecars to load
+    stream: bool
+        If the verdicts are streamed
+
+    Returns
+    -------
+    LoadExistingResponse
+        The best (lowest) cost pickle file to use and the one to discard
+    """
+    files = files or []
+    summarized = {summary_solution_stem(file.filename) for file in files} - {None}
+    solution_names = {solution_stem(file.filename): file.filename for file in files if file.filename}
+    # the solutions which have a summary are not even read
+    files = [file for file in files if solution_stem(file.filename) not in summarized]
+    summaries = [summary_solution_stem(file.filename) is not None for file in files]
+
+    for file, is_summary in zip(files, summaries):
+        if not is_summary:
+            check_pickle_file(file)
+
+    filenames = [
+        solution_names.get(stem, stem + ".npz") if (stem := summary_solution_stem(file.filename)) else file.filename
+        for file in files
+    ]
+    verdicts = [None] * len(files)
+
+    if not stream:
+        async for index, discard, cost in analyze_pickles(files, summaries):
+            verdicts[index] = discard, cost
+        return summarize(filenames, verdicts)
+
+    # each file is read when a worker is available to analyze it, as without streaming
+    files = [detach(file) for file in files]
+
+    async def content():
+        try:
+            async for index, discard, cost in analyze_pickles(files, summaries):
+                verdicts[index] = discard, cost
+                verdict = PickleVerdictResponse(filename=filenames[index], verdict=discard.name, cost=cost)
+                yield verdict.model_dump_json() + "\n"
+            yield summarize(filenames, verdicts).model_dump_json() + "\n"
+        finally:
+            for file in files:
+                await file.close()
+
+    return StreamingResponse(content(), media_type="application/x-ndjson")
@@ -6,3 +6,9 @@ from pydantic import BaseModel
 class LoadExistingResponse(BaseModel):
     to_discard: list[str] = []
     best: Optional[str] = None
+
+
+class PickleVerdictResponse(BaseModel):
+    filename: str
+    verdict: str
+    cost: float
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from enum import Enum, auto
+from typing import AsyncIterator
+
+import numpy as np
+
+from bioptim_gui_api.load_existing.misc.solution_file import load_solution
+
+ANALYSIS_WORKERS_ENV = "BIOPTIM_GUI_ANALYSIS_WORKERS"
+ALLOW_PICKLE_ENV = "BIOPTIM_GUI_ALLOW_PICKLE"
+# the summary sidecar written by the generated code alongside each solution (see save_summary)
+SUMMARY_SUFFIX = ".summary.json"
+# the solution files, and the pickles saved by older generated code
+SOLUTION_EXTENSIONS = (".npz", ".pkl")
+
+
+class DiscardState(str, Enum):
+    """
+    Enum used to describe the state of a pickle file
+    """
+
+    HARD_DISCARD = auto()  # the pickle is not even a solution
+    KEEP = auto()  # the pickle is a solution and can be kept
+    SOFT_DISCARD = auto()  # the solution diverges too much from the integrated states
+
+
+def discard_state(integrated_q, q) -> DiscardState:
+    """
+    A solution has to be discarded if its final integrated states and its final states diverge by more than 1 degree.
+
+    Parameters
+    ----------
+    integrated_q: np.ndarray
+        The final q of the integrated solution
+    q: np.ndarray
+        The final q of the solution
+
+    Returns
+    -------
+    DiscardState
+        KEEP or SOFT_DISCARD
+    """
+    if np.any(abs(np.asarray(integrated_q) - np.asarray(q)) > np.deg2rad(1)):
+        return DiscardState.SOFT_DISCARD
+    return DiscardState.KEEP
+
+
+def allow_pickle() -> bool:
+    """
+    If the uploaded pickles are unpickled, given by the BIOPTIM_GUI_ALLOW_PICKLE environment variable ("1" to accept
+    them), refused by default. Unpickling an upload runs arbitrary code, only allow it on a trusted deployment, the
+    solution files (see solution_file.py) are safe.
+    """
+    return os.environ.get(ALLOW_PICKLE_ENV, "0") == "1"
+
+
+def analyze_pickle(pickle_data: bytes, pickles_allowed: bool = None) -> tuple[DiscardState, float]:
+    """
+    Check if a saved solution has to be discarded and return its cost, run in the worker processes.
+    The solution can be a solution file, a summary sidecar or a pickle (see allow_pickle).
+
+    Parameters
+    ----------
+    pickle_data: bytes
+        The content of the file
+    pickles_allowed: bool
+        If a pickle can be unpickled, given by allow_pickle if None
+
+    Returns
+    -------
+    DiscardState
+        If the solution has to be discarded (see discard_state)
+    float
+        The cost of the solution, -1 if it is not a solution
+    """
+    if pickle_data.lstrip()[:1] == b"{":
+        return analyze_summary(pickle_data)
+
+    if pickles_allowed is None:
+        pickles_allowed = allow_pickle()
+
+    try:
+        solution = load_solution(pickle_data, allow_pickle=pickles_allowed)
+    except Exception:
+        return DiscardState.HARD_DISCARD, -1
+
+    with solution:
+        try:
+            integrated_phase = solution.nb_group_phases("integrated_states") - 1
+            phase = solution.nb_group_phases("solution/states") - 1
+            integrated_state = solution.array(f"integrated_states/{integrated_phase}/q")[:, -1]
+            sol_states = solution.array(f"solution/states/{phase}/q")[:, -1]
+            cost = float(solution.metadata["cost"])
+        except (KeyError, IndexError, TypeError):
+            return DiscardState.HARD_DISCARD, -1
+
+        return discard_state(integrated_state, sol_states), cost
+
+
+def analyze_summary(summary_data: bytes) -> tuple[DiscardState, float]:
+    """
+    Same as analyze_pickle, from the summary sidecar of the solution, without loading the solution
+
+    Parameters
+    ----------
+    summary_data: bytes
+        The content of the summary file
+
+    Returns
+    -------
+    DiscardState
+        If the solution has to be discarded (see discard_state)
+    float
+        The cost of the solution, -1 if it is not a summary of a solution
+    """
+    try:
+        summary = json.loads(summary_data)
+        integrated_q, q, cost = summary["final_integrated_q"], summary["final_q"], float(summary["cost"])
+    except (ValueError, KeyError, TypeError):
+        return DiscardState.HARD_DISCARD, -1
+
+    return discard_state(integrated_q, q), cost
+
+
+def summary_solution_stem(filename: str) -> str | None:
+    """
+    The name, without extension, of the solution summarized by the file, None if the file is not a summary
+
+    Parameters
+    ----------
+    filename: str
+        The name of the file (e.g. "acrobatics_1_left_straight_0.summary.json")
+
+    Returns
+    -------
+    str | None
+        The name of the solution without extension (e.g. "acrobatics_1_left_straight_0", of
+        "acrobatics_1_left_straight_0.npz" or of the older "acrobatics_1_left_straight_0.pkl")
+    """
+    if not filename or not filename.endswith(SUMMARY_SUFFIX):
+        return None
+    return filename[: -len(SUMMARY_SUFFIX)]
+
+
+def solution_stem(filename: str) -> str:
+    """
+    The name of a solution file or pickle without its extension
+    """
+    for extension in SOLUTION_EXTENSIONS:
+        if filename and filename.endswith(extension):
+            return filename[: -len(extension)]
+    return filename
+
+
+def analysis_workers() -> int:
+    """
+    The number of worker processes, given by the BIOPTIM_GUI_ANALYSIS_WORKERS environment variable, the number of
+    cpus by default or if the variable is not an integer
+    """
+    try:
+        return max(1, int(os.environ[ANALYSIS_WORKERS_ENV]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def analysis_pool() -> ProcessPoolExecutor:
+    """
+    The process pool analyzing the pickles, created on first use
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=analysis_workers())
+        return _pool
+
+
+def shutdown_analysis_pool() -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def analyze_pickles(
+    pickles: list, summaries: list[bool] = None
+) -> AsyncIterator[tuple[int, DiscardState, float]]:
+    """
+    Analyze the pickles in the process pool, at most one pickle per worker at a time so that the pickles waiting
+    for a worker are not all read in memory. The event loop is never blocked by the deserialization.
+
+    Parameters
+    ----------
+    pickles: list
+        The contents of the pickles, or objects with an async read() method returning it (e.g. UploadFile)
+    summaries: list[bool]
+        If each pickle is a summary sidecar, analyzed without the pool (see analyze_summary), all pickles if None
+
+    Yields
+    ------
+    tuple[int, DiscardState, float]
+        The index of the pickle in the list, if it has to be discarded and its cost (see analyze_pickle), as soon as
+        each pickle is analyzed
+    """
+    loop = asyncio.get_running_loop()
+    pool = analysis_pool()
+    # read by the api rather than by the workers, which keep the environment of when they were started
+    pickles_allowed = allow_pickle()
+    semaphore = asyncio.Semaphore(analysis_workers())
+
+    async def analyze(index: int, file) -> tuple[int, DiscardState, float]:
+        async with semaphore:
+            pickle_data = file if isinstance(file, bytes) else await file.read()
+            if summaries is not None and summaries[index]:
+                return index, *analyze_summary(pickle_data)
+            return index, *await loop.run_in_executor(pool, analyze_pickle, pickle_data, pickles_allowed)
+
+    tasks = [asyncio.create_task(analyze(i, file)) for i, file in enumerate(pickles)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    except BrokenProcessPool:
+        # a worker died (e.g. out of memory), the next analysis starts a new pool
+        shutdown_analysis_pool()
+        raise
+    finally:
+        for task in tasks:
+            task.cancel()
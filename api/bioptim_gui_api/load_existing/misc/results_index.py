@@ -0,0 +1,266 @@
+import argparse
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import NamedTuple
+
+from bioptim_gui_api.load_existing.misc.solution_file import load_solution
+
+# the index of a results folder (output/<script>/results/index.sqlite), maintained by the save_results function of the
+# generated code (see index_result) and completed from the files by rescan
+RESULTS_INDEX_NAME = "index.sqlite"
+RESULTS_INDEX_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS results ("
+    "file_path TEXT PRIMARY KEY, seed INTEGER, status INTEGER, cost REAL, solve_time REAL, iterations INTEGER, "
+    "half_twists TEXT, side TEXT, position TEXT)"
+)
+RESULTS_INDEX_INSERT = "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+RESULTS_INDEX_TIMEOUT = 60  # the pools of a multistart write concurrently
+
+_result_name_pattern = re.compile(
+    r"(?:warming_|warm_)?acrobatics_(?P<half_twists>\d+(?:_\d+)*)_(?P<side>left|right)_(?P<position>\w+?)_"
+    r"(?P<seed>\d+)\.(?:npz|pkl)"
+)
+_summary_suffix = ".summary.json"
+
+
+class IndexedResult(NamedTuple):
+    """
+    A result of the index, the file only exists for the saved results (the generated code does not save the results
+    that did not converge, except for the collision scripts)
+    """
+
+    file_path: str
+    seed: int | None
+    status: int | None
+    cost: float | None
+    solve_time: float | None
+    iterations: int | None
+    half_twists: str | None  # e.g. "1_2" for two phases of 1 and 2 half twists
+    side: str | None
+    position: str | None
+
+    @property
+    def converged(self) -> bool:
+        return self.status == 0
+
+
+def figure_parameters(filename: str) -> dict | None:
+    """
+    The parameters of the figure of a result, given by its file name
+
+    Parameters
+    ----------
+    filename: str
+        The name of the file (e.g. "acrobatics_1_2_left_pike_0.npz")
+
+    Returns
+    -------
+    dict | None
+        The half_twists ("1_2"), side ("left"), position ("pike") and seed (0), None if the name is not the one of a
+        result
+    """
+    match = _result_name_pattern.fullmatch(filename)
+    if match is None:
+        return None
+    return {**match.groupdict(), "seed": int(match["seed"])}
+
+
+def read_result(path: str | Path, allow_pickle: bool = False) -> IndexedResult | None:
+    """
+    The index entry of a result file, from its summary sidecar when there is one, from its metadata otherwise
+
+    Parameters
+    ----------
+    path: str | Path
+        The path of the result (.npz, or .pkl saved by older generated code)
+    allow_pickle: bool
+        If a pickle without summary can be loaded, unpickling runs arbitrary code
+
+    Returns
+    -------
+    IndexedResult | None
+        The entry, None if the file is not a result
+    """
+    path = Path(path)
+    parameters = figure_parameters(path.name)
+    if parameters is None:
+        return None
+
+    summary_path = path.with_suffix(_summary_suffix)
+    try:
+        if summary_path.is_file():
+            metadata = json.loads(summary_path.read_text())
+        else:
+            with load_solution(path, allow_pickle=allow_pickle) as solution:
+                metadata = solution.metadata
+    except Exception:
+        return None
+
+    return IndexedResult(
+        file_path=str(path),
+        seed=parameters["seed"],
+        status=metadata.get("status"),
+        cost=metadata.get("cost"),
+        solve_time=metadata.get("solve_time"),
+        iterations=metadata.get("iterations"),
+        half_twists=parameters["half_twists"],
+        side=parameters["side"],
+        position=parameters["position"],
+    )
+
+
+class ResultsIndex:
+    """
+    The sqlite index of a results folder, to query the results (e.g. the best converged ones) without loading them.
+
+    Attributes
+    ----------
+    path: Path
+        The path of the index database
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Parameters
+        ----------
+        path: str | Path
+            The path of the index database, or of the results folder to use its index.sqlite
+        """
+        path = Path(path)
+        self.path = path / RESULTS_INDEX_NAME if path.is_dir() else path
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=RESULTS_INDEX_TIMEOUT)
+        connection.execute(RESULTS_INDEX_SCHEMA)
+        return connection
+
+    def add(self, *results: IndexedResult) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(RESULTS_INDEX_INSERT, results)
+        finally:
+            connection.close()
+
+    def results(self) -> list[IndexedResult]:
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT * FROM results ORDER BY file_path").fetchall()
+        finally:
+            connection.close()
+        return [IndexedResult(*row) for row in rows]
+
+    def best(
+        self,
+        n: int = 1,
+        converged: bool = True,
+        half_twists: str = None,
+        side: str = None,
+        position: str = None,
+    ) -> list[IndexedResult]:
+        """
+        The lowest cost results
+
+        Parameters
+        ----------
+        n: int
+            The maximum number of results
+        converged: bool
+            If only the converged results are returned
+        half_twists: str
+            Only the results of this number of half twists per phase (e.g. "1_2"), all if None
+        side: str
+            Only the results of this twist side, all if None
+        position: str
+            Only the results of this position, all if None
+
+        Returns
+        -------
+        list[IndexedResult]
+            The results, ordered by cost
+        """
+        conditions = ["cost IS NOT NULL"]
+        parameters = []
+        if converged:
+            conditions.append("status = 0")
+        for column, value in (("half_twists", half_twists), ("side", side), ("position", position)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+
+        query = f"SELECT * FROM results WHERE {' AND '.join(conditions)} ORDER BY cost LIMIT ?"
+        connection = self._connect()
+        try:
+            rows = connection.execute(query, (*parameters, n)).fetchall()
+        finally:
+            connection.close()
+        return [IndexedResult(*row) for row in rows]
+
+    def rescan(self, results_folder: str | Path = None, allow_pickle: bool = False) -> int:
+        """
+        Index the result files of the folder, e.g. the results saved before the index existed. The rows of the files
+        are replaced, the other rows are kept: the results that were not saved (e.g. did not converge), and the files
+        that cannot be read (e.g. the pickles when allow_pickle is False) but were indexed when they were saved.
+
+        Parameters
+        ----------
+        results_folder: str | Path
+            The folder of the results, the folder of the index by default
+        allow_pickle: bool
+            If the pickles without summary can be loaded, unpickling runs arbitrary code
+
+        Returns
+        -------
+        int
+            The number of indexed result files
+        """
+        results_folder = Path(results_folder) if results_folder else self.path.parent
+        results = []
+        for path in sorted(results_folder.iterdir()):
+            result = read_result(path, allow_pickle)
+            if result is not None:
+                results.append(result)
+
+        connection = self._connect()
+        try:
+            with connection:
+                # the path of an indexed file is kept, the folder may be given differently (e.g. absolute) than when
+                # the result was saved
+                indexed_paths = {
+                    Path(file_path).name: file_path
+                    for (file_path,) in connection.execute("SELECT file_path FROM results").fetchall()
+                }
+                results = [
+                    result._replace(file_path=indexed_paths.get(Path(result.file_path).name, result.file_path))
+                    for result in results
+                ]
+                connection.executemany(RESULTS_INDEX_INSERT, results)
+        finally:
+            connection.close()
+        return len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the index of a results folder or index its result files.")
+    parser.add_argument("command", choices=["rescan", "best"])
+    parser.add_argument("results_folder", help="The results folder (e.g. output/<script>/results)")
+    parser.add_argument("-n", type=int, default=1, help="The number of results of best")
+    parser.add_argument("--all", action="store_true", help="Also the results that did not converge")
+    parser.add_argument(
+        "--allow-pickle", action="store_true", help="Also read the pickles saved by older generated code (trusted only)"
+    )
+
+    args = parser.parse_args()
+
+    index = ResultsIndex(args.results_folder)
+    if args.command == "rescan":
+        print(f"{index.rescan(allow_pickle=args.allow_pickle)} results indexed in {index.path}")
+    else:
+        for result in index.best(args.n, converged=not args.all):
+            print(f"{result.cost}\t{result.file_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import io
+import json
+import pickle as pkl
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+# the solution files are uncompressed npz archives (np.savez) of the arrays of the solution, named e.g.
+# "solution/states/0/q", "solution/controls/0/tau", "integrated_states/0/q", "interpolated_states/0/q",
+# "time_vector/0", "x_bounds/0/q/min", plus the json metadata (biomodel_path, coneless_model, seed, cost, status,
+# iterations, solve_time, nb_phases) stored as bytes under METADATA_KEY
+METADATA_KEY = "__metadata__"
+FORMAT_VERSION = 1
+
+_ZIP_MAGIC = b"PK\x03\x04"
+_LOCAL_HEADER_SIZE = 30
+
+
+def is_solution_file(data: bytes) -> bool:
+    """
+    If the content is a solution file (npz archive), as opposed to a pickle
+
+    Parameters
+    ----------
+    data: bytes
+        The beginning of the content of the file
+
+    Returns
+    -------
+    bool
+        True for a solution file
+    """
+    return data[: len(_ZIP_MAGIC)] == _ZIP_MAGIC
+
+
+class SolutionFile:
+    """
+    A solution saved by the generated code. The arrays are read lazily, only the ones that are accessed are loaded,
+    and they are memory-mapped when the file is on disk. Never unpickles anything.
+
+    Attributes
+    ----------
+    metadata: dict
+        The metadata of the solution
+    """
+
+    def __init__(self, file: str | Path | bytes, mmap: bool = True):
+        """
+        Parameters
+        ----------
+        file: str | Path | bytes
+            The path of the file, or its content
+        mmap: bool
+            If the arrays of a file on disk are memory-mapped instead of read
+        """
+        self._path = None if isinstance(file, bytes) else Path(file)
+        self._mmap = mmap and self._path is not None
+        self._zip = zipfile.ZipFile(io.BytesIO(file) if isinstance(file, bytes) else self._path)
+        self._members = {
+            info.filename[: -len(".npy")]: info for info in self._zip.infolist() if info.filename.endswith(".npy")
+        }
+        self.metadata = json.loads(self._read(METADATA_KEY).tobytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def keys(self) -> list[str]:
+        return [name for name in self._members if name != METADATA_KEY]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    @property
+    def nb_phases(self) -> int:
+        return self.metadata["nb_phases"]
+
+    def _read(self, name: str) -> np.ndarray:
+        with self._zip.open(self._members[name]) as f:
+            return np.lib.format.read_array(f, allow_pickle=False)
+
+    def _memmap(self, name: str) -> np.ndarray | None:
+        info = self._members[name]
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+
+        with open(self._path, "rb") as f:
+            f.seek(info.header_offset)
+            local_header = f.read(_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            f.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+
+        if dtype.hasobject or 0 in shape:
+            return None
+        return np.memmap(
+            self._path, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran_order else "C"
+        )
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Read one array of the solution
+
+        Parameters
+        ----------
+        name: str
+            The name of the array (e.g. "solution/states/0/q")
+
+        Returns
+        -------
+        np.ndarray
+            The array, read-only if memory-mapped
+
+        Raises
+        ------
+        KeyError
+            If there is no such array
+        """
+        if name not in self._members or name == METADATA_KEY:
+            raise KeyError(name)
+
+        array = self._memmap(name) if self._mmap else None
+        return self._read(name) if array is None else array
+
+    def nb_group_phases(self, group: str) -> int:
+        """
+        The number of phases of a group of arrays, e.g. 1 for the integrated states which are saved merged
+
+        Parameters
+        ----------
+        group: str
+            The group of arrays (e.g. "solution/states", "solution/controls", "integrated_states",
+            "interpolated_states")
+
+        Returns
+        -------
+        int
+            The number of phases
+        """
+        prefix = f"{group}/"
+        phases = [name[len(prefix) :].split("/")[0] for name in self._members if name.startswith(prefix)]
+        return max((int(phase) + 1 for phase in phases), default=0)
+
+    def phases(self, group: str) -> list[dict[str, np.ndarray]]:
+        """
+        The arrays of each phase of a group
+
+        Parameters
+        ----------
+        group: str
+            The group of arrays (e.g. "solution/states", "solution/controls", "integrated_states",
+            "interpolated_states")
+
+        Returns
+        -------
+        list[dict[str, np.ndarray]]
+            The arrays of each phase by key (e.g. [{"q": ..., "qdot": ...}, ...])
+        """
+        phases = []
+        for phase in range(self.nb_group_phases(group)):
+            prefix = f"{group}/{phase}/"
+            phases.append({name[len(prefix) :]: self.array(name) for name in self._members if name.startswith(prefix)})
+        return phases
+
+
+class PickledSolution:
+    """
+    The same interface as SolutionFile for the pickles saved before the solution files existed.
+    Unpickling runs arbitrary code, only load trusted files.
+    """
+
+    def __init__(self, file: str | Path | bytes):
+        if isinstance(file, bytes):
+            data = pkl.loads(file)
+        else:
+            with open(file, "rb") as f:
+                data = pkl.load(f)
+
+        solution = data["solution"]
+        self.metadata = {
+            "biomodel_path": data.get("biomodel_path"),
+            "coneless_model": data.get("coneless_model"),
+            "seed": data.get("seed"),
+            "cost": float(solution.cost),
+            "status": getattr(solution, "status", None),
+            "nb_phases": len(solution.states),
+        }
+        self._groups = {
+            "solution/states": solution.states,
+            "solution/controls": getattr(solution, "controls", []),
+            "integrated_states": data.get("integrated_states", []),
+            "interpolated_states": data.get("interpolated_states", []),
+        }
+        self._arrays = {}
+        for group, phases in self._groups.items():
+            for phase, arrays in enumerate(phases):
+                for key, array in arrays.items():
+                    self._arrays[f"{group}/{phase}/{key}"] = array
+        for phase, time_vector in enumerate(data.get("time_vector", [])):
+            self._arrays[f"time_vector/{phase}"] = time_vector
+        for phase, bounds in enumerate(data.get("x_bounds", [])):
+            for key in solution.states[min(phase, len(solution.states) - 1)]:
+                try:
+                    self._arrays[f"x_bounds/{phase}/{key}/min"] = bounds[key].min
+                    self._arrays[f"x_bounds/{phase}/{key}/max"] = bounds[key].max
+                except (KeyError, AttributeError):
+                    continue
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def keys(self) -> list[str]:
+        return list(self._arrays)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._arrays
+
+    @property
+    def nb_phases(self) -> int:
+        return self.metadata["nb_phases"]
+
+    def array(self, name: str) -> np.ndarray:
+        return np.asarray(self._arrays[name])
+
+    def nb_group_phases(self, group: str) -> int:
+        return len(self._groups[group])
+
+    def phases(self, group: str) -> list[dict[str, np.ndarray]]:
+        return [{key: np.asarray(array) for key, array in arrays.items()} for arrays in self._groups[group]]
+
+
+def load_solution(file: str | Path | bytes, allow_pickle: bool = False) -> SolutionFile | PickledSolution:
+    """
+    Load a saved solution, a solution file or a pickle saved by older generated code
+
+    Parameters
+    ----------
+    file: str | Path | bytes
+        The path of the file, or its content
+    allow_pickle: bool
+        If pickles can be loaded, only for trusted files: unpickling runs arbitrary code
+
+    Returns
+    -------
+    SolutionFile | PickledSolution
+        The solution
+
+    Raises
+    ------
+    ValueError
+        If the file is a pickle and allow_pickle is False
+    """
+    if isinstance(file, bytes):
+        head = file[: len(_ZIP_MAGIC)]
+    else:
+        with open(file, "rb") as f:
+            head = f.read(len(_ZIP_MAGIC))
+
+    if is_solution_file(head):
+        return SolutionFile(file)
+    if not allow_pickle:
+        raise ValueError("The file is not a solution file and loading pickles is not allowed")
+    return PickledSolution(file)
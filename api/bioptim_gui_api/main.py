@@ -1,19 +1,26 @@
-import json
-import os
-
 from fastapi import FastAPI
 
 from bioptim_gui_api.acrobatics_ocp.endpoints.acrobatics import router as acrobatics_router
 from bioptim_gui_api.acrobatics_ocp.misc.acrobatics_data import AcrobaticsOCPData
-from bioptim_gui_api.acrobatics_ocp.misc.phase_updating import update_phase_info
 from bioptim_gui_api.generic_ocp.endpoints.generic_ocp import router as generic_ocp_router
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
+from bioptim_gui_api.generic_ocp.misc.workspaces import WorkspaceLockMiddleware, WorkspaceMiddleware
 from bioptim_gui_api.load_existing.endpoints.load_existing import router as load_existing_router
+from bioptim_gui_api.load_existing.misc.pickle_analysis import shutdown_analysis_pool
+from bioptim_gui_api.model_registry.endpoints.model_registry import router as model_registry_router
 from bioptim_gui_api.penalty.endpoints.penalty import router as penalty_router
 from bioptim_gui_api.variables.endpoints.variables import router as variables_router
 
 app = FastAPI()
 
+# the modifications of the ocp data of a workspace are serialized and versioned
+app.add_middleware(
+    WorkspaceLockMiddleware,
+    data_by_prefix={"/acrobatics": AcrobaticsOCPData, "/generic_ocp": GenericOCPData},
+)
+# the ocp data of each request is the one of the workspace given by the X-Workspace-Id header
+app.add_middleware(WorkspaceMiddleware)
+
 app.include_router(acrobatics_router)
 app.include_router(generic_ocp_router)
 
@@ -22,20 +29,18 @@ app.include_router(variables_router)
 
 app.include_router(load_existing_router)
 
+app.include_router(model_registry_router)
+
 
 @app.on_event("startup")
 def startup_event():
-    with open(AcrobaticsOCPData.datafile, "w") as f:
-        base_data = AcrobaticsOCPData.base_data
-        json.dump(base_data, f)
-
-    update_phase_info()
-
-    with open(GenericOCPData.datafile, "w") as f:
-        json.dump(GenericOCPData.base_data, f)
+    # the default workspace starts from scratch, the other ones are restored from disk when they are used
+    AcrobaticsOCPData.init_data()
+    GenericOCPData.init_data()
 
 
 @app.on_event("shutdown")
 def shutdown_event():
-    os.remove(AcrobaticsOCPData.datafile)
-    os.remove(GenericOCPData.datafile)
+    # write the pending modifications of the ocp data
+    GenericOCPData.store.close()
+    shutdown_analysis_pool()
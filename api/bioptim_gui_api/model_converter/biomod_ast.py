@@ -0,0 +1,217 @@
+from typing import NamedTuple
+
+# the keywords that can follow a ranges block in a segment, they end the rows of the ranges
+SEGMENT_KEYWORDS = frozenset(
+    {
+        "parent",
+        "rt",
+        "rtinmatrix",
+        "translations",
+        "rotations",
+        "rangesQ",
+        "rangesQdot",
+        "rangesQddot",
+        "com",
+        "mass",
+        "inertia",
+        "mesh",
+        "meshfile",
+        "meshrt",
+        "meshscale",
+        "meshcolor",
+        "patch",
+        "endsegment",
+    }
+)
+
+
+def _keyword(line: str) -> str:
+    stripped = line.strip()
+    return stripped.split(maxsplit=1)[0] if stripped else ""
+
+
+class Statement(NamedTuple):
+    """
+    A line of the bioMod kept as is (e.g. "\tcom 0.0 0.0 0.0\n", "version 4\n" or an empty line)
+    """
+
+    line: str
+
+    @property
+    def keyword(self) -> str:
+        return _keyword(self.line)
+
+
+class Dofs(NamedTuple):
+    """
+    A rotations or translations line of a segment
+
+    Attributes
+    ----------
+    kind: str
+        "rotations" or "translations"
+    axes: str
+        The axes of the dofs (e.g. "xyz")
+    line: str
+        The line of the bioMod
+    """
+
+    kind: str
+    axes: str
+    line: str
+
+
+class Ranges(NamedTuple):
+    """
+    A rangesQ (rangesQdot, rangesQddot) block of a segment, the keyword line followed by one row per dof
+    """
+
+    lines: tuple[str, ...]
+
+
+class Segment(NamedTuple):
+    """
+    A segment ... endsegment block
+
+    Attributes
+    ----------
+    name: str
+        The name of the segment
+    header: str
+        The "segment <name>" line
+    body: tuple[Statement | Dofs | Ranges | Marker, ...]
+        The content of the segment
+    footer: str
+        The endsegment line, empty if the file ends before it
+    """
+
+    name: str
+    header: str
+    body: tuple
+    footer: str
+
+    @property
+    def meshes(self) -> list[Statement]:
+        return [node for node in self.body if isinstance(node, Statement) and node.keyword.startswith("mesh")]
+
+
+class Marker(NamedTuple):
+    """
+    A marker ... endmarker block, kept as is
+
+    Attributes
+    ----------
+    name: str
+        The name of the marker
+    lines: tuple[str, ...]
+        The lines of the block, from the marker line to the endmarker line
+    """
+
+    name: str
+    lines: tuple[str, ...]
+
+
+class BioModDocument(NamedTuple):
+    """
+    The syntax tree of a bioMod: the top level statements, segments and markers in the order of the file.
+    Serializing an unmodified document gives back the parsed content.
+    """
+
+    nodes: tuple
+
+    @property
+    def segments(self) -> dict[str, Segment]:
+        return {node.name: node for node in self.nodes if isinstance(node, Segment)}
+
+    @property
+    def markers(self) -> dict[str, Marker]:
+        markers = {}
+        for node in self.nodes:
+            for child in node.body if isinstance(node, Segment) else (node,):
+                if isinstance(child, Marker):
+                    markers[child.name] = child
+        return markers
+
+    def serialize(self) -> str:
+        return "".join(serialize_lines(self.nodes))
+
+
+def serialize_lines(nodes) -> list[str]:
+    """
+    The lines of the bioMod of the given nodes
+
+    Parameters
+    ----------
+    nodes: Iterable
+        The nodes (Statement, Dofs, Ranges, Segment, Marker) to serialize
+
+    Returns
+    -------
+    list[str]
+        The lines of the nodes, with their new line character
+    """
+    lines = []
+    for node in nodes:
+        if isinstance(node, (Statement, Dofs)):
+            lines.append(node.line)
+        elif isinstance(node, (Ranges, Marker)):
+            lines.extend(node.lines)
+        elif isinstance(node, Segment):
+            lines.append(node.header)
+            lines.extend(serialize_lines(node.body))
+            lines.append(node.footer)
+    return lines
+
+
+def parse_biomod(model_content: str) -> BioModDocument:
+    """
+    Parse a bioMod in a single pass over its lines.
+
+    Parameters
+    ----------
+    model_content: str
+        The content of the bioMod
+
+    Returns
+    -------
+    BioModDocument
+        The syntax tree of the bioMod
+    """
+    lines = [line + "\n" for line in model_content.split("\n")]
+    n_lines = len(lines)
+
+    nodes = []
+    segment = None  # (name, header, body) of the segment being parsed
+    i = 0
+    while i < n_lines:
+        line = lines[i]
+        keyword = _keyword(line)
+        # the nodes found outside of a segment (e.g. in a malformed model) are kept at the top level
+        container = nodes if segment is None else segment[2]
+
+        if keyword == "marker":
+            start = i
+            while i < n_lines and _keyword(lines[i]) != "endmarker":
+                i += 1
+            container.append(Marker(line.split()[1], tuple(lines[start : i + 1])))
+        elif keyword in ("rotations", "translations"):
+            values = line.split()
+            container.append(Dofs(keyword, values[1] if len(values) > 1 else "", line))
+        elif keyword.startswith("ranges"):
+            start = i
+            while i + 1 < n_lines and _keyword(lines[i + 1]) not in SEGMENT_KEYWORDS:
+                i += 1
+            container.append(Ranges(tuple(lines[start : i + 1])))
+        elif keyword == "segment" and segment is None:
+            segment = (line.split()[1], line, [])
+        elif keyword == "endsegment" and segment is not None:
+            nodes.append(Segment(*segment[:2], tuple(segment[2]), line))
+            segment = None
+        else:
+            container.append(Statement(line))
+        i += 1
+
+    if segment is not None:
+        nodes.append(Segment(*segment[:2], tuple(segment[2]), ""))
+
+    return BioModDocument(tuple(nodes))
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
+from bioptim_gui_api.utils.cache_utils import EnvConfigured, source_fingerprint
+
+CONVERTED_MODELS_CACHE_ENV = "BIOPTIM_GUI_CONVERTED_MODELS_CACHE"
+
+# the converted models depend on the code of these files, a model converted by another version of them is not used
+_source_files = tuple(Path(__file__).parent.glob("*.py"))
+
+
+class ConvertedModelCache:
+    """
+    A least recently used cache of converted bioMods, addressed by the content of the model and the conversion
+    (position and additional criteria), optionally persisted on disk to be shared between processes and restarts.
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of converted models kept in memory
+    directory: Path | None
+        The directory where the converted models are persisted, None to only keep them in memory
+    """
+
+    def __init__(self, maxsize: int = 32, directory: str | Path = None):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory else None
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model_content: str, position: str, additional_criteria: AdditionalCriteria) -> str:
+        """
+        The address of a converted model
+
+        Parameters
+        ----------
+        model_content: str
+            The content of the original bioMod
+        position: str
+            The position of the acrobatics
+        additional_criteria: AdditionalCriteria
+            The additional criteria of the acrobatics
+
+        Returns
+        -------
+        str
+            The hex digest addressing the converted model
+        """
+        content_digest = hashlib.sha256(model_content.encode("utf-8")).hexdigest()
+        conversion = json.dumps(
+            [source_fingerprint(_source_files), content_digest, position, list(additional_criteria)]
+        )
+        return hashlib.sha256(conversion.encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> str | None:
+        if self.directory is None:
+            return None
+        try:
+            return (self.directory / f"{key}.bioMod").read_text()
+        except OSError:
+            return None
+
+    def _write(self, key: str, model: str) -> None:
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_path.write_text(model)
+            # atomic, another process never reads a partially written model
+            os.replace(tmp_path, self.directory / f"{key}.bioMod")
+        except OSError:
+            # persisting is only an optimization
+            pass
+
+    def get(
+        self,
+        model_content: str,
+        position: str,
+        additional_criteria: AdditionalCriteria,
+        convert: Callable[[], str],
+    ) -> str:
+        """
+        Return the converted model, converting it if it is neither in memory nor on disk
+
+        Parameters
+        ----------
+        model_content: str
+            The content of the original bioMod
+        position: str
+            The position of the acrobatics
+        additional_criteria: AdditionalCriteria
+            The additional criteria of the acrobatics
+        convert: Callable[[], str]
+            Convert the model
+
+        Returns
+        -------
+        str
+            The converted model
+
+        Raises
+        ------
+        ValueError
+            If the model cannot be converted, errors are not cached
+        """
+        key = self.key(model_content, position, additional_criteria)
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+
+        model = self._read(key)
+        if model is None:
+            with self._lock:
+                self.misses += 1
+            model = convert()
+            self._write(key, model)
+        else:
+            with self._lock:
+                self.hits += 1
+
+        with self._lock:
+            self._models[key] = model
+            if len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+        return model
+
+    def clear(self) -> None:
+        """
+        Empty the memory, the models persisted on disk are kept
+        """
+        with self._lock:
+            self._models.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = EnvConfigured(CONVERTED_MODELS_CACHE_ENV, lambda directory: ConvertedModelCache(directory=directory))
+
+
+def converted_models() -> ConvertedModelCache:
+    """
+    The cache of converted models, persisted in the directory given by the BIOPTIM_GUI_CONVERTED_MODELS_CACHE
+    environment variable (e.g. "models/.converted") if set.
+
+    Returns
+    -------
+    ConvertedModelCache
+        The cache
+    """
+    return _cache.get()
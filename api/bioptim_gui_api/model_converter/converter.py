@@ -1,4 +1,4 @@
-from bioptim_gui_api.model_converter.converter_str_utils import BioModConverterUtils
+from bioptim_gui_api.model_converter.biomod_ast import BioModDocument, Marker, Segment, Statement, parse_biomod
 
 
 class BioModConverter:
@@ -22,73 +22,83 @@ class BioModConverter:
     markers = []
 
     @classmethod
-    def _add_dofs(cls, segment_name: str, updated_lines: list[str], stripped: str):
+    def _dofs_lines(cls, segment_name: str) -> list[str]:
         """
-        This function is used to add them to the updated_lines list if needed.
-
-        rotations and translations line in a bioMod are usually written after the rt line.
+        The rotations and translations lines the segment should contain, they are written after its rt line.
         """
-        if stripped.startswith("rt"):
-            if segment_name in cls.segment_translation:
-                updated_lines.append(f"\ttranslations {cls.segment_translation[segment_name]}\n")
-            if segment_name in cls.segment_rotation:
-                updated_lines.append(f"\trotations {cls.segment_rotation[segment_name]}\n")
+        lines = []
+        if segment_name in cls.segment_translation:
+            lines.append(f"\ttranslations {cls.segment_translation[segment_name]}\n")
+        if segment_name in cls.segment_rotation:
+            lines.append(f"\trotations {cls.segment_rotation[segment_name]}\n")
+        return lines
 
     @classmethod
-    def _ignore_unused_markers(cls, lines: list[str], current_index: int) -> int:
+    def _convert_nodes(cls, nodes, segment_name: str = "") -> list[str]:
         """
-        This function is used to ignore the markers that are not used in the model.
+        The lines of the converted nodes: unused markers, dofs and ranges are removed, and the dofs of the converter
+        are added after the rt line of the segments.
         """
-        stripped = lines[current_index].strip()
-
-        if not stripped.startswith("marker"):
-            return current_index
-
-        marker_name = stripped.split()[1]
-        if marker_name in cls.markers:
-            # don't ignore the marker, it is used
-            return current_index
-
-        while not lines[current_index].strip().startswith("endmarker"):
-            current_index += 1
-
-        # recursive call to handle the case where there are multiple markers in a row without a new line
-        return cls._ignore_unused_markers(lines, current_index + 1)
+        updated_lines = []
+        for node in nodes:
+            if isinstance(node, Segment):
+                updated_lines.append(node.header)
+                updated_lines.extend(cls._convert_nodes(node.body, node.name))
+                updated_lines.append(node.footer)
+            elif isinstance(node, Marker):
+                if node.name in cls.markers:
+                    updated_lines.extend(node.lines)
+            elif isinstance(node, Statement):
+                updated_lines.append(node.line)
+                if segment_name and node.keyword == "rt":
+                    updated_lines.extend(cls._dofs_lines(segment_name))
+            # Dofs and Ranges are removed
+        return updated_lines
 
     @classmethod
-    def _check_missing_segments(cls, lines: list[str]) -> None:
+    def _check_missing_segments(cls, document: BioModDocument) -> None:
         """
         This function is used to check that the model contains all the required segments according to the converter.
         """
-        utils = BioModConverterUtils(lines)
-        existing_segments = set()
-        segment_name = ""
-        for i, _ in enumerate(lines):
-            segment_name = utils.get_segment_name(i, segment_name)
-            if segment_name in cls.segment_rotation or segment_name in cls.segment_translation:
-                existing_segments.add(segment_name)
-
-        missing_segments = (set(cls.segment_rotation) | set(cls.segment_translation)) - existing_segments
+        missing_segments = (set(cls.segment_rotation) | set(cls.segment_translation)) - set(document.segments)
 
         if missing_segments:
             raise ValueError(f"Missing segments: {', '.join(missing_segments)}")
 
     @classmethod
-    def _check_missing_markers(cls, lines: list[str]) -> None:
+    def _check_missing_markers(cls, document: BioModDocument) -> None:
         """
         This function is used to check that the model contains all the required markers according to the converter.
         """
-        utils = BioModConverterUtils(lines)
-        existing_markers = set()
-        for line in lines:
-            marker_name = utils.get_marker_name(line)
-            if marker_name in cls.markers:
-                existing_markers.add(marker_name)
-
-        missing_markers = set(cls.markers) - existing_markers
+        missing_markers = set(cls.markers) - set(document.markers)
         if missing_markers:
             raise ValueError(f"Missing markers: {', '.join(missing_markers)}")
 
+    @classmethod
+    def convert_document(cls, document: BioModDocument) -> str:
+        """
+        'Convert' an already parsed bioptim model, see convert.
+        The document is not modified, so it can be converted by several converters.
+
+        Parameters
+        ----------
+        document: BioModDocument
+            The parsed bioptim model (see parse_biomod)
+
+        Returns
+        -------
+        The updated bioMod model as a string
+
+        Raises
+        ------
+        ValueError
+            If the model does not contain all the required markers/segments
+        """
+        cls._check_missing_segments(document)
+        cls._check_missing_markers(document)
+
+        return "".join(cls._convert_nodes(document.nodes))
+
     @classmethod
     def convert(cls, model_content: str) -> str:
         """
@@ -120,37 +130,7 @@ class BioModConverter:
         ValueError
             If the model does not contain all the required markers/segments
         """
-        lines = [line + "\n" for line in model_content.split("\n")]
-
-        utils = BioModConverterUtils(lines)
-        cls._check_missing_segments(lines)
-        cls._check_missing_markers(lines)
-
-        n_lines = len(lines)
-        updated_lines = []
-        segment_name = ""
-
-        i = 0
-
-        while i < n_lines:
-            segment_name = utils.get_segment_name(i, segment_name)
-
-            i = cls._ignore_unused_markers(lines, i)
-
-            i = utils.ignore_dofs_lines(i)
-            # rangesQ tends to be just after the dofs
-            i = utils.skip_ranges_q(i)
-
-            stripped = lines[i].strip()
-            # if condition in the case of dofs being after rangesQ
-            if not stripped.startswith("rotations") and not stripped.startswith("translations"):
-                updated_lines.append(lines[i])
-
-            cls._add_dofs(segment_name, updated_lines, stripped)
-
-            i += 1
-
-        return "".join(updated_lines)
+        return cls.convert_document(parse_biomod(model_content))
 
 
 class StraightConverter(BioModConverter):
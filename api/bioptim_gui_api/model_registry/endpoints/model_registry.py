@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from bioptim_gui_api.model_registry.endpoints.model_registry_responses import ModelResponse
+from bioptim_gui_api.model_registry.misc.model_registry import model_registry
+
+router = APIRouter(
+    prefix="/models",
+    tags=["models"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.post("/", response_model=ModelResponse)
+async def post_model(file: UploadFile):
+    """
+    Store a bioMod once and return its reference, to be given to the ocp data instead of uploading the model again
+    (see PUT /acrobatics/model and PUT /generic_ocp/model)
+    """
+    try:
+        model_content = (await file.read()).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="The model must be an utf-8 encoded bioMod")
+
+    reference = await run_in_threadpool(model_registry().put, model_content)
+    return ModelResponse(model_hash=reference, size=len(model_content.encode("utf-8")))
+
+
+@router.get("/{model_hash}", response_class=PlainTextResponse)
+def get_model(model_hash: str):
+    try:
+        return model_registry().get(model_hash)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No model {model_hash}")
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class ModelResponse(BaseModel):
+    model_hash: str
+    size: int
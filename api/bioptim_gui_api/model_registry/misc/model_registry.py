@@ -0,0 +1,169 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from bioptim_gui_api.utils.cache_utils import EnvConfigured
+
+MODEL_REGISTRY_ENV = "BIOPTIM_GUI_MODEL_REGISTRY"
+DEFAULT_MODEL_REGISTRY = "models/registry"
+
+_model_hash_pattern = re.compile(r"[0-9a-f]{64}")
+
+
+def model_hash(model_content: str) -> str:
+    """
+    The reference of a model in the registry
+
+    Parameters
+    ----------
+    model_content: str
+        The content of the bioMod
+
+    Returns
+    -------
+    str
+        The sha256 hex digest of the content
+    """
+    return hashlib.sha256(model_content.encode("utf-8")).hexdigest()
+
+
+class ModelRegistry:
+    """
+    The uploaded bioMods, stored once on disk and referenced by the hash of their content, so that the ocp data only
+    keeps the reference instead of the whole model. The recently read models are kept in memory.
+
+    Attributes
+    ----------
+    directory: Path
+        The directory of the models, one <hash>.bioMod file per model
+    maxsize: int
+        The maximum number of models kept in memory
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_MODEL_REGISTRY, maxsize: int = 8):
+        self.directory = Path(directory)
+        self.maxsize = maxsize
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, reference: str) -> Path:
+        if not _model_hash_pattern.fullmatch(reference):
+            raise KeyError(reference)
+        return self.directory / f"{reference}.bioMod"
+
+    def _remember(self, reference: str, model_content: str) -> None:
+        with self._lock:
+            self._models[reference] = model_content
+            self._models.move_to_end(reference)
+            if len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+
+    def put(self, model_content: str) -> str:
+        """
+        Store a model, storing the same content again is a no-op
+
+        Parameters
+        ----------
+        model_content: str
+            The content of the bioMod
+
+        Returns
+        -------
+        str
+            The reference of the model
+        """
+        reference = model_hash(model_content)
+        path = self.path(reference)
+        if not path.is_file():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f"{reference}.{os.getpid()}.{threading.get_ident()}.tmp"
+            # as bytes, the newlines are kept as is (e.g. "\r\n") so that the content still has the hash of its reference
+            tmp_path.write_bytes(model_content.encode("utf-8"))
+            # atomic, a model is never read partially written
+            os.replace(tmp_path, path)
+
+        self._remember(reference, model_content)
+        return reference
+
+    def get(self, reference: str) -> str:
+        """
+        The content of a model
+
+        Parameters
+        ----------
+        reference: str
+            The reference of the model (see put)
+
+        Returns
+        -------
+        str
+            The content of the bioMod
+
+        Raises
+        ------
+        KeyError
+            If there is no model with this reference
+        """
+        with self._lock:
+            model_content = self._models.get(reference)
+            if model_content is not None:
+                self._models.move_to_end(reference)
+                return model_content
+
+        try:
+            model_content = self.path(reference).read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            raise KeyError(reference)
+
+        self._remember(reference, model_content)
+        return model_content
+
+    def __contains__(self, reference: str) -> bool:
+        try:
+            return self.path(reference).is_file()
+        except KeyError:
+            return False
+
+
+_registry = EnvConfigured(MODEL_REGISTRY_ENV, ModelRegistry, default=DEFAULT_MODEL_REGISTRY)
+
+
+def model_registry() -> ModelRegistry:
+    """
+    The registry of the directory given by the BIOPTIM_GUI_MODEL_REGISTRY environment variable, models/registry by
+    default.
+
+    Returns
+    -------
+    ModelRegistry
+        The registry
+    """
+    return _registry.get()
+
+
+def read_model_content(data: dict) -> str:
+    """
+    The content of the model of the ocp data
+
+    Parameters
+    ----------
+    data: dict
+        The ocp data, referencing its model by "model_hash"
+        (data saved before the registry existed contain the whole model in "model_content")
+
+    Returns
+    -------
+    str
+        The content of the bioMod
+
+    Raises
+    ------
+    KeyError
+        If the referenced model is not in the registry
+    """
+    if not data.get("model_hash") and "model_content" in data:
+        return data["model_content"]
+    return model_registry().get(data.get("model_hash", ""))
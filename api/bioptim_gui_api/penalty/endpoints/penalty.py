@@ -1,9 +1,13 @@
-from bioptim import QuadratureRule
-from fastapi import APIRouter
+import functools
 
+from fastapi import APIRouter, Request
+
+from bioptim_gui_api.penalty.misc.bioptim_enums import QuadratureRule
 from bioptim_gui_api.penalty.misc.enums import Node
 from bioptim_gui_api.penalty.misc.penalty_config import DefaultPenaltyConfig
+from bioptim_gui_api.penalty.misc.penalty_signatures import penalty_signatures
 from bioptim_gui_api.utils.format_utils import get_spaced_capitalized
+from bioptim_gui_api.utils.static_response import StaticJSON, add_static_route
 
 router = APIRouter(
     prefix="/penalties",
@@ -12,18 +16,15 @@ router = APIRouter(
 )
 
 
-@router.get("/nodes", response_model=list[str])
 def get_nodes():
     # not bioptim.Node because all nodes are not implemented yet
     return get_spaced_capitalized(Node)
 
 
-@router.get("/integration_rules", response_model=list[str])
 def get_integration_rules():
     return get_spaced_capitalized(QuadratureRule)
 
 
-@router.get("/objectives", response_model=dict)
 def get_objectives():
     return {
         "minimize": list(DefaultPenaltyConfig.min_to_original_dict.keys()),
@@ -31,7 +32,6 @@ def get_objectives():
     }
 
 
-@router.get("/constraints", response_model=list[str])
 def get_constraints():
     # TODO all constraints types are not implemented yet,
     #  use get_spaced_capitalized when they are
@@ -61,7 +61,6 @@ def get_constraints():
     ]
 
 
-@router.get("/available_values", response_model=dict)
 def penalties_get_available_values():
     return {
         "nodes": get_nodes(),
@@ -69,3 +68,26 @@ def penalties_get_available_values():
         "constraints": get_constraints(),
         "integration_rules": get_integration_rules(),
     }
+
+
+# the catalogs are computed once, when the api starts, and served with etags (see StaticJSON)
+add_static_route(router, "/nodes", get_nodes, response_model=list[str])
+add_static_route(router, "/integration_rules", get_integration_rules, response_model=list[str])
+add_static_route(router, "/objectives", get_objectives, response_model=dict)
+add_static_route(router, "/constraints", get_constraints, response_model=list[str])
+add_static_route(router, "/available_values", penalties_get_available_values, response_model=dict)
+
+
+@functools.cache
+def _static_penalty_signatures() -> StaticJSON:
+    # not computed when the api starts, the signatures may need to import bioptim
+    return StaticJSON(penalty_signatures())
+
+
+@router.get("/signatures", response_model=dict)
+def get_penalty_signatures(request: Request):
+    """
+    The arguments of all the penalty functions, by group ("mayer", "lagrange", "constraints") and penalty type, e.g.
+    {"mayer": {"MINIMIZE_TIME": [{"name": "min_bound", "value": None, "type": "float"}, ...], ...}, ...}
+    """
+    return _static_penalty_signatures().response(request)
@@ -0,0 +1,45 @@
+from enum import Enum, IntEnum
+
+# Snapshots of the bioptim enums used by the request and response models, so that the api starts without importing
+# bioptim (and casadi, biorbd). They must stay the same as the ones of the bioptim version of the Dockerfile, this is
+# checked by tests/penalty/misc/test_bioptim_enums.py.
+
+
+class QuadratureRule(Enum):
+    """
+    Same as bioptim.QuadratureRule
+    """
+
+    DEFAULT = "default"
+    RECTANGLE_LEFT = "rectangle_left"
+    RECTANGLE_RIGHT = "rectangle_right"
+    MIDPOINT = "midpoint"
+    APPROXIMATE_TRAPEZOIDAL = "approximate_trapezoidal"
+    TRAPEZOIDAL = "trapezoidal"
+
+
+class Node(Enum):
+    """
+    Same as bioptim.Node
+    """
+
+    START = "start"
+    MID = "mid"
+    INTERMEDIATES = "intermediates"
+    PENULTIMATE = "penultimate"
+    END = "end"
+    ALL = "all"
+    ALL_SHOOTING = "all_shooting"
+    TRANSITION = "transition"
+    MULTINODES = "multinodes"
+    DEFAULT = "default"
+
+
+class Axis(IntEnum):
+    """
+    Same as bioptim.Axis
+    """
+
+    X = 0
+    Y = 1
+    Z = 2
@@ -1,8 +1,8 @@
 from typing import Optional
 
-from bioptim import QuadratureRule, Node
 from pydantic import BaseModel
 
+from bioptim_gui_api.penalty.misc.bioptim_enums import QuadratureRule, Node
 from bioptim_gui_api.penalty.misc.enums import ObjectiveType
 
 
@@ -0,0 +1,192 @@
+import argparse
+import functools
+import importlib.metadata
+import inspect
+import json
+import os
+import re
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+# bioptim (and casadi, biorbd) is only imported when the signatures are introspected, not when they are read from disk
+
+PENALTY_SIGNATURES_CACHE_ENV = "BIOPTIM_GUI_PENALTY_SIGNATURES_CACHE"
+# the version of the format of the signatures (see get_args), signatures persisted in another format are not used
+PENALTY_SIGNATURES_FORMAT = 2
+PENALTY_GROUPS = ("mayer", "lagrange", "constraints")
+
+
+def format_arg_type(arg_type: str) -> str:
+    """
+    Format the type of the argument
+
+    Parameters
+    ----------
+    arg_type: str
+        The type of the argument (e.g. "<class 'list'>", "float")
+
+    Returns
+    -------
+    The formatted type (e.g. "list", "float")
+    """
+    pattern = r"<(class|enum) '(.*)'>"
+    arg_type = str(arg_type)
+    match = re.search(pattern, arg_type)
+    return match and match.group(2) or arg_type
+
+
+def get_args(penalty_fcn) -> list:
+    """
+    Get the arguments of the penalty function
+
+    Parameters
+    ----------
+    penalty_fcn: ObjectiveFcn or ConstraintFcn
+        The penalty function
+
+    Returns
+    -------
+    The list of arguments (e.g. [{"name": "state_idx", "value": None, "type": "list"}])
+    with "value" being the defaults value
+    """
+    penalty_fcn = penalty_fcn.value[0]
+    # arguments
+    arg_specs = inspect.getfullargspec(penalty_fcn)
+    defaults = arg_specs.defaults
+    arguments = arg_specs.annotations
+
+    formatted_arguments = [{"name": k, "value": None, "type": format_arg_type(v)} for k, v in arguments.items()]
+
+    if defaults:
+        l_defaults = len(defaults)
+        for i in range(l_defaults):
+            formatted_arguments[-l_defaults + i]["value"] = defaults[i]
+
+    formatted_arguments = [arg for arg in formatted_arguments if arg["name"] not in ("_", "penalty", "controller")]
+
+    return formatted_arguments
+
+
+def build_penalty_signatures() -> dict[str, dict[str, list]]:
+    """
+    Introspect the arguments of all the penalty functions of bioptim
+
+    Returns
+    -------
+    dict[str, dict[str, list]]
+        The arguments (see get_args) of each penalty function of each group ("mayer", "lagrange", "constraints"), e.g.
+        {"mayer": {"MINIMIZE_TIME": [{"name": "min_bound", "value": None, "type": "float"}, ...], ...}, ...}
+        The default values are converted to json (e.g. tuples to lists, enums to their values), as they are sent to the
+        GUI, so that the signatures are the same whether they are introspected or read from disk.
+    """
+    from bioptim import ConstraintFcn, ObjectiveFcn
+
+    penalty_fcns_by_group = dict(zip(PENALTY_GROUPS, (ObjectiveFcn.Mayer, ObjectiveFcn.Lagrange, ConstraintFcn)))
+
+    signatures = {}
+    for group, penalty_fcns in penalty_fcns_by_group.items():
+        signatures[group] = {}
+        for name, penalty_fcn in penalty_fcns.__members__.items():
+            try:
+                signatures[group][name] = jsonable_encoder(get_args(penalty_fcn))
+            except (TypeError, ValueError, IndexError, AttributeError):
+                # not a python function, left to get_args when it is asked for
+                continue
+    return signatures
+
+
+def bioptim_version() -> str:
+    """
+    The version of the installed bioptim, read from its metadata to not import it
+    """
+    try:
+        return importlib.metadata.version("bioptim")
+    except importlib.metadata.PackageNotFoundError:
+        import bioptim
+
+        return bioptim.__version__
+
+
+def signatures_path(directory: str | Path) -> Path:
+    """
+    The file of the signatures of the installed version of bioptim
+    """
+    return Path(directory) / f"penalty_signatures-{bioptim_version()}-{PENALTY_SIGNATURES_FORMAT}.json"
+
+
+def _read_signatures(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_signatures(path: Path, signatures: dict) -> None:
+    serialized = json.dumps(signatures)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(serialized)
+        # atomic, another process never reads partially written signatures
+        os.replace(tmp_path, path)
+    except OSError:
+        # persisting is only an optimization
+        pass
+
+
+def write_penalty_signatures(directory: str | Path) -> Path:
+    """
+    Introspect the signatures and write them in the directory, to be given in BIOPTIM_GUI_PENALTY_SIGNATURES_CACHE
+
+    Parameters
+    ----------
+    directory: str | Path
+        The directory of the signatures
+
+    Returns
+    -------
+    Path
+        The file of the signatures
+    """
+    path = signatures_path(directory)
+    _write_signatures(path, build_penalty_signatures())
+    return path
+
+
+@functools.cache
+def penalty_signatures() -> dict[str, dict[str, list]]:
+    """
+    The arguments of all the penalty functions (see build_penalty_signatures), introspected once, on first use.
+    They are persisted in the directory given by the BIOPTIM_GUI_PENALTY_SIGNATURES_CACHE environment variable (e.g.
+    "models/.signatures") if set, so that they are not introspected again by the next processes using the same version
+    of bioptim. The docker image prebuilds them (see write_penalty_signatures), bioptim is then never imported to get
+    them.
+
+    The signatures must not be modified, copy them first.
+
+    Returns
+    -------
+    dict[str, dict[str, list]]
+        The arguments of each penalty function of each group
+    """
+    directory = os.environ.get(PENALTY_SIGNATURES_CACHE_ENV)
+    if not directory:
+        return build_penalty_signatures()
+
+    path = signatures_path(directory)
+    signatures = _read_signatures(path)
+    if signatures is None:
+        signatures = build_penalty_signatures()
+        _write_signatures(path, signatures)
+    return signatures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild the signatures of the penalty functions of bioptim")
+    parser.add_argument(
+        "directory", help=f"The directory of the signatures, to be given in {PENALTY_SIGNATURES_CACHE_ENV}"
+    )
+    args = parser.parse_args()
+
+    print(f"Signatures written in {write_penalty_signatures(args.directory)}")
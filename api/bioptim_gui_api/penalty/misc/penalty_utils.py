@@ -1,60 +1,8 @@
-import inspect
-import re
+import copy
 
-import bioptim
-from bioptim import ObjectiveFcn
 from fastapi import HTTPException
 
-
-def format_arg_type(arg_type: str) -> str:
-    """
-    Format the type of the argument
-
-    Parameters
-    ----------
-    arg_type: str
-        The type of the argument (e.g. "<class 'list'>", "float")
-
-    Returns
-    -------
-    The formatted type (e.g. "list", "float")
-    """
-    pattern = r"<(class|enum) '(.*)'>"
-    arg_type = str(arg_type)
-    match = re.search(pattern, arg_type)
-    return match and match.group(2) or arg_type
-
-
-def get_args(penalty_fcn) -> list:
-    """
-    Get the arguments of the penalty function
-
-    Parameters
-    ----------
-    penalty_fcn: ObjectiveFcn or ConstraintFcn
-        The penalty function
-
-    Returns
-    -------
-    The list of arguments (e.g. [{"name": "state_idx", "value": None, "type": "list"}])
-    with "value" being the defaults value
-    """
-    penalty_fcn = penalty_fcn.value[0]
-    # arguments
-    arg_specs = inspect.getfullargspec(penalty_fcn)
-    defaults = arg_specs.defaults
-    arguments = arg_specs.annotations
-
-    formatted_arguments = [{"name": k, "value": None, "type": format_arg_type(v)} for k, v in arguments.items()]
-
-    if defaults:
-        l_defaults = len(defaults)
-        for i in range(l_defaults):
-            formatted_arguments[-l_defaults + i]["value"] = defaults[i]
-
-    formatted_arguments = [arg for arg in formatted_arguments if arg["name"] not in ("_", "penalty", "controller")]
-
-    return formatted_arguments
+from bioptim_gui_api.penalty.misc.penalty_signatures import get_args, penalty_signatures
 
 
 def obj_arguments(objective_type: str, penalty_type: str) -> list:
@@ -76,6 +24,13 @@ def obj_arguments(objective_type: str, penalty_type: str) -> list:
     if penalty_type == "CUSTOM":
         return [{"name": "function", "value": None, "type": "function"}]
 
+    arguments = penalty_signatures().get(objective_type, {}).get(penalty_type)
+    if objective_type in ("mayer", "lagrange") and arguments is not None:
+        return copy.deepcopy(arguments)
+
+    # not in the signatures, looked up in bioptim to report why
+    from bioptim import ObjectiveFcn
+
     try:
         if objective_type == "mayer":
             penalty_fcn = getattr(ObjectiveFcn.Mayer, penalty_type)
@@ -104,8 +59,14 @@ def constraint_arguments(penalty_type: str) -> list:
     The list of arguments (e.g. [{"name": "state_idx", "value": None, "type": "list"}])
     """
     penalty_type = penalty_type.upper().replace(" ", "_")
+    arguments = penalty_signatures()["constraints"].get(penalty_type)
+    if arguments is not None:
+        return copy.deepcopy(arguments)
+
+    from bioptim import ConstraintFcn
+
     try:
-        penalty_fcn = getattr(bioptim.ConstraintFcn, penalty_type)
+        penalty_fcn = getattr(ConstraintFcn, penalty_type)
     except AttributeError as e:
         raise HTTPException(404, f"{penalty_type} not found from {e}") from e
 
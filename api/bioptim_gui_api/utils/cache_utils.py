@@ -0,0 +1,74 @@
+import functools
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@functools.cache
+def source_fingerprint(paths: tuple[Path, ...]) -> str:
+    """
+    The hash of the code of some files, a value cached on disk by another version of this code is outdated.
+    The files are only read once per process.
+
+    Parameters
+    ----------
+    paths: tuple[Path, ...]
+        The files the cached values depend on
+
+    Returns
+    -------
+    str
+        The hex digest of the code
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class EnvConfigured(Generic[T]):
+    """
+    A process-wide instance configured by an environment variable, rebuilt when the variable changes (e.g. in the
+    tests).
+
+    Attributes
+    ----------
+    env_var: str
+        The name of the environment variable
+    factory: Callable[[str | None], T]
+        Build the instance from the value of the variable
+    default: str | None
+        The value used when the variable is not set or empty
+    """
+
+    def __init__(self, env_var: str, factory: Callable[[str | None], T], default: str | None = None):
+        self.env_var = env_var
+        self.factory = factory
+        self.default = default
+        self._value = None
+        self._instance = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """
+        The instance of the current value of the environment variable
+
+        Returns
+        -------
+        T
+            The instance
+        """
+        value = os.environ.get(self.env_var) or self.default
+        with self._lock:
+            # the factory may give None (e.g. nothing configured), it is not called again until the value changes
+            if not self._built or self._value != value:
+                self._instance = self.factory(value)
+                self._value = value
+                self._built = True
+            return self._instance
@@ -71,6 +71,30 @@ def invert_min_max(bounds: list, index: int) -> None:
         bounds[i]["max"][index] = -tmp
 
 
+def invert_min_max_array(min_bounds, max_bounds, index: int) -> None:
+    """
+    Invert the min and max of the bounds of all the phases at the given index, at once.
+
+    Example:
+    index = 1
+    min [[0, 0, 0], [0, 0, 0]], max [[1, 1, 1], [1, 1, 1]] -> min [[0, 0, 0], [-1, -1, -1]], max [[1, 1, 1], [0, 0, 0]]
+
+    Parameters
+    ----------
+    min_bounds: np.ndarray
+        The min bounds to invert, of shape (nb_phases, nb_dofs, nb_nodes).
+    max_bounds: np.ndarray
+        The max bounds to invert, of shape (nb_phases, nb_dofs, nb_nodes).
+    index: int
+        The index of the dof to invert.
+
+    Returns
+    -------
+    None
+    """
+    min_bounds[:, index], max_bounds[:, index] = -max_bounds[:, index], -min_bounds[:, index]
+
+
 def indent_lines(text: str, indent: int = 4) -> str:
     """
     Indent each line of the given text by the given number of spaces. Ignore beginning and trailing new lines.
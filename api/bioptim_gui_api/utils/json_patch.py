@@ -0,0 +1,172 @@
+import copy
+import json
+from difflib import SequenceMatcher
+
+
+def escape_pointer_token(token) -> str:
+    """
+    Escape a key to be used in a json pointer (RFC 6901).
+
+    Parameters
+    ----------
+    token: str | int
+        The key of a dict or the index of a list.
+
+    Returns
+    -------
+    str
+        The escaped token.
+    """
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _strictly_equal(old, new) -> bool:
+    """
+    If two json-like values are equal and of the same types, down to their nested values (1, 1.0 and True are equal in
+    python but not in json).
+
+    Parameters
+    ----------
+    old: Any
+        The json-like original value.
+    new: Any
+        The json-like modified value.
+
+    Returns
+    -------
+    bool
+        If the values are the same json.
+    """
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, dict):
+        return old.keys() == new.keys() and all(_strictly_equal(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return len(old) == len(new) and all(_strictly_equal(a, b) for a, b in zip(old, new))
+    return old == new
+
+
+def make_patch(old, new, path: str = "") -> list[dict]:
+    """
+    Compute the json patch (RFC 6902) that transforms old into new.
+    Dicts are compared key by key, lists are aligned on their equal elements so that inserting or removing an
+    element in the middle of a list does not replace all the following ones.
+
+    Parameters
+    ----------
+    old: Any
+        The json-like original value.
+    new: Any
+        The json-like modified value.
+    path: str
+        The json pointer of the values, the patch is relative to the root if empty.
+
+    Returns
+    -------
+    list[dict]
+        The operations (add, remove, replace) to apply to old in order to obtain new.
+    """
+    if _strictly_equal(old, new):
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch = []
+        for key in old:
+            if key not in new:
+                patch.append({"op": "remove", "path": f"{path}/{escape_pointer_token(key)}"})
+        for key, value in new.items():
+            key_path = f"{path}/{escape_pointer_token(key)}"
+            if key not in old:
+                patch.append({"op": "add", "path": key_path, "value": value})
+            else:
+                patch += make_patch(old[key], value, key_path)
+        return patch
+
+    if isinstance(old, list) and isinstance(new, list):
+        return _make_list_patch(old, new, path)
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _make_list_patch(old: list, new: list, path: str) -> list[dict]:
+    matcher = SequenceMatcher(
+        None,
+        [json.dumps(value, sort_keys=True) for value in old],
+        [json.dumps(value, sort_keys=True) for value in new],
+        autojunk=False,
+    )
+
+    patch = []
+    # the indices of the operations are shifted by the elements already added or removed
+    offset = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+
+        nb_common = min(i2 - i1, j2 - j1)
+        for k in range(nb_common):
+            patch += make_patch(old[i1 + k], new[j1 + k], f"{path}/{i1 + k + offset}")
+
+        for _ in range(i1 + nb_common, i2):
+            patch.append({"op": "remove", "path": f"{path}/{i1 + nb_common + offset}"})
+        offset -= i2 - i1 - nb_common
+
+        for j in range(j1 + nb_common, j2):
+            patch.append({"op": "add", "path": f"{path}/{i1 + nb_common + offset}", "value": new[j]})
+            offset += 1
+
+    return patch
+
+
+def apply_patch(document, patch: list[dict]):
+    """
+    Apply a json patch (RFC 6902) made of add, remove and replace operations.
+
+    Parameters
+    ----------
+    document: Any
+        The json-like value to patch, it is not modified.
+    patch: list[dict]
+        The operations to apply.
+
+    Returns
+    -------
+    Any
+        The patched value.
+    """
+    document = copy.deepcopy(document)
+
+    for operation in patch:
+        op, path = operation["op"], operation["path"]
+        if op not in ("add", "remove", "replace"):
+            raise ValueError(f"Unsupported operation {op}")
+
+        if path == "":
+            if op == "remove":
+                raise ValueError("Cannot remove the whole document")
+            document = copy.deepcopy(operation["value"])
+            continue
+
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in path.split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op == "add":
+                parent.insert(index, copy.deepcopy(operation["value"]))
+            elif op == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(operation["value"])
+        else:
+            if op == "remove":
+                del parent[last]
+            elif op == "replace" and last not in parent:
+                raise KeyError(f"Cannot replace {path}, it does not exist")
+            else:
+                parent[last] = copy.deepcopy(operation["value"])
+
+    return document
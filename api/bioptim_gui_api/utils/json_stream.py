@@ -0,0 +1,24 @@
+import json
+from typing import Iterable, Iterator
+
+
+def json_string_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Encode a string given in several chunks as a json string, chunk by chunk, so that it can be streamed without
+    being built in memory first.
+
+    Parameters
+    ----------
+    chunks: Iterable[str]
+        The chunks of the string
+
+    Returns
+    -------
+    Iterator[str]
+        The chunks of the json string, quotes included
+    """
+    yield '"'
+    for chunk in chunks:
+        # the escaping of a string is the concatenation of the escaping of its characters
+        yield json.dumps(chunk, ensure_ascii=False)[1:-1]
+    yield '"'
@@ -0,0 +1,97 @@
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+
+class SectionCache:
+    """
+    A least recently used cache of generated code sections, keyed by a hash of the inputs of the section.
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of sections kept
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._sections = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*inputs) -> bytes:
+        """
+        Hash json-like inputs (classes and enums are hashed by their repr)
+
+        Parameters
+        ----------
+        inputs: Any
+            The inputs of a section
+
+        Returns
+        -------
+        bytes
+            The digest of the inputs
+        """
+        encoded = json.dumps(inputs, sort_keys=True, default=repr).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+
+    def get(self, key: bytes, generate: Callable[[], str]) -> str:
+        """
+        Return the section of the key, generating it if it is not in the cache
+
+        Parameters
+        ----------
+        key: bytes
+            The key of the section (see SectionCache.key)
+        generate: Callable[[], str]
+            Generate the section
+
+        Returns
+        -------
+        str
+            The section
+        """
+        with self._lock:
+            section = self._sections.get(key)
+            if section is not None:
+                self._sections.move_to_end(key)
+                self.hits += 1
+                return section
+            self.misses += 1
+
+        section = generate()
+
+        with self._lock:
+            self._sections[key] = section
+            if len(self._sections) > self.maxsize:
+                self._sections.popitem(last=False)
+        return section
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sections.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+section_cache = SectionCache()
+
+
+def cached_section(func: Callable[..., str]) -> Callable[..., str]:
+    """
+    Cache the sections generated by func, a function of json-like arguments returning a section of generated code,
+    so that only the sections whose inputs changed are generated again.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> str:
+        key = SectionCache.key(func.__qualname__, args, kwargs)
+        return section_cache.get(key, lambda: func(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,102 @@
+import hashlib
+from typing import Any, Callable
+
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import JSONResponse
+
+# the catalogs (enum values, penalty names, ...) do not change while the api runs, but may change with a new version of
+# the api, they are revalidated with their etag after a day
+STATIC_MAX_AGE = 24 * 60 * 60
+
+
+class StaticJSON:
+    """
+    A json response whose content never changes, serialized once and served with a strong etag. The requests whose
+    If-None-Match header matches the etag are answered 304 without body.
+
+    Attributes
+    ----------
+    body: bytes
+        The serialized content
+    etag: str
+        The strong etag of the content (quoted)
+    """
+
+    def __init__(self, content: Any, max_age: int = STATIC_MAX_AGE):
+        """
+        Parameters
+        ----------
+        content: Any
+            The content, anything FastAPI can serialize
+        max_age: int
+            The number of seconds during which the clients can use the response without revalidating it
+        """
+        self.body = JSONResponse(content).body
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+        self._headers = {"ETag": self.etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """
+        If the If-None-Match header designates this content (weak comparison, as required for If-None-Match)
+
+        Parameters
+        ----------
+        if_none_match: str | None
+            The value of the header, e.g. '"abc", W/"def"' or "*"
+
+        Returns
+        -------
+        bool
+            True if the client already has the content
+        """
+        if not if_none_match:
+            return False
+        etags = [etag.strip() for etag in if_none_match.split(",")]
+        return "*" in etags or any(etag.removeprefix("W/") == self.etag for etag in etags)
+
+    def response(self, request: Request) -> Response:
+        """
+        The response to a request, 304 if the client already has the content
+
+        Parameters
+        ----------
+        request: Request
+            The request
+
+        Returns
+        -------
+        Response
+            The content, or an empty 304
+        """
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self._headers)
+        return Response(content=self.body, media_type="application/json", headers=self._headers)
+
+
+def add_static_route(router: APIRouter, path: str, content_function: Callable[[], Any], **kwargs) -> StaticJSON:
+    """
+    Add a GET endpoint serving the content of a function as a StaticJSON, the function is called once, now
+
+    Parameters
+    ----------
+    router: APIRouter
+        The router of the endpoint
+    path: str
+        The path of the endpoint
+    content_function: Callable[[], Any]
+        The function computing the content, it also names the endpoint
+    kwargs:
+        The other arguments of the endpoint (e.g. response_model)
+
+    Returns
+    -------
+    StaticJSON
+        The served content
+    """
+    static_json = StaticJSON(content_function())
+
+    def endpoint(request: Request) -> Response:
+        return static_json.response(request)
+
+    router.add_api_route(path, endpoint, methods=["GET"], name=content_function.__name__, **kwargs)
+    return static_json
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from bioptim_gui_api.utils.format_utils import get_spaced_capitalized
+from bioptim_gui_api.utils.static_response import add_static_route
 from bioptim_gui_api.variables.misc.enums import Dynamics, InterpolationType
 
 router = APIRouter(
@@ -10,21 +11,24 @@ router = APIRouter(
 )
 
 
-@router.get("/interpolation_type", response_model=list[str])
 def get_interpolation_types():
     # TODO all interpolations types are not implemented yet,
     #  use get_spaced_capitalized on bioptim.Interpolation_Type when they are
     return get_spaced_capitalized(InterpolationType)
 
 
-@router.get("/dynamics", response_model=list[str])
 def get_dynamics_list():
     return get_spaced_capitalized(Dynamics)
 
 
-@router.get("/available_values", response_model=dict)
 def variables_get_available_values():
     return {
         "interpolation_types": get_interpolation_types(),
         "dynamics": get_dynamics_list(),
     }
+
+
+# the catalogs are computed once, when the api starts, and served with etags (see StaticJSON)
+add_static_route(router, "/interpolation_type", get_interpolation_types, response_model=list[str])
+add_static_route(router, "/dynamics", get_dynamics_list, response_model=list[str])
+add_static_route(router, "/available_values", variables_get_available_values, response_model=dict)
@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from tests.acrobatics_ocp.code_generation.common import AcrobaticsGenerationCommon
 from tests.acrobatics_ocp.code_generation.common_non_collision import (
     AcrobaticsGenerationCommonNonCollision,
@@ -10,7 +12,25 @@ from tests.acrobatics_ocp.code_generation.gen_prepare_ocp_non_collision import (
 from tests.acrobatics_ocp.code_generation.imports import AcrobaticsGenerationImport
 
 
-def generated_code(data: dict, new_model_path: str, coneless_model_path: str = None) -> str:
+def generated_code_chunks(data: dict, new_model_path: str, coneless_model_path: str = None) -> Iterator[str]:
+    """
+    Generate the script of the acrobatics section by section, the sections whose inputs did not change since a
+    previous generation are not generated again (see cached_section)
+
+    Parameters
+    ----------
+    data: dict
+        The data of the acrobatics
+    new_model_path: str
+        The path of the converted model
+    coneless_model_path: str
+        The path of the converted model without the vision cone, if any
+
+    Returns
+    -------
+    Iterator[str]
+        The sections of the script, in order
+    """
     non_collision = data["collision_constraint"]
     prepare_ocp_printer = AcrobaticsGenerationPrepareOCP
     common_printer = AcrobaticsGenerationCommon
@@ -19,13 +39,16 @@ def generated_code(data: dict, new_model_path: str, coneless_model_path: str = N
         prepare_ocp_printer = AcrobaticsGenerationPrepareOCPNonCollision
         common_printer = AcrobaticsGenerationCommonNonCollision
 
-    ret = AcrobaticsGenerationImport.generate_imports()
-    ret += f'BIOMODEL_PATH = "{new_model_path}"\n'
+    yield AcrobaticsGenerationImport.generate_imports(common_printer.limit_threads())
+    yield f'BIOMODEL_PATH = "{new_model_path}"\n'
     if coneless_model_path:
-        ret += f'CONELESS_MODEL = "{coneless_model_path}"\n'
+        yield f'CONELESS_MODEL = "{coneless_model_path}"\n'
     else:
-        ret += f"CONELESS_MODEL = None\n"
-    ret += AcrobaticsGenerationCustomPenalties.all_customs_function(data)
-    ret += prepare_ocp_printer.prepare_ocp(data, new_model_path)
-    ret += common_printer.generate_common(data)
-    return ret
+        yield f"CONELESS_MODEL = None\n"
+    yield from AcrobaticsGenerationCustomPenalties.all_customs_function_chunks(data)
+    yield from prepare_ocp_printer.prepare_ocp_chunks(data, new_model_path)
+    yield from common_printer.generate_common_chunks(data)
+
+
+def generated_code(data: dict, new_model_path: str, coneless_model_path: str = None) -> str:
+    return "".join(generated_code_chunks(data, new_model_path, coneless_model_path))
@@ -1,159 +1,91 @@
-import numpy as np
+from typing import Iterator
 
-from bioptim_gui_api.utils.format_utils import format_2d_array
-from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
+from bioptim_gui_api.acrobatics_ocp.variables.utils import BioptimVariable, var_bounds_list, var_initial_guess_list
+from bioptim_gui_api.generic_ocp.code_generation.bounds import BoundsGeneration
 
 
-class AcrobaticsGenerationBounds:
+class AcrobaticsGenerationBounds(BoundsGeneration):
     """
     This class is used to generate the bounds inside prepare_ocp of the acrobatics OCP.
     """
 
-    @staticmethod
-    def declare_bounds() -> str:
-        return """
-    # Declaration of optimization variables bounds and initial guesses
-    # Path constraint
-    x_bounds = BoundsList()
-    x_initial_guesses = InitialGuessList()
-
-    u_bounds = BoundsList()
-    u_initial_guesses = InitialGuessList()
-"""
-
-    @staticmethod
-    def add_q_bounds(data: dict, model) -> str:
+    @classmethod
+    def add_q_bounds(cls, data: dict) -> str:
         phases = data["phases_info"]
-        half_twists = data["nb_half_twists"]
-        prefer_left = data["preferred_twist_side"] == "left"
+
+        q_bounds = var_bounds_list(data, "q", BioptimVariable.STATE_VARIABLE)
 
         nb_phases = len(phases)
-        q_bounds = model.get_q_bounds(half_twists, prefer_left)
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_bounds.add(
-        "q",
-        min_bound={format_2d_array(q_bounds[i]["min"])},
-        max_bound={format_2d_array(q_bounds[i]["max"])},
-        interpolation=InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT,
-        phase={i},
-    )
-"""
+            ret += cls.add_bounds("x_bounds", "q", i, q_bounds[i])
         return ret
 
-    @staticmethod
-    def add_qdot_bounds(data: dict, model) -> str:
+    @classmethod
+    def add_qdot_bounds(cls, data: dict) -> str:
         phases = data["phases_info"]
-        is_forward = sum(data["nb_half_twists"]) % 2 != 0
+
+        qdot_bounds = var_bounds_list(data, "qdot", BioptimVariable.STATE_VARIABLE)
 
         nb_phases = len(phases)
-        total_time = sum(s["duration"] for s in phases)
-        qdot_bounds = model.get_qdot_bounds(nb_phases, total_time, is_forward)
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_bounds.add(
-        "qdot",
-        min_bound={format_2d_array(qdot_bounds[i]["min"])},
-        max_bound={format_2d_array(qdot_bounds[i]["max"])},
-        interpolation=InterpolationType.CONSTANT_WITH_FIRST_AND_LAST_DIFFERENT,
-        phase={i},
-    )
-"""
+            ret += cls.add_bounds("x_bounds", "qdot", i, qdot_bounds[i])
         return ret
 
-    @staticmethod
-    def add_q_init(data: dict, model) -> str:
+    @classmethod
+    def add_q_init(cls, data: dict) -> str:
         phases = data["phases_info"]
-        half_twists = data["nb_half_twists"]
-        prefer_left = data["preferred_twist_side"] == "left"
+
+        q_init = var_initial_guess_list(data, "q", BioptimVariable.STATE_VARIABLE)
 
         nb_phases = len(phases)
-        q_init = model.get_q_init(half_twists, prefer_left)
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_initial_guesses.add(
-        "q",
-        initial_guess={format_2d_array(q_init[i].T)},
-        interpolation=InterpolationType.LINEAR,
-        phase={i},
-    )
-"""
+            ret += cls.add_initial_guess("x_initial_guesses", "q", i, q_init[i])
         return ret
 
-    @staticmethod
-    def add_qdot_init(data: dict, model) -> str:
-        phases = data["phases_info"]
-        phase_durations = [s["duration"] for s in phases]
-        nb_somersaults = data["nb_somersaults"]
-        is_forward = sum(data["nb_half_twists"]) % 2 != 0
+    @classmethod
+    def add_qdot_init(cls, data: dict) -> str:
         nb_phases = data["nb_phases"]
-        qdot_init = np.round(
-            model.get_qdot_init(nb_somersaults, phase_durations, is_forward, nb_phases),
-            2,
-        )
+        q_init = var_initial_guess_list(data, "qdot", BioptimVariable.STATE_VARIABLE)
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    x_initial_guesses.add(
-        "qdot",
-        initial_guess={format_2d_array(qdot_init[i])},
-        interpolation=InterpolationType.CONSTANT,
-        phase={i},
-    )
-"""
+            ret += cls.add_initial_guess("x_initial_guesses", "qdot", i, q_init[i])
         return ret
 
-    @staticmethod
-    def add_tau_bounds(data: dict, model) -> str:
+    @classmethod
+    def add_tau_bounds(cls, data: dict) -> str:
         nb_phases = data["nb_phases"]
-        tau_bounds = model.get_tau_bounds(nb_phases)
-        control = DefaultVariablesConfig.dynamics_control[data["dynamics"]]
+        control_name = data["phases_info"][0]["control_variables"][0]["name"]
+        control_bounds = var_bounds_list(data, control_name, BioptimVariable.CONTROL_VARIABLE)
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    u_bounds.add(
-        "{control}",
-        min_bound={format_2d_array(tau_bounds[i]["min"] )},
-        max_bound={format_2d_array(tau_bounds[i]["max"])},
-        interpolation=InterpolationType.CONSTANT,
-        phase={i},
-    )
-"""
+            ret += cls.add_bounds("u_bounds", control_name, i, control_bounds[i])
         return ret
 
-    @staticmethod
-    def add_tau_init(data: dict, model) -> str:
+    @classmethod
+    def add_tau_init(cls, data: dict) -> str:
+        control_name = data["phases_info"][0]["control_variables"][0]["name"]
         nb_phases = data["nb_phases"]
-        tau_init = model.get_tau_init(nb_phases)
-        control = DefaultVariablesConfig.dynamics_control[data["dynamics"]]
+        control_init = var_initial_guess_list(data, control_name, BioptimVariable.CONTROL_VARIABLE)
 
         ret = ""
         for i in range(nb_phases):
-            ret += f"""
-    u_initial_guesses.add(
-        "{control}",
-        initial_guess={format_2d_array(tau_init[i])},
-        interpolation=InterpolationType.CONSTANT,
-        phase={i},
-    )
-"""
+            ret += cls.add_initial_guess("u_initial_guesses", control_name, i, control_init[i])
         return ret
 
-    @staticmethod
-    def bounds(data: dict, model) -> str:
-        ret = AcrobaticsGenerationBounds.declare_bounds()
-        ret += AcrobaticsGenerationBounds.add_q_bounds(data, model)
-        ret += AcrobaticsGenerationBounds.add_qdot_bounds(data, model)
-        ret += AcrobaticsGenerationBounds.add_tau_bounds(data, model)
-        ret += AcrobaticsGenerationBounds.add_q_init(data, model)
-        ret += AcrobaticsGenerationBounds.add_qdot_init(data, model)
-        ret += AcrobaticsGenerationBounds.add_tau_init(data, model)
-        return ret
+    @classmethod
+    def bounds_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.declare_bounds()
+        yield cls.add_q_bounds(data)
+        yield cls.add_qdot_bounds(data)
+        yield cls.add_tau_bounds(data)
+        yield cls.add_q_init(data)
+        yield cls.add_qdot_init(data)
+        yield cls.add_tau_init(data)
@@ -1,17 +1,180 @@
-class AcrobaticsGenerationCommon:
+from typing import Iterator
+
+from bioptim_gui_api.generic_ocp.code_generation.common import CommonGeneration
+from bioptim_gui_api.load_existing.misc.results_index import (
+    RESULTS_INDEX_INSERT,
+    RESULTS_INDEX_NAME,
+    RESULTS_INDEX_SCHEMA,
+    RESULTS_INDEX_TIMEOUT,
+)
+
+
+class AcrobaticsGenerationCommon(CommonGeneration):
     """
     This class contains the common code for the generation of the acrobatics, including multistart, save, main, ...
     """
 
-    @staticmethod
-    def construct_path(half_twists: list[int], side: str, position: str):
+    @classmethod
+    def construct_path(cls, data: dict) -> str:
+        half_twists = data["nb_half_twists"]
+        side = data["preferred_twist_side"]
+        position = data["position"]
+
         return f"""
 def construct_filepath(save_path, seed = 0):
-    return f"{{save_path}}/acrobatics_{'_'.join(str(i) for i in half_twists)}_{side}_{position}_{{seed}}.pkl"
+    return f"{{save_path}}/acrobatics_{'_'.join(str(i) for i in half_twists)}_{side}_{position}_{{seed}}.npz"
+"""
+
+    @classmethod
+    def save_summary(cls) -> str:
+        return """
+def save_summary(sol: Solution, integrated_states: list, file_path: str, seed: int = None) -> None:
+    \"""
+    Write a small json summary of the solution alongside its file (acrobatics_..._0.npz ->
+    acrobatics_..._0.summary.json), so that the results can be ranked without loading them
+
+    Parameters
+    ----------
+    sol: Solution
+        The solution to the ocp
+    integrated_states: list
+        The states of the integrated solution
+    file_path: str
+        The path of the file of the solution
+    seed: int
+        The seed of the solution if it is a multistart
+    \"""
+
+    summary = {
+        "cost": float(sol.cost),
+        "status": sol.status,
+        "iterations": sol.iterations,
+        "solve_time": sol.real_time_to_optimize,
+        "seed": seed,
+        "final_integrated_q": np.array(integrated_states[-1]["q"])[:, -1].tolist(),
+        "final_q": np.array(sol.states[-1]["q"])[:, -1].tolist(),
+    }
+
+    with open(Path(file_path).with_suffix(".summary.json"), "w") as file:
+        json.dump(summary, file)
+"""
+
+    @classmethod
+    def index_result(cls, data: dict) -> str:
+        half_twists = "_".join(str(i) for i in data["nb_half_twists"])
+        side = data["preferred_twist_side"]
+        position = data["position"]
+        return f"""
+def index_result(sol: Solution, file_path: str, seed: int) -> None:
+    \"""
+    Add the result to the index of its folder ({RESULTS_INDEX_NAME}), so that the results can be queried without
+    loading them, e.g. the best converged ones: SELECT file_path FROM results WHERE status = 0 ORDER BY cost LIMIT 5
+    The results that did not converge are indexed even if they are not saved.
+
+    Parameters
+    ----------
+    sol: Solution
+        The solution to the ocp
+    file_path: str
+        The path of the file of the solution
+    seed: int
+        The seed of the solution
+    \"""
+
+    connection = sqlite3.connect(Path(file_path).parent / "{RESULTS_INDEX_NAME}", timeout={RESULTS_INDEX_TIMEOUT})
+    try:
+        with connection:
+            connection.execute("{RESULTS_INDEX_SCHEMA}")
+            connection.execute(
+                "{RESULTS_INDEX_INSERT}",
+                (
+                    file_path,
+                    seed,
+                    sol.status,
+                    float(sol.cost),
+                    sol.real_time_to_optimize,
+                    sol.iterations,
+                    "{half_twists}",
+                    "{side}",
+                    "{position}",
+                ),
+            )
+    finally:
+        connection.close()
 """
 
-    @staticmethod
-    def save_result():
+    @classmethod
+    def save_solution(cls) -> str:
+        return """
+def save_solution(
+    file_path: str,
+    sol: Solution,
+    integrated_states: list,
+    time_vector: list,
+    interpolated_states: list,
+    x_bounds: list,
+    metadata: dict,
+) -> None:
+    \"""
+    Save the solution as an uncompressed npz archive of its arrays ("solution/states/0/q", "solution/controls/0/tau",
+    "solution/parameters/time", "integrated_states/0/q", "interpolated_states/0/q", "time_vector/0", "x_bounds/0/q/min", ...) and of its json
+    metadata ("__metadata__"). It does not depend on the versions of the libraries, is safe to load, and its arrays can
+    be read one by one or memory-mapped, e.g. np.load(file_path)["solution/states/0/q"]
+
+    Parameters
+    ----------
+    file_path: str
+        The path of the file (.npz)
+    sol: Solution
+        The solution to the ocp
+    integrated_states: list
+        The states of the integrated solution
+    time_vector: list
+        The time vector of the integrated solution
+    interpolated_states: list
+        The states of the interpolated solution
+    x_bounds: list
+        The bounds of the states of each phase
+    metadata: dict
+        The json metadata of the solution
+    \"""
+
+    def as_list(phases):
+        return phases if isinstance(phases, list) else [phases]
+
+    arrays = {}
+    groups = {
+        "solution/states": sol.states,
+        "solution/controls": sol.controls,
+        "integrated_states": integrated_states,
+        "interpolated_states": interpolated_states,
+    }
+    for group, phases in groups.items():
+        for phase, phase_arrays in enumerate(as_list(phases)):
+            for key, array in phase_arrays.items():
+                arrays[f"{group}/{phase}/{key}"] = np.asarray(array)
+
+    for key, parameter in sol.parameters.items():
+        arrays[f"solution/parameters/{key}"] = np.asarray(parameter)
+
+    for phase, phase_time_vector in enumerate(as_list(time_vector)):
+        arrays[f"time_vector/{phase}"] = np.asarray(phase_time_vector)
+
+    for phase, phase_bounds in enumerate(x_bounds):
+        for key in as_list(sol.states)[phase]:
+            try:
+                arrays[f"x_bounds/{phase}/{key}/min"] = np.asarray(phase_bounds[key].min)
+                arrays[f"x_bounds/{phase}/{key}/max"] = np.asarray(phase_bounds[key].max)
+            except (KeyError, AttributeError, TypeError):
+                continue  # e.g. "all", which has no bounds
+
+    metadata = {"format_version": 1, "nb_phases": len(as_list(sol.states)), **metadata}
+    encoded_metadata = np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8)
+    np.savez(file_path, __metadata__=encoded_metadata, **arrays)
+"""
+
+    @classmethod
+    def save_result(cls) -> str:
         return """
 def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -> None:
     \"""
@@ -28,8 +191,8 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
     \"""
 
     try:
-        seed, is_multistart = combinatorial_parameters
-    except:
+        seed, is_multistart, warm_start, n_threads = combinatorial_parameters
+    except ValueError:
         seed, is_multistart = 0, False
     
     x_bounds = extra_parameters["x_bounds"]
@@ -40,6 +203,9 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
     if not os.path.exists(save_folder):
         os.mkdir(save_folder)
 
+    file_path = construct_filepath(save_folder, seed)
+    index_result(sol, file_path, seed)
+
     with open(f"{save_folder}/log.txt", "a") as f:
         if sol.status != 0:
             f.write(f"{seed} DVG\\n")
@@ -47,8 +213,6 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
         else:
             f.write(f"{seed} CVG\\n")
 
-    file_path = construct_filepath(save_folder, seed)
-
     integrated = sol.integrate(merge_phases=True)
     integrated_states, time_vector = integrated._states["unscaled"], integrated._time_vector
 
@@ -57,24 +221,21 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
     n_frames = [round(time_parameters[i][0] * fps) for i in range(len(time_parameters))]
     interpolated_states = sol.interpolate(n_frames).states
 
-    to_save = {
-            "biomodel_path": BIOMODEL_PATH,
-            "coneless_model": CONELESS_MODEL,
-            "solution": sol,
-            "integrated_states": integrated_states,
-            "time_vector": time_vector,
-            "interpolated_states": interpolated_states,
-            "seed": seed if is_multistart else None,
-            "x_bounds": x_bounds,
+    metadata = {
+        "biomodel_path": BIOMODEL_PATH,
+        "coneless_model": CONELESS_MODEL,
+        "seed": seed if is_multistart else None,
+        "cost": float(sol.cost),
+        "status": sol.status,
+        "iterations": sol.iterations,
+        "solve_time": sol.real_time_to_optimize,
     }
-    del sol.ocp
-
-    with open(file_path, "wb") as file:
-        pkl.dump(to_save, file)
+    save_solution(file_path, sol, integrated_states, time_vector, interpolated_states, x_bounds, metadata)
+    save_summary(sol, integrated_states, file_path, seed if is_multistart else None)
 """
 
-    @staticmethod
-    def should_solve():
+    @classmethod
+    def should_solve(cls) -> str:
         return """
 def should_solve(*combinatorial_parameters, **extra_parameters):
     \"""
@@ -88,15 +249,45 @@ def should_solve(*combinatorial_parameters, **extra_parameters):
         All the non-combinatorial parameters sent by the user
     \"""
 
-    seed, is_multistart = combinatorial_parameters
+    seed, is_multistart, warm_start, n_threads = combinatorial_parameters
     save_folder = extra_parameters["save_folder"]
 
     file_path = construct_filepath(save_folder, seed)
     return not os.path.exists(file_path)
 """
 
-    @staticmethod
-    def get_solver():
+    @classmethod
+    def prepare_ocp_once(cls) -> str:
+        return """
+_built_ocps = {}
+
+
+def prepare_ocp_once(*combinatorial_parameters) -> OptimalControlProgram:
+    \"""
+    Callback of the prepare_ocp_callback, the ocp is built once per process and structure of the ocp, the next seeds
+    solved by the process only update the initial guesses of the built ocp, instead of building it again.
+    The structure is given by every combinatorial parameter but the seed and the source of the initial guesses (the
+    third one), e.g. the ocp of the warm up stage, with its own penalties and bounds, is not reused by the next stage.
+
+    Parameters
+    ----------
+    combinatorial_parameters:
+        The current values of the combinatorial_parameters being treated, the number of threads being the last one
+    \"""
+
+    seed, structure, guesses_source, n_threads = combinatorial_parameters
+    key = (structure, n_threads)
+    ocp = _built_ocps.get(key)
+    if ocp is None:
+        ocp = _built_ocps[key] = prepare_ocp(*combinatorial_parameters)
+    else:
+        _, _, x_initial_guesses, u_initial_guesses = prepare_bounds_and_initial_guesses(seed, structure, guesses_source)
+        ocp.update_initial_guess(x_init=x_initial_guesses, u_init=u_initial_guesses)
+    return ocp
+"""
+
+    @classmethod
+    def get_solver(cls) -> str:
         return """
 def get_solver():
     solver = Solver.IPOPT(show_online_optim=False, show_options=dict(show_bounds=True))
@@ -106,8 +297,8 @@ def get_solver():
     return solver
 """
 
-    @staticmethod
-    def prepare_multi_start():
+    @classmethod
+    def prepare_multi_start(cls) -> str:
         return """
 def prepare_multi_start(
     combinatorial_parameters: dict,
@@ -121,7 +312,7 @@ def prepare_multi_start(
 
     return MultiStart(
         combinatorial_parameters=combinatorial_parameters,
-        prepare_ocp_callback=prepare_ocp,
+        prepare_ocp_callback=prepare_ocp_once,
         post_optimization_callback=(save_results, {"save_folder": save_folder, "x_bounds": x_bounds}),
         should_solve_callback=(should_solve, {"save_folder": save_folder}),
         solver=get_solver(),  # You cannot use show_online_optim with multi-start
@@ -129,11 +320,22 @@ def prepare_multi_start(
     )
 """
 
-    @staticmethod
-    def main_function(half_twists: list[int], side: str, position: str) -> str:
+    @classmethod
+    def main_function(cls, data: dict) -> str:
+        half_twists = data["nb_half_twists"]
+        side = data["preferred_twist_side"]
+        position = data["position"]
         file_addon = f"{'_'.join(str(i) for i in half_twists)}_{side}_{position}"
+        nb_phases = len(data["phases_info"])
         return f"""
-def main(is_multistart: bool = False, nb_seeds: int = 1, save_folder: str = "save"):
+def main(
+    is_multistart: bool = False,
+    nb_seeds: int = 1,
+    save_folder: str = "save",
+    n_pools: int = 1,
+    n_threads: int = 1,
+    warm_start: str = None,
+):
     # --- Prepare the multi-start and run it --- #
 
     seed = [i for i in range(nb_seeds)]
@@ -141,48 +343,124 @@ def main(is_multistart: bool = False, nb_seeds: int = 1, save_folder: str = "sav
     combinatorial_parameters = {{
         "seed": seed,
         "is_multistart": [is_multistart],
+        "warm_start": [warm_start],
+        "n_threads": [n_threads],
     }}
 
     if not os.path.exists(save_folder):
         os.mkdir(save_folder)
-    
-    ocp = prepare_ocp()
-    nb_phases = len(ocp.nlp)
-    x_bounds = [ocp.nlp[phase].x_bounds for phase in range(nb_phases)]
+
+    x_bounds, _, _, _ = prepare_bounds_and_initial_guesses()
+    x_bounds = [x_bounds[phase] for phase in range({nb_phases})]
 
     if is_multistart:
         multi_start = prepare_multi_start(
             combinatorial_parameters=combinatorial_parameters,
             save_folder=save_folder,
-            n_pools=2,
+            n_pools=n_pools,
             x_bounds=x_bounds,
         )
 
         start_time = time.time()
         multi_start.solve()
         with open(f"{{save_folder}}/timelog.txt", "a") as f:
-            f.write(f"multi_{{nb_seeds}}_acrobatics_{file_addon}: {{time.time() - start_time}}\\n")
+            f.write(
+                f"multi_{{nb_seeds}}_acrobatics_{file_addon} (pools: {{n_pools}}, threads: {{n_threads}}): "
+                f"{{time.time() - start_time}}\\n"
+            )
 
     else:
-        ocp = prepare_ocp()
+        ocp = prepare_ocp(warm_start=warm_start, n_threads=n_threads)
         solver = get_solver()
 
         start_time = time.time()
         sol = ocp.solve(solver=solver)
         with open(f"{{save_folder}}/timelog.txt", "a") as f:
-            f.write(f"acrobatics_{file_addon}: {{time.time() - start_time}}\\n")
+            f.write(f"acrobatics_{file_addon} (threads: {{n_threads}}): {{time.time() - start_time}}\\n")
 
         save_results(sol, save_folder=save_folder, x_bounds=x_bounds)
 """
 
-    @staticmethod
-    def name_eq_main():
+    @classmethod
+    def parallelism(cls) -> str:
+        return """
+def parallelism(args: argparse.Namespace) -> tuple[int, int]:
+    \"""
+    The number of ocps solved in parallel by the multistart and the number of threads of each ocp
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        The multistart, pools and threads arguments of the script
+
+    Returns
+    -------
+    tuple[int, int]
+        The number of pools and the number of threads of each ocp
+    \"""
+
+    nb_seeds = args.multistart or 1
+    n_pools = max(1, min(args.pools or 1, nb_seeds)) if args.multistart is not None else 1
+    return n_pools, args.threads or max(1, (os.cpu_count() or 1) // n_pools)
+"""
+
+    @classmethod
+    def limit_threads(cls) -> str:
+        return f"""
+{cls.parallelism()}
+
+def limit_threads() -> None:
+    \"""
+    Cap the threads of the numerical libraries (OpenMP, BLAS, used e.g. by the linear solver of IPOPT) of this process
+    and of the processes of the multistart to the threads of each ocp, so that the ocps solved in parallel do not
+    oversubscribe the cores. The libraries read the caps when they are loaded, so this is run before importing them,
+    with the arguments of the script. The caps already set in the environment are kept.
+    \"""
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-m', '--multistart', type=int)
+    parser.add_argument('-p', '--pools', type=int, default=os.cpu_count())
+    parser.add_argument('-t', '--threads', type=int)
+    _, n_threads = parallelism(parser.parse_known_args()[0])
+    for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(variable, str(n_threads))
+
+
+if __name__ == "__main__":
+    limit_threads()
+
+"""
+
+    @classmethod
+    def name_eq_main(cls) -> str:
         return """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
 
     # Optional argument for multistart
     parser.add_argument('-m', '--multistart', type=int, help='Number of seeds for multistart')
+    parser.add_argument(
+        '-p',
+        '--pools',
+        type=int,
+        default=os.cpu_count(),
+        help='Number of ocps solved in parallel by the multistart, the number of cores by default',
+    )
+    parser.add_argument(
+        '-t', '--threads', type=int, help='Number of threads of each ocp, the cores shared between the pools by default'
+    )
+    parser.add_argument(
+        '-w',
+        '--warm-start',
+        type=str,
+        help='Start from a previous solution (.npz), e.g. the best one of a similar figure, instead of the initial guesses',
+    )
+    parser.add_argument(
+        '-c',
+        '--function-cache',
+        type=str,
+        help='Directory where the custom penalty functions are compiled and cached, by model, for the next runs',
+    )
 
     args = parser.parse_args()
 
@@ -192,21 +470,25 @@ if __name__ == "__main__":
     nb_seeds = args.multistart or 1
     is_multi = args.multistart is not None
 
-    main(is_multi, nb_seeds, save_folder_path)
+    n_pools, n_threads = parallelism(args)
+    if args.function_cache:
+        # read by the processes of the multistart too
+        os.environ["BIOPTIM_GUI_FUNCTION_CACHE"] = args.function_cache
 
-"""
+    main(is_multi, nb_seeds, save_folder_path, n_pools, n_threads, args.warm_start)
 
-    @staticmethod
-    def generate_common(data: dict) -> str:
-        half_twists = data["nb_half_twists"]
-        side = data["preferred_twist_side"]
-        position = data["position"]
+"""
 
-        ret = AcrobaticsGenerationCommon.construct_path(half_twists, side, position)
-        ret += AcrobaticsGenerationCommon.save_result()
-        ret += AcrobaticsGenerationCommon.should_solve()
-        ret += AcrobaticsGenerationCommon.get_solver()
-        ret += AcrobaticsGenerationCommon.prepare_multi_start()
-        ret += AcrobaticsGenerationCommon.main_function(half_twists, side, position)
-        ret += AcrobaticsGenerationCommon.name_eq_main()
-        return ret
+    @classmethod
+    def generate_common_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.construct_path(data)
+        yield cls.save_solution()
+        yield cls.save_summary()
+        yield cls.index_result(data)
+        yield cls.save_result()
+        yield cls.should_solve()
+        yield cls.prepare_ocp_once()
+        yield cls.get_solver()
+        yield cls.prepare_multi_start()
+        yield cls.main_function(data)
+        yield cls.name_eq_main()
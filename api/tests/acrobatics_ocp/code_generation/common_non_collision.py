@@ -6,16 +6,19 @@ class AcrobaticsGenerationCommonNonCollision(AcrobaticsGenerationCommon):
     This class contains the common code for the generation of the acrobatics, including multistart, save, main, ...
     """
 
-    @staticmethod
-    def construct_path(half_twists: list[int], side: str, position: str):
+    @classmethod
+    def construct_path(cls, data: dict) -> str:
+        half_twists = data["nb_half_twists"]
+        side = data["preferred_twist_side"]
+        position = data["position"]
         return f"""
 def construct_filepath(warming_up, save_path, seed = 0):
     is_warm = "warming" if warming_up else "warm"
-    return f"{{save_path}}/{{is_warm}}_acrobatics_{'_'.join(str(i) for i in half_twists)}_{side}_{position}_{{seed}}.pkl"
+    return f"{{save_path}}/{{is_warm}}_acrobatics_{'_'.join(str(i) for i in half_twists)}_{side}_{position}_{{seed}}.npz"
 """
 
-    @staticmethod
-    def save_result():
+    @classmethod
+    def save_result(cls) -> str:
         return """
 def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -> None:
     \"""
@@ -37,7 +40,7 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
     warming_up = extra_parameters["warming_up"]
     x_bounds = extra_parameters["x_bounds"]
 
-    seed, warming_up, pkl_path = combinatorial_parameters
+    seed, warming_up, pkl_path, n_threads = combinatorial_parameters
     if not warming_up:
         seed = int(pkl_path.split("_")[-1].split(".")[0])
 
@@ -51,6 +54,7 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
             f.write(f"{seed} CVG\\n")
 
     file_path = construct_filepath(warming_up, save_folder, seed)
+    index_result(sol, file_path, seed)
 
     integrated = sol.integrate(merge_phases=True)
     integrated_states, time_vector = integrated._states["unscaled"], integrated._time_vector
@@ -60,41 +64,38 @@ def save_results(sol: Solution, *combinatorial_parameters, **extra_parameters) -
     n_frames = [round(time_parameters[i][0] * fps) for i in range(len(time_parameters))]
     interpolated_states = sol.interpolate(n_frames).states
 
-    to_save = {
-            "biomodel_path": BIOMODEL_PATH,
-            "coneless_model": CONELESS_MODEL,
-            "solution": sol,
-            "integrated_states": integrated_states,
-            "time_vector": time_vector,
-            "interpolated_states": interpolated_states,
-            "seed": seed if warming_up else None,
-            "x_bounds": x_bounds,
+    metadata = {
+        "biomodel_path": BIOMODEL_PATH,
+        "coneless_model": CONELESS_MODEL,
+        "seed": seed if warming_up else None,
+        "cost": float(sol.cost),
+        "status": sol.status,
+        "iterations": sol.iterations,
+        "solve_time": sol.real_time_to_optimize,
     }
-    del sol.ocp
-
-    with open(file_path, "wb") as file:
-        pkl.dump(to_save, file)
+    save_solution(file_path, sol, integrated_states, time_vector, interpolated_states, x_bounds, metadata)
+    save_summary(sol, integrated_states, file_path, seed if warming_up else None)
 """
 
-    @staticmethod
-    def should_solve():
+    @classmethod
+    def should_solve(cls) -> str:
         return """
 def should_solve(*combinatorial_parameters, **extra_parameters):
     save_folder = extra_parameters["save_folder"]
     warming_up = extra_parameters["warming_up"]
 
     if warming_up:
-        seed, warming_up, pkl_path = combinatorial_parameters
+        seed, warming_up, pkl_path, n_threads = combinatorial_parameters
     else:
-        seed, warming_up, pkl_path = combinatorial_parameters
+        seed, warming_up, pkl_path, n_threads = combinatorial_parameters
         seed = int(pkl_path.split("_")[-1].split(".")[0])
 
     file_path = construct_filepath(warming_up, save_folder, seed)
     return not os.path.exists(file_path)
 """
 
-    @staticmethod
-    def get_solver():
+    @classmethod
+    def get_solver(cls) -> str:
         return """
 def get_solver(warming_up: bool = False):
     solver = Solver.IPOPT(show_online_optim=False, show_options=dict(show_bounds=True))
@@ -111,8 +112,8 @@ def get_solver(warming_up: bool = False):
     return solver
 """
 
-    @staticmethod
-    def prepare_multi_start():
+    @classmethod
+    def prepare_multi_start(cls) -> str:
         return """
 def prepare_multi_start(
     combinatorial_parameters: dict,
@@ -127,7 +128,7 @@ def prepare_multi_start(
 
     return MultiStart(
         combinatorial_parameters=combinatorial_parameters,
-        prepare_ocp_callback=prepare_ocp,
+        prepare_ocp_callback=prepare_ocp_once,
         should_solve_callback=(should_solve, {"save_folder": save_folder, "warming_up": warming_up}),
         post_optimization_callback=(save_results, {"save_folder": save_folder, "warming_up": warming_up, "x_bounds": x_bounds}),
         solver=get_solver(warming_up),  # You cannot use show_online_optim with multi-start
@@ -135,17 +136,20 @@ def prepare_multi_start(
     )
 """
 
-    @staticmethod
-    def main_function(half_twists: list[int], side: str, position: str) -> str:
+    @classmethod
+    def main_function(cls, data: dict) -> str:
+        half_twists = data["nb_half_twists"]
+        side = data["preferred_twist_side"]
+        position = data["position"]
         file_addon = f"{'_'.join(str(i) for i in half_twists)}_{side}_{position}"
+        nb_phases = len(data["phases_info"])
         return f"""
-def main(nb_seeds: int = 1, save_folder: str = "save"):
+def main(nb_seeds: int = 1, save_folder: str = "save", n_pools: int = 1, n_threads: int = 1):
     if not os.path.exists(save_folder):
         os.mkdir(save_folder)
-    
-    ocp = prepare_ocp()
-    nb_phases = len(ocp.nlp)
-    x_bounds = [ocp.nlp[phase].x_bounds for phase in range(nb_phases)]
+
+    x_bounds, _, _, _ = prepare_bounds_and_initial_guesses(warming_up=True)
+    x_bounds = [x_bounds[phase] for phase in range({nb_phases})]
 
     # --- Prepare the multi-start and run it --- #
 
@@ -155,12 +159,13 @@ def main(nb_seeds: int = 1, save_folder: str = "save"):
         "seed": seeds,
         "warming_up": [True],
         "pkl_path": [None],
+        "n_threads": [n_threads],
     }}
 
     multi_start = prepare_multi_start(
         combinatorial_parameters=combinatorial_parameters,
         save_folder=save_folder,
-        n_pools=2,
+        n_pools=n_pools,
         warming_up=True,
         x_bounds=x_bounds,
     )
@@ -168,16 +173,19 @@ def main(nb_seeds: int = 1, save_folder: str = "save"):
     start_time = time.time()
     multi_start.solve()
     with open(f"{{save_folder}}/timelog.txt", "a") as f:
-        f.write(f"warming_{{nb_seeds}}_acrobatics_{file_addon}: {{time.time() - start_time}}\\n")
+        f.write(
+            f"warming_{{nb_seeds}}_acrobatics_{file_addon} (pools: {{n_pools}}, threads: {{n_threads}}): "
+            f"{{time.time() - start_time}}\\n"
+        )
 
     pkl_paths = [construct_filepath(True, save_folder, seed) for seed in seeds]
 
     cost_path = {{}}
 
     for pkl_path in pkl_paths:
-        with open(pkl_path, "rb") as file:
-            sol = pkl.load(file)["solution"]
-            cost_path[str(sol.cost)] = pkl_path
+        with np.load(pkl_path) as file:
+            cost = json.loads(file["__metadata__"].tobytes())["cost"]
+            cost_path[str(cost)] = pkl_path
         
     pkl_paths = cost_path.values()
 
@@ -185,28 +193,70 @@ def main(nb_seeds: int = 1, save_folder: str = "save"):
         "seed": [0],
         "warming_up": [False],
         "pkl_path": pkl_paths,
+        "n_threads": [n_threads],
     }}
 
     multi_start = prepare_multi_start(
         combinatorial_parameters=combinatorial_parameters,
         save_folder=save_folder,
-        n_pools=2,
+        n_pools=n_pools,
         x_bounds=x_bounds,
     )
 
     start_time = time.time()
     multi_start.solve()
     with open(f"{{save_folder}}/timelog.txt", "a") as f:
-        f.write(f"warm_{{nb_seeds}}_acrobatics_{file_addon}: {{time.time() - start_time}}\\n")
+        f.write(
+            f"warm_{{nb_seeds}}_acrobatics_{file_addon} (pools: {{n_pools}}, threads: {{n_threads}}): "
+            f"{{time.time() - start_time}}\\n"
+        )
 """
 
-    @staticmethod
-    def name_eq_main():
+    @classmethod
+    def parallelism(cls) -> str:
+        return """
+def parallelism(args: argparse.Namespace) -> tuple[int, int]:
+    \"""
+    The number of ocps solved in parallel and the number of threads of each ocp
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        The multistart, pools and threads arguments of the script
+
+    Returns
+    -------
+    tuple[int, int]
+        The number of pools and the number of threads of each ocp
+    \"""
+
+    n_pools = max(1, min(args.pools or 1, args.multistart or 1))
+    return n_pools, args.threads or max(1, (os.cpu_count() or 1) // n_pools)
+"""
+
+    @classmethod
+    def name_eq_main(cls) -> str:
         return """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
 
     parser.add_argument('-m', '--multistart', type=int, help='Number of seeds for multistart', default=1)
+    parser.add_argument(
+        '-p',
+        '--pools',
+        type=int,
+        default=os.cpu_count(),
+        help='Number of ocps solved in parallel, the number of cores by default',
+    )
+    parser.add_argument(
+        '-t', '--threads', type=int, help='Number of threads of each ocp, the cores shared between the pools by default'
+    )
+    parser.add_argument(
+        '-c',
+        '--function-cache',
+        type=str,
+        help='Directory where the custom penalty functions are compiled and cached, by model, for the next runs',
+    )
 
     args = parser.parse_args()
 
@@ -215,20 +265,10 @@ if __name__ == "__main__":
     save_folder_path = str(save_folder_path)
     nb_seeds = args.multistart
 
-    main(nb_seeds, save_folder_path)
-"""
+    n_pools, n_threads = parallelism(args)
+    if args.function_cache:
+        # read by the processes of the multistart too
+        os.environ["BIOPTIM_GUI_FUNCTION_CACHE"] = args.function_cache
 
-    @staticmethod
-    def generate_common(data: dict) -> str:
-        half_twists = data["nb_half_twists"]
-        side = data["preferred_twist_side"]
-        position = data["position"]
-
-        ret = AcrobaticsGenerationCommonNonCollision.construct_path(half_twists, side, position)
-        ret += AcrobaticsGenerationCommonNonCollision.save_result()
-        ret += AcrobaticsGenerationCommonNonCollision.should_solve()
-        ret += AcrobaticsGenerationCommonNonCollision.get_solver()
-        ret += AcrobaticsGenerationCommonNonCollision.prepare_multi_start()
-        ret += AcrobaticsGenerationCommonNonCollision.main_function(half_twists, side, position)
-        ret += AcrobaticsGenerationCommonNonCollision.name_eq_main()
-        return ret
+    main(nb_seeds, save_folder_path, n_pools, n_threads)
+"""
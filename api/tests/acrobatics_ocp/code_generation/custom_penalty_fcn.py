@@ -1,64 +1,147 @@
+import hashlib
+from typing import Iterator
+
+
 class AcrobaticsGenerationCustomPenalties:
     """
     This class contains the custom penalty functions used in the acrobatics ocp.
     """
 
-    @staticmethod
-    def custom_trampoline_bed_in_peripheral_vision():
+    @classmethod
+    def build_peripheral_vision_function(cls) -> str:
         return """
-def custom_trampoline_bed_in_peripheral_vision(controller: PenaltyController) -> cas.MX:
+def build_peripheral_vision_function(model: BiorbdModel, jit: bool = False) -> cas.Function:
     \"""
-    This function aims to encourage the avatar to keep the trampoline bed in his peripheral vision.
-    It is done by discretizing the vision cone into vectors and determining if the vector projection of the gaze are
-    inside the trampoline bed.
+    The cost of custom_trampoline_bed_in_peripheral_vision as a function of q. The markers are evaluated once, then the
+    11 x 10 vectors discretizing the vision cone are projected on the trampoline bed all at once.
     \"""
 
     a = 1.07  # Trampoline with/2
     b = 2.14  # Trampoline length/2
     n = 6  # order of the polynomial for the trampoline bed rectangle equation
 
+    q = cas.MX.sym("q", model.nb_q)
+    markers = model.markers(q)
+
     # Get the gaze vector
-    eyes_vect_start_marker_idx = controller.model.marker_index(f"eyes_vect_start")
-    eyes_vect_end_marker_idx = controller.model.marker_index(f"eyes_vect_end")
-    gaze_vector = (
-        controller.model.markers(controller.states["q"].mx)[eyes_vect_end_marker_idx]
-        - controller.model.markers(controller.states["q"].mx)[eyes_vect_start_marker_idx]
-    )
+    vector_origin = markers[model.marker_index("eyes_vect_start")]
+    gaze_vector = markers[model.marker_index("eyes_vect_end")] - vector_origin
 
-    point_in_the_plane = np.array([1, 2, -0.83])
-    vector_normal_to_the_plane = np.array([0, 0, 1])
-    obj = 0
-    for i_r in range(11):
-        for i_th in range(10):
-            marker_idx = controller.model.marker_index(f"cone_approx_{i_r}_{i_th}")
-            vector_origin = controller.model.markers(controller.states["q"].mx)[eyes_vect_start_marker_idx]
-            vector_end = controller.model.markers(controller.states["q"].mx)[marker_idx]
-            vector = vector_end - vector_origin
+    # one column per vector of the cone
+    cone = cas.horzcat(
+        *[markers[model.marker_index(f"cone_approx_{i_r}_{i_th}")] for i_r in range(11) for i_th in range(10)]
+    )
+    nb_vectors = cone.shape[1]
+    vectors = cone - cas.repmat(vector_origin, 1, nb_vectors)
 
-            t = (
-                cas.dot(point_in_the_plane, vector_normal_to_the_plane)
-                - cas.dot(vector_normal_to_the_plane, vector_origin)
-            ) / cas.dot(vector, vector_normal_to_the_plane)
-            point_projection = vector_origin + vector * cas.fabs(t)
+    point_in_the_plane = cas.DM([1, 2, -0.83])
+    vector_normal_to_the_plane = cas.DM([0, 0, 1])
+    t = (
+        cas.dot(point_in_the_plane, vector_normal_to_the_plane)
+        - cas.dot(vector_normal_to_the_plane, vector_origin)
+    ) / cas.mtimes(vector_normal_to_the_plane.T, vectors)
+    point_projections = cas.repmat(vector_origin, 1, nb_vectors) + vectors * cas.repmat(cas.fabs(t), 3, 1)
 
-            obj += cas.tanh(((point_projection[0] / a) ** n + (point_projection[1] / b) ** n) - 1) + 1
+    obj = cas.sum2(
+        cas.tanh(((point_projections[0, :] / a) ** n + (point_projections[1, :] / b) ** n) - 1) + 1
+    )
 
     val = cas.if_else(
         gaze_vector[2] > -0.01,
-        2 * 10 * 11,
+        2 * nb_vectors,
         cas.if_else(
             cas.fabs(gaze_vector[0] / gaze_vector[2]) > np.tan(3 * np.pi / 8),
-            2 * 10 * 11,
-            cas.if_else(cas.fabs(gaze_vector[1] / gaze_vector[2]) > np.tan(3 * np.pi / 8), 2 * 10 * 11, obj),
+            2 * nb_vectors,
+            cas.if_else(cas.fabs(gaze_vector[1] / gaze_vector[2]) > np.tan(3 * np.pi / 8), 2 * nb_vectors, obj),
         ),
     )
+
+    function = cas.Function("peripheral_vision", [q], [val]).expand()
+    if not jit:
+        return function
+
+    q = cas.SX.sym("q", model.nb_q)
+    try:
+        return cas.Function(
+            "peripheral_vision",
+            [q],
+            [function(q)],
+            {"jit": True, "compiler": "shell", "jit_options": {"flags": ["-O2"]}, "jit_serialize": "embed"},
+        )
+    except RuntimeError:
+        # no compiler available, the function is cached without being compiled
+        return function
+"""
+
+    @classmethod
+    def peripheral_vision_function(cls) -> str:
+        build = cls.build_peripheral_vision_function()
+        version = hashlib.blake2b(build.encode("utf-8"), digest_size=8).hexdigest()
+        return (
+            f"""
+PERIPHERAL_VISION_FUNCTIONS = {{}}
+# the hash of build_peripheral_vision_function, the functions cached by another version of it are not loaded
+PERIPHERAL_VISION_VERSION = "{version}"
+
+"""
+            + build
+            + """
+
+def peripheral_vision_function(model: BiorbdModel) -> cas.Function:
+    \"""
+    The function of build_peripheral_vision_function, built once per model and process.
+    If the BIOPTIM_GUI_FUNCTION_CACHE environment variable gives a directory (see --function-cache), the function is
+    compiled and saved there, keyed by the hash of the model (and of the versions of casadi and of the function), so
+    that the next ocps of the same model only load it.
+    \"""
+    try:
+        with open(model.path, "rb") as f:
+            content = f.read()
+    except (AttributeError, OSError):
+        # the model is not read from a file, it can not be keyed
+        return build_peripheral_vision_function(model)
+    key = hashlib.blake2b(
+        content + cas.__version__.encode() + PERIPHERAL_VISION_VERSION.encode(), digest_size=16
+    ).hexdigest()
+
+    if key not in PERIPHERAL_VISION_FUNCTIONS:
+        cache = os.environ.get("BIOPTIM_GUI_FUNCTION_CACHE")
+        path = Path(cache) / f"peripheral_vision-{key}.casadi" if cache else None
+
+        if path is not None and path.exists():
+            function = cas.Function.load(str(path))
+        else:
+            function = build_peripheral_vision_function(model, jit=path is not None)
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                function.save(str(tmp_path))
+                # atomic, the other processes of the multistart never load a partially written function
+                os.replace(tmp_path, path)
+
+        PERIPHERAL_VISION_FUNCTIONS[key] = function
+
+    return PERIPHERAL_VISION_FUNCTIONS[key]
+"""
+        )
+
+    @classmethod
+    def custom_trampoline_bed_in_peripheral_vision(cls):
+        return """
+def custom_trampoline_bed_in_peripheral_vision(controller: PenaltyController) -> cas.MX:
+    \"""
+    This function aims to encourage the avatar to keep the trampoline bed in his peripheral vision.
+    It is done by discretizing the vision cone into vectors and determining if the vector projection of the gaze are
+    inside the trampoline bed (see build_peripheral_vision_function).
+    \"""
+    val = peripheral_vision_function(controller.model)(controller.states["q"].mx)
     out = controller.mx_to_cx("peripheral_vision", val, controller.states["q"])
 
     return out
 """
 
-    @staticmethod
-    def closest_distance_between_lines() -> str:
+    @classmethod
+    def closest_distance_between_lines(cls) -> str:
         return """
 def closest_distance_between_lines():
     # adapté de https://stackoverflow.com/questions/2824478/shortest-distance-between-two-line-segments
@@ -104,8 +187,8 @@ def closest_distance_between_lines():
     return Func
 """
 
-    @staticmethod
-    def custom_noncrossing_const() -> str:
+    @classmethod
+    def custom_noncrossing_const(cls) -> str:
         return """
 def custom_noncrossing_const(
     controller: PenaltyController,
@@ -131,8 +214,8 @@ def custom_noncrossing_const(
     return constraint_value
 """
 
-    @staticmethod
-    def custom_noncrossing_obj() -> str:
+    @classmethod
+    def custom_noncrossing_obj(cls) -> str:
         return """
 def custom_noncrossing_obj(
     controller: PenaltyController,
@@ -161,37 +244,105 @@ def custom_noncrossing_obj(
     return objective_value
 """
 
-    @staticmethod
-    def add_noncrossing_penalty() -> str:
+    @classmethod
+    def custom_noncrossing_batch_const(cls) -> str:
+        return """
+def custom_noncrossing_batch_const(
+    controller: PenaltyController,
+    cylinder_pairs: list,
+    radius_1: float,
+    radius_2: float,
+):
+    distances = noncrossing_distances(controller, cylinder_pairs)
+    return distances - (radius_1 + radius_2)
+"""
+
+    @classmethod
+    def custom_noncrossing_batch_obj(cls) -> str:
+        return """
+def custom_noncrossing_batch_obj(
+    controller: PenaltyController,
+    cylinder_pairs: list,
+    radius_1: float,
+    radius_2: float,
+):
+    distances = noncrossing_distances(controller, cylinder_pairs)
+    tmp = 4 * 0.5 ** ((distances - (radius_1 + radius_2)) - 1)
+    return cas.if_else(distances > 4 * (radius_1 + radius_2), 0, tmp)
+"""
+
+    @classmethod
+    def noncrossing_distances(cls) -> str:
+        return """
+def noncrossing_distances(controller: PenaltyController, cylinder_pairs: list):
+    \"""
+    The distances between the cylinders of all the pairs [marker_1, marker_2, marker_3, marker_4], evaluated in a
+    single call of the distance function mapped over the pairs
+    \"""
+    markers = controller.model.markers(controller.states["q"].cx_start)
+    markers_idx = [[controller.model.marker_index(marker) for marker in pair] for pair in cylinder_pairs]
+
+    # one 3 x n_pairs matrix for each end of the cylinders
+    ends = [cas.horzcat(*[markers[pair_idx[i]] for pair_idx in markers_idx]) for i in range(4)]
+    distances = closest_distance_between_lines().map(len(cylinder_pairs))(*ends)
+    return distances.T
+"""
+
+    @classmethod
+    def add_noncrossing_penalty(cls) -> str:
         return """
 def add_non_crossing_penalty(objectives, constraints, warm_start=True, **kwargs):
     kwargs["quadratic"] = not warm_start
+    batch = "cylinder_pairs" in kwargs
     if warm_start:
         objectives.add(
-            custom_noncrossing_obj,
+            custom_noncrossing_batch_obj if batch else custom_noncrossing_obj,
             **kwargs,
             custom_type=ObjectiveFcn.Mayer,
         )
     else:
         constraints.add(
-            custom_noncrossing_const,
+            custom_noncrossing_batch_const if batch else custom_noncrossing_const,
             **kwargs,
         )
 """
 
     @staticmethod
-    def all_customs_function(data: dict) -> str:
+    def _custom_function_names(data: dict) -> set[str]:
+        """
+        The names of the functions of the custom penalties of all the phases
+        """
+        return {
+            argument["value"]
+            for phase in data["phases_info"]
+            for penalty in phase["objectives"] + phase["constraints"]
+            if penalty["penalty_type"] == "CUSTOM"
+            for argument in penalty["arguments"]
+            if argument["name"] == "function"
+        }
+
+    @classmethod
+    def all_customs_function_chunks(cls, data: dict) -> Iterator[str]:
         with_visual_criteria = data["with_visual_criteria"]
         collision_constraint = data["collision_constraint"]
 
-        ret = ""
-
         if with_visual_criteria:
-            ret += AcrobaticsGenerationCustomPenalties.custom_trampoline_bed_in_peripheral_vision()
+            yield cls.peripheral_vision_function()
+            yield cls.custom_trampoline_bed_in_peripheral_vision()
 
         if collision_constraint:
-            ret += AcrobaticsGenerationCustomPenalties.closest_distance_between_lines()
-            ret += AcrobaticsGenerationCustomPenalties.custom_noncrossing_const()
-            ret += AcrobaticsGenerationCustomPenalties.custom_noncrossing_obj()
-            ret += AcrobaticsGenerationCustomPenalties.add_noncrossing_penalty()
-        return ret
+            function_names = cls._custom_function_names(data)
+            yield cls.closest_distance_between_lines()
+            if function_names & {"custom_noncrossing_batch_const", "custom_noncrossing_batch_obj"}:
+                yield cls.noncrossing_distances()
+                yield cls.custom_noncrossing_batch_const()
+                yield cls.custom_noncrossing_batch_obj()
+            # the penalties of one pair, in the acrobatics saved before the pairs were batched
+            if function_names & {"custom_noncrossing_const", "custom_noncrossing_obj"}:
+                yield cls.custom_noncrossing_const()
+                yield cls.custom_noncrossing_obj()
+            yield cls.add_noncrossing_penalty()
+
+    @classmethod
+    def all_customs_function(cls, data: dict) -> str:
+        return "".join(cls.all_customs_function_chunks(data))
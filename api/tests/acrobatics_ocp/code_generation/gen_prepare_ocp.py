@@ -1,11 +1,9 @@
-from multiprocessing import cpu_count
+from typing import Iterator
 
-from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
-from bioptim_gui_api.acrobatics_ocp.variables.variable_compute import get_variable_computer
+from tests.acrobatics_ocp.code_generation.bounds import AcrobaticsGenerationBounds
 from bioptim_gui_api.penalty.misc.constraint_printer import ConstraintPrinter
 from bioptim_gui_api.penalty.misc.objective_printer import ObjectivePrinter
 from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
-from tests.acrobatics_ocp.code_generation.bounds import AcrobaticsGenerationBounds
 
 
 class AcrobaticsGenerationPrepareOCP:
@@ -13,12 +11,16 @@ class AcrobaticsGenerationPrepareOCP:
     This class is used to generate the prepare_ocp function
     """
 
-    @staticmethod
-    def prepare_ocp_header() -> str:
+    bounds_generation = AcrobaticsGenerationBounds
+
+    @classmethod
+    def prepare_ocp_header(cls) -> str:
         return """
 def prepare_ocp(
     seed: int = 0,
     is_multistart: bool = False,
+    warm_start: str = None,
+    n_threads: int = 1,
 )-> OptimalControlProgram:
     \"""
     This function build an optimal control program and instantiate it.
@@ -34,8 +36,206 @@ def prepare_ocp(
     \"""
 """
 
-    @staticmethod
-    def generic_elements(data: dict, new_model_path: str) -> str:
+    @classmethod
+    def warm_start_functions(cls, data: dict) -> str:
+        control = DefaultVariablesConfig.dynamics_control[data["dynamics"]]
+        return f"""
+def resample(array: np.ndarray, n_columns: int) -> np.ndarray:
+    \"""
+    Linearly resample the columns (the nodes) of an array to another number of columns
+    \"""
+
+    if array.shape[1] == n_columns:
+        return array
+    nodes = np.linspace(0, 1, array.shape[1])
+    new_nodes = np.linspace(0, 1, n_columns)
+    return np.array([np.interp(new_nodes, nodes, row) for row in array])
+
+
+def resample_phases(
+    arrays: list[np.ndarray], durations: list[float], new_durations: list[float], n_columns: list[int], with_end: bool
+) -> list[np.ndarray]:
+    \"""
+    Linearly resample the columns (the nodes) of the arrays of consecutive phases across other phases, e.g. when a
+    half twist added a phase. The new phases span the same total duration as the old ones, split in proportion to
+    new_durations.
+
+    Parameters
+    ----------
+    arrays: list[np.ndarray]
+        The array of each phase
+    durations: list[float]
+        The duration of each phase
+    new_durations: list[float]
+        The duration of each new phase
+    n_columns: list[int]
+        The number of columns of each new phase
+    with_end: bool
+        If the last column of each phase is at its end (states) or one interval before (controls)
+
+    Returns
+    -------
+    The array of each new phase
+    \"""
+
+    def column_times(start: float, duration: float, n: int) -> np.ndarray:
+        return start + duration * np.arange(n) / (n - 1 if with_end else n)
+
+    starts = np.concatenate(([0], np.cumsum(durations)))
+    times = np.concatenate([column_times(start, d, a.shape[1]) for start, d, a in zip(starts, durations, arrays)])
+    values = np.concatenate(arrays, axis=1)
+
+    new_durations = np.asarray(new_durations) * starts[-1] / np.sum(new_durations)
+    new_starts = np.concatenate(([0], np.cumsum(new_durations)))
+    return [
+        np.array([np.interp(column_times(start, d, n), times, row) for row in values])
+        for start, d, n in zip(new_starts, new_durations, n_columns)
+    ]
+
+
+def load_warm_start(
+    file_path: str, n_shooting: list[int], phase_time: list[float]
+) -> tuple[InitialGuessList, InitialGuessList]:
+    \"""
+    The initial guesses given by a previous solution (saved by save_results), the states and controls of each phase
+    are resampled if its number of shooting points differs. If the number of phases differs (e.g. a half twist was
+    added), the whole solution is resampled across the new phases instead.
+
+    Parameters
+    ----------
+    file_path: str
+        The path of the solution (.npz)
+    n_shooting: list[int]
+        The number of shooting points of each phase
+    phase_time: list[float]
+        The duration of each phase, used to split the solution when the number of phases differs
+
+    Returns
+    -------
+    The x_initial_guesses and u_initial_guesses
+    \"""
+
+    x_initial_guesses = InitialGuessList()
+    u_initial_guesses = InitialGuessList()
+
+    with np.load(file_path) as sol:
+        nb_phases = json.loads(sol["__metadata__"].tobytes())["nb_phases"]
+        states = {{
+            key: [sol[f"solution/states/{{phase}}/{{key}}"] for phase in range(nb_phases)] for key in ("q", "qdot")
+        }}
+        controls = [sol[f"solution/controls/{{phase}}/{control}"][:, :-1] for phase in range(nb_phases)]
+        saved_time = sol["solution/parameters/time"].ravel() if "solution/parameters/time" in sol else []
+
+    if nb_phases == len(n_shooting):
+        states = {{key: [resample(a, n + 1) for a, n in zip(arrays, n_shooting)] for key, arrays in states.items()}}
+        controls = [resample(a, n) for a, n in zip(controls, n_shooting)]
+    else:
+        if len(saved_time) != nb_phases:
+            # the durations were not saved, the phases are assumed to have the same time step
+            saved_time = [a.shape[1] - 1 for a in states["q"]]
+        states = {{
+            key: resample_phases(arrays, saved_time, phase_time, [n + 1 for n in n_shooting], True)
+            for key, arrays in states.items()
+        }}
+        controls = resample_phases(controls, saved_time, phase_time, n_shooting, False)
+
+    for phase in range(len(n_shooting)):
+        for key in ("q", "qdot"):
+            x_initial_guesses.add(
+                key,
+                initial_guess=states[key][phase],
+                interpolation=InterpolationType.EACH_FRAME,
+                phase=phase,
+            )
+
+        u_initial_guesses.add(
+            "{control}",
+            initial_guess=controls[phase],
+            interpolation=InterpolationType.EACH_FRAME,
+            phase=phase,
+        )
+
+    return x_initial_guesses, u_initial_guesses
+
+
+def load_warm_start_phase_time(file_path: str, phase_time: list[float]) -> list[float]:
+    \"""
+    The durations of the phases of a previous solution (saved by save_results), phase_time if it does not have them.
+    If the number of phases differs, phase_time scaled to the total duration of the solution (see load_warm_start).
+    \"""
+
+    with np.load(file_path) as sol:
+        if "solution/parameters/time" not in sol:
+            return phase_time
+        saved_time = np.asarray(sol["solution/parameters/time"]).ravel().tolist()
+
+    if len(saved_time) != len(phase_time):
+        return [duration * sum(saved_time) / sum(phase_time) for duration in phase_time]
+    return saved_time
+
+"""
+
+    @classmethod
+    def warm_start_initial_guesses(cls, data: dict) -> str:
+        phases = data["phases_info"]
+        return f"""
+    if warm_start:
+        phase_time = [{", ".join([str(s["duration"]) for s in phases])}]
+        x_initial_guesses, u_initial_guesses = load_warm_start(warm_start, n_shooting, phase_time)
+"""
+
+    @classmethod
+    def bounds_function_header(cls) -> str:
+        return """
+def prepare_bounds_and_initial_guesses(
+    seed: int = 0,
+    is_multistart: bool = False,
+    warm_start: str = None,
+) -> tuple[BoundsList, BoundsList, InitialGuessList, InitialGuessList]:
+    \"""
+    The bounds and the (seeded) initial guesses of the optimal control program, without building it. The initial
+    guesses are the ones of the previous solution warm_start if any
+
+    Returns
+    -------
+    The x_bounds, u_bounds, x_initial_guesses and u_initial_guesses
+    \"""
+"""
+
+    @classmethod
+    def shooting_elements(cls, data: dict) -> str:
+        phases = data["phases_info"]
+
+        return f"""
+    n_shooting = [{", ".join([str(s["nb_shooting_points"]) for s in phases])}]
+    nb_phases = {len(phases)}
+"""
+
+    @classmethod
+    def bounds_function_call(cls) -> str:
+        return """
+    x_bounds, u_bounds, x_initial_guesses, u_initial_guesses = prepare_bounds_and_initial_guesses(
+        seed, is_multistart, warm_start
+    )
+    if warm_start:
+        phase_time = load_warm_start_phase_time(warm_start, phase_time)
+"""
+
+    @classmethod
+    def bounds_function_chunks(cls, data: dict) -> Iterator[str]:
+        yield cls.warm_start_functions(data)
+        yield cls.bounds_function_header()
+        yield cls.shooting_elements(data)
+        yield from cls.bounds_generation.bounds_chunks(data)
+        yield cls.warm_start_initial_guesses(data)
+        yield cls.multistart_noise(data)
+        yield """
+    return x_bounds, u_bounds, x_initial_guesses, u_initial_guesses
+
+"""
+
+    @classmethod
+    def generic_elements(cls, data: dict, new_model_path: str) -> str:
         phases = data["phases_info"]
         nb_phases = len(phases)
 
@@ -50,8 +250,8 @@ def prepare_ocp(
 
 """
 
-    @staticmethod
-    def penalties(data: dict) -> str:
+    @classmethod
+    def penalties(cls, data: dict) -> str:
         phases = data["phases_info"]
         nb_phases = len(phases)
         ret = """
@@ -73,8 +273,8 @@ def prepare_ocp(
 """
         return ret
 
-    @staticmethod
-    def dynamics_str(data) -> str:
+    @classmethod
+    def dynamics_str(cls, data) -> str:
         dynamics = data["dynamics"].upper()
         return f"""
     # Declaration of the dynamics function used during integration
@@ -87,8 +287,8 @@ def prepare_ocp(
         )
 """
 
-    @staticmethod
-    def multinode_constraints(data) -> str:
+    @classmethod
+    def multinode_constraints(cls, data) -> str:
         phases = data["phases_info"]
         nb_phases = len(phases)
         total_time = sum(s["duration"] for s in phases)
@@ -105,9 +305,8 @@ def prepare_ocp(
     )
 """
 
-    @staticmethod
-    def multistart_noise(data: dict) -> str:
-        dynamics = data["dynamics"]
+    @classmethod
+    def multistart_noise(cls, data: dict) -> str:
         control = DefaultVariablesConfig.dynamics_control[data["dynamics"]]
         return f"""
     if is_multistart:
@@ -136,10 +335,11 @@ def prepare_ocp(
             )
 """
 
-    @staticmethod
-    def bimapping(model) -> str:
-        nb_q = model.nb_q
-        nb_tau = model.nb_tau
+    @classmethod
+    def bimapping(cls, data: dict) -> str:
+        nb_q = data["phases_info"][0]["state_variables"][0]["dimension"]
+        nb_tau = data["phases_info"][0]["control_variables"][0]["dimension"]
+
         return f"""
     mapping = BiMappingList()
     mapping.add(
@@ -149,10 +349,9 @@ def prepare_ocp(
     )
 """
 
-    @staticmethod
-    def return_ocp(torque_driven: bool) -> str:
-        n_threads = cpu_count() - 2
-        ret = f"""
+    @classmethod
+    def return_ocp(cls, torque_driven: bool) -> str:
+        ret = """
     # Construct and return the optimal control program (OCP)
     return OptimalControlProgram(
         bio_model=bio_model,
@@ -168,33 +367,29 @@ def prepare_ocp(
         if torque_driven:
             ret += "        variable_mappings=mapping,\n"
 
-        ret += f"""        use_sx=False,
+        ret += """        use_sx=False,
         constraints=constraints,
         multinode_constraints=multinode_constraints,
-        n_threads=({int(n_threads / 2)} if is_multistart else {n_threads}),
+        n_threads=n_threads,
     )
 """
         return ret
 
-    @staticmethod
-    def prepare_ocp(data: dict, new_model_path: str) -> str:
-        position = data["position"]
+    @classmethod
+    def prepare_ocp_chunks(cls, data: dict, new_model_path: str) -> Iterator[str]:
         torque_driven = data["dynamics"] == "TORQUE_DRIVEN"
-        additional_criteria = AdditionalCriteria(
-            with_visual_criteria=data["with_visual_criteria"],
-            collision_constraint=data["collision_constraint"],
-            with_spine=data["with_spine"],
-        )
-        model = get_variable_computer(position, additional_criteria)
-
-        ret = AcrobaticsGenerationPrepareOCP.prepare_ocp_header()
-        ret += AcrobaticsGenerationPrepareOCP.generic_elements(data, new_model_path)
-        ret += AcrobaticsGenerationPrepareOCP.penalties(data)
-        ret += AcrobaticsGenerationPrepareOCP.dynamics_str(data)
-        ret += AcrobaticsGenerationPrepareOCP.multinode_constraints(data)
-        ret += AcrobaticsGenerationBounds.bounds(data, model)
-        ret += AcrobaticsGenerationPrepareOCP.multistart_noise(data)
+
+        yield from cls.bounds_function_chunks(data)
+        yield cls.prepare_ocp_header()
+        yield cls.generic_elements(data, new_model_path)
+        yield cls.penalties(data)
+        yield cls.dynamics_str(data)
+        yield cls.multinode_constraints(data)
+        yield cls.bounds_function_call()
         if torque_driven:
-            ret += AcrobaticsGenerationPrepareOCP.bimapping(model)
-        ret += AcrobaticsGenerationPrepareOCP.return_ocp(torque_driven)
-        return ret
+            yield cls.bimapping(data)
+        yield cls.return_ocp(torque_driven)
+
+    @classmethod
+    def prepare_ocp(cls, data: dict, new_model_path: str) -> str:
+        return "".join(cls.prepare_ocp_chunks(data, new_model_path))
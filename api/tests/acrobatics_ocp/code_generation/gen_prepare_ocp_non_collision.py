@@ -1,15 +1,11 @@
-from multiprocessing import cpu_count
-
-from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
-from bioptim_gui_api.acrobatics_ocp.variables.variable_compute import get_variable_computer
-from bioptim_gui_api.penalty.misc.constraint_printer import ConstraintPrinter
-from bioptim_gui_api.penalty.misc.objective_printer import ObjectivePrinter
-from bioptim_gui_api.penalty.misc.penalty_utils import penalty_str_to_non_collision_penalty
-from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
 from tests.acrobatics_ocp.code_generation.bounds_non_collision import (
     AcrobaticsGenerationBoundsNonCollision,
 )
 from tests.acrobatics_ocp.code_generation.gen_prepare_ocp import AcrobaticsGenerationPrepareOCP
+from bioptim_gui_api.penalty.misc.constraint_printer import ConstraintPrinter
+from bioptim_gui_api.penalty.misc.objective_printer import ObjectivePrinter
+from bioptim_gui_api.penalty.misc.penalty_utils import penalty_str_to_non_collision_penalty
+from bioptim_gui_api.variables.misc.variables_config import DefaultVariablesConfig
 
 
 class AcrobaticsGenerationPrepareOCPNonCollision(AcrobaticsGenerationPrepareOCP):
@@ -17,13 +13,16 @@ class AcrobaticsGenerationPrepareOCPNonCollision(AcrobaticsGenerationPrepareOCP)
     This class is used to generate the prepare_ocp function for non-collision acrobatics
     """
 
-    @staticmethod
-    def prepare_ocp_header() -> str:
+    bounds_generation = AcrobaticsGenerationBoundsNonCollision
+
+    @classmethod
+    def prepare_ocp_header(cls) -> str:
         return """
 def prepare_ocp(
     seed: int = 0,
     warming_up: bool = False,
     pkl_path: str = None,
+    n_threads: int = 1,
 )-> OptimalControlProgram:
     \"""
     This function build an optimal control program and instantiate it.
@@ -39,8 +38,43 @@ def prepare_ocp(
     \"""
 """
 
-    @staticmethod
-    def penalties(data: dict) -> str:
+    @classmethod
+    def warm_start_functions(cls, data: dict) -> str:
+        # the warm up already provides the initial guesses (see use_solution_as_initial_guess)
+        return ""
+
+    @classmethod
+    def warm_start_initial_guesses(cls, data: dict) -> str:
+        return ""
+
+    @classmethod
+    def bounds_function_header(cls) -> str:
+        return """
+def prepare_bounds_and_initial_guesses(
+    seed: int = 0,
+    warming_up: bool = False,
+    pkl_path: str = None,
+) -> tuple[BoundsList, BoundsList, InitialGuessList, InitialGuessList]:
+    \"""
+    The bounds and the initial guesses of the optimal control program, without building it. The initial guesses are
+    seeded when warming up, and the solution of the warm up (pkl_path) otherwise
+
+    Returns
+    -------
+    The x_bounds, u_bounds, x_initial_guesses and u_initial_guesses
+    \"""
+"""
+
+    @classmethod
+    def bounds_function_call(cls) -> str:
+        return """
+    x_bounds, u_bounds, x_initial_guesses, u_initial_guesses = prepare_bounds_and_initial_guesses(
+        seed, warming_up, pkl_path
+    )
+"""
+
+    @classmethod
+    def penalties(cls, data: dict) -> str:
         phases = data["phases_info"]
         nb_phases = len(phases)
         ret = """
@@ -82,9 +116,8 @@ def prepare_ocp(
 """
         return ret
 
-    @staticmethod
-    def multistart_noise(data: dict) -> str:
-        dynamics = data["dynamics"]
+    @classmethod
+    def multistart_noise(cls, data: dict) -> str:
         control = DefaultVariablesConfig.dynamics_control[data["dynamics"]]
         return f"""
     if warming_up:
@@ -113,23 +146,9 @@ def prepare_ocp(
             )
 """
 
-    @staticmethod
-    def bimapping(model) -> str:
-        nb_q = model.nb_q
-        nb_tau = model.nb_tau
-        return f"""
-    mapping = BiMappingList()
-    mapping.add(
-        "tau",
-        to_second=[None, None, None, None, None, None, {", ".join([str(i) for i in range(nb_tau)])}],
-        to_first=[{", ".join([str(i + (nb_q - nb_tau)) for i in range(nb_tau)])}],
-    )
-"""
-
-    @staticmethod
-    def return_ocp(torque_driven: bool) -> str:
-        n_threads = cpu_count() - 2
-        ret = f"""
+    @classmethod
+    def return_ocp(cls, torque_driven: bool) -> str:
+        ret = """
     # Construct and return the optimal control program (OCP)
     return OptimalControlProgram(
         bio_model=bio_model,
@@ -145,34 +164,10 @@ def prepare_ocp(
         if torque_driven:
             ret += "        variable_mappings=mapping,\n"
 
-        ret += f"""        use_sx=False,
+        ret += """        use_sx=False,
         constraints=constraints,
         multinode_constraints=multinode_constraints,
-        n_threads={int(n_threads / 2)},
+        n_threads=n_threads,
     )
 """
         return ret
-
-    @staticmethod
-    def prepare_ocp(data: dict, new_model_path: str) -> str:
-        position = data["position"]
-        torque_driven = data["dynamics"] == "TORQUE_DRIVEN"
-        additional_criteria = AdditionalCriteria(
-            with_visual_criteria=data["with_visual_criteria"],
-            collision_constraint=data["collision_constraint"],
-            with_spine=data["with_spine"],
-        )
-
-        model = get_variable_computer(position, additional_criteria)
-
-        ret = AcrobaticsGenerationPrepareOCPNonCollision.prepare_ocp_header()
-        ret += AcrobaticsGenerationPrepareOCPNonCollision.generic_elements(data, new_model_path)
-        ret += AcrobaticsGenerationPrepareOCPNonCollision.penalties(data)
-        ret += AcrobaticsGenerationPrepareOCPNonCollision.dynamics_str(data)
-        ret += AcrobaticsGenerationPrepareOCPNonCollision.multinode_constraints(data)
-        ret += AcrobaticsGenerationBoundsNonCollision.bounds(data, model)
-        ret += AcrobaticsGenerationPrepareOCPNonCollision.multistart_noise(data)
-        if torque_driven:
-            ret += AcrobaticsGenerationPrepareOCPNonCollision.bimapping(model)
-        ret += AcrobaticsGenerationPrepareOCPNonCollision.return_ocp(torque_driven)
-        return ret
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bioptim_gui_api.acrobatics_ocp.code_generation.custom_penalty_fcn import AcrobaticsGenerationCustomPenalties
+from bioptim_gui_api.acrobatics_ocp.penalties.phases.collision_constraint import collision_constraint_constraints
+
+try:
+    import casadi as cas
+except ImportError:
+    cas = None
+
+config_examples_path = "acrobatics_ocp/config_examples"
+
+
+def config(folder: str, position: str = "pike") -> dict:
+    with open(f"{config_examples_path}/simple/{folder}/{position}.json", "r") as json_file:
+        return json.load(json_file)
+
+
+def test_peripheral_vision():
+    data = config("with_visual")
+    customs = AcrobaticsGenerationCustomPenalties.all_customs_function(data)
+    compile(customs, "customs", "exec")
+
+    assert "def custom_trampoline_bed_in_peripheral_vision(" in customs
+    assert "def peripheral_vision_function(" in customs
+    # the markers are evaluated once for all the vectors of the cone
+    assert customs.count(".markers(") == 1
+    assert "BIOPTIM_GUI_FUNCTION_CACHE" in customs
+
+    data["with_visual_criteria"] = False
+    assert "peripheral_vision" not in AcrobaticsGenerationCustomPenalties.all_customs_function(data)
+
+
+def test_peripheral_vision_version():
+    customs = AcrobaticsGenerationCustomPenalties.peripheral_vision_function()
+    build = AcrobaticsGenerationCustomPenalties.build_peripheral_vision_function()
+    version = hashlib.blake2b(build.encode("utf-8"), digest_size=8).hexdigest()
+
+    # the functions cached by another version of build_peripheral_vision_function are not loaded
+    assert f'PERIPHERAL_VISION_VERSION = "{version}"' in customs
+    assert "PERIPHERAL_VISION_VERSION.encode()" in customs
+
+
+class LinearMarkersModel:
+    """
+    A model with the markers of the vision cone, each marker being an affine function of q
+    """
+
+    nb_q = 4
+
+    def __init__(self, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.names = ["eyes_vect_start", "eyes_vect_end"] + [
+            f"cone_approx_{i_r}_{i_th}" for i_r in range(11) for i_th in range(10)
+        ]
+        # the eyes above the trampoline bed, looking down at the cone
+        offsets = [np.array([0.0, 0.0, 1.0]), np.array([0.05, 0.05, 0.5])]
+        offsets += [np.array([*rng.uniform(-0.5, 0.5, 2), 0.5]) for _ in range(110)]
+        self.offsets = offsets
+        self.gains = [rng.uniform(-0.1, 0.1, (3, self.nb_q)) for _ in self.names]
+
+    def marker_index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def markers(self, q):
+        return [cas.mtimes(cas.DM(gain), q) + cas.DM(offset) for gain, offset in zip(self.gains, self.offsets)]
+
+
+def loop_peripheral_vision(model: LinearMarkersModel, q):
+    # the cost as computed, one vector of the cone at a time, before build_peripheral_vision_function
+    a, b, n = 1.07, 2.14, 6
+    markers = model.markers(q)
+    vector_origin = markers[model.marker_index("eyes_vect_start")]
+    gaze_vector = markers[model.marker_index("eyes_vect_end")] - vector_origin
+
+    point_in_the_plane = np.array([1, 2, -0.83])
+    vector_normal_to_the_plane = np.array([0, 0, 1])
+    obj = 0
+    for i_r in range(11):
+        for i_th in range(10):
+            vector = markers[model.marker_index(f"cone_approx_{i_r}_{i_th}")] - vector_origin
+            t = (
+                cas.dot(point_in_the_plane, vector_normal_to_the_plane)
+                - cas.dot(vector_normal_to_the_plane, vector_origin)
+            ) / cas.dot(vector, vector_normal_to_the_plane)
+            point_projection = vector_origin + vector * cas.fabs(t)
+            obj += cas.tanh(((point_projection[0] / a) ** n + (point_projection[1] / b) ** n) - 1) + 1
+
+    return cas.if_else(
+        gaze_vector[2] > -0.01,
+        2 * 10 * 11,
+        cas.if_else(
+            cas.fabs(gaze_vector[0] / gaze_vector[2]) > np.tan(3 * np.pi / 8),
+            2 * 10 * 11,
+            cas.if_else(cas.fabs(gaze_vector[1] / gaze_vector[2]) > np.tan(3 * np.pi / 8), 2 * 10 * 11, obj),
+        ),
+    )
+
+
+@pytest.mark.skipif(cas is None, reason="casadi is not installed")
+def test_peripheral_vision_same_as_loop():
+    namespace = {"cas": cas, "np": np, "os": os, "hashlib": hashlib, "Path": Path, "BiorbdModel": object}
+    exec(AcrobaticsGenerationCustomPenalties.peripheral_vision_function(), namespace)
+
+    model = LinearMarkersModel()
+    vectorized = namespace["build_peripheral_vision_function"](model)
+    q = cas.MX.sym("q", model.nb_q)
+    loop = cas.Function("loop", [q], [loop_peripheral_vision(model, q)])
+
+    rng = np.random.default_rng(1)
+    values = []
+    for q_value in [np.zeros(model.nb_q), *rng.uniform(-2, 2, (5, model.nb_q))]:
+        expected = float(loop(q_value))
+        values.append(expected)
+        assert float(vectorized(q_value)) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+    # the cone is projected (not only the fallback value when the gaze does not look down)
+    assert any(value != 2 * 110 for value in values)
+
+
+@pytest.mark.parametrize("position", ["straight", "pike", "tuck"])
+def test_noncrossing_batch(position):
+    data = config("with_collision", position)
+    for phase in data["phases_info"]:
+        phase["constraints"] = [
+            constraint
+            for constraint in phase["constraints"]
+            if not any(argument["name"] == "marker_1" for argument in constraint["arguments"])
+        ]
+        phase["constraints"] += collision_constraint_constraints(phase["phase_name"], position)
+
+    customs = AcrobaticsGenerationCustomPenalties.all_customs_function(data)
+    compile(customs, "customs", "exec")
+
+    assert "def custom_noncrossing_batch_const(" in customs
+    assert "def custom_noncrossing_batch_obj(" in customs
+    assert "def custom_noncrossing_const(" not in customs
+    assert "def add_non_crossing_penalty(" in customs
+
+
+def test_noncrossing_per_pair():
+    # the acrobatics saved with one penalty per pair
+    customs = AcrobaticsGenerationCustomPenalties.all_customs_function(config("with_collision"))
+
+    assert "def custom_noncrossing_const(" in customs
+    assert "def custom_noncrossing_obj(" in customs
+    assert "def custom_noncrossing_batch_const(" not in customs
@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pytest
+
+from bioptim_gui_api.acrobatics_ocp.code_generation.gen_prepare_ocp import AcrobaticsGenerationPrepareOCP
+
+
+class InitialGuessList(list):
+    def add(self, key, initial_guess, interpolation, phase):
+        self.append((key, phase, initial_guess))
+
+
+class InterpolationType:
+    EACH_FRAME = "EACH_FRAME"
+
+
+@pytest.fixture
+def warm_start_functions() -> dict:
+    namespace = {"np": np, "json": json, "InitialGuessList": InitialGuessList, "InterpolationType": InterpolationType}
+    exec(AcrobaticsGenerationPrepareOCP.warm_start_functions({"dynamics": "TORQUE_DRIVEN"}), namespace)
+    return namespace
+
+
+@pytest.fixture
+def solution(tmp_path) -> str:
+    """
+    A solution of 3 phases whose states and controls are the time
+    """
+    durations, n_shooting = [0.3, 0.5, 0.2], [10, 20, 5]
+    arrays = {"solution/parameters/time": np.array(durations)}
+    start = 0
+    for phase, (duration, n) in enumerate(zip(durations, n_shooting)):
+        time = start + duration * np.arange(n + 1) / n
+        arrays[f"solution/states/{phase}/q"] = np.vstack([time, time])
+        arrays[f"solution/states/{phase}/qdot"] = np.vstack([2 * time])
+        arrays[f"solution/controls/{phase}/tau"] = np.vstack([time])
+        start += duration
+
+    path = tmp_path / "solution.npz"
+    metadata = np.frombuffer(json.dumps({"nb_phases": 3}).encode("utf-8"), dtype=np.uint8)
+    np.savez(path, __metadata__=metadata, **arrays)
+    return str(path)
+
+
+def test_load_warm_start_same_phases(warm_start_functions, solution):
+    x_initial_guesses, u_initial_guesses = warm_start_functions["load_warm_start"](solution, [20, 20, 5], [1, 1, 1])
+
+    assert [(key, phase, guess.shape) for key, phase, guess in x_initial_guesses] == [
+        ("q", 0, (2, 21)),
+        ("qdot", 0, (1, 21)),
+        ("q", 1, (2, 21)),
+        ("qdot", 1, (1, 21)),
+        ("q", 2, (2, 6)),
+        ("qdot", 2, (1, 6)),
+    ]
+    assert [guess.shape for _, _, guess in u_initial_guesses] == [(1, 20), (1, 20), (1, 5)]
+    np.testing.assert_allclose(x_initial_guesses[0][2][0], np.linspace(0, 0.3, 21))
+
+
+def test_load_warm_start_other_phases(warm_start_functions, solution):
+    # e.g. a half twist added 2 phases, the solution is resampled across them
+    x_initial_guesses, u_initial_guesses = warm_start_functions["load_warm_start"](solution, [40] * 5, [2] * 5)
+
+    assert [(key, phase) for key, phase, _ in x_initial_guesses] == [
+        (key, phase) for phase in range(5) for key in ("q", "qdot")
+    ]
+    for key, phase, guess in x_initial_guesses:
+        time = np.linspace(0.2 * phase, 0.2 * (phase + 1), 41)
+        np.testing.assert_allclose(guess, [time, time] if key == "q" else [2 * time], atol=1e-12)
+
+    assert [phase for _, phase, _ in u_initial_guesses] == list(range(5))
+    assert all(guess.shape == (1, 40) for _, _, guess in u_initial_guesses)
+
+
+def test_load_warm_start_phase_time(warm_start_functions, solution):
+    load_warm_start_phase_time = warm_start_functions["load_warm_start_phase_time"]
+    assert load_warm_start_phase_time(solution, [1, 1, 1]) == [0.3, 0.5, 0.2]
+    # other phases, in the same total duration as the solution
+    assert load_warm_start_phase_time(solution, [1, 1, 2, 1]) == pytest.approx([0.2, 0.2, 0.4, 0.2])
@@ -1,5 +1,3 @@
-import json
-
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -17,22 +15,15 @@ client = TestClient(test_app)
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-
-    datafile = AcrobaticsOCPData.datafile
-
-    with open(datafile, "w") as f:
-        base_data = AcrobaticsOCPData.base_data
-        json.dump(base_data, f)
+    # before test: create data
+    AcrobaticsOCPData.reset_data()
 
     update_phase_info()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    AcrobaticsOCPData.delete_data()
 
 
 def test_base_info():
@@ -365,3 +356,12 @@ def test_available_values():
     assert data["sport_types"] == ["Trampoline", "Diving"]
     assert data["positions"] == ["Straight", "Tuck", "Pike"]
     assert data["preferred_twist_sides"] == ["Left", "Right"]
+
+
+def test_available_values_not_modified():
+    response = client.get("/acrobatics/available_values")
+    assert response.status_code == 200, response
+    etag = response.headers["etag"]
+
+    response = client.get("/acrobatics/available_values", headers={"If-None-Match": etag})
+    assert response.status_code == 304, response
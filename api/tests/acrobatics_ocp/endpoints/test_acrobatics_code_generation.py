@@ -1,4 +1,6 @@
-import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -29,28 +31,131 @@ def save_config(top_folder, folder, position):
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-
-    datafile = AcrobaticsOCPData.datafile
-
-    with open(datafile, "w") as f:
-        base_data = AcrobaticsOCPData.base_data
-        json.dump(base_data, f)
+    # before test: create data
+    AcrobaticsOCPData.reset_data()
 
     update_phase_info()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    AcrobaticsOCPData.delete_data()
 
 
 def test_generate_code_no_model():
     response = client.post("/acrobatics/generate_code", json={"model_path": "", "save_path": "models/cheh.py"})
     assert response.status_code == 400
 
+    response = client.post("/acrobatics/generate_code", params={"stream": True})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("with_visual_criteria", [False, True])
+def test_generate_code_stream(with_visual_criteria):
+    model_path = str(Path("test_biomods/with_visual/good/straight.bioMod").absolute())
+    with open(model_path, "rb") as f:
+        response = client.put("/acrobatics/model_path/", files={"file": (model_path, f)})
+    assert response.status_code == 200, response
+
+    if with_visual_criteria:
+        response = client.put("/acrobatics/with_visual_criteria", json={"with_visual_criteria": True})
+        assert response.status_code == 200, response
+
+    expected = client.post("/acrobatics/generate_code").json()
+
+    response = client.post("/acrobatics/generate_code", params={"stream": True})
+    assert response.status_code == 200, response
+    assert response.json() == expected
+
+
+@pytest.mark.parametrize(
+    ("position", "arms"),
+    [
+        ("straight", "['RightShoulder', 'RightKnuckle', 'LeftShoulder', 'LeftKnuckle']"),
+        ("pike", "['RightElbow', 'RightKnuckle', 'LeftElbow', 'LeftKnuckle']"),
+        ("tuck", "['RightElbow', 'RightKnuckle', 'LeftElbow', 'LeftKnuckle']"),
+    ],
+)
+def test_generate_code_cull_collisions(position, arms):
+    model_path = str(Path(f"test_biomods/with_collision/good/{position}.bioMod").absolute())
+    with open(model_path, "rb") as f:
+        response = client.put("/acrobatics/model_path/", files={"file": (model_path, f)})
+    assert response.status_code == 200, response
+
+    response = client.put("/acrobatics/collision_constraint", json={"collision_constraint": True})
+    assert response.status_code == 200, response
+    response = client.put("/acrobatics/position", json={"position": position})
+    assert response.status_code != 400, response
+
+    generated = client.post("/acrobatics/generate_code").json()["generated_code"]
+    assert "def custom_noncrossing_batch_const(" in generated
+    assert "def custom_noncrossing_const(" not in generated
+    assert arms in generated
+
+    # the default bounds let the arms cross
+    response = client.post("/acrobatics/generate_code", params={"cull_collisions": True})
+    assert response.status_code == 200, response
+    assert response.json()["generated_code"] == generated
+
+    # only the root moves, the segments keep their distance
+    phases = AcrobaticsOCPData.read_data("phases_info")
+    for phase in phases:
+        q = phase["state_variables"][0]
+        for bounds in ("min_bounds", "max_bounds"):
+            for dof in range(6, q["dimension"]):
+                q["bounds"][bounds][dof] = [0.0, 0.0, 0.0]
+    AcrobaticsOCPData.update_data("phases_info", phases)
+
+    generated = client.post("/acrobatics/generate_code").json()["generated_code"]
+    assert arms in generated
+
+    response = client.post("/acrobatics/generate_code", params={"cull_collisions": True})
+    assert response.status_code == 200, response
+    culled = response.json()["generated_code"]
+    assert arms not in culled
+    assert "cylinder_pairs=" not in culled
+
+    # the data is not modified by the culling
+    assert client.post("/acrobatics/generate_code").json()["generated_code"] == generated
+
+
+@pytest.mark.parametrize("non_collision", [False, True])
+@pytest.mark.parametrize(
+    ("arguments", "expected_threads"),
+    [
+        (["-t", "3"], "3"),
+        (["--threads=2", "-m", "4", "-p", "2"], "2"),
+        # the cores are shared between the pools by default
+        (["-m", "4", "-p", "4"], str(max(1, (os.cpu_count() or 1) // 4))),
+    ],
+)
+def test_generate_code_limit_threads(non_collision, arguments, expected_threads):
+    model_path = str(Path("test_biomods/with_collision/good/straight.bioMod").absolute())
+    with open(model_path, "rb") as f:
+        response = client.put("/acrobatics/model_path/", files={"file": (model_path, f)})
+    assert response.status_code == 200, response
+    if non_collision:
+        response = client.put("/acrobatics/collision_constraint", json={"collision_constraint": True})
+        assert response.status_code == 200, response
+
+    generated = client.post("/acrobatics/generate_code").json()["generated_code"]
+
+    # the caps are set before the numerical libraries are imported
+    code = generated[: generated.index("import biorbd")]
+    code += "print(' '.join(os.environ[v] for v in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')))"
+    env = {k: v for k, v in os.environ.items() if not k.endswith("_NUM_THREADS")}
+    result = subprocess.run(
+        [sys.executable, "-c", code, *arguments], env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == [expected_threads] * 3
+
+    # the caps given in the environment are kept
+    env["OMP_NUM_THREADS"] = "5"
+    result = subprocess.run(
+        [sys.executable, "-c", code, *arguments], env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["5"] + [expected_threads] * 2
+
 
 @pytest.mark.parametrize("position", ["straight", "pike", "tuck"])
 @pytest.mark.parametrize(
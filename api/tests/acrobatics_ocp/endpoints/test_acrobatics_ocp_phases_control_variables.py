@@ -1,5 +1,3 @@
-import json
-
 import numpy as np
 import pytest
 from fastapi import FastAPI
@@ -16,22 +14,15 @@ client = TestClient(test_app)
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-
-    datafile = AcrobaticsOCPData.datafile
-
-    with open(datafile, "w") as f:
-        base_data = AcrobaticsOCPData.base_data
-        json.dump(base_data, f)
+    # before test: create data
+    AcrobaticsOCPData.reset_data()
 
     update_phase_info()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    AcrobaticsOCPData.delete_data()
 
 
 def test_exists_tau():
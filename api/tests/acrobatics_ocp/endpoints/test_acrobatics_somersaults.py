@@ -1,5 +1,3 @@
-import json
-
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -17,21 +15,15 @@ client = TestClient(test_app)
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-
-    datafile = AcrobaticsOCPData.datafile
-
-    with open(datafile, "w") as f:
-        json.dump(AcrobaticsOCPData.base_data, f)
+    # before test: create data
+    AcrobaticsOCPData.reset_data()
 
     update_phase_info()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    AcrobaticsOCPData.delete_data()
 
 
 @pytest.mark.parametrize("nb_somersaults", [-1e9, -1000, -1, 0, 6, 7, 8, 9, 100, 1e9])
@@ -62,7 +54,7 @@ def test_put_nb_somersault():
     assert response.status_code == 200, response
     assert response.json()["nb_somersaults"] == 2
 
-    data = json.load(open("acrobatics_data.json"))
+    data = AcrobaticsOCPData.read_data()
     assert data["nb_somersaults"] == 2
     assert data["nb_half_twists"] == [0, 0]
 
@@ -1,5 +1,3 @@
-import json
-
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -9,29 +7,31 @@ from bioptim_gui_api.acrobatics_ocp.endpoints.acrobatics import (
 )
 from bioptim_gui_api.acrobatics_ocp.misc.acrobatics_data import AcrobaticsOCPData
 from bioptim_gui_api.acrobatics_ocp.misc.phase_updating import update_phase_info
+from bioptim_gui_api.generic_ocp.misc.workspaces import WorkspaceLockMiddleware, WorkspaceMiddleware
+from bioptim_gui_api.utils.json_patch import apply_patch
 
 test_app = FastAPI()
 test_app.include_router(router)
 client = TestClient(test_app)
 
+versioned_app = FastAPI()
+versioned_app.include_router(router)
+versioned_app.add_middleware(WorkspaceLockMiddleware, data_by_prefix={"/acrobatics": AcrobaticsOCPData})
+versioned_app.add_middleware(WorkspaceMiddleware)
+versioned_client = TestClient(versioned_app)
+
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-
-    datafile = AcrobaticsOCPData.datafile
-
-    with open(datafile, "w") as f:
-        json.dump(AcrobaticsOCPData.base_data, f)
+    # before test: create data
+    AcrobaticsOCPData.reset_data()
 
     update_phase_info()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    AcrobaticsOCPData.delete_data()
 
 
 def test_put_nb_half_twists():
@@ -72,3 +72,62 @@ def test_put_nb_half_twists_wrong_type():
         json={"nb_half_twists": "wrong"},
     )
     assert response.status_code == 422, response
+
+
+def tuck_two_somersaults():
+    response = client.put("/acrobatics/position", json={"position": "tuck"})
+    assert response.status_code == 200, response
+    data = response.json()
+    assert data["nb_half_twists"] == [0, 0]
+    return data["phases_info"]
+
+
+def test_put_nb_half_twists_keeps_modifications():
+    phases = tuck_two_somersaults()
+    assert [phase["phase_name"] for phase in phases] == ["Tuck", "Somersault", "Kick out", "Waiting", "Landing"]
+
+    phases[0]["nb_shooting_points"] = 12
+    phases[1]["objectives"] = []
+    AcrobaticsOCPData.update_data("phases_info", phases)
+
+    response = client.put("/acrobatics/nb_half_twists/1", json={"nb_half_twists": 1})
+    assert response.status_code == 200, response
+    new_phases = response.json()
+    assert [phase["phase_name"] for phase in new_phases] == ["Tuck", "Somersault", "Kick out", "Twist", "Landing"]
+    assert new_phases[0]["nb_shooting_points"] == 12
+    assert new_phases[1]["objectives"] == []
+    assert new_phases[3]["nb_shooting_points"] == 40
+    assert AcrobaticsOCPData.read_data("phases_info") == new_phases
+
+    # the modifications of the phases that do not depend on the twist are kept when it is removed (the parity of the
+    # half twists changes, and with it the bounds and initial guesses of all the phases)
+    response = client.put("/acrobatics/nb_half_twists/1", json={"nb_half_twists": 0})
+    assert response.status_code == 200, response
+    new_phases = response.json()
+    assert [phase["phase_name"] for phase in new_phases] == ["Tuck", "Somersault", "Kick out", "Waiting", "Landing"]
+    assert new_phases[0]["nb_shooting_points"] == 12
+    assert new_phases[1]["objectives"] == []
+
+
+def test_put_nb_half_twists_same_as_full_update():
+    tuck_two_somersaults()
+
+    response = client.put("/acrobatics/nb_half_twists/0", json={"nb_half_twists": 1})
+    assert response.status_code == 200, response
+
+    assert response.json() == update_phase_info()
+
+
+def test_put_nb_half_twists_patch():
+    tuck_two_somersaults()
+    revision, data = AcrobaticsOCPData.snapshot()
+
+    response = versioned_client.put(
+        "/acrobatics/nb_half_twists/0", headers={"X-OCP-Patch-From": str(revision)}, json={"nb_half_twists": 1}
+    )
+    assert response.status_code == 200, response
+    body = response.json()
+    assert body["revision"] > revision
+    assert body["patch"]
+
+    assert apply_patch(data, body["patch"]) == AcrobaticsOCPData.read_data()
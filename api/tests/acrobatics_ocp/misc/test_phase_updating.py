@@ -0,0 +1,85 @@
+import copy
+
+import pytest
+
+from bioptim_gui_api.acrobatics_ocp.misc.acrobatics_data import AcrobaticsOCPData
+from bioptim_gui_api.acrobatics_ocp.misc.phase_updating import (
+    _phases_info_template,
+    keep_user_modifications,
+    phases_info_template,
+    update_phase_info,
+)
+
+
+@pytest.fixture(autouse=True)
+def run_for_all():
+    # before test: create data
+    AcrobaticsOCPData.reset_data()
+
+    yield
+
+    # after test : delete data
+    AcrobaticsOCPData.delete_data()
+
+
+def test_phases_info_template_is_a_copy():
+    data = copy.deepcopy(AcrobaticsOCPData.base_data)
+    phases, dof_names = phases_info_template(data)
+    phases[0]["nb_shooting_points"] = 1
+    phases[0]["state_variables"][0]["bounds"]["min_bounds"][0][0] = 100.0
+    dof_names.append("foo")
+
+    phases, dof_names = phases_info_template(data)
+    assert phases[0]["nb_shooting_points"] == 40
+    assert phases[0]["state_variables"][0]["bounds"]["min_bounds"][0][0] != 100.0
+    assert "foo" not in dof_names
+
+
+def test_phases_info_template_cache():
+    data = copy.deepcopy(AcrobaticsOCPData.base_data)
+    data["nb_somersaults"] = 2
+    data["nb_half_twists"] = [1, 0]
+    data["position"] = "tuck"
+
+    _phases_info_template.cache_clear()
+    first, _ = phases_info_template(data)
+    data["with_visual_criteria"] = True
+    phases_info_template(data)
+    data["with_visual_criteria"] = False
+    second, _ = phases_info_template(data)
+
+    assert first == second
+    assert _phases_info_template.cache_info().hits == 1
+
+
+def test_update_phase_info_toggle_back():
+    phases = update_phase_info()
+    dof_names = AcrobaticsOCPData.read_data("dof_names")
+
+    AcrobaticsOCPData.update_data("with_spine", True)
+    AcrobaticsOCPData.update_data("dynamics", "JOINTS_ACCELERATION_DRIVEN")
+    update_phase_info()
+    assert AcrobaticsOCPData.read_data("dof_names") != dof_names
+
+    AcrobaticsOCPData.update_data("with_spine", False)
+    AcrobaticsOCPData.update_data("dynamics", "TORQUE_DRIVEN")
+    assert update_phase_info() == phases
+    assert AcrobaticsOCPData.read_data("phases_info") == phases
+    assert AcrobaticsOCPData.read_data("dof_names") == dof_names
+    assert AcrobaticsOCPData.read_data("nb_phases") == len(phases)
+
+
+@pytest.mark.parametrize(
+    "old_generated, current, new_generated, expected",
+    [
+        (1, 2, 1, 2),
+        (1, 1, 3, 3),
+        (1, 2, 3, 3),
+        ({"a": 1, "b": 1}, {"a": 2, "b": 1}, {"a": 1, "b": 3}, {"a": 2, "b": 3}),
+        ({"a": 1}, {"a": 2, "b": 1}, {"a": 3}, {"a": 3}),
+        ([[0, 1], [2, 3]], [[0, 5], [2, 3]], [[0, 1], [2, 4]], [[0, 5], [2, 4]]),
+        ([0, 1], [0, 1, 2], [0, 3], [0, 3]),
+    ],
+)
+def test_keep_user_modifications(old_generated, current, new_generated, expected):
+    assert keep_user_modifications(old_generated, current, new_generated) == expected
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+from bioptim_gui_api.acrobatics_ocp.penalties.non_collision_cylinders.cylinder_collisions import (
+    get_collision_computer,
+)
+from bioptim_gui_api.acrobatics_ocp.penalties.non_collision_cylinders.cylinder_culling import (
+    Skeleton,
+    can_collide,
+    cull_collision_pairs,
+    segment_distance,
+)
+from bioptim_gui_api.acrobatics_ocp.penalties.phases.collision_constraint import collision_constraint_constraints
+
+ARMS = ("RightShoulder", "RightKnuckle", "LeftShoulder", "LeftKnuckle")
+
+
+def skeleton(position: str) -> Skeleton:
+    with open(f"test_biomods/with_collision/good/{position}.bioMod") as f:
+        return Skeleton.from_biomod(f.read())
+
+
+def test_segment_distance():
+    o, x, y, z = np.zeros(3), np.array([1.0, 0, 0]), np.array([0, 1.0, 0]), np.array([0, 0, 1.0])
+    # crossing
+    assert segment_distance(o - x, o + x, z - y, z + y) == pytest.approx(1)
+    # parallel
+    assert segment_distance(o, x, y, y + x) == pytest.approx(1)
+    # the closest points of the lines are out of the segments
+    assert segment_distance(o, x, 3 * x + y, 3 * x + 2 * y) == pytest.approx(np.sqrt(5))
+
+
+@pytest.mark.parametrize(("position", "nb_q"), [("straight", 10), ("pike", 16), ("tuck", 17)])
+def test_skeleton(position, nb_q):
+    model = skeleton(position)
+    assert model.nb_q == nb_q
+
+    markers = model.marker_positions(np.zeros(nb_q), ["HeadTop", "RightKnuckle", "LeftKnuckle"])
+    np.testing.assert_almost_equal(markers["HeadTop"], [0, 0, 0.78], decimal=2)
+    # the arms are symmetric
+    np.testing.assert_almost_equal(markers["RightKnuckle"] * [-1, 1, 1], markers["LeftKnuckle"])
+
+    # the root translations move all the markers
+    q = np.zeros(nb_q)
+    q[:3] = [1, 2, 3]
+    np.testing.assert_almost_equal(model.marker_positions(q, ["HeadTop"])["HeadTop"], [1, 2, 3.78], decimal=2)
+
+
+@pytest.mark.parametrize("position", ["straight", "pike", "tuck"])
+def test_can_collide(position):
+    model = skeleton(position)
+    q = np.zeros(model.nb_q)
+
+    # the arms are apart when nothing moves, whatever the root does
+    assert not can_collide(model, ARMS, 0.1, q, q)
+    q_min, q_max = q.copy(), q.copy()
+    q_min[:6], q_max[:6] = -10, 10
+    assert not can_collide(model, ARMS, 0.1, q_min, q_max)
+
+    # they may cross when they move freely
+    assert can_collide(model, ARMS, 0.1, q - 3, q + 3)
+    assert can_collide(model, ARMS, 0.1, q - np.inf, q + np.inf)
+    assert can_collide(model, ("Unknown", *ARMS[1:]), 0.1, q, q)
+
+
+@pytest.mark.parametrize("position", ["straight", "pike", "tuck"])
+def test_can_collide_is_conservative(position):
+    model = skeleton(position)
+    rng = np.random.default_rng(42)
+    radii = 0.1
+
+    for _ in range(10):
+        center = rng.uniform(-2, 2, model.nb_q)
+        half_range = rng.uniform(0, 0.4, model.nb_q)
+        for markers in get_collision_computer(position).non_collision_markers_combinations():
+            if can_collide(model, markers, radii, center - half_range, center + half_range, margin=0):
+                continue
+            for q in rng.uniform(center - half_range, center + half_range, (50, model.nb_q)):
+                positions = model.marker_positions(q, list(markers))
+                assert segment_distance(*(positions[marker] for marker in markers)) > radii
+
+
+def phase_data(position: str, bounds: float, objectives=(), constraints=()) -> dict:
+    model = skeleton(position)
+    nb_q = model.nb_q
+    return {
+        "phases_info": [
+            {
+                "state_variables": [
+                    {
+                        "name": "q",
+                        "dimension": nb_q,
+                        "bounds": {
+                            "min_bounds": [[-bounds] * 3 for _ in range(nb_q)],
+                            "max_bounds": [[bounds] * 3 for _ in range(nb_q)],
+                        },
+                    }
+                ],
+                "objectives": list(objectives),
+                "constraints": list(constraints),
+            }
+        ]
+    }
+
+
+@pytest.mark.parametrize("position", ["straight", "pike", "tuck"])
+def test_cull_collision_pairs(position):
+    with open(f"test_biomods/with_collision/good/{position}.bioMod") as f:
+        model_content = f.read()
+    constraints = collision_constraint_constraints("Waiting", position)
+    all_pairs = constraints[0]["arguments"][1]["value"]
+
+    # nothing moves, the pairs which are not touching are culled
+    data = phase_data(position, 0, constraints=constraints)
+    culled = cull_collision_pairs(data, model_content)
+    assert data["phases_info"][0]["constraints"][0]["arguments"][1]["value"] == all_pairs
+    culled_constraints = culled["phases_info"][0]["constraints"]
+    if culled_constraints:
+        culled_pairs = culled_constraints[0]["arguments"][1]["value"]
+        assert len(culled_pairs) < len(all_pairs)
+        assert all(pair in all_pairs for pair in culled_pairs)
+        assert ARMS not in [tuple(pair) for pair in culled_pairs]
+
+    # everything can move, nothing is culled
+    data = phase_data(position, 10, constraints=constraints)
+    assert cull_collision_pairs(data, model_content) == data
+
+    # the model does not match the bounds
+    data = phase_data(position, 0, constraints=constraints)
+    data["phases_info"][0]["state_variables"][0]["dimension"] += 1
+    assert cull_collision_pairs(data, model_content) == data
+
+
+def test_cull_collision_pairs_legacy_penalties():
+    with open("test_biomods/with_collision/good/straight.bioMod") as f:
+        model_content = f.read()
+
+    def pair_penalty(markers):
+        return {
+            "penalty_type": "CUSTOM",
+            "arguments": [
+                {"name": "function", "value": "custom_noncrossing_obj", "type": "function"},
+                {"name": "marker_1", "value": markers[0], "type": "str"},
+                {"name": "marker_2", "value": markers[1], "type": "str"},
+                {"name": "radius_1", "value": 0.05, "type": "float"},
+                {"name": "marker_3", "value": markers[2], "type": "str"},
+                {"name": "marker_4", "value": markers[3], "type": "str"},
+                {"name": "radius_2", "value": 0.05, "type": "float"},
+            ],
+        }
+
+    other = {"penalty_type": "MINIMIZE_TIME", "arguments": []}
+    data = phase_data("straight", 0, objectives=[pair_penalty(ARMS), other])
+    assert cull_collision_pairs(data, model_content)["phases_info"][0]["objectives"] == [other]
+
+    data = phase_data("straight", 10, objectives=[pair_penalty(ARMS), other])
+    assert cull_collision_pairs(data, model_content) == data
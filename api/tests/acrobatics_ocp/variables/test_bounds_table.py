@@ -0,0 +1,97 @@
+import json
+
+import numpy as np
+import pytest
+
+from bioptim_gui_api.acrobatics_ocp.variables.bounds_table import (
+    BOUNDS_TABLE_ENV,
+    INDEX_FILE,
+    QBoundsTable,
+    all_variable_computers,
+    bounds_table,
+    get_q_bounds,
+)
+from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.pike_acrobatics_variables import (
+    PikeAcrobaticsVariables,
+)
+from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.straight_acrobatics_variables import (
+    StraightAcrobaticsVariables,
+)
+
+
+@pytest.fixture(scope="module")
+def table_directory(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("bounds_table")
+    QBoundsTable.build(directory, max_somersaults=3, max_half_twists=2)
+    return directory
+
+
+@pytest.mark.parametrize("model", all_variable_computers())
+@pytest.mark.parametrize("half_twists", [[0, 0], [1, 2], [2, 0, 1], [0, 0, 0]])
+@pytest.mark.parametrize("prefer_left", [True, False])
+def test_same_as_computed(table_directory, model, half_twists, prefer_left):
+    min_bounds, max_bounds = QBoundsTable(table_directory).get_q_bounds_array(model, half_twists, prefer_left)
+    expected_min, expected_max = model.get_q_bounds_array(half_twists, prefer_left)
+
+    assert np.array_equal(min_bounds, expected_min)
+    assert np.array_equal(max_bounds, expected_max)
+
+
+def test_phases_stored_once(table_directory):
+    for model in all_variable_computers():
+        phases = np.load(table_directory / f"{model.__name__}.npy")
+        rows = np.load(table_directory / f"{model.__name__}.rows.npy")
+        assert len(np.unique(phases, axis=0)) == len(phases)
+        assert len(phases) < len(rows)
+
+
+def test_not_in_table(table_directory):
+    table = QBoundsTable(table_directory)
+    assert table.get_q_bounds_array(StraightAcrobaticsVariables, [3], True) is None
+    assert table.get_q_bounds_array(StraightAcrobaticsVariables, [0, 0, 0, 0], True) is None
+    # 1 somersault pike is not a valid acrobatics
+    assert table.get_q_bounds_array(PikeAcrobaticsVariables, [1], True) is None
+
+
+def test_read_bounds_can_be_modified(table_directory):
+    table = QBoundsTable(table_directory)
+    min_bounds, _ = table.get_q_bounds_array(StraightAcrobaticsVariables, [1], True)
+    min_bounds[:] = 42
+
+    min_bounds, _ = table.get_q_bounds_array(StraightAcrobaticsVariables, [1], True)
+    assert not np.any(min_bounds == 42)
+
+
+def test_get_q_bounds(table_directory, monkeypatch):
+    monkeypatch.setenv(BOUNDS_TABLE_ENV, str(table_directory))
+    assert bounds_table() is not None
+
+    for half_twists in ([1, 1], [5, 5]):  # in and out of the table
+        actual = get_q_bounds(StraightAcrobaticsVariables, half_twists, False)
+        expected = StraightAcrobaticsVariables.get_q_bounds(half_twists, False)
+        assert len(actual) == len(expected)
+        for i in range(len(expected)):
+            assert np.array_equal(actual[i]["min"], expected[i]["min"])
+            assert np.array_equal(actual[i]["max"], expected[i]["max"])
+
+
+def test_no_table(tmp_path, monkeypatch):
+    monkeypatch.setenv(BOUNDS_TABLE_ENV, str(tmp_path))
+    assert bounds_table() is None
+
+    monkeypatch.delenv(BOUNDS_TABLE_ENV)
+    assert bounds_table() is None
+    assert len(get_q_bounds(StraightAcrobaticsVariables, [1, 1], True)) == 3
+
+
+def test_outdated_table(tmp_path, monkeypatch):
+    QBoundsTable.build(tmp_path, max_somersaults=1, max_half_twists=0)
+    with open(tmp_path / INDEX_FILE, "r") as f:
+        index = json.load(f)
+    index["fingerprint"] = "outdated"
+    with open(tmp_path / INDEX_FILE, "w") as f:
+        json.dump(index, f)
+
+    assert not QBoundsTable(tmp_path).is_up_to_date
+    monkeypatch.setenv(BOUNDS_TABLE_ENV, str(tmp_path))
+    assert bounds_table() is None
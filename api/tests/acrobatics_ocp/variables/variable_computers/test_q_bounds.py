@@ -4,9 +4,15 @@ import pytest
 from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.pike_acrobatics_variables import (
     PikeAcrobaticsVariables,
 )
+from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.pike_acrobatics_variables_with_spine import (
+    PikeAcrobaticsVariablesWithSpine,
+)
 from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.pike_with_visual_acrobatics_variables import (
     PikeAcrobaticsWithVisualVariables,
 )
+from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.pike_with_visual_acrobatics_variables_with_spine import (
+    PikeAcrobaticsWithVisualVariablesWithSpine,
+)
 from bioptim_gui_api.acrobatics_ocp.variables.variable_computers.straight_acrobatics_variables import (
     StraightAcrobaticsVariables,
 )
@@ -77,3 +83,40 @@ def test_q_bounds(variable_compute, baseline, prefer_left, half_twist):
     for i in range(len(expected)):
         assert np.allclose(expected[i]["min"], actual[i]["min"])
         assert np.allclose(expected[i]["max"], actual[i]["max"])
+
+
+@pytest.mark.parametrize(
+    "variable_compute",
+    [
+        StraightAcrobaticsVariables,
+        PikeAcrobaticsWithVisualVariables,
+        TuckAcrobaticsVariables,
+        PikeAcrobaticsVariablesWithSpine,
+        PikeAcrobaticsWithVisualVariablesWithSpine,
+    ],
+)
+@pytest.mark.parametrize("half_twist", [[0, 1], [1, 0, 1], [2, 0, 0, 3]])
+def test_q_bounds_array(variable_compute, half_twist):
+    min_bounds, max_bounds = variable_compute.get_q_bounds_array(half_twist, False)
+    bounds = variable_compute.get_q_bounds(half_twist, False)
+
+    assert min_bounds.shape == max_bounds.shape == (len(bounds), variable_compute.nb_q, 3)
+    for i in range(len(bounds)):
+        assert np.array_equal(min_bounds[i], bounds[i]["min"])
+        assert np.array_equal(max_bounds[i], bounds[i]["max"])
+
+
+def test_q_bounds_visual_first_node():
+    model = PikeAcrobaticsWithVisualVariablesWithSpine
+    bounds = model.get_q_bounds([1, 1], True)
+
+    assert np.allclose(bounds[0]["min"][[model.ZrotHead, model.XrotEyes], 0], [-0.1, np.pi / 8 - 0.1])
+    assert np.allclose(bounds[0]["max"][[model.ZrotHead, model.XrotEyes], 0], [0.1, np.pi / 8 + 0.1])
+
+
+def test_q_bounds_spine_last_node():
+    model = PikeAcrobaticsVariablesWithSpine
+    bounds = model.get_q_bounds([1, 1], True)
+
+    assert np.allclose(bounds[-1]["min"][model.XrotStomach : model.ZrotShoulder, 2], -0.01)
+    assert np.allclose(bounds[-1]["max"][model.XrotStomach : model.ZrotShoulder, 2], 0.01)
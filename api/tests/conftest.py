@@ -0,0 +1,16 @@
+import pytest
+
+from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
+from bioptim_gui_api.model_registry.misc.model_registry import MODEL_REGISTRY_ENV
+
+
+@pytest.fixture(autouse=True, scope="session")
+def runtime_directories(tmp_path_factory):
+    """
+    Write the ocp data and the uploaded models to a temporary directory instead of the working directory
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv(MODEL_REGISTRY_ENV, str(tmp_path_factory.mktemp("registry")))
+        monkeypatch.setattr(GenericOCPData.store.persistence, "directory", str(tmp_path_factory.mktemp("ocp_data")))
+        yield
+        GenericOCPData.store.close()
@@ -1,5 +1,3 @@
-import json
-
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -9,6 +7,7 @@ from bioptim_gui_api.generic_ocp.endpoints.generic_ocp import (
 )
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
 from bioptim_gui_api.generic_ocp.misc.generic_ocp_utils import add_phase_info, remove_phase_info
+from bioptim_gui_api.model_registry.misc.model_registry import MODEL_REGISTRY_ENV, model_hash, model_registry
 
 test_app = FastAPI()
 test_app.include_router(router)
@@ -17,18 +16,13 @@ client = TestClient(test_app)
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-    datafile = GenericOCPData.datafile
-
-    with open(datafile, "w") as f:
-        json.dump(GenericOCPData.base_data, f)
+    # before test: create data
+    GenericOCPData.reset_data()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    GenericOCPData.delete_data()
 
 
 def test_add_phase_info_wrong():
@@ -66,7 +60,7 @@ def test_put_nb_phase():
     assert response.status_code == 200, response
     assert response.json()["nb_phases"] == 2
 
-    data = json.load(open("generic_ocp_data.json"))
+    data = GenericOCPData.read_data()
     assert data["nb_phases"] == 2
 
     response = client.get("/generic_ocp/")
@@ -74,6 +68,21 @@ def test_put_nb_phase():
     assert response.json()["nb_phases"] == 2
 
 
+def test_get_snapshot():
+    response = client.get("/generic_ocp/snapshot")
+    assert response.status_code == 200, response
+    revision = response.json()["revision"]
+    assert response.json()["data"] == GenericOCPData.read_data()
+
+    response = client.put("/generic_ocp/nb_phases/", json={"nb_phases": 2})
+    assert response.status_code == 200, response
+
+    response = client.get("/generic_ocp/snapshot")
+    assert response.status_code == 200, response
+    assert response.json()["revision"] > revision
+    assert response.json()["data"]["nb_phases"] == 2
+
+
 def test_put_model_path():
     vanilla_path = "test_biomods/vanilla/vanilla_base.bioMod"
     with open(vanilla_path, "rb") as f:
@@ -87,6 +96,42 @@ def test_put_model_path():
     assert response.json()["model_path"] == vanilla_path
 
 
+def test_put_model_path_keeps_reference(monkeypatch, tmp_path):
+    monkeypatch.setenv(MODEL_REGISTRY_ENV, str(tmp_path))
+    vanilla_path = "test_biomods/vanilla/vanilla_base.bioMod"
+    with open(vanilla_path, "r") as f:
+        content = f.read()
+    with open(vanilla_path, "rb") as f:
+        response = client.put("/generic_ocp/model_path/", files={"file": (vanilla_path, f)})
+    assert response.status_code == 200, response
+
+    data = client.get("/generic_ocp/").json()
+    assert data["model_hash"] == model_hash(content)
+    assert "model_content" not in data
+    assert model_registry().get(data["model_hash"]) == content
+
+
+def test_put_model(monkeypatch, tmp_path):
+    monkeypatch.setenv(MODEL_REGISTRY_ENV, str(tmp_path))
+    reference = model_registry().put("version 4\n")
+
+    response = client.put("/generic_ocp/model", json={"model_path": "model.bioMod", "model_hash": reference})
+    assert response.status_code == 200, response
+    assert response.json() == {"model_path": "model.bioMod", "model_hash": reference}
+
+    data = client.get("/generic_ocp/").json()
+    assert data["model_path"] == "model.bioMod"
+    assert data["model_hash"] == reference
+
+
+def test_put_model_unknown(monkeypatch, tmp_path):
+    monkeypatch.setenv(MODEL_REGISTRY_ENV, str(tmp_path))
+    response = client.put("/generic_ocp/model", json={"model_path": "model.bioMod", "model_hash": model_hash("a")})
+    assert response.status_code == 404, response
+
+    assert client.get("/generic_ocp/").json()["model_path"] == ""
+
+
 # effect of changing nb_phases tests
 
 
@@ -224,3 +269,69 @@ def test_available_values():
     assert data["constraints"]
     assert data["interpolation_types"] == ["Constant", "Constant with first and last different", "Linear"]
     assert data["dynamics"] == ["Torque driven", "Joints acceleration driven"]
+
+
+def test_post_batch():
+    response = client.post(
+        "/generic_ocp/batch",
+        json={
+            "operations": [
+                {"method": "PUT", "path": "/nb_phases", "body": {"nb_phases": 2}},
+                {
+                    "method": "PUT",
+                    "path": "/phases_info/1/state_variables/0/max_bounds",
+                    "body": {"x": 0, "y": 1, "value": 42},
+                },
+                {
+                    "method": "PUT",
+                    "path": "/phases_info/1/state_variables/0/min_bounds",
+                    "body": {"x": 0, "y": 2, "value": -42},
+                },
+                {"method": "GET", "path": "/phases_info/1"},
+            ]
+        },
+    )
+    assert response.status_code == 200, response
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [200, 200, 200, 200]
+    assert results[0]["body"]["nb_phases"] == 2
+    assert results[3]["body"]["state_variables"][0]["bounds"] == {
+        "min_bounds": [[0.0, 0.0, -42.0]],
+        "max_bounds": [[0.0, 42.0, 0.0]],
+    }
+
+    data = GenericOCPData.read_data()
+    assert data["nb_phases"] == 2
+    assert data["phases_info"][1]["state_variables"][0]["bounds"]["max_bounds"] == [[0.0, 42.0, 0.0]]
+
+
+def test_post_batch_rollback():
+    data = GenericOCPData.read_data()
+
+    response = client.post(
+        "/generic_ocp/batch",
+        json={
+            "operations": [
+                {"method": "PUT", "path": "/nb_phases", "body": {"nb_phases": 2}},
+                {"method": "PUT", "path": "/nb_phases", "body": {"nb_phases": -1}},
+            ]
+        },
+    )
+    assert response.status_code == 400, response
+    assert response.json()["detail"] == {"operation_index": 1, "detail": "nb_phases must be positive"}
+    assert GenericOCPData.read_data() == data
+
+    response = client.post(
+        "/generic_ocp/batch",
+        json={"operations": [{"method": "PUT", "path": "/nb_phases", "body": {"nb_phases": "wrong"}}]},
+    )
+    assert response.status_code == 422, response
+    assert response.json()["detail"]["operation_index"] == 0
+
+
+def test_post_batch_nested():
+    response = client.post(
+        "/generic_ocp/batch",
+        json={"operations": [{"method": "POST", "path": "/batch", "body": {"operations": []}}]},
+    )
+    assert response.status_code == 400, response
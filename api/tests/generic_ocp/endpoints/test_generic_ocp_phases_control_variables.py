@@ -1,5 +1,3 @@
-import json
-
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -14,18 +12,13 @@ client = TestClient(test_app)
 
 @pytest.fixture(autouse=True)
 def run_for_all():
-    # before test: create file
-    datafile = GenericOCPData.datafile
-
-    with open(datafile, "w") as f:
-        json.dump(GenericOCPData.base_data, f)
+    # before test: create data
+    GenericOCPData.reset_data()
 
     yield
 
-    # after test : delete file
-    import os
-
-    os.remove(datafile)
+    # after test : delete data
+    GenericOCPData.delete_data()
 
 
 def test_put_control_variable_dimension():
@@ -0,0 +1,48 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from bioptim_gui_api.generic_ocp.misc.batch import dispatch_operation
+
+
+class ValueRequest(BaseModel):
+    value: int
+
+
+router = APIRouter(prefix="/test")
+values = {}
+
+
+@router.put("/{name}")
+def put_value(name: str, value: ValueRequest):
+    if value.value < 0:
+        raise HTTPException(status_code=400, detail="value must be positive")
+    values[name] = value.value
+    return values
+
+
+@router.get("/{name}")
+async def get_value(name: str, default: int = 0):
+    return values.get(name, default)
+
+
+def dispatch(*args, **kwargs):
+    return asyncio.run(dispatch_operation(router, *args, **kwargs))
+
+
+def test_dispatch_operation():
+    assert dispatch("PUT", "/a", {"value": 1}) == (200, {"a": 1})
+    assert dispatch("get", "/a") == (200, 1)
+    assert dispatch("GET", "/b", query={"default": 3}) == (200, 3)
+
+
+def test_dispatch_operation_errors():
+    assert dispatch("PUT", "/a", {"value": -1}) == (400, "value must be positive")
+
+    status_code, body = dispatch("PUT", "/a", {"value": "wrong"})
+    assert status_code == 422
+    assert body[0]["loc"] == ["body", "value"]
+
+    assert dispatch("PUT", "/a/b", {"value": 1})[0] == 404
+    assert dispatch("DELETE", "/a")[0] == 405
@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from bioptim_gui_api.generic_ocp.misc.ocp_store import InMemoryStore, JsonFileStore
+
+
+@pytest.fixture
+def file_store(tmp_path):
+    return JsonFileStore(directory=str(tmp_path))
+
+
+def test_json_file_store_update_read(file_store):
+    file_store.update("data.json", None, {"a": 1, "b": [1, 2]})
+    file_store.update("data.json", "a", 2)
+
+    assert file_store.read("data.json") == {"a": 2, "b": [1, 2]}
+    assert file_store.read("data.json", "b") == [1, 2]
+
+
+def test_json_file_store_delete(file_store):
+    file_store.update("data.json", None, {"a": 1})
+    file_store.delete("data.json")
+    file_store.delete("data.json")
+    assert file_store.revision("data.json") == 0
+
+    with pytest.raises(FileNotFoundError):
+        file_store.read("data.json")
+
+
+def test_in_memory_store_read_update():
+    store = InMemoryStore()
+    store.update("data.json", None, {"a": 1, "b": {"c": [1, 2]}})
+    store.update("data.json", "a", 2)
+
+    assert store.read("data.json") == {"a": 2, "b": {"c": [1, 2]}}
+    assert store.read("data.json", "a") == 2
+
+
+def test_in_memory_store_read_is_a_copy():
+    store = InMemoryStore()
+    value = {"c": [1, 2]}
+    store.update("data.json", None, {"b": value})
+
+    value["c"].append(3)
+    read = store.read("data.json", "b")
+    read["c"].append(4)
+
+    assert store.read("data.json", "b") == {"c": [1, 2]}
+
+
+def test_in_memory_store_missing_document():
+    store = InMemoryStore()
+    with pytest.raises(FileNotFoundError):
+        store.read("data.json")
+    with pytest.raises(FileNotFoundError):
+        store.update("data.json", "a", 1)
+
+
+def test_in_memory_store_missing_key():
+    store = InMemoryStore()
+    store.update("data.json", None, {"a": 1})
+    with pytest.raises(KeyError):
+        store.read("data.json", "b")
+
+
+def test_in_memory_store_flush(file_store, tmp_path):
+    store = InMemoryStore(persistence=file_store, flush_interval=3600)
+    store.update("data.json", None, {"a": 1, "b": [1.5, "x"]})
+    store.update("data.json", "a", {"c": None})
+    store.close()
+
+    with open(tmp_path / "data.json") as f:
+        assert json.load(f) == {"a": {"c": None}, "b": [1.5, "x"]}
+
+
+def test_in_memory_store_lazy_load(file_store):
+    file_store.update("data.json", None, {"a": 1})
+    store = InMemoryStore(persistence=file_store, flush_interval=3600)
+
+    assert store.read("data.json", "a") == 1
+    store.update("data.json", "b", 2)
+    store.close()
+
+    assert file_store.read("data.json") == {"a": 1, "b": 2}
+
+
+def test_in_memory_store_delete(file_store, tmp_path):
+    store = InMemoryStore(persistence=file_store, flush_interval=3600)
+    store.update("data.json", None, {"a": 1})
+    store.flush()
+    assert (tmp_path / "data.json").exists()
+
+    store.delete("data.json")
+    assert store.revision("data.json") == 0
+    store.close()
+
+    assert not (tmp_path / "data.json").exists()
+    with pytest.raises(FileNotFoundError):
+        store.read("data.json")
+
+
+def test_in_memory_store_evict_least_recently_used(file_store, tmp_path):
+    store = InMemoryStore(persistence=file_store, flush_interval=3600, max_documents=2)
+    store.update("a.json", None, {"a": 1})
+    store.update("b.json", None, {"b": 1})
+    store.read("a.json")
+    store.update("c.json", None, {"c": 1})
+
+    # b.json is the least recently used document, it is written and dropped from memory
+    assert file_store.read("b.json") == {"b": 1}
+    assert not (tmp_path / "a.json").exists()
+    assert not (tmp_path / "c.json").exists()
+    # its revision is dropped with it
+    assert store.revision("b.json") == 0
+    assert store.revision("a.json") == 1
+
+    # and restored on its next access
+    store.update("b.json", "b", 2)
+    assert store.read("b.json") == {"b": 2}
+    store.close()
+
+    assert file_store.read("a.json") == {"a": 1}
+    assert file_store.read("b.json") == {"b": 2}
+    assert file_store.read("c.json") == {"c": 1}
+
+
+def test_in_memory_store_evict_idle(file_store):
+    store = InMemoryStore(persistence=file_store, flush_interval=3600, idle_timeout=0)
+    store.update("a.json", None, {"a": 1})
+    store._evict_idle()
+
+    assert file_store.read("a.json") == {"a": 1}
+    assert store.read("a.json") == {"a": 1}
+    store.close()
+
+
+def test_in_memory_store_no_eviction_without_persistence():
+    store = InMemoryStore(max_documents=1, idle_timeout=0)
+    store.update("a.json", None, {"a": 1})
+    store.update("b.json", None, {"b": 1})
+    store._evict_idle()
+
+    assert store.read("a.json") == {"a": 1}
+    assert store.read("b.json") == {"b": 1}
+
+
+def test_in_memory_store_snapshot():
+    store = InMemoryStore(history_size=2)
+    store.update("data.json", None, {"a": 1})
+    store.update("data.json", "a", 2)
+    store.update("data.json", "b", 3)
+
+    assert store.revision("data.json") == 3
+    assert store.snapshot("data.json") == (3, {"a": 2, "b": 3})
+    assert store.snapshot("data.json", 2) == (2, {"a": 2})
+    with pytest.raises(KeyError):
+        # only the last 2 revisions are kept
+        store.snapshot("data.json", 1)
+
+
+def test_json_file_store_snapshot(file_store):
+    file_store.update("data.json", None, {"a": 1})
+
+    assert file_store.snapshot("data.json") == (1, {"a": 1})
+    assert file_store.snapshot("data.json", 1) == (1, {"a": 1})
+    with pytest.raises(KeyError):
+        file_store.snapshot("data.json", 0)
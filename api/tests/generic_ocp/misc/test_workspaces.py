@@ -0,0 +1,191 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from bioptim_gui_api.generic_ocp.misc.generic_ocp_data import GenericOCPData
+from bioptim_gui_api.generic_ocp.misc.workspaces import (
+    WorkspaceLockMiddleware,
+    WorkspaceMiddleware,
+    current_workspace,
+    validate_workspace_id,
+    workspace_document,
+)
+from bioptim_gui_api.utils.json_patch import apply_patch
+
+test_app = FastAPI()
+test_app.add_middleware(WorkspaceLockMiddleware, data_by_prefix={"/generic_ocp": GenericOCPData})
+test_app.add_middleware(WorkspaceMiddleware)
+
+
+@test_app.get("/generic_ocp/nb_phases")
+def get_nb_phases():
+    return {"workspace": current_workspace.get(), "nb_phases": GenericOCPData.read_data("nb_phases")}
+
+
+@test_app.put("/generic_ocp/nb_phases")
+def put_nb_phases(nb_phases: int):
+    GenericOCPData.update_data("nb_phases", nb_phases)
+
+
+@test_app.put("/generic_ocp/model_path")
+def put_model_path(model_path: str):
+    if not model_path:
+        raise HTTPException(status_code=400, detail="model_path must not be empty")
+    GenericOCPData.update_data("model_path", model_path)
+    return GenericOCPData.read_data()
+
+
+@test_app.post("/generic_ocp/increment_nb_phases")
+def increment_nb_phases():
+    nb_phases = GenericOCPData.read_data("nb_phases")
+    time.sleep(0.01)
+    GenericOCPData.update_data("nb_phases", nb_phases + 1)
+
+
+client = TestClient(test_app)
+
+
+@pytest.fixture(autouse=True)
+def run_for_all():
+    yield
+
+    for workspace in ("default", "lab_1", "lab-2"):
+        token = current_workspace.set(workspace)
+        GenericOCPData.delete_data()
+        current_workspace.reset(token)
+
+
+@pytest.mark.parametrize("workspace_id", ["default", "lab_1", "A-2", "a" * 64])
+def test_validate_workspace_id(workspace_id):
+    assert validate_workspace_id(workspace_id) == workspace_id
+
+
+@pytest.mark.parametrize("workspace_id", ["", "../data", "a/b", "a b", "a" * 65])
+def test_validate_workspace_id_wrong(workspace_id):
+    with pytest.raises(ValueError):
+        validate_workspace_id(workspace_id)
+
+
+def test_workspace_document():
+    assert workspace_document("data.json") == "data.json"
+    assert workspace_document("data.json", "default") == "data.json"
+    assert workspace_document("data.json", "lab_1") == "workspaces/lab_1/data.json"
+
+
+def test_default_workspace():
+    response = client.get("/generic_ocp/nb_phases")
+    assert response.status_code == 200, response
+    assert response.json() == {"workspace": "default", "nb_phases": 1}
+
+
+def test_invalid_workspace():
+    response = client.get("/generic_ocp/nb_phases", headers={"X-Workspace-Id": "../data"})
+    assert response.status_code == 400, response
+
+
+def test_workspaces_are_isolated():
+    response = client.put("/generic_ocp/nb_phases", params={"nb_phases": 3}, headers={"X-Workspace-Id": "lab_1"})
+    assert response.status_code == 200, response
+
+    response = client.get("/generic_ocp/nb_phases", headers={"X-Workspace-Id": "lab_1"})
+    assert response.json() == {"workspace": "lab_1", "nb_phases": 3}
+
+    response = client.get("/generic_ocp/nb_phases", headers={"X-Workspace-Id": "lab-2"})
+    assert response.json() == {"workspace": "lab-2", "nb_phases": 1}
+
+    response = client.get("/generic_ocp/nb_phases")
+    assert response.json() == {"workspace": "default", "nb_phases": 1}
+
+
+def test_revision_header():
+    response = client.get("/generic_ocp/nb_phases", headers={"X-Workspace-Id": "lab_1"})
+    revision = int(response.headers["X-OCP-Revision"])
+
+    response = client.put("/generic_ocp/nb_phases", params={"nb_phases": 3}, headers={"X-Workspace-Id": "lab_1"})
+    assert response.status_code == 200, response
+    assert int(response.headers["X-OCP-Revision"]) == revision + 1
+
+
+def test_if_match():
+    headers = {"X-Workspace-Id": "lab_1"}
+    revision = client.get("/generic_ocp/nb_phases", headers=headers).headers["X-OCP-Revision"]
+
+    response = client.put("/generic_ocp/nb_phases", params={"nb_phases": 3}, headers={**headers, "If-Match": revision})
+    assert response.status_code == 200, response
+
+    # the data has been modified since revision
+    response = client.put("/generic_ocp/nb_phases", params={"nb_phases": 4}, headers={**headers, "If-Match": revision})
+    assert response.status_code == 412, response
+    assert response.headers["X-OCP-Revision"] == str(int(revision) + 1)
+
+    response = client.get("/generic_ocp/nb_phases", headers=headers)
+    assert response.json()["nb_phases"] == 3
+
+
+def test_concurrent_modifications():
+    headers = {"X-Workspace-Id": "lab_1"}
+    with TestClient(test_app) as concurrent_client:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(
+                executor.map(
+                    lambda _: concurrent_client.post("/generic_ocp/increment_nb_phases", headers=headers), range(16)
+                )
+            )
+
+        assert all(response.status_code == 200 for response in responses)
+        response = concurrent_client.get("/generic_ocp/nb_phases", headers=headers)
+        assert response.json()["nb_phases"] == 17
+
+
+def test_patch_from():
+    headers = {"X-Workspace-Id": "lab_1"}
+    token = current_workspace.set("lab_1")
+    revision, data = GenericOCPData.snapshot()
+    current_workspace.reset(token)
+
+    response = client.put(
+        "/generic_ocp/model_path",
+        params={"model_path": "model.bioMod"},
+        headers={**headers, "X-OCP-Patch-From": str(revision)},
+    )
+    assert response.status_code == 200, response
+    body = response.json()
+    assert body["revision"] == revision + 1
+    assert body["patch"] == [{"op": "replace", "path": "/model_path", "value": "model.bioMod"}]
+    assert response.headers["X-OCP-Revision"] == str(revision + 1)
+
+    # patch from an older revision
+    response = client.put(
+        "/generic_ocp/nb_phases",
+        params={"nb_phases": 2},
+        headers={**headers, "X-OCP-Patch-From": str(revision)},
+    )
+    assert response.status_code == 200, response
+    body = response.json()
+    assert body["revision"] == revision + 2
+    assert apply_patch(data, body["patch"]) == {**data, "model_path": "model.bioMod", "nb_phases": 2}
+
+
+def test_patch_from_error():
+    headers = {"X-Workspace-Id": "lab_1"}
+    revision = client.get("/generic_ocp/nb_phases", headers=headers).headers["X-OCP-Revision"]
+
+    response = client.put(
+        "/generic_ocp/model_path", params={"model_path": ""}, headers={**headers, "X-OCP-Patch-From": revision}
+    )
+    assert response.status_code == 400, response
+    assert response.json() == {"detail": "model_path must not be empty"}
+
+    response = client.put(
+        "/generic_ocp/model_path", params={"model_path": "a"}, headers={**headers, "X-OCP-Patch-From": "a"}
+    )
+    assert response.status_code == 400, response
+
+    response = client.put(
+        "/generic_ocp/model_path", params={"model_path": "a"}, headers={**headers, "X-OCP-Patch-From": "1000"}
+    )
+    assert response.status_code == 409, response
+    assert client.get("/generic_ocp/nb_phases", headers=headers).headers["X-OCP-Revision"] == revision
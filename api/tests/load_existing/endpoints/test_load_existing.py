@@ -1,12 +1,16 @@
+import asyncio
+import io
+import json
 import os
 import pickle as pkl
 
 import numpy as np
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, UploadFile
 from fastapi.testclient import TestClient
 
-from bioptim_gui_api.load_existing.endpoints.load_existing import router
+from bioptim_gui_api.load_existing.endpoints.load_existing import detach, router
+from bioptim_gui_api.load_existing.misc.pickle_analysis import ALLOW_PICKLE_ENV
 
 test_app = FastAPI()
 test_app.include_router(router)
@@ -24,6 +28,12 @@ class FakeSolution:
         self.states = [{"q": tmp}]
 
 
+@pytest.fixture(autouse=True)
+def allow_pickles(monkeypatch):
+    # the test solutions are pickles, as saved by older generated code
+    monkeypatch.setenv(ALLOW_PICKLE_ENV, "1")
+
+
 @pytest.fixture(autouse=True)
 def run_for_all():
     # before test: create pickles
@@ -188,6 +198,14 @@ def test_load_single_pkl_good():
         assert response.json() == {"to_discard": [], "best": "test0.pkl"}
 
 
+def test_load_pickle_refused_by_default(monkeypatch):
+    monkeypatch.delenv(ALLOW_PICKLE_ENV)
+    with open(f"{path_to_tests_pkl}/test0.pkl", "rb") as f:
+        response = client.post("/load_existing/load", files=[("files", f)])
+    assert response.status_code == 200
+    assert response.json() == {"to_discard": ["test0.pkl"], "best": None}
+
+
 def test_load_single_to_discard():
     pkl_path = f"{path_to_tests_pkl}/test_to_discard.pkl"
 
@@ -240,3 +258,71 @@ def test_load_best_pkl():
         "to_discard": ["test_to_discard.pkl"],
         "best": "test_lowest_cost.pkl",
     }, "Lowest cost must be the lowest that is not discarded"
+
+
+def test_load_stream():
+    pkls = [
+        "bad_pickle.pkl",
+        "test0.pkl",
+        "test_lowest_cost.pkl",
+        "test_to_discard.pkl",
+    ]
+
+    files = [("files", open(f"{path_to_tests_pkl}/{pkl_path}", "rb")) for pkl_path in pkls]
+
+    response = client.post("/load_existing/load", files=files, params={"stream": True})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    # the verdicts are streamed as soon as each pickle is analyzed, in any order
+    verdicts = sorted(lines[:-1], key=lambda verdict: verdict["filename"])
+    assert verdicts == [
+        {"filename": "bad_pickle.pkl", "verdict": "HARD_DISCARD", "cost": -1},
+        {"filename": "test0.pkl", "verdict": "KEEP", "cost": 32560.9},
+        {"filename": "test_lowest_cost.pkl", "verdict": "KEEP", "cost": 32560.8},
+        {"filename": "test_to_discard.pkl", "verdict": "SOFT_DISCARD", "cost": 32560.8},
+    ]
+    assert lines[-1] == {"to_discard": ["bad_pickle.pkl", "test_to_discard.pkl"], "best": "test_lowest_cost.pkl"}
+
+
+def test_detach():
+    file = UploadFile(io.BytesIO(b"content"), filename="sol_0.npz")
+    detached = detach(file)
+    asyncio.run(file.close())
+
+    assert detached.filename == "sol_0.npz"
+    assert asyncio.run(detached.read()) == b"content"
+
+
+def test_load_with_summary():
+    summary = {"cost": 1.0, "final_integrated_q": [0.0, 1.0], "final_q": [0.0, 1.0]}
+    with open(f"{path_to_tests_pkl}/test0.pkl", "rb") as f:
+        files = [
+            ("files", ("not_read.pkl", b"not a pickle", "application/octet-stream")),
+            ("files", ("not_read.summary.json", json.dumps(summary).encode("utf-8"), "application/json")),
+            ("files", ("only_summary.summary.json", json.dumps({**summary, "cost": 2.0}), "application/json")),
+            ("files", f),
+        ]
+        response = client.post("/load_existing/load", files=files)
+    assert response.status_code == 200
+    assert response.json() == {"to_discard": [], "best": "not_read.pkl"}
+
+
+def test_load_solution_files(tmp_path):
+    metadata = {"format_version": 1, "nb_phases": 1, "cost": 3.0}
+    q = np.zeros((2, 4))
+    np.savez(
+        tmp_path / "sol_0.npz",
+        __metadata__=np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8),
+        **{"solution/states/0/q": q, "integrated_states/0/q": q},
+    )
+    summary = {"cost": 1.0, "final_integrated_q": [0.0, 1.0], "final_q": [0.0, 1.0]}
+    files = [
+        ("files", ("sol_0.npz", (tmp_path / "sol_0.npz").read_bytes(), "application/octet-stream")),
+        ("files", ("sol_1.npz", b"not read", "application/octet-stream")),
+        ("files", ("sol_1.summary.json", json.dumps(summary), "application/json")),
+        ("files", ("sol_2.summary.json", json.dumps({**summary, "final_q": [0.0, 2.0]}), "application/json")),
+    ]
+    response = client.post("/load_existing/load", files=files)
+    assert response.status_code == 200
+    assert response.json() == {"to_discard": ["sol_2.npz"], "best": "sol_1.npz"}
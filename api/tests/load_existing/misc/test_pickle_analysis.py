@@ -0,0 +1,79 @@
+import json
+import os
+import pickle as pkl
+
+import pytest
+
+from bioptim_gui_api.load_existing.misc.pickle_analysis import (
+    ANALYSIS_WORKERS_ENV,
+    DiscardState,
+    analysis_workers,
+    analyze_pickle,
+    analyze_summary,
+    solution_stem,
+    summary_solution_stem,
+)
+
+
+@pytest.mark.parametrize(
+    "pickle_data",
+    [
+        b"not a pickle",
+        pkl.dumps({"missing_keys": {}}),
+        pkl.dumps([1, 2, 3]),
+    ],
+)
+def test_analyze_not_a_solution(pickle_data):
+    assert analyze_pickle(pickle_data) == (DiscardState.HARD_DISCARD, -1)
+
+
+def test_analysis_workers(monkeypatch):
+    monkeypatch.setenv(ANALYSIS_WORKERS_ENV, "3")
+    assert analysis_workers() == 3
+
+    monkeypatch.setenv(ANALYSIS_WORKERS_ENV, "0")
+    assert analysis_workers() == 1
+
+    monkeypatch.setenv(ANALYSIS_WORKERS_ENV, "four")
+    assert analysis_workers() == (os.cpu_count() or 1)
+
+    monkeypatch.setenv(ANALYSIS_WORKERS_ENV, "")
+    assert analysis_workers() == (os.cpu_count() or 1)
+
+    monkeypatch.delenv(ANALYSIS_WORKERS_ENV)
+    assert analysis_workers() >= 1
+
+
+@pytest.mark.parametrize(
+    ("summary", "expected"),
+    [
+        ({"cost": 12.5, "final_integrated_q": [0.0, 1.0], "final_q": [0.0, 1.01]}, (DiscardState.KEEP, 12.5)),
+        ({"cost": 12.5, "final_integrated_q": [0.0, 1.0], "final_q": [0.0, 1.1]}, (DiscardState.SOFT_DISCARD, 12.5)),
+        ({"cost": 12.5}, (DiscardState.HARD_DISCARD, -1)),
+        ([], (DiscardState.HARD_DISCARD, -1)),
+    ],
+)
+def test_analyze_summary(summary, expected):
+    assert analyze_summary(json.dumps(summary).encode("utf-8")) == expected
+
+
+def test_analyze_summary_not_json():
+    assert analyze_summary(b"{") == (DiscardState.HARD_DISCARD, -1)
+
+
+def test_summary_solution_stem():
+    assert summary_solution_stem("acrobatics_1_left_straight_0.summary.json") == "acrobatics_1_left_straight_0"
+    assert summary_solution_stem("acrobatics_1_left_straight_0.npz") is None
+    assert summary_solution_stem("summary.json") is None
+
+
+def test_solution_stem():
+    assert solution_stem("acrobatics_1_left_straight_0.npz") == "acrobatics_1_left_straight_0"
+    assert solution_stem("acrobatics_1_left_straight_0.pkl") == "acrobatics_1_left_straight_0"
+    assert solution_stem("acrobatics_1_left_straight_0.summary.json") == "acrobatics_1_left_straight_0.summary.json"
+
+
+def test_analyze_pickle_summary_content():
+    # the gui sends the summary of a solution under the name of the solution
+    summary = {"cost": 12.5, "final_integrated_q": [0.0, 1.0], "final_q": [0.0, 1.0]}
+    assert analyze_pickle(json.dumps(summary).encode("utf-8")) == (DiscardState.KEEP, 12.5)
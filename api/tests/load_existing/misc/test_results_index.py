@@ -0,0 +1,121 @@
+import json
+import pickle as pkl
+
+import numpy as np
+import pytest
+
+from bioptim_gui_api.load_existing.misc.results_index import (
+    RESULTS_INDEX_NAME,
+    IndexedResult,
+    ResultsIndex,
+    figure_parameters,
+    read_result,
+)
+
+
+def indexed_result(seed: int, status: int, cost: float, position: str = "pike") -> IndexedResult:
+    return IndexedResult(
+        file_path=f"acrobatics_1_2_left_{position}_{seed}.npz",
+        seed=seed,
+        status=status,
+        cost=cost,
+        solve_time=1.5,
+        iterations=10,
+        half_twists="1_2",
+        side="left",
+        position=position,
+    )
+
+
+def save_solution(path, metadata: dict):
+    np.savez(path, __metadata__=np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8))
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("acrobatics_1_2_left_pike_3.npz", {"half_twists": "1_2", "side": "left", "position": "pike", "seed": 3}),
+        ("acrobatics_1_right_straight_0.pkl", {"half_twists": "1", "side": "right", "position": "straight", "seed": 0}),
+        ("warm_acrobatics_2_left_tuck_12.npz", {"half_twists": "2", "side": "left", "position": "tuck", "seed": 12}),
+        ("acrobatics_1_left_tuck_0.summary.json", None),
+        ("index.sqlite", None),
+    ],
+)
+def test_figure_parameters(filename, expected):
+    assert figure_parameters(filename) == expected
+
+
+def test_best(tmp_path):
+    index = ResultsIndex(tmp_path)
+    assert index.path == tmp_path / RESULTS_INDEX_NAME
+    index.add(
+        indexed_result(0, 0, 3.0),
+        indexed_result(1, 1, 1.0),
+        indexed_result(2, 0, 2.0),
+        indexed_result(3, 0, 0.5, position="tuck"),
+    )
+
+    assert [result.seed for result in index.best(2)] == [3, 2]
+    assert [result.seed for result in index.best(5, position="pike")] == [2, 0]
+    assert [result.seed for result in index.best(2, converged=False)] == [3, 1]
+    assert index.best(1, side="right") == []
+    assert index.best(1)[0].converged
+
+
+def test_add_replaces(tmp_path):
+    index = ResultsIndex(tmp_path)
+    index.add(indexed_result(0, 1, 3.0))
+    index.add(indexed_result(0, 0, 2.0))
+    assert index.results() == [indexed_result(0, 0, 2.0)]
+
+
+class FakeSolution:
+    def __init__(self):
+        self.cost = 4.0
+        self.status = 0
+        self.states = [{"q": np.zeros((2, 3))}]
+
+
+def test_rescan(tmp_path):
+    save_solution(tmp_path / "acrobatics_1_left_pike_0.npz", {"cost": 2.0, "status": 0, "iterations": 5})
+    save_solution(tmp_path / "acrobatics_1_left_pike_1.npz", {"cost": 99.0, "status": 0})
+    # the summary is read instead of the solution
+    (tmp_path / "acrobatics_1_left_pike_1.summary.json").write_text(json.dumps({"cost": 1.0, "status": 1}))
+    (tmp_path / "acrobatics_1_left_pike_2.pkl").write_bytes(pkl.dumps({"solution": FakeSolution()}))
+    (tmp_path / "acrobatics_1_left_pike_3.npz").write_bytes(b"not a solution")
+    (tmp_path / "log.txt").write_text("0 CVG\n")
+
+    index = ResultsIndex(tmp_path)
+    assert index.rescan(allow_pickle=True) == 3
+
+    assert [(result.seed, result.status, result.cost) for result in index.results()] == [
+        (0, 0, 2.0),
+        (1, 1, 1.0),
+        (2, 0, 4.0),
+    ]
+    assert [result.seed for result in index.best(5)] == [0, 2]
+
+
+def test_rescan_keeps_indexed(tmp_path):
+    save_solution(tmp_path / "acrobatics_1_left_pike_0.npz", {"cost": 2.0, "status": 0})
+    (tmp_path / "acrobatics_1_left_pike_1.pkl").write_bytes(pkl.dumps({"solution": FakeSolution()}))
+
+    index = ResultsIndex(tmp_path)
+    # indexed when saved: a result that was not saved and the pickle, with the path given to the generated code
+    not_saved = indexed_result(9, 1, 0.1)._replace(file_path="acrobatics_1_left_pike_9.npz")
+    pickled = indexed_result(1, 0, 4.0)._replace(file_path="results/acrobatics_1_left_pike_1.pkl")
+    solution = indexed_result(0, 1, 3.0)._replace(file_path="results/acrobatics_1_left_pike_0.npz")
+    index.add(not_saved, pickled, solution)
+
+    # the pickle cannot be read without allow_pickle
+    assert index.rescan() == 1
+    assert [(result.file_path, result.status, result.cost) for result in index.results()] == [
+        ("acrobatics_1_left_pike_9.npz", 1, 0.1),
+        ("results/acrobatics_1_left_pike_0.npz", 0, 2.0),
+        ("results/acrobatics_1_left_pike_1.pkl", 0, 4.0),
+    ]
+
+
+def test_read_result_not_a_result(tmp_path):
+    assert read_result(tmp_path / "log.txt") is None
+    assert read_result(tmp_path / "acrobatics_1_left_pike_0.npz") is None
@@ -0,0 +1,121 @@
+import json
+import pickle as pkl
+
+import numpy as np
+import pytest
+
+from bioptim_gui_api.load_existing.misc.pickle_analysis import ALLOW_PICKLE_ENV, DiscardState, analyze_pickle
+from bioptim_gui_api.load_existing.misc.solution_file import (
+    METADATA_KEY,
+    PickledSolution,
+    SolutionFile,
+    is_solution_file,
+    load_solution,
+)
+
+
+def save_solution(file, final_q: float = 1.0, cost: float = 12.5):
+    # same layout as the save_solution function of the generated code
+    q = np.arange(6.0).reshape(2, 3)
+    q_end = q.copy()
+    q_end[:, -1] = final_q
+    metadata = {"format_version": 1, "nb_phases": 2, "cost": cost, "seed": 3}
+    np.savez(
+        file,
+        **{METADATA_KEY: np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8)},
+        **{
+            "solution/states/0/q": q,
+            "solution/states/1/q": q_end,
+            "solution/controls/0/tau": np.ones((2, 3)),
+            "solution/controls/1/tau": np.ones((2, 3)),
+            "integrated_states/0/q": np.full((2, 10), 1.0),
+            "time_vector/0": np.linspace(0, 1, 10),
+        },
+    )
+
+
+class FakeSolution:
+    def __init__(self):
+        self.cost = 4.0
+        self.states = [{"q": np.zeros((2, 3))}]
+        self.controls = [{"tau": np.ones((2, 3))}]
+
+
+@pytest.fixture
+def solution_path(tmp_path):
+    path = tmp_path / "solution.npz"
+    save_solution(path)
+    return path
+
+
+def test_solution_file(solution_path):
+    with SolutionFile(solution_path) as solution:
+        assert solution.metadata["cost"] == 12.5
+        assert solution.nb_phases == 2
+        assert METADATA_KEY not in solution.keys()
+        assert "solution/states/0/q" in solution
+
+        q = solution.array("solution/states/0/q")
+        assert isinstance(q, np.memmap)
+        np.testing.assert_array_equal(q, np.arange(6.0).reshape(2, 3))
+
+        with pytest.raises(KeyError):
+            solution.array("solution/states/2/q")
+        with pytest.raises(KeyError):
+            solution.array(METADATA_KEY)
+
+
+def test_solution_file_bytes(solution_path):
+    with SolutionFile(solution_path.read_bytes()) as solution:
+        q = solution.array("solution/states/0/q")
+        assert not isinstance(q, np.memmap)
+        np.testing.assert_array_equal(q, np.arange(6.0).reshape(2, 3))
+
+
+def test_solution_file_phases(solution_path):
+    with SolutionFile(solution_path) as solution:
+        assert solution.nb_group_phases("solution/states") == 2
+        assert solution.nb_group_phases("integrated_states") == 1
+        assert solution.nb_group_phases("interpolated_states") == 0
+
+        controls = solution.phases("solution/controls")
+        assert [list(phase) for phase in controls] == [["tau"], ["tau"]]
+
+
+def test_load_solution(solution_path, tmp_path):
+    assert is_solution_file(solution_path.read_bytes())
+    assert isinstance(load_solution(solution_path), SolutionFile)
+
+    pickle_path = tmp_path / "solution.pkl"
+    pickle_path.write_bytes(pkl.dumps({"solution": FakeSolution(), "integrated_states": [{"q": np.zeros((2, 5))}]}))
+    assert not is_solution_file(pickle_path.read_bytes())
+
+    with load_solution(pickle_path, allow_pickle=True) as solution:
+        assert isinstance(solution, PickledSolution)
+        assert solution.metadata["cost"] == 4.0
+        assert solution.nb_group_phases("integrated_states") == 1
+        np.testing.assert_array_equal(solution.array("solution/controls/0/tau"), np.ones((2, 3)))
+
+    with pytest.raises(ValueError):
+        load_solution(pickle_path)
+
+
+@pytest.mark.parametrize(("final_q", "expected"), [(1.0, DiscardState.KEEP), (1.1, DiscardState.SOFT_DISCARD)])
+def test_analyze_solution_file(tmp_path, final_q, expected):
+    path = tmp_path / "solution.npz"
+    save_solution(path, final_q=final_q)
+    assert analyze_pickle(path.read_bytes()) == (expected, 12.5)
+
+
+def test_analyze_refused_pickle(monkeypatch):
+    pickle_data = pkl.dumps({"solution": FakeSolution(), "integrated_states": [{"q": np.zeros((2, 5))}]})
+    monkeypatch.delenv(ALLOW_PICKLE_ENV, raising=False)
+    assert analyze_pickle(pickle_data) == (DiscardState.HARD_DISCARD, -1)
+
+    monkeypatch.setenv(ALLOW_PICKLE_ENV, "0")
+    assert analyze_pickle(pickle_data) == (DiscardState.HARD_DISCARD, -1)
+
+    monkeypatch.setenv(ALLOW_PICKLE_ENV, "1")
+    assert analyze_pickle(pickle_data) == (DiscardState.KEEP, 4.0)
+
+    assert analyze_pickle(pickle_data, pickles_allowed=False) == (DiscardState.HARD_DISCARD, -1)
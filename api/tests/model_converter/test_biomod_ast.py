@@ -0,0 +1,71 @@
+import glob
+
+import pytest
+
+from bioptim_gui_api.model_converter.biomod_ast import Dofs, Marker, Ranges, Segment, Statement, parse_biomod
+
+BIOMODS_PATH = "test_biomods"  # to change depending on from where you run the test
+
+MODEL = """version 4
+
+segment Pelvis
+\trt 0.0 0.0 0.0 xyz 0.0 0.0 0.0
+\ttranslations xyz
+\trotations xyz
+\trangesQ
+\t\t-0.5 0.5
+\t\t-10*3.14 10*3.14
+\tcom 0.0 0.0 0.0
+\tmeshfile Model_mesh/pelvis.stl
+\tmeshrt -0.175 0 0 xyz 0 0 0
+endsegment
+
+\tmarker PelvisBase
+\t\tparent Pelvis
+\t\tposition 0.0 0.0 0.0
+\tendmarker
+"""
+
+
+def test_parse():
+    document = parse_biomod(MODEL)
+
+    assert list(document.segments) == ["Pelvis"]
+    assert list(document.markers) == ["PelvisBase"]
+
+    pelvis = document.segments["Pelvis"]
+    assert pelvis.header == "segment Pelvis\n"
+    assert pelvis.footer == "endsegment\n"
+    assert pelvis.body == (
+        Statement("\trt 0.0 0.0 0.0 xyz 0.0 0.0 0.0\n"),
+        Dofs("translations", "xyz", "\ttranslations xyz\n"),
+        Dofs("rotations", "xyz", "\trotations xyz\n"),
+        Ranges(("\trangesQ\n", "\t\t-0.5 0.5\n", "\t\t-10*3.14 10*3.14\n")),
+        Statement("\tcom 0.0 0.0 0.0\n"),
+        Statement("\tmeshfile Model_mesh/pelvis.stl\n"),
+        Statement("\tmeshrt -0.175 0 0 xyz 0 0 0\n"),
+    )
+    assert [mesh.keyword for mesh in pelvis.meshes] == ["meshfile", "meshrt"]
+
+    assert document.markers["PelvisBase"].lines[0] == "\tmarker PelvisBase\n"
+    assert document.markers["PelvisBase"].lines[-1] == "\tendmarker\n"
+
+
+def test_unterminated_segment():
+    document = parse_biomod("segment Pelvis\n\tcom 0 0 0")
+    assert document.nodes == (Segment("Pelvis", "segment Pelvis\n", (Statement("\tcom 0 0 0\n"),), ""),)
+
+
+def test_many_markers():
+    markers = "".join(f"marker cone_{i}\n\tparent Head\n\tposition 0 0 {i}\nendmarker\n" for i in range(20000))
+    document = parse_biomod(markers)
+
+    assert len(document.nodes) == 20001
+    assert all(isinstance(node, Marker) for node in document.nodes[:-1])
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(f"{BIOMODS_PATH}/**/*.bioMod", recursive=True)))
+def test_serialize(path):
+    with open(path, "r") as f:
+        content = f.read()
+    assert parse_biomod(content).serialize() == content + "\n"
@@ -0,0 +1,89 @@
+import pytest
+
+from bioptim_gui_api.acrobatics_ocp.misc.models import AdditionalCriteria
+from bioptim_gui_api.model_converter.converted_model_cache import (
+    CONVERTED_MODELS_CACHE_ENV,
+    ConvertedModelCache,
+    converted_models,
+)
+from bioptim_gui_api.model_converter.converter_utils import get_converter
+
+BIOMODS_PATH = "test_biomods"  # to change depending on from where you run the test
+
+
+def read_model(folder: str = "with_visual") -> str:
+    with open(f"{BIOMODS_PATH}/{folder}/{folder}_base.bioMod", "r") as f:
+        return f.read()
+
+
+def test_key():
+    content = read_model()
+    criteria = AdditionalCriteria(with_visual_criteria=True)
+
+    key = ConvertedModelCache.key(content, "straight", criteria)
+    assert key == ConvertedModelCache.key(content, "straight", AdditionalCriteria(True))
+    assert key != ConvertedModelCache.key(content, "pike", criteria)
+    assert key != ConvertedModelCache.key(content, "straight", criteria._replace(without_cone=True))
+    assert key != ConvertedModelCache.key(content + "\n", "straight", criteria)
+
+
+def test_get():
+    cache = ConvertedModelCache()
+    content = read_model()
+    criteria = AdditionalCriteria(with_visual_criteria=True)
+    converter = get_converter("straight", criteria)
+    calls = []
+
+    def convert():
+        calls.append(1)
+        return converter.convert(content)
+
+    expected = converter.convert(content)
+    assert cache.get(content, "straight", criteria, convert) == expected
+    assert cache.get(content, "straight", criteria, convert) == expected
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted():
+    cache = ConvertedModelCache(maxsize=2)
+    criteria = AdditionalCriteria()
+    cache.get("a", "straight", criteria, lambda: "converted a")
+    cache.get("b", "straight", criteria, lambda: "converted b")
+    cache.get("a", "straight", criteria, lambda: "converted a")
+    cache.get("c", "straight", criteria, lambda: "converted c")
+
+    assert cache.get("a", "straight", criteria, lambda: "new a") == "converted a"
+    assert cache.get("b", "straight", criteria, lambda: "new b") == "new b"
+
+
+def test_errors_are_not_cached():
+    cache = ConvertedModelCache()
+    content = read_model("vanilla")
+    criteria = AdditionalCriteria(with_visual_criteria=True)
+    converter = get_converter("straight", criteria)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.get(content, "straight", criteria, lambda: converter.convert(content))
+    assert cache.misses == 2
+
+
+def test_persisted(tmp_path):
+    criteria = AdditionalCriteria()
+    ConvertedModelCache(directory=tmp_path).get("a", "straight", criteria, lambda: "converted a")
+
+    # e.g. another process or a restart
+    cache = ConvertedModelCache(directory=tmp_path)
+    assert cache.get("a", "straight", criteria, lambda: "new a") == "converted a"
+    assert cache.hits == 1
+    assert [path.suffix for path in tmp_path.iterdir()] == [".bioMod"]
+
+
+def test_converted_models(monkeypatch, tmp_path):
+    monkeypatch.delenv(CONVERTED_MODELS_CACHE_ENV, raising=False)
+    assert converted_models().directory is None
+    assert converted_models() is converted_models()
+
+    monkeypatch.setenv(CONVERTED_MODELS_CACHE_ENV, str(tmp_path))
+    assert converted_models().directory == tmp_path
@@ -74,3 +74,14 @@ def test_bad(position, with_visual_criteria, non_collision, without_cone, folder
         with pytest.raises(ValueError):
             with open(filepath, "r") as f:
                 converter.convert(f.read())
+
+
+def test_many_unused_markers():
+    # consecutive unused markers used to be skipped recursively, reaching the recursion limit
+    converter = get_converter("straight", AdditionalCriteria())
+    with open(f"{BIOMODS_PATH}/vanilla/vanilla_base.bioMod", "r") as f:
+        content = f.read()
+    expected = converter.convert(content)
+
+    cones = "".join(f"marker cone_{i}\n\tparent Pelvis\n\tposition 0 0 {i}\nendmarker\n" for i in range(5000))
+    assert converter.convert(content + "\n" + cones).strip() == expected.strip()
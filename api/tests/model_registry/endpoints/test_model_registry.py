@@ -0,0 +1,44 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bioptim_gui_api.model_registry.endpoints.model_registry import router
+from bioptim_gui_api.model_registry.misc.model_registry import MODEL_REGISTRY_ENV, model_hash
+
+test_app = FastAPI()
+test_app.include_router(router)
+client = TestClient(test_app)
+
+BIOMODS_PATH = "test_biomods"  # to change depending on from where you run the test
+
+
+@pytest.fixture(autouse=True)
+def registry_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv(MODEL_REGISTRY_ENV, str(tmp_path))
+    return tmp_path
+
+
+def test_post_get_model():
+    model_path = f"{BIOMODS_PATH}/with_collision_and_visual/with_collision_and_visual_base.bioMod"
+    with open(model_path, "r") as f:
+        content = f.read()
+
+    for _ in range(2):
+        with open(model_path, "rb") as f:
+            response = client.post("/models/", files={"file": (model_path, f)})
+        assert response.status_code == 200, response
+        assert response.json() == {"model_hash": model_hash(content), "size": len(content.encode("utf-8"))}
+
+    response = client.get(f"/models/{model_hash(content)}")
+    assert response.status_code == 200, response
+    assert response.text == content
+
+
+def test_post_not_utf8():
+    response = client.post("/models/", files={"file": ("model.bioMod", b"\xff\xfe")})
+    assert response.status_code == 400, response
+
+
+def test_get_unknown():
+    response = client.get(f"/models/{model_hash('unknown')}")
+    assert response.status_code == 404, response
@@ -0,0 +1,64 @@
+import pytest
+
+from bioptim_gui_api.model_registry.misc.model_registry import (
+    MODEL_REGISTRY_ENV,
+    ModelRegistry,
+    model_hash,
+    model_registry,
+    read_model_content,
+)
+
+MODEL = "version 4\n\nsegment Pelvis\n\ttranslations xyz\nendsegment\n"
+
+
+def test_put_get(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    reference = registry.put(MODEL)
+
+    assert reference == model_hash(MODEL)
+    assert registry.get(reference) == MODEL
+    assert reference in registry
+    assert registry.put(MODEL) == reference
+    assert [path.name for path in tmp_path.iterdir()] == [f"{reference}.bioMod"]
+
+    # e.g. another process or a restart
+    assert ModelRegistry(tmp_path).get(reference) == MODEL
+
+
+def test_newlines_kept(tmp_path):
+    model = MODEL.replace("\n", "\r\n")
+    reference = ModelRegistry(tmp_path).put(model)
+
+    assert (tmp_path / f"{reference}.bioMod").read_bytes() == model.encode("utf-8")
+    read_model = ModelRegistry(tmp_path).get(reference)
+    assert read_model == model
+    assert model_hash(read_model) == reference
+
+
+@pytest.mark.parametrize("reference", [model_hash("unknown"), "../../etc/passwd", ""])
+def test_get_unknown(tmp_path, reference):
+    registry = ModelRegistry(tmp_path)
+    with pytest.raises(KeyError):
+        registry.get(reference)
+    assert reference not in registry
+
+
+def test_least_recently_used_is_forgotten(tmp_path):
+    registry = ModelRegistry(tmp_path, maxsize=1)
+    first = registry.put("first")
+    registry.put("second")
+
+    (tmp_path / f"{first}.bioMod").unlink()
+    with pytest.raises(KeyError):
+        registry.get(first)
+
+
+def test_read_model_content(monkeypatch, tmp_path):
+    monkeypatch.setenv(MODEL_REGISTRY_ENV, str(tmp_path))
+    reference = model_registry().put(MODEL)
+
+    assert read_model_content({"model_path": "model.bioMod", "model_hash": reference}) == MODEL
+    # saved before the registry existed
+    assert read_model_content({"model_path": "model.bioMod", "model_content": MODEL}) == MODEL
+    with pytest.raises(KeyError):
+        read_model_content({"model_path": "", "model_hash": ""})
@@ -1,3 +1,4 @@
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
@@ -51,3 +52,28 @@ def test_get_available_values():
     assert "objectives" in data
     assert "constraints" in data
     assert "integration_rules" in data
+
+
+def test_get_penalty_signatures():
+    response = client.get("/penalties/signatures")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"mayer", "lagrange", "constraints"}
+    assert "MINIMIZE_TIME" in data["mayer"]
+    assert "MINIMIZE_CONTROL" in data["lagrange"]
+    assert "TIME_CONSTRAINT" in data["constraints"]
+    assert data["lagrange"]["MINIMIZE_STATE"] == [{"name": "key", "value": None, "type": "str"}]
+
+
+@pytest.mark.parametrize(
+    "endpoint",
+    ["nodes", "integration_rules", "objectives", "constraints", "available_values"],
+)
+def test_catalogs_not_modified(endpoint):
+    response = client.get(f"/penalties/{endpoint}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "max-age" in response.headers["cache-control"]
+
+    response = client.get(f"/penalties/{endpoint}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,16 @@
+import bioptim
+import pytest
+
+from bioptim_gui_api.penalty.misc.bioptim_enums import Axis, Node, QuadratureRule
+
+
+@pytest.mark.parametrize(
+    "snapshot, enum",
+    [
+        (QuadratureRule, bioptim.QuadratureRule),
+        (Node, bioptim.Node),
+        (Axis, bioptim.Axis),
+    ],
+)
+def test_same_as_bioptim(snapshot, enum):
+    assert {e.name: e.value for e in snapshot} == {e.name: e.value for e in enum}
@@ -0,0 +1,57 @@
+import json
+
+from bioptim import ConstraintFcn, ObjectiveFcn
+
+from bioptim_gui_api.penalty.misc import penalty_signatures as signatures_module
+from bioptim_gui_api.penalty.misc.penalty_signatures import (
+    PENALTY_SIGNATURES_CACHE_ENV,
+    build_penalty_signatures,
+    get_args,
+    penalty_signatures,
+    signatures_path,
+    write_penalty_signatures,
+)
+from bioptim_gui_api.penalty.misc.penalty_utils import constraint_arguments, obj_arguments
+
+
+def test_build_penalty_signatures():
+    signatures = build_penalty_signatures()
+    assert set(signatures) == {"mayer", "lagrange", "constraints"}
+    assert signatures["mayer"]["MINIMIZE_TIME"] == get_args(ObjectiveFcn.Mayer.MINIMIZE_TIME)
+    assert signatures["lagrange"]["MINIMIZE_STATE"] == get_args(ObjectiveFcn.Lagrange.MINIMIZE_STATE)
+    assert signatures["constraints"]["TIME_CONSTRAINT"] == get_args(ConstraintFcn.TIME_CONSTRAINT)
+
+
+def test_penalty_signatures_built_once():
+    assert penalty_signatures() is penalty_signatures()
+
+
+def test_arguments_are_copies():
+    arguments = obj_arguments("mayer", "MINIMIZE_TIME")
+    arguments[0]["value"] = 1.0
+    assert obj_arguments("mayer", "MINIMIZE_TIME")[0]["value"] is None
+
+    arguments = constraint_arguments("TRACK_STATE")
+    arguments.clear()
+    assert constraint_arguments("TRACK_STATE") == get_args(ConstraintFcn.TRACK_STATE)
+
+
+def test_penalty_signatures_persisted(tmp_path, monkeypatch):
+    monkeypatch.setenv(PENALTY_SIGNATURES_CACHE_ENV, str(tmp_path))
+    penalty_signatures.cache_clear()
+    try:
+        signatures = penalty_signatures()
+        assert signatures_path(tmp_path).is_file()
+
+        # read back by the next process instead of introspecting bioptim again
+        penalty_signatures.cache_clear()
+        monkeypatch.setattr(signatures_module, "build_penalty_signatures", lambda: None)
+        assert penalty_signatures() == signatures
+    finally:
+        penalty_signatures.cache_clear()
+
+
+def test_write_penalty_signatures(tmp_path):
+    path = write_penalty_signatures(tmp_path)
+    assert path == signatures_path(tmp_path)
+    assert json.loads(path.read_text()) == build_penalty_signatures()
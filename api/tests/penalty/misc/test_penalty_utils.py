@@ -4,9 +4,9 @@ from fastapi.exceptions import HTTPException
 
 from bioptim_gui_api.penalty.misc.constraint_printer import ConstraintPrinter
 from bioptim_gui_api.penalty.misc.objective_printer import ObjectivePrinter
+from bioptim_gui_api.penalty.misc.penalty_signatures import format_arg_type
 from bioptim_gui_api.penalty.misc.penalty_utils import (
     get_args,
-    format_arg_type,
     obj_arguments,
     constraint_arguments,
     create_objective,
@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from bioptim_gui_api.penalty.misc.penalty_signatures import PENALTY_SIGNATURES_CACHE_ENV, signatures_path
+
+API_FOLDER = Path(__file__).parent.parent
+
+# importing the api takes about 1.5 times as long as importing fastapi, it took more than 10 times as long when
+# bioptim was imported on startup
+MAX_IMPORT_TIME_RATIO = 5
+
+SIGNATURES = {
+    "mayer": {"MINIMIZE_TIME": [{"name": "min_bound", "value": None, "type": "float"}]},
+    "lagrange": {},
+    "constraints": {},
+}
+
+
+def run_api(code: str, cwd: Path = API_FOLDER, env: dict = None) -> dict:
+    """
+    Run some code using the api in a new process, as uvicorn does on startup
+
+    Parameters
+    ----------
+    code: str
+        The code to run, it prints the json of its result
+    cwd: Path
+        The working directory of the process
+    env: dict
+        The environment variables to add to the ones of the tests
+
+    Returns
+    -------
+    dict
+        The result printed by the code
+    """
+    python_path = os.pathsep.join(filter(None, (str(API_FOLDER), os.environ.get("PYTHONPATH"))))
+    env = {**os.environ, "PYTHONPATH": python_path, **(env or {})}
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def imported_modules() -> set[str]:
+    """
+    Import the api in a new process, as uvicorn does on startup
+
+    Returns
+    -------
+    set[str]
+        The names of the imported modules
+    """
+    code = "import json, sys; import bioptim_gui_api.main; print(json.dumps(list(sys.modules)))"
+    return set(run_api(code))
+
+
+def test_startup_does_not_import_bioptim():
+    modules = imported_modules()
+    for module in ("bioptim", "casadi", "biorbd"):
+        assert module not in modules
+
+
+def test_lifespan_does_not_import_bioptim(tmp_path):
+    # the signatures prebuilt in the docker image
+    signatures_directory = tmp_path / "signatures"
+    signatures_directory.mkdir()
+    signatures_path(signatures_directory).write_text(json.dumps(SIGNATURES))
+
+    code = """
+import json, sys
+from fastapi.testclient import TestClient
+from bioptim_gui_api.main import app
+
+with TestClient(app) as client:
+    signatures = client.get("/penalties/signatures").json()
+print(json.dumps({"modules": list(sys.modules), "signatures": signatures}))
+"""
+    # the ocp data is written in the working directory
+    result = run_api(code, cwd=tmp_path, env={PENALTY_SIGNATURES_CACHE_ENV: str(signatures_directory)})
+
+    assert result["signatures"] == SIGNATURES
+    for module in ("bioptim", "casadi", "biorbd"):
+        assert module not in result["modules"]
+
+
+def test_workspaces_restored_on_startup(tmp_path):
+    code = """
+import json
+from fastapi.testclient import TestClient
+from bioptim_gui_api.main import app
+
+with TestClient(app) as client:
+    for workspace, nb_phases in updates.items():
+        client.put("/generic_ocp/nb_phases", json={"nb_phases": nb_phases}, headers={"X-Workspace-Id": workspace})
+    result = {
+        workspace: client.get("/generic_ocp/", headers={"X-Workspace-Id": workspace}).json()["nb_phases"]
+        for workspace in ("default", "lab")
+    }
+print(json.dumps(result))
+"""
+    # the ocp data is written in the working directory when the api stops
+    assert run_api("updates = {'default': 2, 'lab': 2}" + code, cwd=tmp_path) == {"default": 2, "lab": 2}
+    assert (tmp_path / "workspaces" / "lab" / "generic_ocp_data.json").is_file()
+
+    # restarted, the workspaces are restored but the default one, which starts from scratch
+    assert run_api("updates = {}" + code, cwd=tmp_path) == {"default": 1, "lab": 2}
+
+
+def test_startup_time(record_property):
+    # relative to the import of fastapi on the same machine, the absolute time depends on the machine
+    code = """
+import json, time
+start = time.perf_counter()
+import fastapi
+fastapi_time = time.perf_counter() - start
+start = time.perf_counter()
+import bioptim_gui_api.main
+api_time = time.perf_counter() - start
+print(json.dumps({"fastapi": fastapi_time, "api": api_time}))
+"""
+    times = run_api(code)
+    record_property("fastapi_import_time", times["fastapi"])
+    record_property("api_import_time", times["api"])
+
+    assert times["api"] < MAX_IMPORT_TIME_RATIO * times["fastapi"]
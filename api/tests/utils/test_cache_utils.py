@@ -0,0 +1,50 @@
+from bioptim_gui_api.utils.cache_utils import EnvConfigured, source_fingerprint
+
+
+def test_source_fingerprint(tmp_path):
+    a = tmp_path / "a.py"
+    b = tmp_path / "b.py"
+    a.write_text("a = 1\n")
+    b.write_text("b = 1\n")
+
+    fingerprint = source_fingerprint((a, b))
+    assert fingerprint == source_fingerprint((b, a))
+    assert fingerprint != source_fingerprint((a,))
+
+    c = tmp_path / "c.py"
+    c.write_text("b = 2\n")
+    assert fingerprint != source_fingerprint((a, c))
+
+
+def test_env_configured(monkeypatch):
+    configured = EnvConfigured("BIOPTIM_GUI_TEST_ENV_CONFIGURED", lambda value: [value], default="default")
+
+    monkeypatch.delenv("BIOPTIM_GUI_TEST_ENV_CONFIGURED", raising=False)
+    instance = configured.get()
+    assert instance == ["default"]
+    assert configured.get() is instance
+
+    monkeypatch.setenv("BIOPTIM_GUI_TEST_ENV_CONFIGURED", "value")
+    assert configured.get() == ["value"]
+
+    monkeypatch.setenv("BIOPTIM_GUI_TEST_ENV_CONFIGURED", "")
+    assert configured.get() == ["default"]
+
+
+def test_env_configured_none(monkeypatch):
+    calls = []
+
+    def factory(value):
+        calls.append(value)
+        return None
+
+    configured = EnvConfigured("BIOPTIM_GUI_TEST_ENV_CONFIGURED", factory)
+
+    monkeypatch.delenv("BIOPTIM_GUI_TEST_ENV_CONFIGURED", raising=False)
+    assert configured.get() is None
+    assert configured.get() is None
+    assert calls == [None]
+
+    monkeypatch.setenv("BIOPTIM_GUI_TEST_ENV_CONFIGURED", "value")
+    assert configured.get() is None
+    assert calls == [None, "value"]
@@ -1,6 +1,13 @@
+import numpy as np
 import pytest
 
-from bioptim_gui_api.utils.format_utils import format_2d_array, arg_to_string, indent_lines
+from bioptim_gui_api.utils.format_utils import (
+    format_2d_array,
+    arg_to_string,
+    indent_lines,
+    invert_min_max,
+    invert_min_max_array,
+)
 
 
 def test_format_2d_array():
@@ -80,3 +87,18 @@ def test_multiple_newline_in_middle():
 """
 
     assert indent_lines(text, 4) == expected
+
+
+def test_invert_min_max_array_same_as_invert_min_max():
+    rng = np.random.default_rng(0)
+    min_bounds = rng.uniform(-2, 0, (3, 4, 3))
+    max_bounds = rng.uniform(0, 2, (3, 4, 3))
+    bounds = [{"min": min_bounds[i].copy(), "max": max_bounds[i].copy()} for i in range(3)]
+
+    invert_min_max(bounds, 1)
+    invert_min_max_array(min_bounds, max_bounds, 1)
+
+    for i in range(3):
+        assert np.array_equal(bounds[i]["min"], min_bounds[i])
+        assert np.array_equal(bounds[i]["max"], max_bounds[i])
+    assert np.all(min_bounds <= max_bounds)
@@ -0,0 +1,72 @@
+import pytest
+
+from bioptim_gui_api.utils.json_patch import apply_patch, make_patch
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        (1, 1),
+        (1, 2),
+        (1, 1.0),
+        ("a", None),
+        ({"a": 1}, {"a": 1, "b": [1, 2]}),
+        ({"a": 1, "b": 2}, {"b": 3}),
+        ({"a/b": 1, "c~d": 2}, {"a/b": 2, "c~d": 3}),
+        ([1, 2, 3], [1, 2, 3, 4]),
+        ([1, 2, 3], [0, 1, 2, 3]),
+        ([1, 2, 3], [1, 3]),
+        ([1, 2, 3], []),
+        ([], [{"a": 1}]),
+        ([1, 2, 3, 4, 5], [1, 6, 7, 4, 5, 8]),
+        ([[0, 1], [2, 3]], [[0, 1], [2, 4], [5, 6]]),
+        (
+            [{"phase_name": "Twist"}, {"phase_name": "Tuck"}, {"phase_name": "Landing"}],
+            [{"phase_name": "Tuck", "duration": 1}, {"phase_name": "Twist"}, {"phase_name": "Landing"}],
+        ),
+        ({"a": [1, {"b": [1, 2]}]}, {"a": [{"b": [2]}, 1]}),
+    ],
+)
+def test_make_apply_patch(old, new):
+    patch = make_patch(old, new)
+    patched = apply_patch(old, patch)
+    assert patched == new
+    assert [type(v) for v in [patched]] == [type(new)]
+
+
+def test_make_patch_equal():
+    assert make_patch({"a": [1, 2]}, {"a": [1, 2]}) == []
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [([1], [1.0]), ({"b": 1}, {"b": True}), ({"a": [{"b": 0}]}, {"a": [{"b": 0.0}]}), ([[1, 2]], [[1, 2.0]])],
+)
+def test_make_patch_nested_types(old, new):
+    patch = make_patch(old, new)
+    assert patch != []
+    patched = apply_patch(old, patch)
+    assert repr(patched) == repr(new)
+
+
+def test_make_patch_is_minimal():
+    old = [{"phase_name": str(i)} for i in range(5)]
+    new = old[:2] + [{"phase_name": "new"}] + old[2:]
+    assert make_patch(old, new) == [{"op": "add", "path": "/2", "value": {"phase_name": "new"}}]
+
+    new = [dict(phase) for phase in old]
+    new[3]["duration"] = 1.0
+    assert make_patch(old, new) == [{"op": "add", "path": "/3/duration", "value": 1.0}]
+
+
+def test_apply_patch_does_not_modify_document():
+    document = {"a": [1, 2]}
+    apply_patch(document, [{"op": "add", "path": "/a/-", "value": 3}])
+    assert document == {"a": [1, 2]}
+
+
+def test_apply_patch_wrong():
+    with pytest.raises(ValueError):
+        apply_patch({}, [{"op": "move", "path": "/a", "from": "/b"}])
+    with pytest.raises(KeyError):
+        apply_patch({}, [{"op": "replace", "path": "/a", "value": 1}])
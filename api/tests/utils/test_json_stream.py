@@ -0,0 +1,18 @@
+import json
+
+import pytest
+
+from bioptim_gui_api.utils.json_stream import json_string_chunks
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        [],
+        [""],
+        ["def main():\n", '    print("hello")\n'],
+        ["\\", "\t", "é", "😀", "\x00"],
+    ],
+)
+def test_json_string_chunks(chunks):
+    assert json.loads("".join(json_string_chunks(chunks))) == "".join(chunks)
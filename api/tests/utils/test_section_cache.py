@@ -0,0 +1,51 @@
+from bioptim_gui_api.utils.section_cache import SectionCache, cached_section, section_cache
+
+
+def test_get():
+    cache = SectionCache(maxsize=2)
+    calls = []
+
+    def generate(value):
+        def f():
+            calls.append(value)
+            return value
+
+        return f
+
+    assert cache.get(SectionCache.key("a"), generate("a")) == "a"
+    assert cache.get(SectionCache.key("a"), generate("other")) == "a"
+    assert calls == ["a"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted():
+    cache = SectionCache(maxsize=2)
+    cache.get(SectionCache.key("a"), lambda: "a")
+    cache.get(SectionCache.key("b"), lambda: "b")
+    cache.get(SectionCache.key("a"), lambda: "a")
+    cache.get(SectionCache.key("c"), lambda: "c")
+
+    assert cache.get(SectionCache.key("a"), lambda: "new a") == "a"
+    assert cache.get(SectionCache.key("b"), lambda: "new b") == "new b"
+
+
+def test_key():
+    assert SectionCache.key({"a": 1, "b": [1, 2]}) == SectionCache.key({"b": [1, 2], "a": 1})
+    assert SectionCache.key({"a": 1}) != SectionCache.key({"a": 1.5})
+    assert SectionCache.key(1, 2) != SectionCache.key(2, 1)
+
+
+def test_cached_section():
+    calls = []
+
+    @cached_section
+    def section(phase: int, bounds: dict) -> str:
+        calls.append(phase)
+        return f"phase={phase}, bounds={bounds}"
+
+    section_cache.clear()
+    assert section(0, {"min": [[1]]}) == "phase=0, bounds={'min': [[1]]}"
+    assert section(0, {"min": [[1]]}) == "phase=0, bounds={'min': [[1]]}"
+    assert section(1, {"min": [[1]]}) == "phase=1, bounds={'min': [[1]]}"
+    assert section(0, {"min": [[2]]}) == "phase=0, bounds={'min': [[2]]}"
+    assert calls == [0, 1, 0]
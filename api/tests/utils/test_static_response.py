@@ -0,0 +1,60 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from bioptim_gui_api.utils.static_response import STATIC_MAX_AGE, StaticJSON, add_static_route
+
+calls = []
+
+
+def get_catalog():
+    calls.append(1)
+    return {"values": ["A", "B"]}
+
+
+router = APIRouter(prefix="/catalog")
+static_catalog = add_static_route(router, "/", get_catalog, response_model=dict)
+test_app = FastAPI()
+test_app.include_router(router)
+client = TestClient(test_app)
+
+
+def test_same_content_same_etag():
+    assert StaticJSON([1, 2]).etag == StaticJSON([1, 2]).etag
+    assert StaticJSON([1, 2]).etag != StaticJSON([2, 1]).etag
+    assert StaticJSON([1, 2]).etag.startswith('"')
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"other"', False),
+        ("*", True),
+    ],
+)
+def test_matches(if_none_match, expected):
+    assert StaticJSON([1, 2]).matches(if_none_match) == expected
+
+
+def test_matches_list_and_weak():
+    static_json = StaticJSON([1, 2])
+    assert static_json.matches(f'"other", {static_json.etag}')
+    assert static_json.matches(f"W/{static_json.etag}")
+
+
+def test_static_route():
+    response = client.get("/catalog/")
+    assert response.status_code == 200
+    assert response.json() == {"values": ["A", "B"]}
+    assert response.headers["etag"] == static_catalog.etag
+    assert response.headers["cache-control"] == f"public, max-age={STATIC_MAX_AGE}"
+
+    response = client.get("/catalog/", headers={"If-None-Match": static_catalog.etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == static_catalog.etag
+
+    # computed once, when the route is added
+    assert len(calls) == 1
@@ -1,11 +1,15 @@
 import argparse
-import pickle as pkl
+import sys
 
 import bioviz
 import numpy as np
 import cv2
 from pathlib import Path
 
+# the solution files are read with the modules of the api (api/bioptim_gui_api/load_existing/misc), which only need numpy
+sys.path.append(str(Path(__file__).resolve().parents[1] / "api"))
+from bioptim_gui_api.load_existing.misc.solution_file import load_solution  # noqa: E402
+
 
 def merge_videos(video1_path: str, video2_path: str, save_path: str):
     # Open the videos
@@ -86,13 +90,11 @@ def create_video(biorbd_model_path: str, interpolated_states, save_path: str, ca
     b.quit()
 
 
-def animate_solution(pkl_path: str) -> None:
-    with open(pkl_path, "rb") as f:
-        o = pkl.load(f)
-
-    interpolated_states = o["interpolated_states"]
-    biomodel_path = o["biomodel_path"]
-    coneless_model = o.get("coneless_model", biomodel_path)
+def animate_solution(pkl_path: str, allow_pickle: bool = False) -> None:
+    with load_solution(pkl_path, allow_pickle=allow_pickle) as o:
+        interpolated_states = o.phases("interpolated_states")
+        biomodel_path = o.metadata["biomodel_path"]
+        coneless_model = o.metadata.get("coneless_model") or biomodel_path
 
     pkl_path = Path(pkl_path)
     save_name = pkl_path.stem
@@ -114,11 +116,14 @@ if __name__ == "__main__":
     # arg parser
     parser = argparse.ArgumentParser()
 
-    parser.add_argument("pickle", type=str, help="Path to the pickle")
+    parser.add_argument("pickle", type=str, help="Path to the solution (.npz, or .pkl)")
+    parser.add_argument(
+        "--allow-pickle", action="store_true", help="Load a pickle saved by older generated code (trusted only)"
+    )
 
     # arg handling
     args = parser.parse_args()
 
     pkl_path = args.pickle
 
-    animate_solution(pkl_path)
+    animate_solution(pkl_path, args.allow_pickle)
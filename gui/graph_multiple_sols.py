@@ -1,12 +1,16 @@
 import argparse
-import pickle as pkl
+import sys
 import numpy as np
-import bioptim
 import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 from pathlib import Path
 
+# the solution files are read with the modules of the api (api/bioptim_gui_api/load_existing/misc), which only need numpy
+sys.path.append(str(Path(__file__).resolve().parents[1] / "api"))
+from bioptim_gui_api.load_existing.misc.results_index import ResultsIndex  # noqa: E402
+from bioptim_gui_api.load_existing.misc.solution_file import load_solution  # noqa: E402
+
 
 def get_dofs_name(nb_q):
     # vanilla, with vision, with spine, with spine and vision
@@ -91,19 +95,17 @@ def get_dofs_name(nb_q):
     return dof_names
 
 
-def plot_solutions(pkl_paths: list[str], variable: str = "q") -> None:
+def plot_solutions(pkl_paths: list[str], variable: str = "q", allow_pickle: bool = False) -> None:
     assert len(pkl_paths) != 0
 
-    with open(pkl_paths[0], "rb") as f:
-        o = pkl.load(f)
+    with load_solution(pkl_paths[0], allow_pickle=allow_pickle) as o:
+        nb_q = len(o.array(f"integrated_states/0/{variable}"))
+        final_time = round(float(o.array("time_vector/0")[-1]), 2)
+        nb_phases = o.nb_phases
+        n_shooting = [o.array(f"solution/states/{phase}/{variable}").shape[1] - 1 for phase in range(nb_phases)]
 
-    nb_q = len(o["integrated_states"][0][variable])
     name_dof = get_dofs_name(nb_q)
 
-    final_time = round(o["time_vector"][0][-1], 2)
-    nb_phases = len(o["solution"].states)
-    n_shooting = [len(o["solution"].states[phase][variable][0]) - 1 for phase in range(nb_phases)]
-
     time = np.linspace(0, final_time, sum(n_shooting) + 1)
 
     # plot setup
@@ -116,15 +118,21 @@ def plot_solutions(pkl_paths: list[str], variable: str = "q") -> None:
     legend_handles = []
 
     for i, pkl_path in enumerate(pkl_paths):
-        with open(pkl_path, "rb") as f:
-            o = pkl.load(f)
-
-        nb_phases = len(o["solution"].states)
-        n_shooting = [len(o["solution"].states[phase][variable][0]) - 1 for phase in range(nb_phases)]
+        with load_solution(pkl_path, allow_pickle=allow_pickle) as o:
+            nb_phases = o.nb_phases
+            n_shooting = [o.array(f"solution/states/{phase}/{variable}").shape[1] - 1 for phase in range(nb_phases)]
+            integrated_states = np.array(o.array(f"integrated_states/0/{variable}"))
+            x_bounds = [
+                (
+                    np.array(o.array(f"x_bounds/{phase}/{variable}/min")),
+                    np.array(o.array(f"x_bounds/{phase}/{variable}/max")),
+                )
+                for phase in range(nb_phases)
+            ]
         time = np.linspace(0, final_time, sum(n_shooting) + 1)
 
         for dof in range(nb_q):
-            solution_q = o["integrated_states"][0][variable][dof]
+            solution_q = integrated_states[dof]
 
             # plot solution
             color = cmap(i / len(pkl_paths))
@@ -135,8 +143,8 @@ def plot_solutions(pkl_paths: list[str], variable: str = "q") -> None:
             # title
             axs[dof].set_title(name_dof[dof], fontsize=18)
 
-            min_bounds_per_phase = [o["x_bounds"][phase][variable].min[dof].tolist() for phase in range(nb_phases)]
-            max_bounds_per_phase = [o["x_bounds"][phase][variable].max[dof].tolist() for phase in range(nb_phases)]
+            min_bounds_per_phase = [x_bounds[phase][0][dof].tolist() for phase in range(nb_phases)]
+            max_bounds_per_phase = [x_bounds[phase][1][dof].tolist() for phase in range(nb_phases)]
 
             ylims = [
                 (np.min(min_bounds_per_phase) - 0.1) * 1.1,
@@ -203,16 +211,28 @@ def plot_solutions(pkl_paths: list[str], variable: str = "q") -> None:
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Process a list of pickle files.")
-
-    parser.add_argument("pickles", nargs="+", help="List of pickle files to process.")
+    parser = argparse.ArgumentParser(description="Process a list of solution files (.npz, or .pkl).")
+
+    parser.add_argument("pickles", nargs="+", help="List of solution files to process.")
+    parser.add_argument(
+        "--best",
+        type=int,
+        help="Plot the best converged solutions of the given results folders (e.g. output/<script>/results) instead, "
+        "given by their index",
+    )
+    parser.add_argument(
+        "--allow-pickle", action="store_true", help="Load the pickles saved by older generated code (trusted only)"
+    )
 
     args = parser.parse_args()
 
     pickle_paths = args.pickles
+    if args.best:
+        results = [result for folder in args.pickles for result in ResultsIndex(folder).best(args.best)]
+        pickle_paths = [result.file_path for result in sorted(results, key=lambda result: result.cost)[: args.best]]
 
-    plot_solutions(pickle_paths)
-    plot_solutions(pickle_paths, "qdot")
+    plot_solutions(pickle_paths, allow_pickle=args.allow_pickle)
+    plot_solutions(pickle_paths, "qdot", args.allow_pickle)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import 'dart:convert';
 
 import 'package:bioptim_gui/models/acrobatics_data.dart';
 import 'package:bioptim_gui/models/api_config.dart';
+import 'package:bioptim_gui/models/catalog_cache.dart';
 import 'package:bioptim_gui/models/ocp_request_maker.dart';
 import 'package:flutter/foundation.dart';
 import 'package:http/http.dart' as http;
@@ -29,8 +30,8 @@ class AcrobaticsRequestMaker extends OCPRequestMaker<AcrobaticsData> {
   @override
   Future<AcrobaticsAvailableValues> getAvailableValues() async {
     final url = Uri.parse('${APIConfig.url}/$prefix/available_values');
-    final response = await http.get(url);
-    final jsonResponse = json.decode(response.body);
+    final body = await CatalogCache.get(url);
+    final jsonResponse = json.decode(body!);
 
     List<String> nodeValues = List<String>.from(jsonResponse["nodes"]);
     List<String> integrationRules =
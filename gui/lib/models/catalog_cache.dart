@@ -0,0 +1,61 @@
+import 'package:http/http.dart' as http;
+
+///
+/// [CatalogCache] keeps the responses of the catalog endpoints of the API
+/// (available values, positions, dynamics, ...) which are served with an ETag
+/// and a max-age. A cached response is used as is until it expires, then it is
+/// revalidated with If-None-Match, a 304 costing no body.
+class CatalogCache {
+  static final Map<Uri, _CachedCatalog> _catalogs = {};
+
+  static final RegExp _maxAgePattern = RegExp(r'max-age=(\d+)');
+
+  /// The body of a GET on the url, from the cache if it is still valid.
+  /// Returns null if the request failed and nothing is cached.
+  static Future<String?> get(Uri url) async {
+    final cached = _catalogs[url];
+    if (cached != null && DateTime.now().isBefore(cached.expiresAt)) {
+      return cached.body;
+    }
+
+    final headers = <String, String>{};
+    if (cached?.etag != null) headers['If-None-Match'] = cached!.etag!;
+
+    final response = await http.get(url, headers: headers);
+
+    if (response.statusCode == 304 && cached != null) {
+      _catalogs[url] = _CachedCatalog(
+        cached.body,
+        response.headers['etag'] ?? cached.etag,
+        _expiresAt(response),
+      );
+      return cached.body;
+    }
+
+    if (response.statusCode != 200) return cached?.body;
+
+    _catalogs[url] = _CachedCatalog(
+      response.body,
+      response.headers['etag'],
+      _expiresAt(response),
+    );
+    return response.body;
+  }
+
+  static DateTime _expiresAt(http.Response response) {
+    final match =
+        _maxAgePattern.firstMatch(response.headers['cache-control'] ?? '');
+    final maxAge = match == null ? 0 : int.parse(match.group(1)!);
+    return DateTime.now().add(Duration(seconds: maxAge));
+  }
+
+  static void clear() => _catalogs.clear();
+}
+
+class _CachedCatalog {
+  _CachedCatalog(this.body, this.etag, this.expiresAt);
+
+  final String body;
+  final String? etag;
+  final DateTime expiresAt;
+}
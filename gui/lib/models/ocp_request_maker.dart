@@ -2,6 +2,7 @@ import 'dart:convert';
 import 'dart:io';
 
 import 'package:bioptim_gui/models/api_config.dart';
+import 'package:bioptim_gui/models/catalog_cache.dart';
 import 'package:bioptim_gui/models/decision_variable_value_type.dart';
 import 'package:bioptim_gui/models/decision_variables_type.dart';
 import 'package:bioptim_gui/models/ocp_data.dart';
@@ -26,8 +27,8 @@ class OCPRequestMaker<T extends OCPData> {
 
   Future<OCPAvailableValues> getAvailableValues() async {
     final url = Uri.parse('${APIConfig.url}/$prefix/available_values');
-    final response = await http.get(url);
-    final jsonResponse = json.decode(response.body);
+    final body = await CatalogCache.get(url);
+    final jsonResponse = json.decode(body!);
 
     List<String> nodeValues = List<String>.from(jsonResponse["nodes"]);
     List<String> integrationRules =
@@ -98,6 +98,7 @@ class PythonInterface {
     String path, {
     bool multistart = false,
     int nbSeeds = 1,
+    int? nbPools,
     String? overrideWorkingDirectory,
   }) async {
     // TODO Better fail if not ready (popup?)
@@ -114,6 +115,8 @@ class PythonInterface {
             path,
             '-m',
             nbSeeds.toString(),
+            // the script uses all the cores by default
+            if (nbPools != null) ...['-p', nbPools.toString()],
           ]
         : [
             path,
@@ -1,4 +1,5 @@
 import 'dart:convert';
+import 'dart:io';
 import 'package:bioptim_gui/models/acrobatics_controllers.dart';
 import 'package:bioptim_gui/models/optimal_control_program_controllers.dart';
 import 'package:bioptim_gui/models/optimal_control_program_type.dart';
@@ -134,6 +135,8 @@ class _BuildTraillingState extends State<_BuildTrailling> {
     final status = PythonInterface.instance.status;
 
     final nbSeedsController = TextEditingController(text: '1');
+    final nbPoolsController =
+        TextEditingController(text: Platform.numberOfProcessors.toString());
 
     final scriptName = basename(_scriptPath!);
     switch (status) {
@@ -167,6 +170,14 @@ class _BuildTraillingState extends State<_BuildTrailling> {
                   label: 'Seeds',
                 ),
               ),
+              SizedBox(
+                width: 120,
+                child: PositiveIntegerTextField(
+                  value: Platform.numberOfProcessors.toString(),
+                  controller: nbPoolsController,
+                  label: 'Pools',
+                ),
+              ),
             ],
           ),
         );
@@ -182,7 +193,8 @@ class _BuildTraillingState extends State<_BuildTrailling> {
                   onPressed: () => {
                         _onRunScript(
                             multistart: true,
-                            nbSeedController: nbSeedsController)
+                            nbSeedController: nbSeedsController,
+                            nbPoolsController: nbPoolsController)
                       },
                   child: Text('Run $scriptName multistart')),
               SizedBox(
@@ -193,6 +205,14 @@ class _BuildTraillingState extends State<_BuildTrailling> {
                   label: 'Seeds',
                 ),
               ),
+              SizedBox(
+                width: 120,
+                child: PositiveIntegerTextField(
+                  value: Platform.numberOfProcessors.toString(),
+                  controller: nbPoolsController,
+                  label: 'Pools',
+                ),
+              ),
             ],
           ),
         );
@@ -247,11 +267,15 @@ class _BuildTraillingState extends State<_BuildTrailling> {
   void _onRunScript({
     bool multistart = false,
     TextEditingController? nbSeedController,
+    TextEditingController? nbPoolsController,
   }) async {
     final process = await PythonInterface.instance.runFile(_scriptPath!,
         multistart: multistart,
         nbSeeds:
-            (nbSeedController == null) ? 1 : int.parse(nbSeedController.text));
+            (nbSeedController == null) ? 1 : int.parse(nbSeedController.text),
+        nbPools: (nbPoolsController == null)
+            ? null
+            : int.tryParse(nbPoolsController.text));
     if (process == null) return;
 
     setState(() {
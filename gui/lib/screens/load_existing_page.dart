@@ -25,11 +25,19 @@ class _LoadExistingState extends State<LoadExisting> {
   void requestBestAndDiscard() {
     final url = Uri.parse('${APIConfig.url}/load_existing/load');
     final request = http.MultipartRequest('POST', url);
-    request.files.addAll(pickedFiles.map((file) => http.MultipartFile.fromBytes(
-          'files',
-          file.readAsBytesSync(),
-          filename: file.path,
-        )));
+    request.files.addAll(pickedFiles.map((file) {
+      // the summary written alongside the solution is enough to rank it and is
+      // much smaller than the solution, it is sent under the name of the
+      // solution (the api recognizes its content)
+      final summary = File(
+          file.path.replaceAll(RegExp(r'\.(npz|pkl)$'), '.summary.json'));
+      final toSend = summary.existsSync() ? summary : file;
+      return http.MultipartFile.fromBytes(
+        'files',
+        toSend.readAsBytesSync(),
+        filename: file.path,
+      );
+    }));
 
     setState(() {
       bestFile = '';
@@ -57,7 +65,7 @@ class _LoadExistingState extends State<LoadExisting> {
   void handleFilePickerOnPressed() async {
     final results = await FilePicker.platform.pickFiles(
       type: FileType.custom,
-      allowedExtensions: ["pkl"],
+      allowedExtensions: ["npz", "pkl"],
       allowMultiple: true,
     );
     if (results == null) return;
@@ -1,4 +1,5 @@
 import 'package:bioptim_gui/models/api_config.dart';
+import 'package:bioptim_gui/models/catalog_cache.dart';
 import 'package:bioptim_gui/widgets/utils/custom_dropdown_button.dart';
 import 'package:bioptim_gui/widgets/utils/extensions.dart';
 import 'package:flutter/material.dart';
@@ -59,10 +60,10 @@ class CustomHttpDropdownState extends State<CustomHttpDropdown> {
 
   Future<void> _fetchAvailableValues() async {
     final url = Uri.parse('${APIConfig.url}${widget.getEndpoint}');
-    final response = await http.get(url);
+    final body = await CatalogCache.get(url);
 
-    if (response.statusCode == 200) {
-      final List<dynamic> responseData = json.decode(response.body);
+    if (body != null) {
+      final List<dynamic> responseData = json.decode(body);
       final values = responseData
           .map((value) =>
               value.toString().replaceAll("_", " ").toLowerCase().capitalize())